@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from fastapi import HTTPException, status
+
+from cancellation import CancelToken, RequestCancelled
+from enums import JobStatus, RangeOutput
+from ranges import count_range_steps
+from schemas import RangeCostEstimate, RangeJobStatus, TransitRangeRequest, TransitRangeResponse
+from utils import resolve_range_bounds
+
+# Per-snapshot cost model, measured on a default 8-point config; tune per deployment.
+RANGE_CPU_MS_PER_SNAPSHOT = float(os.getenv("RANGE_CPU_MS_PER_SNAPSHOT", "25"))
+RANGE_MEMORY_KB_PER_SNAPSHOT = float(os.getenv("RANGE_MEMORY_KB_PER_SNAPSHOT", "150"))
+RANGE_RESPONSE_KB_PER_SNAPSHOT = float(os.getenv("RANGE_RESPONSE_KB_PER_SNAPSHOT", "35"))
+# `output=patterns` keeps only pattern lifecycles, which grow with pattern changes rather than steps.
+RANGE_PATTERN_KB_PER_SNAPSHOT = float(os.getenv("RANGE_PATTERN_KB_PER_SNAPSHOT", "0.5"))
+
+# Per-request limits: above the sync limit a range is downgraded to a background
+# job, above the hard limit it is rejected outright.
+RANGE_MAX_SYNC_SNAPSHOTS = int(os.getenv("RANGE_MAX_SYNC_SNAPSHOTS", "2000"))
+RANGE_MAX_SNAPSHOTS = int(os.getenv("RANGE_MAX_SNAPSHOTS", "50000"))
+# Largest estimated memory (MB) one buffered range may hold; streams are exempt.
+RANGE_MAX_MEMORY_MB = float(os.getenv("RANGE_MAX_MEMORY_MB", "1024"))
+
+# Per-user budget: cost units (subject builds) allowed per sliding window.
+RANGE_USER_BUDGET = int(os.getenv("RANGE_USER_BUDGET", "100000"))
+RANGE_USER_BUDGET_WINDOW_SECONDS = float(os.getenv("RANGE_USER_BUDGET_WINDOW_SECONDS", "3600"))
+
+# Background jobs for downgraded ranges.
+RANGE_ASYNC_WORKERS = int(os.getenv("RANGE_ASYNC_WORKERS", "2"))
+RANGE_MAX_JOBS_PER_USER = int(os.getenv("RANGE_MAX_JOBS_PER_USER", "2"))
+RANGE_JOB_TTL_SECONDS = float(os.getenv("RANGE_JOB_TTL_SECONDS", "900"))
+# Estimated memory (MB) of queued/running jobs plus retained results; the oldest
+# finished results are discarded (status `expired`) to make room for new jobs.
+RANGE_JOB_MEMORY_MB = float(os.getenv("RANGE_JOB_MEMORY_MB", "2048"))
+
+_ACTIVE = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+def estimate_range_cost(payload: TransitRangeRequest) -> RangeCostEstimate:
+    """
+    Estimate snapshot count, CPU, memory and response size of a range without computing it.
+    """
+    _, start_dt, end_dt = resolve_range_bounds(payload)
+    if start_dt > end_dt:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Range end must not be before its start.",
+        )
+    try:
+        snapshots = count_range_steps(start_dt, end_dt, payload.granularity, payload.step_minutes)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+    has_natal = payload.birth is not None
+    cost = snapshots + (1 if has_natal else 0)
+    if payload.output == RangeOutput.PATTERNS:
+        response_kb = memory_kb = snapshots * RANGE_PATTERN_KB_PER_SNAPSHOT
+    else:
+        # Each snapshot repeats the natal subject, roughly doubling its serialized size.
+        response_kb = snapshots * RANGE_RESPONSE_KB_PER_SNAPSHOT * (2 if has_natal else 1)
+        memory_kb = snapshots * RANGE_MEMORY_KB_PER_SNAPSHOT
+    return RangeCostEstimate(
+        snapshots=snapshots,
+        cost=cost,
+        estimated_cpu_seconds=round(cost * RANGE_CPU_MS_PER_SNAPSHOT / 1000.0, 2),
+        estimated_memory_mb=round(memory_kb / 1024.0, 1),
+        estimated_response_mb=round(response_kb / 1024.0, 1),
+        max_sync_snapshots=RANGE_MAX_SYNC_SNAPSHOTS,
+        max_snapshots=RANGE_MAX_SNAPSHOTS,
+    )
+
+
+class CostBudget:
+    """
+    Sliding-window cost budget per user.
+
+    Every admitted request is recorded as (timestamp, cost); a new request is
+    admitted only if the costs still inside the window plus its own fit the limit.
+    """
+
+    def __init__(self, limit: int, window_seconds: float) -> None:
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self._spent: dict[str, deque[tuple[float, int]]] = {}
+        self._lock = threading.Lock()
+
+    def try_charge(self, user: str, cost: int, now: Optional[float] = None) -> Optional[float]:
+        """
+        Charge `cost` to `user`. Returns None on success, otherwise seconds until it would fit.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entries = self._spent.setdefault(user, deque())
+            while entries and now - entries[0][0] >= self.window_seconds:
+                entries.popleft()
+            used = sum(c for _, c in entries)
+            if used + cost <= self.limit:
+                entries.append((now, cost))
+                return None
+            # Walk forward through expiring entries until enough budget frees up.
+            excess = used + cost - self.limit
+            for ts, c in entries:
+                excess -= c
+                if excess <= 0:
+                    return max(0.0, ts + self.window_seconds - now)
+            return self.window_seconds
+
+    def refund(self, user: str, cost: int) -> None:
+        """
+        Take back the most recent charge of `cost` to `user`, for a request refused after it was charged.
+        """
+        with self._lock:
+            entries = self._spent.get(user) or deque()
+            for i in range(len(entries) - 1, -1, -1):
+                if entries[i][1] == cost:
+                    del entries[i]
+                    return
+
+    def remaining(self, user: str, now: Optional[float] = None) -> int:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entries = self._spent.get(user) or deque()
+            used = sum(c for ts, c in entries if now - ts < self.window_seconds)
+        return max(0, self.limit - used)
+
+
+@dataclass
+class RangeJob:
+    """Background transit range computation owned by one user."""
+
+    id: str
+    owner: str
+    estimate: RangeCostEstimate
+    status: JobStatus = JobStatus.QUEUED
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+    result: Optional[TransitRangeResponse] = None
+    error: Optional[str] = None
+    token: CancelToken = field(default_factory=CancelToken)
+
+    def to_status(self) -> RangeJobStatus:
+        return RangeJobStatus(
+            job_id=self.id,
+            status=self.status,
+            created_at=self.created_at,
+            finished_at=self.finished_at,
+            estimate=self.estimate,
+            result=self.result,
+            error=self.error,
+        )
+
+
+class RangeJobStore:
+    """
+    In-process store and worker pool for transit ranges downgraded to async execution.
+
+    Finished jobs are kept for `ttl_seconds` so clients can poll their result.
+    Jobs are accounted by their estimated memory: queued and running jobs plus
+    retained results must fit `memory_mb`, and the oldest results are dropped
+    (their job marked `expired`) when a new job needs the room.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_jobs_per_user: int,
+        ttl_seconds: float,
+        memory_mb: float = RANGE_JOB_MEMORY_MB,
+    ) -> None:
+        self.max_jobs_per_user = max_jobs_per_user
+        self.ttl_seconds = ttl_seconds
+        self.memory_mb = memory_mb
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="range-job")
+        self._jobs: dict[str, RangeJob] = {}
+        self._lock = threading.Lock()
+
+    def _purge_expired(self) -> None:
+        cutoff = datetime.now(timezone.utc).timestamp() - self.ttl_seconds
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and job.finished_at.timestamp() < cutoff:
+                del self._jobs[job_id]
+
+    def _active_count(self, owner: str) -> int:
+        return sum(1 for j in self._jobs.values() if j.owner == owner and j.status in _ACTIVE)
+
+    def _held_mb(self) -> float:
+        return sum(
+            j.estimate.estimated_memory_mb for j in self._jobs.values()
+            if j.status in _ACTIVE or j.result is not None
+        )
+
+    def _make_room(self, memory_mb: float) -> bool:
+        """Drop the oldest retained results until `memory_mb` more fits; False if it never can."""
+        excess = self._held_mb() + memory_mb - self.memory_mb
+        if excess <= 0:
+            return True
+        retained = sorted((j for j in self._jobs.values() if j.result is not None), key=lambda j: j.finished_at)
+        if sum(j.estimate.estimated_memory_mb for j in retained) < excess:
+            return False
+        for job in retained:
+            if excess <= 0:
+                break
+            job.result = None
+            job.status = JobStatus.EXPIRED
+            job.error = "Result discarded to free memory for newer jobs; submit the range again."
+            excess -= job.estimate.estimated_memory_mb
+        return True
+
+    def _check_capacity(self, owner: str, estimate: RangeCostEstimate) -> None:
+        if self._active_count(owner) >= self.max_jobs_per_user:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"At most {self.max_jobs_per_user} background range jobs may run at once.",
+            )
+        if not self._make_room(estimate.estimated_memory_mb):
+            running = [j.estimate.estimated_cpu_seconds for j in self._jobs.values() if j.status in _ACTIVE]
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Background range jobs are using all of their memory budget; retry later.",
+                headers={"Retry-After": str(max(1, math.ceil(min(running, default=1.0))))},
+            )
+
+    def ensure_capacity(self, owner: str, estimate: RangeCostEstimate) -> None:
+        """Raise 429 unless a job for `estimate` could be submitted for `owner` right now."""
+        with self._lock:
+            self._purge_expired()
+            self._check_capacity(owner, estimate)
+
+    def submit(
+        self,
+        owner: str,
+        estimate: RangeCostEstimate,
+        func: Callable[..., TransitRangeResponse],
+        *args,
+    ) -> RangeJob:
+        """
+        Queue `func(*args, cancel_token=...)`; its `TransitRangeResponse` becomes the job's result.
+        """
+        with self._lock:
+            self._purge_expired()
+            self._check_capacity(owner, estimate)
+            job = RangeJob(id=uuid.uuid4().hex, owner=owner, estimate=estimate)
+            self._jobs[job.id] = job
+
+        def run() -> None:
+            # Claim the job; a cancel that got in first has already finalised it.
+            with self._lock:
+                if job.status != JobStatus.QUEUED:
+                    return
+                job.status = JobStatus.RUNNING
+            result, error = None, None
+            try:
+                result = func(*args, cancel_token=job.token)
+                outcome = JobStatus.SUCCEEDED
+            except RequestCancelled:
+                outcome = JobStatus.CANCELLED
+            except Exception as exc:
+                error = str(exc) or exc.__class__.__name__
+                outcome = JobStatus.FAILED
+            with self._lock:
+                job.result, job.error, job.status = result, error, outcome
+                job.finished_at = datetime.now(timezone.utc)
+
+        self._executor.submit(run)
+        return job
+
+    def get(self, owner: str, job_id: str) -> RangeJob:
+        with self._lock:
+            self._purge_expired()
+            job = self._jobs.get(job_id)
+        # Other users' jobs are indistinguishable from missing ones.
+        if job is None or job.owner != owner:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+        return job
+
+    def cancel(self, owner: str, job_id: str) -> RangeJob:
+        """
+        Cancel a job. Queued jobs are finalised at once; running ones stop at
+        their next cancellation check and are finalised by their worker.
+        """
+        job = self.get(owner, job_id)
+        with self._lock:
+            if job.status in _ACTIVE:
+                job.token.cancel()
+            if job.status == JobStatus.QUEUED:
+                job.status = JobStatus.CANCELLED
+                job.finished_at = datetime.now(timezone.utc)
+        return job
+
+
+range_budget = CostBudget(RANGE_USER_BUDGET, RANGE_USER_BUDGET_WINDOW_SECONDS)
+range_jobs = RangeJobStore(RANGE_ASYNC_WORKERS, RANGE_MAX_JOBS_PER_USER, RANGE_JOB_TTL_SECONDS)
+
+
+def admit_range_request(
+    payload: TransitRangeRequest,
+    username: str,
+    allow_async: bool = True,
+    buffered: bool = True,
+) -> tuple[RangeCostEstimate, bool]:
+    """
+    Decide whether a range may run, charging its cost to the user's budget.
+
+    Returns `(estimate, run_async)`. Raises 413 when the range exceeds the
+    per-request limits (or the sync limit with `allow_async=False`) and 429
+    with `Retry-After` when the user's budget is exhausted. Unbuffered
+    (streamed) ranges skip the memory limit and always run synchronously.
+    """
+    estimate = estimate_range_cost(payload)
+    limit = min(RANGE_MAX_SNAPSHOTS, RANGE_USER_BUDGET)
+    if estimate.snapshots > limit:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail={
+                "message": f"Range produces {estimate.snapshots} snapshots; the limit is {limit}. "
+                "Use a coarser granularity or a shorter range.",
+                "estimate": estimate.model_dump(mode="json"),
+            },
+        )
+    if buffered and estimate.estimated_memory_mb > RANGE_MAX_MEMORY_MB:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail={
+                "message": f"Range needs about {estimate.estimated_memory_mb:g} MB; the limit is "
+                f"{RANGE_MAX_MEMORY_MB:g} MB. Use output=patterns, /transit-range/stream, "
+                "a coarser granularity or a shorter range.",
+                "estimate": estimate.model_dump(mode="json"),
+            },
+        )
+    run_async = buffered and estimate.snapshots > RANGE_MAX_SYNC_SNAPSHOTS
+    if run_async and not allow_async:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail={
+                "message": f"Range produces {estimate.snapshots} snapshots; synchronous requests are "
+                f"limited to {RANGE_MAX_SYNC_SNAPSHOTS}. Retry with allow_async=true.",
+                "estimate": estimate.model_dump(mode="json"),
+            },
+        )
+    # Check job slots and memory before charging so a refused downgrade costs nothing.
+    if run_async:
+        range_jobs.ensure_capacity(username, estimate)
+
+    retry_after = range_budget.try_charge(username, estimate.cost)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Transit range budget exhausted for this user.",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+    return estimate, run_async
+
+
+def submit_range_job(
+    username: str,
+    estimate: RangeCostEstimate,
+    func: Callable[..., TransitRangeResponse],
+    *args,
+) -> RangeJob:
+    """
+    Queue an admitted range as a background job, refunding its budget charge if the store refuses it.
+
+    `admit_range_request` checks job capacity before charging, but another
+    request can take the last slot (or memory) before this one is submitted.
+    """
+    try:
+        return range_jobs.submit(username, estimate, func, *args)
+    except HTTPException:
+        range_budget.refund(username, estimate.cost)
+        raise
@@ -1,47 +1,31 @@
 from pathlib import Path
 
-import secrets
-import os
-
-from fastapi import FastAPI,Depends, HTTPException, status
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.security import HTTPBasic, HTTPBasicCredentials
 
+from auth import get_current_username
 from endpoints.health import router as health_router
 from endpoints.natal import router as natal_router
 from endpoints.transit import router as transit_router
 from endpoints.transit_range import router as transit_range_router
+from endpoints.aspect_timeline import router as aspect_timeline_router
+from endpoints.sky_events import router as sky_events_router
+from endpoints.returns import router as returns_router
+from endpoints.progressions import router as progressions_router
+from endpoints.astrocartography import router as astrocartography_router
+from endpoints.relocation import router as relocation_router
+from endpoints.compare import router as compare_router
 from endpoints.svg_chart import router as svg_chart_router
+from endpoints.bundle import router as bundle_router
+from endpoints.live_sky import router as live_sky_router
 from endpoints.report import router as report_router
 from endpoints.relationship import router as relationship_router
 
 BASE_DIR = Path(__file__).resolve().parent
 FRONTEND_DIR = BASE_DIR / "frontend"
 
-
-security = HTTPBasic()
-
-# 🔐 Credentials
-DEMO_USERNAME = os.getenv("DEMO_USERNAME", "demo")
-DEMO_PASSWORD = os.getenv("DEMO_PASSWORD", "demo1234")
-
-
-def get_current_username(credentials: HTTPBasicCredentials = Depends(security)):
-    # Use compare_digest to avoid timing attacks
-    correct_username = secrets.compare_digest(credentials.username, DEMO_USERNAME)
-    correct_password = secrets.compare_digest(credentials.password, DEMO_PASSWORD)
-
-    if not (correct_username and correct_password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password",
-            headers={"WWW-Authenticate": "Basic"},
-        )
-
-    return credentials.username
-
 app = FastAPI(
     title="Astro API",
     version="0.4.0",
@@ -119,6 +103,15 @@ app.include_router(health_router, prefix=API_PREFIX)
 app.include_router(natal_router, prefix=API_PREFIX)
 app.include_router(transit_router, prefix=API_PREFIX)
 app.include_router(transit_range_router, prefix=API_PREFIX)
+app.include_router(aspect_timeline_router, prefix=API_PREFIX)
+app.include_router(sky_events_router, prefix=API_PREFIX)
+app.include_router(returns_router, prefix=API_PREFIX)
+app.include_router(progressions_router, prefix=API_PREFIX)
+app.include_router(astrocartography_router, prefix=API_PREFIX)
+app.include_router(relocation_router, prefix=API_PREFIX)
+app.include_router(compare_router, prefix=API_PREFIX)
+app.include_router(live_sky_router, prefix=API_PREFIX)
 app.include_router(report_router, prefix=API_PREFIX)
 app.include_router(relationship_router, prefix=API_PREFIX)
 app.include_router(svg_chart_router, prefix=API_PREFIX)
+app.include_router(bundle_router, prefix=API_PREFIX)
@@ -1,12 +1,31 @@
 from .ptolemaic import (  # noqa: F401
     NormalAspect,
     AspectLink,
+    ClusterDefinition,
+    PatternDefinition,
+    PatternEdge,
     PtolemaicAspect,
     PtolemaicAspectCalculator,
     PtolemaicAspectConfiguration,
     PTOLEMAIC_ASPECTS,
     PTOLEMAIC_PATTERNS,
+    PATTERN_DEFINITIONS,
+    PATTERN_MINOR_ASPECTS,
+    compile_pattern,
+    compute_cross_major_aspects,
     compute_major_aspects,
     compute_ptolemaic_patterns,
     serialize_ptolemaic_aspects,
 )
+from .cross import (  # noqa: F401
+    PointPositions,
+    compute_cross_aspects,
+    cross_aspect_arrays,
+)
+from .timeline import (  # noqa: F401
+    AspectWindow,
+    SignIngress,
+    find_aspect_windows,
+    find_sign_ingresses,
+    refine_roots,
+)
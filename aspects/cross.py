@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from .ptolemaic import PTOLEMAIC_ASPECTS, NormalAspect
+
+
+def _normalize_key(key: str) -> str:
+    return str(key).replace(" ", "_").replace("-", "_").lower()
+
+
+@dataclass(frozen=True)
+class PointPositions:
+    """
+    Ecliptic longitudes (and daily speeds) of a fixed list of points, one row per moment.
+    """
+
+    keys: tuple[str, ...]
+    longitudes: np.ndarray  # shape (moments, points)
+    speeds: np.ndarray  # shape (moments, points), degrees per day
+
+    @classmethod
+    def from_subjects(cls, subjects: Sequence[object], points: Iterable[str]) -> "PointPositions":
+        """
+        Read `abs_pos` / `speed` of `points` from Kerykeion subject models.
+
+        Points missing from the first subject are skipped for all of them.
+        """
+        keys = []
+        for pt in points:
+            key = _normalize_key(pt)
+            if key not in keys and subjects and getattr(getattr(subjects[0], key, None), "abs_pos", None) is not None:
+                keys.append(key)
+        longitudes = np.empty((len(subjects), len(keys)))
+        speeds = np.zeros((len(subjects), len(keys)))
+        for row, subject in enumerate(subjects):
+            for col, key in enumerate(keys):
+                point = getattr(subject, key)
+                longitudes[row, col] = point.abs_pos
+                speeds[row, col] = point.speed or 0.0
+        return cls(keys=tuple(keys), longitudes=longitudes, speeds=speeds)
+
+
+def cross_aspect_arrays(
+    moving_lon: np.ndarray,
+    moving_speed: np.ndarray,
+    fixed_lon: np.ndarray,
+    aspects: Sequence[NormalAspect] = PTOLEMAIC_ASPECTS,
+) -> tuple[np.ndarray, ...]:
+    """
+    Vectorized aspects between moving points (T x P) and fixed points (N).
+
+    Returns flat arrays `(moment, moving, fixed, aspect, orb, applying)`, one
+    entry per aspect in orb, where `moment`/`moving`/`fixed`/`aspect` index the
+    inputs and `aspects`. `applying` uses the moving point's speed only, which
+    is exact for transits against a natal chart.
+    """
+    angles = np.array([a.angle for a in aspects])
+    orbs = np.array([a.orb for a in aspects])
+
+    # Signed separation in (-180, 180] and its absolute angular distance.
+    separation = (moving_lon[:, :, None] - fixed_lon[None, None, :] + 180.0) % 360.0 - 180.0
+    distance = np.abs(separation)  # (T, P, N)
+    delta = distance[..., None] - angles  # (T, P, N, A)
+    in_orb = np.abs(delta) <= orbs
+
+    moment, moving, fixed, aspect = np.nonzero(in_orb)
+    signed_delta = delta[moment, moving, fixed, aspect]
+    # d|delta|/dt = sign(delta) * sign(separation) * speed; negative means the orb is closing.
+    closing_rate = (
+        np.sign(signed_delta) * np.sign(separation[moment, moving, fixed]) * moving_speed[moment, moving]
+    )
+    return moment, moving, fixed, aspect, np.abs(signed_delta), closing_rate < 0
+
+
+def compute_cross_aspects(
+    moving: PointPositions,
+    fixed: PointPositions,
+    aspects: Optional[Sequence[NormalAspect]] = None,
+) -> list[list[dict]]:
+    """
+    Aspects from every moving point to every fixed point (first row of `fixed`), per moment.
+
+    Returns one list per row of `moving`, each sorted by orb.
+    """
+    aspect_defs = tuple(aspects or PTOLEMAIC_ASPECTS)
+    rows: list[list[dict]] = [[] for _ in range(moving.longitudes.shape[0])]
+    if not moving.keys or not fixed.keys:
+        return rows
+    moment, moving_idx, fixed_idx, aspect_idx, orb, applying = cross_aspect_arrays(
+        moving.longitudes,
+        moving.speeds,
+        fixed.longitudes[0],
+        aspect_defs,
+    )
+    for t, p, n, a, o, app in zip(
+        moment.tolist(), moving_idx.tolist(), fixed_idx.tolist(), aspect_idx.tolist(), orb.tolist(), applying.tolist()
+    ):
+        rows[t].append(
+            {
+                "transit": moving.keys[p],
+                "natal": fixed.keys[n],
+                "aspect": aspect_defs[a].name,
+                "orb": round(o, 2),
+                "applying": app,
+            }
+        )
+    for row in rows:
+        row.sort(key=lambda item: item["orb"])
+    return rows
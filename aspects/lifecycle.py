@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional
+
+# A pattern's identity across steps: configuration id + point set.
+PatternKey = tuple[str, tuple[str, ...]]
+
+
+@dataclass
+class PatternSpan:
+    """
+    One uninterrupted occurrence of a Ptolemaic pattern across the steps of a range.
+
+    `start` is the first step the pattern was present at and `end` the first
+    step it was gone again; either is None when the pattern was already formed
+    at the range's first step or still formed at its last. `tightest_orb` is
+    the smallest, over the occurrence, of the pattern's widest link orb.
+    """
+
+    id: str
+    name: str
+    points: tuple[str, ...]
+    start: Optional[datetime]
+    tightest: datetime
+    tightest_orb: float
+    end: Optional[datetime] = None
+    steps: int = 0
+
+
+def pattern_key(pattern: dict) -> PatternKey:
+    return pattern["id"], tuple(sorted(pattern["points"]))
+
+
+def pattern_orb(pattern: dict) -> float:
+    """How far the pattern is from exact: the orb of its loosest link."""
+    return max((float(link["orb"]) for link in pattern.get("links") or []), default=0.0)
+
+
+class PatternTracker:
+    """
+    Incremental pattern lifecycles over consecutive range steps.
+
+    Feed each step's serialized patterns to `observe` in time order; `spans`
+    then reports every occurrence once, in order of formation, instead of
+    repeating it in every snapshot.
+    """
+
+    def __init__(self) -> None:
+        self._spans: list[PatternSpan] = []
+        self._open: dict[PatternKey, PatternSpan] = {}
+        self._steps = 0
+
+    def observe(self, timestamp: datetime, patterns: Iterable[dict]) -> None:
+        present: set[PatternKey] = set()
+        for pattern in patterns:
+            key = pattern_key(pattern)
+            if key in present:
+                continue
+            present.add(key)
+            orb = pattern_orb(pattern)
+            span = self._open.get(key)
+            if span is None:
+                span = PatternSpan(
+                    id=pattern["id"],
+                    name=pattern["name"],
+                    points=key[1],
+                    start=timestamp if self._steps else None,
+                    tightest=timestamp,
+                    tightest_orb=orb,
+                )
+                self._open[key] = span
+                self._spans.append(span)
+            elif orb < span.tightest_orb:
+                span.tightest, span.tightest_orb = timestamp, orb
+            span.steps += 1
+
+        for key in [k for k in self._open if k not in present]:
+            self._open.pop(key).end = timestamp
+        self._steps += 1
+
+    @property
+    def spans(self) -> list[PatternSpan]:
+        return list(self._spans)
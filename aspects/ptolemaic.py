@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from itertools import combinations
-from typing import Iterable, Optional, Sequence
+from typing import Callable, Iterable, Mapping, Optional, Sequence
 
 
 @dataclass(frozen=True)
@@ -81,104 +81,399 @@ PTOLEMAIC_ASPECTS: tuple[NormalAspect, ...] = (
     NormalAspect("opposition", 180.0, 6.0, "☍"),
 )
 
-STELLIUM_CLUSTER_WINDOW = 30.0
-STELLIUM_CONJUNCTION_ORB = 10.0
-KITE_SEXTILE_EXTRA_ORB = 1.0
-
-
-PTOLEMAIC_PATTERNS: tuple[PtolemaicAspectConfiguration, ...] = (
-    PtolemaicAspectConfiguration(
-        id="stellium",
-        name="Stellium",
-        planets="3+ planets",
-        aspects=("conjunction",),
-        aspects_label="Conjunctions",
-        geometry="Clustered within ~30° (often one sign) with overlapping 0° links.",
-        orb="Planets within ~5–10° of each other across the cluster.",
-        construction="Conjunction-series bundle occupying one tight sector.",
+# Aspects that only appear as pattern edges (Yod, Thor's Hammer); `compute` does not report them.
+PATTERN_MINOR_ASPECTS: tuple[NormalAspect, ...] = (
+    NormalAspect("sesquiquadrate", 135.0, 2.0, "⚼"),
+    NormalAspect("quincunx", 150.0, 3.0, "⚻"),
+)
+
+# Joins a chart name and a point key in merged multi-chart point sets ("natal.sun").
+CHART_KEY_SEPARATOR = "."
+
+
+@dataclass(frozen=True)
+class PatternEdge:
+    """
+    Aspect required between two pattern vertices (indices into `PatternDefinition.vertices`).
+
+    `extra_orb` widens the aspect's orb for this edge only.
+    """
+
+    a: int
+    b: int
+    aspect: str
+    extra_orb: float = 0.0
+
+
+@dataclass(frozen=True)
+class PatternDefinition:
+    """
+    Declarative pattern: named vertices joined by required aspect edges.
+
+    Matches report one link per edge, in `edges` order. `arrange` fixes the
+    vertex order before links and structure are built: `"longitude"` sorts the
+    vertices by ecliptic longitude, `"chain"` orients a vertex chain so it runs
+    in increasing longitude; arranged patterns also list their points in that
+    order (otherwise points are sorted). `structure` maps the vertex tuple to
+    the match's structure hints.
+    """
+
+    configuration: PtolemaicAspectConfiguration
+    vertices: tuple[str, ...]
+    edges: tuple[PatternEdge, ...]
+    structure: Callable[[tuple[str, ...]], dict]
+    arrange: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ClusterDefinition:
+    """
+    Pattern of `min_points`+ points inside a `window`-degree arc (stellium).
+
+    Links are the `link_aspect` pairs within `max(aspect orb, link_orb)`.
+    """
+
+    configuration: PtolemaicAspectConfiguration
+    window: float
+    link_aspect: str = "conjunction"
+    link_orb: float = 0.0
+    min_points: int = 3
+
+
+@dataclass(frozen=True)
+class PlanStep:
+    """Assign `vertex` from points satisfying every `(assigned vertex, edge)` check."""
+
+    vertex: int
+    checks: tuple[tuple[int, PatternEdge], ...]
+
+
+@dataclass(frozen=True)
+class MatchPlan:
+    """Seed both ends of `seed` from a chart's pairs of its aspect type, then run `steps` in order."""
+
+    seed: PatternEdge
+    steps: tuple[PlanStep, ...]
+
+
+@dataclass(frozen=True)
+class CompiledPattern:
+    """
+    A `PatternDefinition` with one match plan per distinct edge aspect type.
+
+    At match time the plan seeded by the aspect type with the fewest pairs in
+    the chart is used, so rare edges prune the search first.
+    """
+
+    definition: PatternDefinition
+    plans: tuple[MatchPlan, ...]
+    aspects: frozenset[str]
+
+
+_ARRANGEMENTS = (None, "longitude", "chain")
+
+
+def compile_pattern(definition: PatternDefinition) -> CompiledPattern:
+    """
+    Validate a pattern definition and build its match plans.
+
+    After the seed edge, vertices are placed greedily by how many edges join
+    them to already placed vertices, so every step is constrained as early as
+    possible.
+    """
+    pattern_id = definition.configuration.id
+    size = len(definition.vertices)
+    if size < 2 or not definition.edges:
+        raise ValueError(f"Pattern {pattern_id} needs at least two vertices and one edge.")
+    if definition.arrange not in _ARRANGEMENTS:
+        raise ValueError(f"Pattern {pattern_id} has an unknown arrangement: {definition.arrange}.")
+    pairs: set[frozenset[int]] = set()
+    for edge in definition.edges:
+        pair = frozenset((edge.a, edge.b))
+        if len(pair) != 2 or not all(0 <= v < size for v in pair):
+            raise ValueError(f"Pattern {pattern_id} has an invalid edge: {edge}.")
+        if pair in pairs:
+            raise ValueError(f"Pattern {pattern_id} has more than one edge between {edge.a} and {edge.b}.")
+        pairs.add(pair)
+
+    def joining(vertex: int, placed: list[int]) -> list[tuple[int, PatternEdge]]:
+        checks = []
+        for edge in definition.edges:
+            if edge.a == vertex and edge.b in placed:
+                checks.append((edge.b, edge))
+            elif edge.b == vertex and edge.a in placed:
+                checks.append((edge.a, edge))
+        return checks
+
+    plans: list[MatchPlan] = []
+    for seed in definition.edges:
+        if any(plan.seed.aspect == seed.aspect for plan in plans):
+            continue
+        placed = [seed.a, seed.b]
+        steps: list[PlanStep] = []
+        while len(placed) < size:
+            options = [(v, joining(v, placed)) for v in range(size) if v not in placed]
+            vertex, checks = max(options, key=lambda option: len(option[1]))
+            if not checks:
+                raise ValueError(f"Pattern {pattern_id} is not connected.")
+            steps.append(PlanStep(vertex, tuple(checks)))
+            placed.append(vertex)
+        plans.append(MatchPlan(seed, tuple(steps)))
+
+    return CompiledPattern(definition, tuple(plans), frozenset(edge.aspect for edge in definition.edges))
+
+
+def _edges(aspect: str, *pairs: tuple[int, int], extra_orb: float = 0.0) -> tuple[PatternEdge, ...]:
+    return tuple(PatternEdge(a, b, aspect, extra_orb) for a, b in pairs)
+
+
+PATTERN_DEFINITIONS: tuple[PatternDefinition | ClusterDefinition, ...] = (
+    ClusterDefinition(
+        PtolemaicAspectConfiguration(
+            id="stellium",
+            name="Stellium",
+            planets="3+ planets",
+            aspects=("conjunction",),
+            aspects_label="Conjunctions",
+            geometry="Clustered within ~30° (often one sign) with overlapping 0° links.",
+            orb="Planets within ~5–10° of each other across the cluster.",
+            construction="Conjunction-series bundle occupying one tight sector.",
+        ),
+        window=30.0,
+        link_orb=10.0,
+    ),
+    PatternDefinition(
+        PtolemaicAspectConfiguration(
+            id="t_square",
+            name="T-Square",
+            planets="3 planets",
+            aspects=("opposition", "square"),
+            aspects_label="Opposition + Squares",
+            geometry="Opposition capped by two 90° squares, forming a T spine.",
+            orb="Squares/opposition typically ±8–10°.",
+            construction="A ↔ B opposition with C square to both (C = focal).",
+        ),
+        vertices=("a", "focal", "b"),
+        edges=_edges("opposition", (0, 2)) + _edges("square", (0, 1), (1, 2)),
+        structure=lambda v: {"focal": v[1]},
+    ),
+    PatternDefinition(
+        PtolemaicAspectConfiguration(
+            id="grand_trine",
+            name="Grand Trine",
+            planets="3 planets",
+            aspects=("trine",),
+            aspects_label="Trines",
+            geometry="Three 120° links in an equilateral triangle.",
+            orb="Trines usually ±6–8° (often ~±7°).",
+            construction="A–B–C all 120° apart forming a closed triangle.",
+        ),
+        vertices=("a", "b", "c"),
+        edges=_edges("trine", (0, 1), (0, 2), (1, 2)),
+        structure=lambda v: {"triple": tuple(sorted(v))},
     ),
-    PtolemaicAspectConfiguration(
-        id="t_square",
-        name="T-Square",
-        planets="3 planets",
-        aspects=("opposition", "square"),
-        aspects_label="Opposition + Squares",
-        geometry="Opposition capped by two 90° squares, forming a T spine.",
-        orb="Squares/opposition typically ±8–10°.",
-        construction="A ↔ B opposition with C square to both (C = focal).",
+    PatternDefinition(
+        PtolemaicAspectConfiguration(
+            id="kite",
+            name="Kite",
+            planets="4 planets",
+            aspects=("trine", "opposition", "sextile"),
+            aspects_label="Grand Trine + opposition + sextiles",
+            geometry="Grand Trine with a fourth point opposing one trine point and sextile to the other two.",
+            orb="Trines ~±6–8°, opposition ~±8–10°, sextiles ~±5–6°.",
+            construction="A–B–C trines, with D opposite A and sextile B and C (kite spine and sides).",
+        ),
+        vertices=("anchor", "tail", "b", "c"),
+        edges=(
+            _edges("trine", (0, 2), (0, 3), (2, 3))
+            + _edges("opposition", (0, 1))
+            + _edges("sextile", (1, 2), (1, 3), extra_orb=1.0)
+        ),
+        structure=lambda v: {"triangle": (v[0], v[2], v[3]), "opposition": (v[0], v[1])},
     ),
-    PtolemaicAspectConfiguration(
-        id="grand_trine",
-        name="Grand Trine",
-        planets="3 planets",
-        aspects=("trine",),
-        aspects_label="Trines",
-        geometry="Three 120° links in an equilateral triangle.",
-        orb="Trines usually ±6–8° (often ~±7°).",
-        construction="A–B–C all 120° apart forming a closed triangle.",
+    PatternDefinition(
+        PtolemaicAspectConfiguration(
+            id="grand_cross",
+            name="Grand Cross",
+            planets="4 planets",
+            aspects=("opposition", "square"),
+            aspects_label="Oppositions + Squares",
+            geometry="Four points every 90°: two oppositions plus four squares.",
+            orb="Squares/oppositions typically ±8–10°.",
+            construction="A↔C and B↔D oppositions; each is square to its neighbors.",
+        ),
+        vertices=("a", "a_opposite", "b", "b_opposite"),
+        edges=_edges("opposition", (0, 1), (2, 3)) + _edges("square", (0, 2), (0, 3), (1, 2), (1, 3)),
+        structure=lambda v: {"axes": ((v[0], v[1]), (v[2], v[3]))},
     ),
-    PtolemaicAspectConfiguration(
-        id="kite",
-        name="Kite",
-        planets="4 planets",
-        aspects=("trine", "opposition", "sextile"),
-        aspects_label="Grand Trine + opposition + sextiles",
-        geometry="Grand Trine with a fourth point opposing one trine point and sextile to the other two.",
-        orb="Trines ~±6–8°, opposition ~±8–10°, sextiles ~±5–6°.",
-        construction="A–B–C trines, with D opposite A and sextile B and C (kite spine and sides).",
+    PatternDefinition(
+        PtolemaicAspectConfiguration(
+            id="grand_sextile",
+            name="Grand Sextile",
+            planets="6 planets",
+            aspects=("sextile", "trine"),
+            aspects_label="Sextiles + Trines",
+            geometry="Hexagram/Star of David: alternating 60° and 120° points.",
+            orb="Sextiles ±5–6°; trines ±6–8°.",
+            construction="Two interlaced Grand Trines linked by six sextiles.",
+        ),
+        vertices=("a", "b", "c", "d", "e", "f"),
+        edges=(
+            _edges("sextile", *((i, (i + 1) % 6) for i in range(6)))
+            + _edges("trine", *((i, (i + 2) % 6) for i in range(6)))
+        ),
+        structure=lambda v: {"triples": (tuple(v[0::2]), tuple(v[1::2]))},
+        arrange="longitude",
     ),
-    PtolemaicAspectConfiguration(
-        id="grand_cross",
-        name="Grand Cross",
-        planets="4 planets",
-        aspects=("opposition", "square"),
-        aspects_label="Oppositions + Squares",
-        geometry="Four points every 90°: two oppositions plus four squares.",
-        orb="Squares/oppositions typically ±8–10°.",
-        construction="A↔C and B↔D oppositions; each is square to its neighbors.",
+    PatternDefinition(
+        PtolemaicAspectConfiguration(
+            id="mystic_rectangle",
+            name="Mystic Rectangle",
+            planets="4 planets",
+            aspects=("opposition", "trine", "sextile"),
+            aspects_label="Oppositions, Trines, Sextiles",
+            geometry="Two oppositions stitched by trines and sextiles into a rectangle.",
+            orb="Oppositions ±8–10°; trines 6–8°; sextiles 5–6°.",
+            construction="A↔C and B↔D; A sextile D & trine B, C sextile B & trine D.",
+        ),
+        vertices=("a", "b", "c", "d"),
+        edges=(
+            _edges("opposition", (0, 2), (1, 3))
+            + _edges("trine", (0, 1), (2, 3))
+            + _edges("sextile", (1, 2), (3, 0))
+        ),
+        structure=lambda v: {"oppositions": ((v[0], v[2]), (v[1], v[3]))},
     ),
-    PtolemaicAspectConfiguration(
-        id="grand_sextile",
-        name="Grand Sextile",
-        planets="6 planets",
-        aspects=("sextile", "trine"),
-        aspects_label="Sextiles + Trines",
-        geometry="Hexagram/Star of David: alternating 60° and 120° points.",
-        orb="Sextiles ±5–6°; trines ±6–8°.",
-        construction="Two interlaced Grand Trines linked by six sextiles.",
+    PatternDefinition(
+        PtolemaicAspectConfiguration(
+            id="trapeze",
+            name="Trapeze / Cradle",
+            planets="4 planets",
+            aspects=("opposition", "sextile"),
+            aspects_label="Opposition + Sextiles",
+            geometry="Three sextiles in a row with an opposition across the open ends.",
+            orb="Sextiles ±5–6°; opposition ±8–10°.",
+            construction="A sextile B sextile C sextile D, with A↔D in opposition.",
+        ),
+        vertices=("a", "b", "c", "d"),
+        edges=_edges("sextile", (0, 1), (1, 2), (2, 3)) + _edges("opposition", (0, 3)),
+        structure=lambda v: {"chain": v},
+        arrange="chain",
     ),
-    PtolemaicAspectConfiguration(
-        id="mystic_rectangle",
-        name="Mystic Rectangle",
-        planets="4 planets",
-        aspects=("opposition", "trine", "sextile"),
-        aspects_label="Oppositions, Trines, Sextiles",
-        geometry="Two oppositions stitched by trines and sextiles into a rectangle.",
-        orb="Oppositions ±8–10°; trines 6–8°; sextiles 5–6°.",
-        construction="A↔C and B↔D; A sextile D & trine B, C sextile B & trine D.",
+    PatternDefinition(
+        PtolemaicAspectConfiguration(
+            id="yod",
+            name="Yod",
+            planets="3 planets",
+            aspects=("sextile", "quincunx"),
+            aspects_label="Sextile + Quincunxes",
+            geometry="Narrow isosceles triangle: a 60° base pointing to an apex 150° from both ends.",
+            orb="Sextile ±4°; quincunxes ±2–3°.",
+            construction="A sextile B, both quincunx C (C = apex).",
+        ),
+        vertices=("a", "b", "apex"),
+        edges=_edges("sextile", (0, 1)) + _edges("quincunx", (0, 2), (1, 2)),
+        structure=lambda v: {"apex": v[2], "base": (v[0], v[1])},
     ),
-    PtolemaicAspectConfiguration(
-        id="trapeze",
-        name="Trapeze / Cradle",
-        planets="4 planets",
-        aspects=("opposition", "sextile"),
-        aspects_label="Opposition + Sextiles",
-        geometry="Three sextiles in a row with an opposition across the open ends.",
-        orb="Sextiles ±5–6°; opposition ±8–10°.",
-        construction="A sextile B sextile C sextile D, with A↔D in opposition.",
+    PatternDefinition(
+        PtolemaicAspectConfiguration(
+            id="minor_grand_trine",
+            name="Minor Grand Trine",
+            planets="3 planets",
+            aspects=("trine", "sextile"),
+            aspects_label="Trine + Sextiles",
+            geometry="Half a Grand Sextile: a 120° trine bisected by a point 60° from both ends.",
+            orb="Trine ±6°; sextiles ±4°.",
+            construction="A trine C, with B sextile A and C (B = focal).",
+        ),
+        vertices=("a", "focal", "c"),
+        edges=_edges("trine", (0, 2)) + _edges("sextile", (0, 1), (1, 2)),
+        structure=lambda v: {"focal": v[1]},
     ),
+    PatternDefinition(
+        PtolemaicAspectConfiguration(
+            id="thors_hammer",
+            name="Thor's Hammer",
+            planets="3 planets",
+            aspects=("square", "sesquiquadrate"),
+            aspects_label="Square + Sesquiquadrates",
+            geometry="Square whose two ends both form 135° sesquiquadrates to a focal point.",
+            orb="Square ±6°; sesquiquadrates ±2°.",
+            construction="A square B, both sesquiquadrate C (C = focal).",
+        ),
+        vertices=("a", "b", "focal"),
+        edges=_edges("square", (0, 1)) + _edges("sesquiquadrate", (0, 2), (1, 2)),
+        structure=lambda v: {"focal": v[2]},
+    ),
+)
+
+PTOLEMAIC_PATTERNS: tuple[PtolemaicAspectConfiguration, ...] = tuple(
+    definition.configuration for definition in PATTERN_DEFINITIONS
 )
 
+# Compiled once at import; the calculator matches these unless given its own definitions.
+COMPILED_PATTERNS: tuple[CompiledPattern | ClusterDefinition, ...] = tuple(
+    compile_pattern(d) if isinstance(d, PatternDefinition) else d for d in PATTERN_DEFINITIONS
+)
+
+
+@dataclass
+class _PairIndex:
+    """
+    Per-chart lookup: separation of every point pair and, per edge aspect
+    type, the points within that type's widest pattern orb of each point.
+    """
+
+    rank: dict[str, int]
+    diffs: dict[tuple[str, str], float]
+    neighbors: dict[str, dict[str, set[str]]]
+    pair_counts: dict[str, int]
+
 
 class PtolemaicAspectCalculator:
     """
-    Compute the five major Ptolemaic aspects (0/60/90/120/180).
+    Compute the five major Ptolemaic aspects (0/60/90/120/180) and the patterns they form.
+
+    `orbs` overrides aspect orbs by name for pattern matching (e.g.
+    `{"trine": 8}`); it may also name the minor pattern aspects.
     """
 
-    def __init__(self, aspects: Optional[Sequence[NormalAspect]] = None) -> None:
+    def __init__(
+        self,
+        aspects: Optional[Sequence[NormalAspect]] = None,
+        orbs: Optional[Mapping[str, float]] = None,
+        patterns: Optional[Sequence[PatternDefinition | ClusterDefinition]] = None,
+    ) -> None:
         self.aspects = tuple(aspects or PTOLEMAIC_ASPECTS)
         self._aspect_by_name = {a.name: a for a in self.aspects}
 
+        pattern_aspects = {a.name: a for a in PATTERN_MINOR_ASPECTS}
+        pattern_aspects.update(self._aspect_by_name)
+        for name, orb in (orbs or {}).items():
+            if name not in pattern_aspects:
+                raise ValueError(f"Unknown aspect: {name}.")
+            if orb < 0:
+                raise ValueError(f"Orb for {name} must not be negative.")
+            pattern_aspects[name] = replace(pattern_aspects[name], orb=float(orb))
+        self._pattern_aspects = pattern_aspects
+
+        if patterns is None:
+            self.patterns = COMPILED_PATTERNS
+        else:
+            self.patterns = tuple(compile_pattern(p) if isinstance(p, PatternDefinition) else p for p in patterns)
+
+        # Widest orb any edge of each aspect type allows; bounds the per-chart neighbor index.
+        self._edge_limits: dict[str, tuple[float, float]] = {}
+        for pattern in self.patterns:
+            if not isinstance(pattern, CompiledPattern):
+                continue
+            for edge in pattern.definition.edges:
+                aspect = pattern_aspects.get(edge.aspect)
+                if aspect is None:
+                    continue
+                _, limit = self._edge_limits.get(edge.aspect, (aspect.angle, 0.0))
+                self._edge_limits[edge.aspect] = (aspect.angle, max(limit, aspect.orb + edge.extra_orb))
+
     @staticmethod
     def _normalize_key(key: str) -> str:
         return str(key).replace(" ", "_").replace("-", "_").lower()
@@ -219,57 +514,6 @@ class PtolemaicAspectCalculator:
                 return aspect, delta
         return None, None
 
-    def _pair_aspects(self, points: dict[str, dict], keys: list[str]) -> dict[tuple[str, str], dict]:
-        aspects: dict[tuple[str, str], dict] = {}
-        for i, a in enumerate(keys):
-            a_pos = points[a]["abs_pos"]
-            for b in keys[i + 1 :]:
-                b_pos = points[b]["abs_pos"]
-                diff = self._angular_diff(float(a_pos), float(b_pos))
-                aspect_def, orb = self._classify(diff)
-                if not aspect_def or orb is None:
-                    continue
-                pair = tuple(sorted((a, b)))
-                aspects[pair] = {
-                    "type": aspect_def.name,
-                    "angle": aspect_def.angle,
-                    "orb": round(float(orb), 2),
-                    "difference": diff,
-                    "icon": aspect_def.icon,
-                }
-        return aspects
-
-    def _get_aspect_info(
-        self,
-        a: str,
-        b: str,
-        aspect_name: str,
-        points: dict[str, dict],
-        pair_map: dict[tuple[str, str], dict],
-        extra_orb: float = 0.0,
-    ) -> Optional[dict]:
-        """
-        Retrieve an aspect definition for a pair, optionally allowing a small orb extension.
-        """
-        pair = tuple(sorted((a, b)))
-        info = pair_map.get(pair)
-        if info and info["type"] == aspect_name:
-            return info
-        aspect_def = self._aspect_by_name.get(aspect_name)
-        if not aspect_def:
-            return None
-        diff = self._angular_diff(points[a]["abs_pos"], points[b]["abs_pos"])
-        delta = abs(diff - aspect_def.angle)
-        if delta <= aspect_def.orb + extra_orb:
-            return {
-                "type": aspect_def.name,
-                "angle": aspect_def.angle,
-                "orb": round(float(delta), 2),
-                "difference": diff,
-                "icon": aspect_def.icon,
-            }
-        return None
-
     @staticmethod
     def _point_summary(point: dict) -> dict:
         return {
@@ -330,380 +574,234 @@ class PtolemaicAspectCalculator:
         results.sort(key=lambda row: row.get("orb", 9999.0))
         return results
 
-    def _make_link(self, a: str, b: str, info: dict) -> AspectLink:
-        return AspectLink(
-            type=info["type"],
-            pair=tuple(sorted((a, b))),
-            orb=info["orb"],
-            difference=info["difference"],
+    def _index(self, keys: list[str], points: dict[str, dict]) -> _PairIndex:
+        index = _PairIndex(
+            rank={key: i for i, key in enumerate(keys)},
+            diffs={},
+            neighbors={name: {key: set() for key in keys} for name in self._edge_limits},
+            pair_counts=dict.fromkeys(self._edge_limits, 0),
         )
+        for i, a in enumerate(keys):
+            a_pos = points[a]["abs_pos"]
+            for b in keys[i + 1 :]:
+                diff = self._angular_diff(a_pos, points[b]["abs_pos"])
+                index.diffs[a, b] = index.diffs[b, a] = diff
+                for name, (angle, limit) in self._edge_limits.items():
+                    if abs(diff - angle) <= limit:
+                        index.neighbors[name][a].add(b)
+                        index.neighbors[name][b].add(a)
+                        index.pair_counts[name] += 1
+        return index
+
+    def _edge_orb(self, a: str, b: str, edge: PatternEdge, index: _PairIndex) -> Optional[float]:
+        """How far `a`-`b` is from the edge's exact aspect, or None when outside its orb."""
+        aspect = self._pattern_aspects[edge.aspect]
+        delta = abs(index.diffs[a, b] - aspect.angle)
+        return delta if delta <= aspect.orb + edge.extra_orb else None
 
-    def _match_stellium(self, keys: list[str], points: dict[str, dict], pair_map: dict) -> list[PtolemaicAspect]:
-        matches: list[PtolemaicAspect] = []
-        seen: set[frozenset[str]] = set()
-        extra_conj = max(0.0, STELLIUM_CONJUNCTION_ORB - self._aspect_by_name["conjunction"].orb)
-        # Use sorted angles with wrap-around to find clusters within ~30°
-        ordered = sorted([(k, points[k]["abs_pos"]) for k in keys], key=lambda kv: kv[1])
-        extended = ordered + [(k, pos + 360.0) for k, pos in ordered]
-        start = 0
-        for end in range(len(extended)):
-            while extended[end][1] - extended[start][1] > STELLIUM_CLUSTER_WINDOW:
-                start += 1
-            window = extended[start : end + 1]
-            unique_keys = {k for k, _ in window}
-            if len(unique_keys) < 3:
-                continue
-            key_set = frozenset(unique_keys)
-            if key_set in seen:
-                continue
-            seen.add(key_set)
-            links: list[AspectLink] = []
-            for a, b in combinations(sorted(unique_keys), 2):
-                info = self._get_aspect_info(a, b, "conjunction", points, pair_map, extra_orb=extra_conj)
-                if info:
-                    links.append(self._make_link(a, b, info))
-            matches.append(
-                PtolemaicAspect(
-                    configuration=next(p for p in PTOLEMAIC_PATTERNS if p.id == "stellium"),
-                    points=tuple(sorted(unique_keys)),
-                    links=tuple(links),
-                    structure={"cluster": tuple(sorted(unique_keys))},
-                )
-            )
-        return matches
-
-    def _match_t_square(self, keys: list[str], points: dict[str, dict], pair_map: dict) -> list[PtolemaicAspect]:
-        matches: list[PtolemaicAspect] = []
-        seen: set[frozenset[str]] = set()
-        config = next(p for p in PTOLEMAIC_PATTERNS if p.id == "t_square")
-        for a, b, c in combinations(keys, 3):
-            triplet = (a, b, c)
-            combos = [
-                (triplet[0], triplet[1], triplet[2]),
-                (triplet[0], triplet[2], triplet[1]),
-                (triplet[1], triplet[0], triplet[2]),
-            ]
-            for x, focal, y in combos:
-                opp = pair_map.get(tuple(sorted((x, y))))
-                sq1 = pair_map.get(tuple(sorted((x, focal))))
-                sq2 = pair_map.get(tuple(sorted((focal, y))))
-                if opp and opp["type"] == "opposition" and sq1 and sq2 and sq1["type"] == sq2["type"] == "square":
-                    key_set = frozenset((x, focal, y))
-                    if key_set in seen:
-                        continue
-                    seen.add(key_set)
-                    links = [
-                        self._make_link(x, y, opp),
-                        self._make_link(x, focal, sq1),
-                        self._make_link(focal, y, sq2),
-                    ]
-                    matches.append(
-                        PtolemaicAspect(
-                            configuration=config,
-                            points=tuple(sorted(key_set)),
-                            links=tuple(links),
-                            structure={"focal": focal},
-                        )
-                    )
-                    break
-        return matches
+    @staticmethod
+    def _arrange(definition: PatternDefinition, vertices: tuple[str, ...], points: dict[str, dict]) -> tuple[str, ...]:
+        if definition.arrange == "longitude":
+            return tuple(sorted(vertices, key=lambda k: points[k]["abs_pos"]))
+        if definition.arrange == "chain":
+            step = (points[vertices[1]]["abs_pos"] - points[vertices[0]]["abs_pos"]) % 360.0
+            return vertices[::-1] if step > 180.0 else vertices
+        return vertices
+
+    def _match_pattern(
+        self, compiled: CompiledPattern, points: dict[str, dict], index: _PairIndex
+    ) -> list[PtolemaicAspect]:
+        definition = compiled.definition
+        if not compiled.aspects <= self._pattern_aspects.keys():
+            return []
+        plan = min(compiled.plans, key=lambda p: index.pair_counts[p.seed.aspect])
+        if not index.pair_counts[plan.seed.aspect]:
+            return []
 
-    def _match_grand_trine(self, keys: list[str], points: dict[str, dict], pair_map: dict) -> list[PtolemaicAspect]:
-        matches: list[PtolemaicAspect] = []
-        seen: set[frozenset[str]] = set()
-        config = next(p for p in PTOLEMAIC_PATTERNS if p.id == "grand_trine")
-        for a, b, c in combinations(keys, 3):
-            info_ab = pair_map.get(tuple(sorted((a, b))))
-            info_ac = pair_map.get(tuple(sorted((a, c))))
-            info_bc = pair_map.get(tuple(sorted((b, c))))
-            if all(info and info["type"] == "trine" for info in (info_ab, info_ac, info_bc)):
-                key_set = frozenset((a, b, c))
-                if key_set in seen:
-                    continue
-                seen.add(key_set)
-                links = [
-                    self._make_link(a, b, info_ab),
-                    self._make_link(a, c, info_ac),
-                    self._make_link(b, c, info_bc),
-                ]
-                matches.append(
-                    PtolemaicAspect(
-                        configuration=config,
-                        points=tuple(sorted(key_set)),
-                        links=tuple(links),
-                        structure={"triple": tuple(sorted(key_set))},
-                    )
+        # Every point set is reported once, under its assignment that is
+        # smallest by key order, whichever symmetric variant was found first.
+        found: dict[frozenset[str], tuple[int, ...]] = {}
+        assignment: list[Optional[str]] = [None] * len(definition.vertices)
+
+        def extend(depth: int) -> None:
+            if depth == len(plan.steps):
+                ranks = tuple(index.rank[k] for k in assignment)
+                key_set = frozenset(assignment)
+                if key_set not in found or ranks < found[key_set]:
+                    found[key_set] = ranks
+                return
+            step = plan.steps[depth]
+            anchor, first = min(
+                step.checks, key=lambda check: len(index.neighbors[check[1].aspect][assignment[check[0]]])
             )
-        return matches
-
-    def _match_kite(self, keys: list[str], points: dict[str, dict], pair_map: dict) -> list[PtolemaicAspect]:
-        matches: list[PtolemaicAspect] = []
-        seen: set[frozenset[str]] = set()
-        config = next(p for p in PTOLEMAIC_PATTERNS if p.id == "kite")
-        extra_sextile = max(0.0, KITE_SEXTILE_EXTRA_ORB)
-        for quad in combinations(keys, 4):
-            for anchor in quad:
-                for tail in quad:
-                    if tail == anchor:
-                        continue
-                    b_c = [k for k in quad if k not in {anchor, tail}]
-                    if len(b_c) != 2:
-                        continue
-                    b, c = b_c
-                    tr_ab = self._get_aspect_info(anchor, b, "trine", points, pair_map)
-                    tr_ac = self._get_aspect_info(anchor, c, "trine", points, pair_map)
-                    tr_bc = self._get_aspect_info(b, c, "trine", points, pair_map)
-                    opp = self._get_aspect_info(anchor, tail, "opposition", points, pair_map)
-                    sx_tb = self._get_aspect_info(tail, b, "sextile", points, pair_map, extra_orb=extra_sextile)
-                    sx_tc = self._get_aspect_info(tail, c, "sextile", points, pair_map, extra_orb=extra_sextile)
-                    if not all(
-                        [
-                            tr_ab and tr_ab["type"] == "trine",
-                            tr_ac and tr_ac["type"] == "trine",
-                            tr_bc and tr_bc["type"] == "trine",
-                            opp and opp["type"] == "opposition",
-                            sx_tb and sx_tb["type"] == "sextile",
-                            sx_tc and sx_tc["type"] == "sextile",
-                        ]
-                    ):
-                        continue
-                    key_set = frozenset(quad)
-                    if key_set in seen:
-                        continue
-                    seen.add(key_set)
-                    links = [
-                        self._make_link(anchor, b, tr_ab),
-                        self._make_link(anchor, c, tr_ac),
-                        self._make_link(b, c, tr_bc),
-                        self._make_link(anchor, tail, opp),
-                        self._make_link(tail, b, sx_tb),
-                        self._make_link(tail, c, sx_tc),
-                    ]
-                    matches.append(
-                        PtolemaicAspect(
-                            configuration=config,
-                            points=tuple(sorted(key_set)),
-                            links=tuple(links),
-                            structure={"triangle": (anchor, b, c), "opposition": (anchor, tail)},
-                        )
-                    )
-                    break
-        return matches
-
-    def _match_grand_cross(self, keys: list[str], points: dict[str, dict], pair_map: dict) -> list[PtolemaicAspect]:
-        matches: list[PtolemaicAspect] = []
-        seen: set[frozenset[str]] = set()
-        config = next(p for p in PTOLEMAIC_PATTERNS if p.id == "grand_cross")
-        for a, b, c, d in combinations(keys, 4):
-            key_set = frozenset((a, b, c, d))
-            if key_set in seen:
-                continue
-            opp_pairs = []
-            for p, q in combinations((a, b, c, d), 2):
-                info = pair_map.get(tuple(sorted((p, q))))
-                if info and info["type"] == "opposition":
-                    opp_pairs.append(((p, q), info))
-            # Need two disjoint oppositions covering all four points.
-            for (opp1, info1), (opp2, info2) in combinations(opp_pairs, 2):
-                if set(opp1) | set(opp2) != set((a, b, c, d)):
+            for candidate in index.neighbors[first.aspect][assignment[anchor]]:
+                if candidate in assignment:
                     continue
-                square_pairs = [
-                    pair_map.get(tuple(sorted((opp1[0], opp2[0])))),
-                    pair_map.get(tuple(sorted((opp1[0], opp2[1])))),
-                    pair_map.get(tuple(sorted((opp1[1], opp2[0])))),
-                    pair_map.get(tuple(sorted((opp1[1], opp2[1])))),
-                ]
-                if not all(info and info["type"] == "square" for info in square_pairs):
+                if all(self._edge_orb(assignment[v], candidate, edge, index) is not None for v, edge in step.checks):
+                    assignment[step.vertex] = candidate
+                    extend(depth + 1)
+            assignment[step.vertex] = None
+
+        seed = plan.seed
+        for a, others in index.neighbors[seed.aspect].items():
+            for b in others:
+                if self._edge_orb(a, b, seed, index) is None:
                     continue
-                seen.add(key_set)
-                links = [
-                    self._make_link(*opp1, info1),
-                    self._make_link(*opp2, info2),
-                    self._make_link(opp1[0], opp2[0], square_pairs[0]),
-                    self._make_link(opp1[0], opp2[1], square_pairs[1]),
-                    self._make_link(opp1[1], opp2[0], square_pairs[2]),
-                    self._make_link(opp1[1], opp2[1], square_pairs[3]),
-                ]
-                matches.append(
-                    PtolemaicAspect(
-                        configuration=config,
-                        points=tuple(sorted(key_set)),
-                        links=tuple(links),
-                        structure={"axes": (opp1, opp2)},
-                    )
-                )
-                break
-        return matches
+                assignment[seed.a], assignment[seed.b] = a, b
+                extend(0)
 
-    def _match_grand_sextile(self, keys: list[str], points: dict[str, dict], pair_map: dict) -> list[PtolemaicAspect]:
+        keys = list(index.rank)
         matches: list[PtolemaicAspect] = []
-        seen: set[frozenset[str]] = set()
-        config = next(p for p in PTOLEMAIC_PATTERNS if p.id == "grand_sextile")
-        for combo in combinations(keys, 6):
-            ordered = sorted(combo, key=lambda k: points[k]["abs_pos"])
-            # Check sextile ring
-            sextile_ok = True
-            sextile_links: list[AspectLink] = []
-            for i in range(6):
-                a, b = ordered[i], ordered[(i + 1) % 6]
-                info = pair_map.get(tuple(sorted((a, b))))
-                if not info or info["type"] != "sextile":
-                    sextile_ok = False
-                    break
-                sextile_links.append(self._make_link(a, b, info))
-            if not sextile_ok:
-                continue
-            # Check alternating trines
-            trine_links: list[AspectLink] = []
-            trine_ok = True
-            for i in range(6):
-                a, b = ordered[i], ordered[(i + 2) % 6]
-                info = pair_map.get(tuple(sorted((a, b))))
-                if not info or info["type"] != "trine":
-                    trine_ok = False
-                    break
-                trine_links.append(self._make_link(a, b, info))
-            if not trine_ok:
-                continue
-            key_set = frozenset(ordered)
-            if key_set in seen:
-                continue
-            seen.add(key_set)
-            links = sextile_links + trine_links
+        for ranks in sorted(found.values(), key=sorted):
+            vertices = self._arrange(definition, tuple(keys[r] for r in ranks), points)
+            links = []
+            for edge in definition.edges:
+                a, b = vertices[edge.a], vertices[edge.b]
+                links.append(
+                    AspectLink(
+                        type=edge.aspect,
+                        pair=tuple(sorted((a, b))),
+                        orb=round(float(self._edge_orb(a, b, edge, index)), 2),
+                        difference=index.diffs[a, b],
+                    )
+                )
             matches.append(
                 PtolemaicAspect(
-                    configuration=config,
-                    points=tuple(ordered),
+                    configuration=definition.configuration,
+                    points=vertices if definition.arrange else tuple(sorted(vertices)),
                     links=tuple(links),
-                    structure={"triples": (tuple(ordered[0::2]), tuple(ordered[1::2]))},
+                    structure=definition.structure(vertices),
                 )
             )
         return matches
 
-    def _match_mystic_rectangle(self, keys: list[str], points: dict[str, dict], pair_map: dict) -> list[PtolemaicAspect]:
+    def _match_cluster(
+        self, definition: ClusterDefinition, keys: list[str], points: dict[str, dict], index: _PairIndex
+    ) -> list[PtolemaicAspect]:
         matches: list[PtolemaicAspect] = []
         seen: set[frozenset[str]] = set()
-        config = next(p for p in PTOLEMAIC_PATTERNS if p.id == "mystic_rectangle")
-        for a, b, c, d in combinations(keys, 4):
-            opp_ac = pair_map.get(tuple(sorted((a, c))))
-            opp_bd = pair_map.get(tuple(sorted((b, d))))
-            if not (opp_ac and opp_bd and opp_ac["type"] == opp_bd["type"] == "opposition"):
-                continue
-            tr_ab = pair_map.get(tuple(sorted((a, b))))
-            tr_cd = pair_map.get(tuple(sorted((c, d))))
-            sx_bd = pair_map.get(tuple(sorted((b, c))))
-            sx_da = pair_map.get(tuple(sorted((d, a))))
-            if not all(
-                [
-                    tr_ab and tr_ab["type"] == "trine",
-                    tr_cd and tr_cd["type"] == "trine",
-                    sx_bd and sx_bd["type"] == "sextile",
-                    sx_da and sx_da["type"] == "sextile",
-                ]
-            ):
+        aspect = self._pattern_aspects.get(definition.link_aspect)
+        angle = aspect.angle if aspect else 0.0
+        link_orb = max(aspect.orb if aspect else 0.0, definition.link_orb)
+        # Use sorted angles with wrap-around to find clusters within the window
+        ordered = sorted([(k, points[k]["abs_pos"]) for k in keys], key=lambda kv: kv[1])
+        extended = ordered + [(k, pos + 360.0) for k, pos in ordered]
+        start = 0
+        for end in range(len(extended)):
+            while extended[end][1] - extended[start][1] > definition.window:
+                start += 1
+            window = extended[start : end + 1]
+            unique_keys = {k for k, _ in window}
+            if len(unique_keys) < definition.min_points:
                 continue
-            key_set = frozenset((a, b, c, d))
+            key_set = frozenset(unique_keys)
             if key_set in seen:
                 continue
             seen.add(key_set)
-            links = [
-                self._make_link(a, c, opp_ac),
-                self._make_link(b, d, opp_bd),
-                self._make_link(a, b, tr_ab),
-                self._make_link(c, d, tr_cd),
-                self._make_link(b, c, sx_bd),
-                self._make_link(d, a, sx_da),
-            ]
+            links: list[AspectLink] = []
+            for a, b in combinations(sorted(unique_keys), 2):
+                delta = abs(index.diffs[a, b] - angle)
+                if delta <= link_orb:
+                    links.append(
+                        AspectLink(
+                            type=definition.link_aspect,
+                            pair=(a, b),
+                            orb=round(float(delta), 2),
+                            difference=index.diffs[a, b],
+                        )
+                    )
             matches.append(
                 PtolemaicAspect(
-                    configuration=config,
-                    points=tuple(sorted(key_set)),
+                    configuration=definition.configuration,
+                    points=tuple(sorted(unique_keys)),
                     links=tuple(links),
-                    structure={"oppositions": ((a, c), (b, d))},
+                    structure={"cluster": tuple(sorted(unique_keys))},
                 )
             )
         return matches
 
-    def _match_trapeze(self, keys: list[str], points: dict[str, dict], pair_map: dict) -> list[PtolemaicAspect]:
+    def _match_all(self, keys: list[str], points: dict[str, dict]) -> list[PtolemaicAspect]:
+        index = self._index(keys, points)
         matches: list[PtolemaicAspect] = []
-        seen: set[frozenset[str]] = set()
-        config = next(p for p in PTOLEMAIC_PATTERNS if p.id == "trapeze")
-        for combo in combinations(keys, 4):
-            ordered = sorted(combo, key=lambda k: points[k]["abs_pos"])
-            a, b, c, d = ordered
-            sx_ab = pair_map.get(tuple(sorted((a, b))))
-            sx_bc = pair_map.get(tuple(sorted((b, c))))
-            sx_cd = pair_map.get(tuple(sorted((c, d))))
-            opp_ad = pair_map.get(tuple(sorted((a, d))))
-            if not all(
-                [
-                    sx_ab and sx_ab["type"] == "sextile",
-                    sx_bc and sx_bc["type"] == "sextile",
-                    sx_cd and sx_cd["type"] == "sextile",
-                    opp_ad and opp_ad["type"] == "opposition",
-                ]
-            ):
-                continue
-            key_set = frozenset(combo)
-            if key_set in seen:
-                continue
-            seen.add(key_set)
-            links = [
-                self._make_link(a, b, sx_ab),
-                self._make_link(b, c, sx_bc),
-                self._make_link(c, d, sx_cd),
-                self._make_link(a, d, opp_ad),
-            ]
-            matches.append(
-                PtolemaicAspect(
-                    configuration=config,
-                    points=tuple(ordered),
-                    links=tuple(links),
-                    structure={"chain": (a, b, c, d)},
-                )
-            )
+        for pattern in self.patterns:
+            if isinstance(pattern, CompiledPattern):
+                matches.extend(self._match_pattern(pattern, points, index))
+            else:
+                matches.extend(self._match_cluster(pattern, keys, points, index))
         return matches
 
     def compute_patterns(self, subject_data: dict, active_points: Optional[Iterable[str]] = None) -> list[PtolemaicAspect]:
         """
-        Run pattern strategies for all configurations and return matches.
+        Match every pattern definition against the subject's points and return the matches.
         """
         points = self._extract_points(subject_data)
         keys = self._resolve_keys(points, active_points or subject_data.get("active_points"))
         if not keys:
             return []
-        pair_map = self._pair_aspects(points, keys)
-
-        strategies = [
-            self._match_stellium,
-            self._match_t_square,
-            self._match_grand_trine,
-            self._match_kite,
-            self._match_grand_cross,
-            self._match_grand_sextile,
-            self._match_mystic_rectangle,
-            self._match_trapeze,
-        ]
+        return self._match_all(keys, points)
 
-        matches: list[PtolemaicAspect] = []
-        for strategy in strategies:
-            matches.extend(strategy(keys, points, pair_map))
-        return matches
+    def compute_cross_patterns(
+        self,
+        charts: Mapping[str, dict],
+        active_points: Optional[Iterable[str]] = None,
+    ) -> list[PtolemaicAspect]:
+        """
+        Patterns formed jointly by two or more charts (synastry, transits to natal).
+
+        The charts' points are merged under namespaced keys (`"<chart>.<point>"`,
+        e.g. `natal.sun`) and matched as one set; only patterns with points from
+        at least two charts are returned.
+        """
+        points: dict[str, dict] = {}
+        keys: list[str] = []
+        for chart, subject_data in charts.items():
+            prefix = self._normalize_key(chart) + CHART_KEY_SEPARATOR
+            chart_points = self._extract_points(subject_data)
+            for key in self._resolve_keys(chart_points, active_points or subject_data.get("active_points")):
+                points[prefix + key] = chart_points[key]
+                keys.append(prefix + key)
+        if len(charts) < 2 or not keys:
+            return []
+
+        def span(match: PtolemaicAspect) -> int:
+            return len({key.split(CHART_KEY_SEPARATOR, 1)[0] for key in match.points})
+
+        return [match for match in self._match_all(keys, points) if span(match) >= 2]
 
 
-def compute_major_aspects(subject_data: dict, active_points: Optional[Iterable[str]] = None) -> list[dict]:
+def compute_major_aspects(
+    subject_data: dict,
+    active_points: Optional[Iterable[str]] = None,
+    orbs: Optional[Mapping[str, float]] = None,
+) -> list[dict]:
     """
     Convenience wrapper to compute high-level Ptolemaic configurations as JSON-ready dicts.
     """
-    patterns = PtolemaicAspectCalculator().compute_patterns(subject_data, active_points=active_points)
+    patterns = PtolemaicAspectCalculator(orbs=orbs).compute_patterns(subject_data, active_points=active_points)
     return serialize_ptolemaic_aspects(patterns)
 
 
-def compute_ptolemaic_patterns(subject_data: dict, active_points: Optional[Iterable[str]] = None) -> list[PtolemaicAspect]:
+def compute_ptolemaic_patterns(
+    subject_data: dict,
+    active_points: Optional[Iterable[str]] = None,
+    orbs: Optional[Mapping[str, float]] = None,
+) -> list[PtolemaicAspect]:
     """
     Convenience wrapper to compute high-level Ptolemaic configurations.
     """
-    return PtolemaicAspectCalculator().compute_patterns(subject_data, active_points=active_points)
+    return PtolemaicAspectCalculator(orbs=orbs).compute_patterns(subject_data, active_points=active_points)
+
+
+def compute_cross_major_aspects(
+    charts: Mapping[str, dict],
+    active_points: Optional[Iterable[str]] = None,
+    orbs: Optional[Mapping[str, float]] = None,
+) -> list[dict]:
+    """
+    Convenience wrapper to compute cross-chart Ptolemaic configurations as JSON-ready dicts.
+    """
+    patterns = PtolemaicAspectCalculator(orbs=orbs).compute_cross_patterns(charts, active_points=active_points)
+    return serialize_ptolemaic_aspects(patterns)
 
 
 def serialize_ptolemaic_aspects(aspects: Iterable[PtolemaicAspect]) -> list[dict]:
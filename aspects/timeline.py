@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+from .ptolemaic import PTOLEMAIC_ASPECTS, NormalAspect
+
+# `positions(jds, body)` -> (longitudes, daily speeds) of `body` at each Julian day.
+PositionFunction = Callable[[np.ndarray, str], tuple[np.ndarray, np.ndarray]]
+
+# Safeguarded Newton steps per root; typically 2-3 are needed (up to ~20 when bisecting).
+_MAX_ROOT_STEPS = 30
+
+
+@dataclass
+class AspectWindow:
+    """
+    One in-orb period of a transit body to a natal point, in Julian days (UT).
+
+    `start` / `end` are None when the window was already open at the start of
+    the searched range or is still open at its end.
+    """
+
+    transit: str
+    natal: str
+    aspect: str
+    start: Optional[float]
+    end: Optional[float]
+    exact: list[float] = field(default_factory=list)
+    min_orb: float = math.inf
+
+
+@dataclass
+class SignIngress:
+    """A body entering a new sign at `jd`; signs are indices 0 (Aries) .. 11 (Pisces)."""
+
+    body: str
+    jd: float
+    sign: int
+    from_sign: int
+    forward: bool
+
+
+def _wrap(values: np.ndarray) -> np.ndarray:
+    """Fold angles into [-180, 180)."""
+    return (values + 180.0) % 360.0 - 180.0
+
+
+def _targets(
+    natal: dict[str, float],
+    aspects: Sequence[NormalAspect],
+) -> tuple[np.ndarray, np.ndarray, list[tuple[str, str]]]:
+    """
+    Exact longitudes a transit body must reach for each (natal point, aspect).
+
+    Aspects other than conjunction/opposition have two targets (waxing and waning side).
+    """
+    longitudes: list[float] = []
+    orbs: list[float] = []
+    labels: list[tuple[str, str]] = []
+    for key, lon in natal.items():
+        for aspect in aspects:
+            sides = (1.0,) if aspect.angle % 180.0 == 0.0 else (1.0, -1.0)
+            for side in sides:
+                longitudes.append((lon + side * aspect.angle) % 360.0)
+                orbs.append(aspect.orb)
+                labels.append((key, aspect.name))
+    return np.array(longitudes), np.array(orbs), labels
+
+
+def _with_min_orb(window: AspectWindow, sampled_orbs: np.ndarray) -> AspectWindow:
+    """Set `min_orb`: 0 for windows with an exact pass, else the tightest sampled orb."""
+    window.min_orb = 0.0 if window.exact else float(sampled_orbs.min())
+    return window
+
+
+def refine_roots(
+    residual: Callable[[np.ndarray, np.ndarray], tuple[np.ndarray, Optional[np.ndarray]]],
+    lo: np.ndarray,
+    hi: np.ndarray,
+    f_lo: np.ndarray,
+    f_hi: np.ndarray,
+    tolerance_days: float,
+) -> np.ndarray:
+    """
+    Solve `f(t) = 0` inside every bracket `[lo, hi]` at once.
+
+    `residual(t, index)` evaluates `f` (and its slope, or None) at times `t`
+    for the brackets `index`; `f_lo` / `f_hi` are the values at the bracket
+    ends, which differ in sign. Starts from linear interpolation and takes
+    Newton steps, falling back to bisection whenever a step would leave the
+    (shrinking) bracket or no slope is available.
+    """
+    if lo.size == 0:
+        return lo
+
+    lo = lo.copy()
+    hi = hi.copy()
+    f_lo = f_lo.copy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(f_hi != f_lo, lo - f_lo * (hi - lo) / (f_hi - f_lo), (lo + hi) / 2.0)
+    active = np.arange(lo.size)
+    for _ in range(_MAX_ROOT_STEPS):
+        f, slope = residual(t[active], active)
+
+        lower = np.sign(f) == np.sign(f_lo[active])
+        lo[active] = np.where(lower, t[active], lo[active])
+        f_lo[active] = np.where(lower, f, f_lo[active])
+        hi[active] = np.where(lower, hi[active], t[active])
+
+        midpoint = (lo[active] + hi[active]) / 2.0
+        if slope is None:
+            candidate = midpoint
+        else:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                candidate = t[active] - f / slope
+            outside = ~np.isfinite(candidate) | (candidate <= lo[active]) | (candidate >= hi[active])
+            candidate = np.where(outside, midpoint, candidate)
+        converged = (np.abs(candidate - t[active]) < tolerance_days) | (hi[active] - lo[active] < tolerance_days)
+        t[active] = candidate
+        active = active[~converged]
+        if active.size == 0:
+            break
+    return t
+
+
+def find_sign_ingresses(
+    positions: PositionFunction,
+    body: str,
+    grid: np.ndarray,
+    grid_longitudes: np.ndarray,
+    tolerance_days: float = 1.0 / 1440.0,
+) -> list[SignIngress]:
+    """
+    Sign boundary crossings of `body` between samples `grid` (longitudes `grid_longitudes`).
+
+    The grid must be fine enough that the body never crosses a sign and comes
+    back between two samples. Crossings are refined like aspect windows.
+    """
+    sign_index = (grid_longitudes // 30.0).astype(int) % 12
+    (steps,) = np.nonzero(sign_index[1:] != sign_index[:-1])
+    before, after = sign_index[steps], sign_index[steps + 1]
+    # Forward ingress crosses the start of the new sign, a retrograde one the start of the old sign.
+    forward = after == (before + 1) % 12
+    boundary = np.where(forward, after, before) * 30.0
+
+    def residual(t: np.ndarray, index: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        lon, speed = positions(t, body)
+        return _wrap(lon - boundary[index]), speed
+
+    roots = refine_roots(
+        residual,
+        grid[steps],
+        grid[steps + 1],
+        _wrap(grid_longitudes[steps] - boundary),
+        _wrap(grid_longitudes[steps + 1] - boundary),
+        tolerance_days,
+    )
+    return [
+        SignIngress(body, jd, a, b, f)
+        for jd, b, a, f in zip(roots.tolist(), before.tolist(), after.tolist(), forward.tolist())
+    ]
+
+
+def _refine(
+    positions: PositionFunction,
+    body: str,
+    lo: np.ndarray,
+    hi: np.ndarray,
+    f_lo: np.ndarray,
+    f_hi: np.ndarray,
+    target: np.ndarray,
+    level: np.ndarray,
+    absolute: np.ndarray,
+    tolerance_days: float,
+) -> np.ndarray:
+    """
+    Roots of `d(t) - level`, where `d(t)` is the signed distance of `body` from
+    `target`, or its absolute value where `absolute` is set (orb entry/exit).
+    """
+
+    def residual(t: np.ndarray, index: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        lon, speed = positions(t, body)
+        distance = _wrap(lon - target[index])
+        sign = np.where(absolute[index], np.sign(distance), 1.0)
+        return sign * distance - level[index], sign * speed
+
+    return refine_roots(residual, lo, hi, f_lo, f_hi, tolerance_days)
+
+
+def find_aspect_windows(
+    positions: PositionFunction,
+    bodies: Sequence[str],
+    natal: dict[str, float],
+    start_jd: float,
+    end_jd: float,
+    step_days: dict[str, float],
+    aspects: Optional[Sequence[NormalAspect]] = None,
+    tolerance_days: float = 1.0 / 1440.0,
+    on_body: Optional[Callable[[str], None]] = None,
+) -> list[AspectWindow]:
+    """
+    Orb entry, exact passes and orb exit of every transit body to every natal point.
+
+    Each body is sampled on a coarse grid (`step_days[body]`, which must be
+    smaller than the distance it covers within the narrowest orb); sign changes
+    of `|distance| - orb` and of the signed distance on that grid bracket the
+    events, which are then refined together by safeguarded Newton iteration
+    (using the ephemeris speed) to `tolerance_days`.
+    Retrograde loops therefore yield several exact passes inside one window.
+    `on_body` is called before each body (e.g. to check for cancellation).
+    """
+    aspect_defs = tuple(aspects or PTOLEMAIC_ASPECTS)
+    target_lon, target_orb, labels = _targets(natal, aspect_defs)
+    windows: list[AspectWindow] = []
+    if target_lon.size == 0:
+        return windows
+
+    for body in bodies:
+        if on_body is not None:
+            on_body(body)
+        step = step_days[body]
+        count = max(2, math.ceil((end_jd - start_jd) / step) + 1)
+        grid = np.linspace(start_jd, end_jd, count)
+        distance = _wrap(positions(grid, body)[0][:, None] - target_lon[None, :])  # (T, K)
+        in_orb = np.abs(distance) <= target_orb
+        edge_level = np.abs(distance) - target_orb
+
+        # Orb boundary crossings: in_orb flips between consecutive samples.
+        edge_t, edge_k = np.nonzero(in_orb[1:] != in_orb[:-1])
+        edge_jd = _refine(
+            positions,
+            body,
+            grid[edge_t],
+            grid[edge_t + 1],
+            edge_level[edge_t, edge_k],
+            edge_level[edge_t + 1, edge_k],
+            target_lon[edge_k],
+            target_orb[edge_k],
+            np.ones(edge_k.size, dtype=bool),
+            tolerance_days,
+        )
+        # Exact passes: the signed distance changes sign near zero (not at the +-180 wrap).
+        near = np.abs(distance) < 90.0
+        crossing = (np.sign(distance[1:]) != np.sign(distance[:-1])) & near[1:] & near[:-1]
+        exact_t, exact_k = np.nonzero(crossing)
+        exact_jd = _refine(
+            positions,
+            body,
+            grid[exact_t],
+            grid[exact_t + 1],
+            distance[exact_t, exact_k],
+            distance[exact_t + 1, exact_k],
+            target_lon[exact_k],
+            np.zeros(exact_k.size),
+            np.zeros(exact_k.size, dtype=bool),
+            tolerance_days,
+        )
+
+        # Walk each target's events in time order and cut them into windows.
+        events: dict[int, list[tuple[float, int, str]]] = {}
+        for t, k, jd in zip(edge_t.tolist(), edge_k.tolist(), edge_jd.tolist()):
+            events.setdefault(k, []).append((jd, t, "enter" if in_orb[t + 1, k] else "exit"))
+        for t, k, jd in zip(exact_t.tolist(), exact_k.tolist(), exact_jd.tolist()):
+            events.setdefault(k, []).append((jd, t, "exact"))
+        for k in np.nonzero(in_orb[0])[0].tolist():
+            events.setdefault(k, [])
+
+        for k, items in events.items():
+            natal_key, aspect_name = labels[k]
+            abs_distance = np.abs(distance[:, k])
+            current: Optional[AspectWindow] = None
+            first_sample = 0
+            if in_orb[0, k]:
+                current = AspectWindow(body, natal_key, aspect_name, start=None, end=None)
+            for jd, t, kind in sorted(items):
+                if kind == "enter":
+                    current = AspectWindow(body, natal_key, aspect_name, start=jd, end=None)
+                    first_sample = t + 1
+                elif current is None:
+                    continue
+                elif kind == "exact":
+                    current.exact.append(jd)
+                else:
+                    current.end = jd
+                    windows.append(_with_min_orb(current, abs_distance[first_sample : t + 1]))
+                    current = None
+            if current is not None:
+                windows.append(_with_min_orb(current, abs_distance[first_sample:]))
+
+    windows.sort(key=lambda w: (w.start if w.start is not None else -math.inf, w.transit, w.natal))
+    return windows
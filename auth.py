@@ -0,0 +1,40 @@
+import os
+import secrets
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPBasic, HTTPBasicCredentials
+from starlette.requests import HTTPConnection
+
+
+class ConnectionHTTPBasic(HTTPBasic):
+    """
+    HTTP Basic that also authenticates WebSocket handshakes.
+
+    FastAPI only injects `Request` into HTTP routes; declaring the base
+    `HTTPConnection` lets the app-wide auth dependency run for WebSocket routes too.
+    """
+
+    async def __call__(self, request: HTTPConnection):  # type: ignore[override]
+        return await super().__call__(request)  # type: ignore[arg-type]
+
+
+security = ConnectionHTTPBasic(scheme_name="HTTPBasic")
+
+# 🔐 Credentials
+DEMO_USERNAME = os.getenv("DEMO_USERNAME", "demo")
+DEMO_PASSWORD = os.getenv("DEMO_PASSWORD", "demo1234")
+
+
+def get_current_username(credentials: HTTPBasicCredentials = Depends(security)):
+    # Use compare_digest to avoid timing attacks
+    correct_username = secrets.compare_digest(credentials.username, DEMO_USERNAME)
+    correct_password = secrets.compare_digest(credentials.password, DEMO_PASSWORD)
+
+    if not (correct_username and correct_password):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Basic"},
+        )
+
+    return credentials.username
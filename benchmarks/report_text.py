@@ -0,0 +1,66 @@
+"""
+Micro-benchmark for the report text pipeline on a maximum-size report.
+
+Builds a relationship report with `max_aspects=200` (both subjects plus the
+synastry table) and times Markdown rendering, glyph transform and PDF output.
+
+    python -m benchmarks.report_text [repeats]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from enums import Mode
+from schemas import BirthData, ChartConfig, ReportRequest
+from utils import (
+    generate_report_content,
+    render_markdown_report,
+    render_report_text_pdf,
+    render_structured_report_pdf,
+    transform_report_text,
+)
+
+ALL_POINTS = [
+    "sun", "moon", "mercury", "venus", "mars", "jupiter", "saturn", "uranus",
+    "neptune", "pluto", "mean_node", "chiron", "ascendant", "medium_coeli",
+]
+
+
+def max_size_request() -> ReportRequest:
+    return ReportRequest(
+        mode=Mode.RELATIONSHIP,
+        first=BirthData(name="Partner ☉ A", year=1988, month=3, day=14),
+        second=BirthData(name="Partner ☽ B", year=1991, month=9, day=2),
+        config=ChartConfig(active_points=ALL_POINTS),
+        include_aspects=True,
+        max_aspects=200,
+    )
+
+
+def timed(label: str, func, repeats: int) -> None:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    elapsed = (time.perf_counter() - start) / repeats
+    print(f"{label:<28} {elapsed * 1000:9.3f} ms")
+
+
+def main(repeats: int = 50) -> None:
+    structured, markdown = generate_report_content(max_size_request())
+    # Pad the synastry table to the 200-row maximum regardless of how many aspects the charts produce.
+    rows = structured.get("synastry", {}).get("rows") or []
+    if rows:
+        structured["synastry"]["rows"] = (rows * (200 // len(rows) + 1))[:200]
+    markdown = render_markdown_report(structured)
+    glyph_text = markdown + "\n" + "☉☽☿♀♂♃♄♅♆♇☊☋♈♉♊♋♌♍♎♏♐♑♒♓ " * 200
+
+    print(f"markdown: {len(markdown.splitlines())} lines, synastry rows: {len(structured['synastry']['rows'])}")
+    timed("render_markdown_report", lambda: render_markdown_report(structured), repeats)
+    timed("transform_report_text", lambda: transform_report_text(glyph_text), repeats)
+    timed("render_report_text_pdf", lambda: render_report_text_pdf(markdown), max(1, repeats // 10))
+    timed("render_structured_report_pdf", lambda: render_structured_report_pdf(structured), max(1, repeats // 10))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
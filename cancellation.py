@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Callable, Optional, TypeVar
+
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+
+T = TypeVar("T")
+
+# Non-standard status popularised by nginx for "client closed request"; the
+# client never sees it, but it keeps access logs honest.
+CLIENT_CLOSED_REQUEST = 499
+
+DISCONNECT_POLL_INTERVAL = 0.25
+
+
+class RequestCancelled(Exception):
+    """Raised inside a computation when its cancel token has been triggered."""
+
+
+class CancelToken:
+    """
+    Thread-safe flag shared between a request handler and the worker computing its response.
+
+    Long-running helpers accept an optional token and call `raise_if_cancelled()`
+    between units of work (range steps, report subjects, PDF pages, renderer fallbacks).
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise RequestCancelled()
+
+
+def check_cancelled(token: Optional[CancelToken]) -> None:
+    """
+    Abort the current computation if `token` was cancelled; no-op when no token is given.
+    """
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+async def run_cancellable(request: Request, func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run a blocking `func(*args, cancel_token=..., **kwargs)` in the threadpool.
+
+    While it runs, the client connection is polled and the token is cancelled as
+    soon as the client disconnects, so the worker stops at its next checkpoint
+    and raises `RequestCancelled`.
+    """
+    token = CancelToken()
+
+    async def watch_disconnect() -> None:
+        while not token.cancelled:
+            if await request.is_disconnected():
+                token.cancel()
+                return
+            await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        return await run_in_threadpool(func, *args, cancel_token=token, **kwargs)
+    finally:
+        watcher.cancel()
+
+
+def cancelled_response(label: str) -> Response:
+    """
+    Log an aborted request and return the (unseen) response for it.
+    """
+    print(f"{label} cancelled: client disconnected")
+    return Response(status_code=CLIENT_CLOSED_REQUEST)
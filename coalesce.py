@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, TypeVar
+
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+
+from cache import canonical_hash
+from cancellation import DISCONNECT_POLL_INTERVAL, CancelToken, RequestCancelled, run_cancellable
+from schemas import ChartConfig
+
+T = TypeVar("T")
+
+REQUEST_COALESCING_ENABLED = os.getenv("REQUEST_COALESCING_ENABLED", "1").lower() not in {"0", "false", "no"}
+
+
+def request_key(endpoint: str, payload: Any, cfg: Optional[ChartConfig] = None, **extra: Any) -> str:
+    """
+    Canonical hash of an endpoint's request (a pydantic model).
+
+    With `cfg` the payload's own `config` is replaced by the normalized one, so
+    omitted and explicit default configs coalesce. `extra` holds query
+    parameters that also shape the response.
+    """
+    data = {"endpoint": endpoint, **extra}
+    if cfg is not None:
+        data["payload"] = payload.model_dump(mode="json", exclude={"config"})
+        data["config"] = cfg.model_dump(mode="json")
+    else:
+        data["payload"] = payload.model_dump(mode="json")
+    return canonical_hash(data)
+
+
+@dataclass
+class _Flight:
+    token: CancelToken
+    task: Optional[asyncio.Future] = None
+    waiters: int = 0
+
+
+@dataclass
+class _Counters:
+    started: int = 0
+    coalesced: int = 0
+    abandoned: int = 0
+    by_endpoint: dict[str, int] = field(default_factory=dict)
+
+
+class SingleFlight:
+    """
+    Collapse concurrent identical computations into one in-flight run.
+
+    The first request for a key starts `func(*args, cancel_token=...)` in the
+    threadpool; identical requests arriving while it runs await the same
+    result (or exception) instead of computing it again. Results are shared
+    between requests and must be treated as read-only.
+
+    A waiter whose client disconnects leaves with `RequestCancelled`; the shared
+    computation is only cancelled once every waiter has left.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._flights: dict[str, _Flight] = {}
+        self._counters = _Counters()
+        self._lock = threading.Lock()
+
+    def _join(self, key: str, func: Callable[..., T], args: tuple, kwargs: dict) -> tuple[_Flight, bool]:
+        flight = self._flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _Flight(CancelToken())
+            flight.task = asyncio.ensure_future(run_in_threadpool(func, *args, cancel_token=flight.token, **kwargs))
+            flight.task.add_done_callback(lambda task: self._finish(key, flight, task))
+            self._flights[key] = flight
+        flight.waiters += 1
+        return flight, leader
+
+    def _finish(self, key: str, flight: _Flight, task: asyncio.Future) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even when every waiter already left.
+            task.exception()
+
+    def _leave(self, key: str, flight: _Flight) -> None:
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            flight.token.cancel()
+            # Later identical requests start a fresh computation instead of joining a cancelled one.
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            with self._lock:
+                self._counters.abandoned += 1
+
+    async def run(self, endpoint: str, key: str, request: Request, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run `func(*args, cancel_token=..., **kwargs)` once per in-flight `key`.
+
+        `endpoint` only labels the coalesced-request counters. When coalescing
+        is disabled every request runs on its own, still cancelled on disconnect.
+        """
+        if not self.enabled:
+            return await run_cancellable(request, func, *args, **kwargs)
+
+        flight, leader = self._join(key, func, args, kwargs)
+        with self._lock:
+            if leader:
+                self._counters.started += 1
+            else:
+                self._counters.coalesced += 1
+                self._counters.by_endpoint[endpoint] = self._counters.by_endpoint.get(endpoint, 0) + 1
+
+        async def watch_disconnect() -> None:
+            while not await request.is_disconnected():
+                await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            await asyncio.wait({flight.task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if not flight.task.done():
+                raise RequestCancelled()
+            return flight.task.result()
+        finally:
+            watcher.cancel()
+            self._leave(key, flight)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "in_flight": len(self._flights),
+                "started": self._counters.started,
+                "coalesced": self._counters.coalesced,
+                "abandoned": self._counters.abandoned,
+                "coalesced_by_endpoint": dict(self._counters.by_endpoint),
+            }
+
+
+# Shared by the chart, SVG and report endpoints; keys include the endpoint name.
+request_flights = SingleFlight(enabled=REQUEST_COALESCING_ENABLED)
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from kerykeion.utilities import get_planet_house  # type: ignore
+
+from aspects.ptolemaic import compute_major_aspects
+from cache import TTLCache, canonical_hash
+from enums import Perspective
+from projection import (
+    SUBJECT_HOUSE_KEYS,
+    SUBJECT_POINT_KEYS,
+    SubjectProjection,
+    active_point_keys,
+    dump_subject,
+    dump_subject_with_patterns,
+    pattern_orbs,
+)
+from schemas import BirthData, ChartConfig
+from utils import build_subject, to_local_datetime
+
+CURRENT_SKY_ENABLED = os.getenv("CURRENT_SKY_ENABLED", "1").lower() not in {"0", "false", "no"}
+# Requests within this many minutes of the current minute are served from the shared sky.
+CURRENT_SKY_WINDOW_MINUTES = int(os.getenv("CURRENT_SKY_WINDOW_MINUTES", "1"))
+CURRENT_SKY_CACHE_SIZE = int(os.getenv("CURRENT_SKY_CACHE_SIZE", "64"))
+# The background refresher builds the next minute's sky this many seconds before it starts.
+CURRENT_SKY_PREFETCH_SECONDS = float(os.getenv("CURRENT_SKY_PREFETCH_SECONDS", "5"))
+
+# Angles Kerykeion computes alongside the house cusps; the only points a
+# location-only subject needs.
+_AXIAL_POINTS = ["Ascendant", "Medium_Coeli", "Descendant", "Imum_Coeli"]
+
+# Points whose position depends on the observer's location, not only on the moment.
+LOCATION_POINT_KEYS: frozenset[str] = SUBJECT_HOUSE_KEYS | {
+    "ascendant",
+    "descendant",
+    "medium_coeli",
+    "imum_coeli",
+    "vertex",
+    "anti_vertex",
+    "pars_fortunae",
+    "pars_spiritus",
+    "pars_amoris",
+    "pars_fidei",
+}
+
+_HOUSE_ORDER = (
+    "first_house",
+    "second_house",
+    "third_house",
+    "fourth_house",
+    "fifth_house",
+    "sixth_house",
+    "seventh_house",
+    "eighth_house",
+    "ninth_house",
+    "tenth_house",
+    "eleventh_house",
+    "twelfth_house",
+)
+
+
+def sky_cacheable(cfg: ChartConfig) -> bool:
+    """Topocentric planet positions depend on the observer, so only other perspectives share a sky."""
+    return cfg.perspective != Perspective.TOPOCENTRIC
+
+
+def _sky_config(cfg: ChartConfig) -> dict:
+    """The parts of a config that change planet positions (not houses, theme or active points)."""
+    return {
+        "zodiac_type": cfg.zodiac_type.value,
+        "sidereal_mode": cfg.sidereal_mode.value if cfg.sidereal_mode is not None else None,
+        "perspective": cfg.perspective.value,
+    }
+
+
+class SkySnapshot:
+    """
+    Location-independent planet points for one UTC minute and sky configuration.
+
+    Built once (at 0°N 0°E) and shared by every transit request for that minute;
+    `subject_at` adds the requester's houses and angles on top. Ptolemaic
+    patterns between planets are memoized per active point set and orb overrides.
+    """
+
+    def __init__(self, minute: datetime, subject) -> None:
+        self.minute = minute
+        self.subject = subject
+        self.planet_keys = tuple(
+            key
+            for key in sorted(SUBJECT_POINT_KEYS - LOCATION_POINT_KEYS)
+            if getattr(subject, key, None) is not None
+        )
+        self._dump = subject.model_dump(mode="json")
+        self._patterns: dict[tuple, list[dict]] = {}
+        self._lock = threading.Lock()
+
+    def subject_at(self, birth: BirthData, cfg: ChartConfig):
+        """
+        The subject Kerykeion would build for `birth` (whose minute is this snapshot's):
+        a houses-and-angles-only subject for the location, plus the shared planets
+        with their houses assigned against its cusps.
+        """
+        local = build_subject(birth, cfg, active_points=_AXIAL_POINTS)
+        cusps = [getattr(local, key).abs_pos for key in _HOUSE_ORDER]
+        planets = {
+            key: getattr(self.subject, key).model_copy(
+                update={"house": get_planet_house(getattr(self.subject, key).abs_pos, cusps)}
+            )
+            for key in self.planet_keys
+        }
+        return local.model_copy(
+            update={
+                **planets,
+                "active_points": self.subject.active_points,
+                "lunar_phase": self.subject.lunar_phase,
+            }
+        )
+
+    def patterns(self, active_points: list[str], orbs: Optional[dict[str, float]] = None) -> list[dict]:
+        """Ptolemaic patterns among `active_points`, which must all be location-independent."""
+        key = (tuple(active_points), tuple(sorted((orbs or {}).items())))
+        with self._lock:
+            cached = self._patterns.get(key)
+        if cached is None:
+            cached = compute_major_aspects(self._dump, active_points=active_points, orbs=orbs)
+            with self._lock:
+                self._patterns[key] = cached
+        return cached
+
+
+def _floor_minute(moment: datetime) -> datetime:
+    return moment.astimezone(timezone.utc).replace(second=0, microsecond=0)
+
+
+class CurrentSkyCache:
+    """
+    Minute-bucketed cache of `SkySnapshot`s around the current time.
+
+    Moments within `window_minutes` of now are served from the shared sky;
+    other moments return None and are computed as usual. With `refresh`, a
+    daemon thread builds the next minute's sky for recently used configurations
+    shortly before that minute starts, so "now" requests rarely wait for the
+    ephemeris.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        window_minutes: int = 1,
+        prefetch_seconds: float = 5.0,
+        enabled: bool = True,
+        refresh: bool = True,
+    ) -> None:
+        self.enabled = enabled and maxsize > 0
+        self.window = timedelta(minutes=window_minutes)
+        self.prefetch_seconds = prefetch_seconds
+        self.refresh = refresh
+        self._snapshots: TTLCache[SkySnapshot] = TTLCache(maxsize, (2 * window_minutes + 2) * 60.0)
+        self._recent: dict[str, tuple[ChartConfig, float]] = {}
+        self._lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        self.bypassed = 0
+        self.prefetched = 0
+
+    def _key(self, minute: datetime, cfg: ChartConfig) -> tuple[str, str]:
+        sky = canonical_hash(_sky_config(cfg))
+        return sky, f"{minute.isoformat()}|{sky}"
+
+    def _build(self, minute: datetime, cfg: ChartConfig) -> SkySnapshot:
+        birth = BirthData(
+            name="Sky",
+            year=minute.year,
+            month=minute.month,
+            day=minute.day,
+            hour=minute.hour,
+            minute=minute.minute,
+            lng=0.0,
+            lat=0.0,
+            tz_str="UTC",
+        )
+        return SkySnapshot(minute, build_subject(birth, cfg))
+
+    def get(self, moment: datetime, cfg: ChartConfig, now: Optional[datetime] = None) -> Optional[SkySnapshot]:
+        """Shared sky for `moment` (aware), or None when the cache does not apply."""
+        now = datetime.now(timezone.utc) if now is None else now
+        minute = _floor_minute(moment)
+        if not self.enabled or not sky_cacheable(cfg) or abs(minute - _floor_minute(now)) > self.window:
+            with self._lock:
+                self.bypassed += 1
+            return None
+
+        sky, key = self._key(minute, cfg)
+        with self._lock:
+            self._recent[sky] = (cfg, time.monotonic())
+        self._ensure_refresher()
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            snapshot = self._build(minute, cfg)
+            self._snapshots.set(key, snapshot)
+        return snapshot
+
+    def prefetch(self, minute: datetime, max_idle_seconds: float = 300.0) -> int:
+        """Build `minute`'s sky for every configuration used within `max_idle_seconds`."""
+        cutoff = time.monotonic() - max_idle_seconds
+        with self._lock:
+            for sky in [s for s, (_, used) in self._recent.items() if used < cutoff]:
+                del self._recent[sky]
+            configs = [cfg for cfg, _ in self._recent.values()]
+        built = 0
+        for cfg in configs:
+            _, key = self._key(minute, cfg)
+            if self._snapshots.get(key) is None:
+                self._snapshots.set(key, self._build(minute, cfg))
+                built += 1
+        with self._lock:
+            self.prefetched += built
+        return built
+
+    def _ensure_refresher(self) -> None:
+        if not self.refresh or self._refresher is not None:
+            return
+        with self._lock:
+            if self._refresher is not None:
+                return
+            self._refresher = threading.Thread(target=self._refresh_loop, name="current-sky", daemon=True)
+        self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        while True:
+            now = datetime.now(timezone.utc)
+            next_minute = _floor_minute(now) + timedelta(minutes=1)
+            delay = (next_minute - now).total_seconds() - self.prefetch_seconds
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                self.prefetch(next_minute)
+            except Exception as exc:  # keep refreshing; requests fall back to building on demand
+                print("current sky prefetch failed", repr(exc))
+            time.sleep(max(0.0, (next_minute - datetime.now(timezone.utc)).total_seconds()) + 0.01)
+
+    def stats(self) -> dict:
+        with self._lock:
+            extra = {
+                "enabled": self.enabled,
+                "window_minutes": int(self.window.total_seconds() // 60),
+                "configs": len(self._recent),
+                "prefetched": self.prefetched,
+                "bypassed": self.bypassed,
+            }
+        return {**self._snapshots.stats(), **extra}
+
+
+current_sky = CurrentSkyCache(
+    CURRENT_SKY_CACHE_SIZE,
+    window_minutes=CURRENT_SKY_WINDOW_MINUTES,
+    prefetch_seconds=CURRENT_SKY_PREFETCH_SECONDS,
+    enabled=CURRENT_SKY_ENABLED,
+)
+
+
+def transit_subject_with_patterns(
+    birth: BirthData,
+    cfg: ChartConfig,
+    projection: Optional[SubjectProjection] = None,
+) -> Optional[tuple[object, dict, list[dict]]]:
+    """
+    `(subject, dump, patterns)` for a near-now transit moment from the shared sky.
+
+    Returns None when the moment is outside the current window or the config is
+    topocentric; callers then build the subject themselves. Patterns come from
+    the snapshot's memo unless a location-dependent point (an angle) is active.
+    """
+    snapshot = current_sky.get(to_local_datetime(birth), cfg)
+    if snapshot is None:
+        return None
+    subject = snapshot.subject_at(birth, cfg)
+    if active_point_keys(cfg) & LOCATION_POINT_KEYS:
+        subject_dict, patterns = dump_subject_with_patterns(subject, cfg, projection)
+    else:
+        subject_dict, patterns = dump_subject(subject, projection), snapshot.patterns(cfg.active_points, pattern_orbs(cfg))
+    return subject, subject_dict, patterns
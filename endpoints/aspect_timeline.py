@@ -0,0 +1,134 @@
+import os
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from aspects.cross import PointPositions
+from aspects.ptolemaic import PTOLEMAIC_ASPECTS
+from aspects.timeline import find_aspect_windows
+from cancellation import CancelToken, RequestCancelled, cancelled_response, check_cancelled, run_cancellable
+from ephemeris import SWE_BODIES, body_positions, datetime_from_jd, grid_step_days, julian_day
+from projection import active_point_keys, point_key
+from ratelimit import rate_limit
+from schemas import AspectTimelineRequest, AspectTimelineResponse, AspectWindowEntry, ChartConfig
+from utils import cached_subject, ensure_config, resolve_range_bounds
+
+router = APIRouter(tags=["transit"])
+
+# Longest searchable range; a decade takes a few seconds.
+ASPECT_TIMELINE_MAX_YEARS = float(os.getenv("ASPECT_TIMELINE_MAX_YEARS", "50"))
+
+
+def _unprocessable(message: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=message)
+
+
+def compute_aspect_timeline(
+    payload: AspectTimelineRequest,
+    cfg: ChartConfig,
+    cancel_token: Optional[CancelToken] = None,
+) -> AspectTimelineResponse:
+    """
+    Find every transit-to-natal aspect window in the requested range.
+
+    Transit longitudes come straight from the Swiss Ephemeris on a coarse
+    per-body grid; orb entry/exit and exact passes are refined by Newton steps.
+    The natal chart is built once with Kerykeion.
+    """
+    _, start_dt, end_dt = resolve_range_bounds(payload)
+    if end_dt < start_dt:
+        raise HTTPException(status_code=400, detail="end must not be before moment.")
+    start_jd, end_jd = julian_day(start_dt), julian_day(end_dt)
+    if end_jd - start_jd > ASPECT_TIMELINE_MAX_YEARS * 365.25:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Aspect timelines are limited to {ASPECT_TIMELINE_MAX_YEARS:g} years.",
+        )
+
+    if payload.transit_points is not None:
+        bodies = [point_key(p) for p in payload.transit_points]
+        unknown = [p for p, key in zip(payload.transit_points, bodies) if key not in SWE_BODIES]
+        if unknown:
+            raise _unprocessable(
+                f"Unsupported transit points: {', '.join(unknown)}. Supported: {', '.join(SWE_BODIES)}."
+            )
+    else:
+        # Lunar transits last hours; over multi-year ranges they swamp the result, so opt-in only.
+        bodies = [key for key in SWE_BODIES if key in active_point_keys(cfg) and key != "moon"]
+
+    aspect_defs = PTOLEMAIC_ASPECTS
+    if payload.aspects is not None:
+        wanted = {a.strip().lower() for a in payload.aspects}
+        aspect_defs = tuple(a for a in PTOLEMAIC_ASPECTS if a.name in wanted)
+        unknown = sorted(wanted - {a.name for a in aspect_defs})
+        if unknown:
+            raise _unprocessable(f"Unknown aspects: {', '.join(unknown)}.")
+
+    natal_keys = payload.natal_points if payload.natal_points is not None else sorted(active_point_keys(cfg))
+    natal_subject = cached_subject(payload.birth, cfg)
+    natal_positions = PointPositions.from_subjects([natal_subject], natal_keys)
+    missing = sorted({point_key(p) for p in natal_keys} - set(natal_positions.keys))
+    if payload.natal_points is not None and missing:
+        raise _unprocessable(f"Natal points not available in the chart: {', '.join(missing)}.")
+    natal = dict(zip(natal_positions.keys, natal_positions.longitudes[0].tolist()))
+
+    moment = payload.moment
+
+    def positions(jds, body: str):
+        longitudes, speeds = body_positions(jds, [body], cfg, moment.lng, moment.lat)
+        return longitudes[:, 0], speeds[:, 0]
+
+    windows = find_aspect_windows(
+        positions,
+        bodies,
+        natal,
+        start_jd,
+        end_jd,
+        step_days={body: grid_step_days(body) for body in bodies},
+        aspects=aspect_defs,
+        on_body=lambda _: check_cancelled(cancel_token),
+    )
+
+    tz = ZoneInfo(moment.tz_str)
+
+    def local(jd: Optional[float]):
+        return datetime_from_jd(jd, tz) if jd is not None else None
+
+    return AspectTimelineResponse(
+        start=start_dt,
+        end=end_dt,
+        windows=[
+            AspectWindowEntry(
+                transit=w.transit,
+                natal=w.natal,
+                aspect=w.aspect,
+                start=local(w.start),
+                end=local(w.end),
+                exact=[local(jd) for jd in w.exact],
+                min_orb=round(w.min_orb, 2),
+            )
+            for w in windows
+        ],
+    )
+
+
+@router.post(
+    "/aspect-timeline",
+    response_model=AspectTimelineResponse,
+    dependencies=[Depends(rate_limit("range"))],
+)
+async def aspect_timeline(payload: AspectTimelineRequest, request: Request) -> AspectTimelineResponse:
+    """
+    List transit-to-natal aspect windows: orb entry, exact pass(es) and orb exit.
+
+    Answers "Saturn square natal Sun is in orb from X to Y, exact on Z" for
+    multi-year ranges without sampling `/api/transit-range` step by step.
+    Retrograde loops show up as several `exact` timestamps in one window.
+    """
+    print("POST /aspect-timeline", payload.dict(exclude_none=True))
+    cfg = ensure_config(payload.config)
+    try:
+        return await run_cancellable(request, compute_aspect_timeline, payload, cfg)
+    except RequestCancelled:
+        return cancelled_response("POST /aspect-timeline")
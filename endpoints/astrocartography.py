@@ -0,0 +1,146 @@
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from enums import AngleLine
+from ephemeris import SWE_BODIES, equatorial_positions, julian_day
+from projection import active_point_keys, point_key
+from ratelimit import rate_limit
+from schemas import (
+    AstroCartographyLine,
+    AstroCartographyPoint,
+    AstroCartographyRequest,
+    AstroCartographyResponse,
+    ChartConfig,
+)
+from utils import ensure_config, to_local_datetime
+
+router = APIRouter(tags=["relocation"])
+
+
+def _wrap_longitude(values: np.ndarray) -> np.ndarray:
+    """Fold geographic longitudes into [-180, 180)."""
+    return (values + 180.0) % 360.0 - 180.0
+
+
+def meridian_longitudes(ra: np.ndarray, sidereal_time: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Geographic longitudes of the MC and IC lines of each body.
+
+    A body culminates where the local sidereal time (Greenwich sidereal time +
+    east longitude) equals its right ascension.
+    """
+    mc = _wrap_longitude(ra - sidereal_time)
+    return mc, _wrap_longitude(mc + 180.0)
+
+
+def horizon_longitudes(
+    ra: np.ndarray,
+    dec: np.ndarray,
+    sidereal_time: float,
+    latitudes: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Geographic longitudes of the ASC and DSC lines of each body at each latitude.
+
+    Solves the horizon condition `cos H = -tan(lat) tan(dec)` for the hour angle
+    `H` over the whole (body, latitude) grid at once. Returns `(asc, dsc, valid)`
+    arrays of shape `(len(ra), len(latitudes))`; `valid` is False where the body
+    is circumpolar or never rises.
+    """
+    cos_h = -np.tan(np.radians(latitudes))[None, :] * np.tan(np.radians(dec))[:, None]
+    valid = np.abs(cos_h) <= 1.0
+    hour_angle = np.degrees(np.arccos(np.clip(cos_h, -1.0, 1.0)))
+    mc = (ra - sidereal_time)[:, None]
+    # Rising bodies are east of the meridian (negative hour angle), setting ones west.
+    return _wrap_longitude(mc - hour_angle), _wrap_longitude(mc + hour_angle), valid
+
+
+def _segments(longitudes: np.ndarray, latitudes: np.ndarray) -> list[list[list[float]]]:
+    """Split a polyline wherever it jumps across the antimeridian."""
+    breaks = np.nonzero(np.abs(np.diff(longitudes)) > 180.0)[0] + 1
+    return [
+        np.column_stack([lng, lat]).round(4).tolist()
+        for lng, lat in zip(np.split(longitudes, breaks), np.split(latitudes, breaks))
+        if lng.size > 1
+    ]
+
+
+def _meridian(longitude: float, max_latitude: float) -> list[list[list[float]]]:
+    """MC/IC lines are straight north-south lines."""
+    return [[[round(longitude, 4), -max_latitude], [round(longitude, 4), max_latitude]]]
+
+
+def _geojson(lines: list[AstroCartographyLine]) -> dict:
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {"type": "MultiLineString", "coordinates": line.segments},
+                "properties": {"point": line.point, "angle": line.angle.value},
+            }
+            for line in lines
+        ],
+    }
+
+
+def compute_astrocartography(payload: AstroCartographyRequest, cfg: ChartConfig) -> AstroCartographyResponse:
+    """
+    All angular lines of the requested planets from one equatorial ephemeris pass.
+    """
+    if payload.points is not None:
+        points = [point_key(p) for p in payload.points]
+        unknown = [p for p, key in zip(payload.points, points) if key not in SWE_BODIES]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Unsupported points: {', '.join(unknown)}. Supported: {', '.join(SWE_BODIES)}.",
+            )
+    else:
+        points = [key for key in SWE_BODIES if key in active_point_keys(cfg)]
+
+    jd = julian_day(to_local_datetime(payload.birth))
+    ra, dec, sidereal_time = equatorial_positions(jd, points, cfg)
+
+    count = int(round(2 * payload.max_latitude / payload.lat_step)) + 1
+    latitudes = np.linspace(-payload.max_latitude, payload.max_latitude, count)
+    mc, ic = meridian_longitudes(ra, sidereal_time)
+    asc, dsc, valid = horizon_longitudes(ra, dec, sidereal_time, latitudes)
+
+    lines: list[AstroCartographyLine] = []
+    for i, point in enumerate(points):
+        rows = valid[i]
+        segments = {
+            AngleLine.MC: _meridian(float(mc[i]), payload.max_latitude),
+            AngleLine.IC: _meridian(float(ic[i]), payload.max_latitude),
+            AngleLine.ASC: _segments(asc[i, rows], latitudes[rows]),
+            AngleLine.DSC: _segments(dsc[i, rows], latitudes[rows]),
+        }
+        lines.extend(AstroCartographyLine(point=point, angle=angle, segments=segs) for angle, segs in segments.items())
+
+    return AstroCartographyResponse(
+        julian_day=jd,
+        sidereal_time=round(sidereal_time, 6),
+        points=[
+            AstroCartographyPoint(point=point, right_ascension=round(float(r), 6), declination=round(float(d), 6))
+            for point, r, d in zip(points, ra, dec)
+        ],
+        lines=lines,
+        geojson=_geojson(lines) if payload.geojson else None,
+    )
+
+
+@router.post("/astrocartography", response_model=AstroCartographyResponse, dependencies=[Depends(rate_limit("chart"))])
+async def astrocartography(payload: AstroCartographyRequest) -> AstroCartographyResponse:
+    """
+    Astrocartography lines: where on Earth each planet rises (ASC), sets (DSC),
+    culminates (MC) or anti-culminates (IC) at the birth moment.
+
+    Lines are derived analytically from the planets' right ascension and
+    declination, so a world map costs a single ephemeris pass instead of one
+    chart per map cell. Set `geojson` for a ready-to-draw FeatureCollection.
+    """
+    print("POST /astrocartography", payload.dict(exclude_none=True))
+    cfg = ensure_config(payload.config)
+    return await run_in_threadpool(compute_astrocartography, payload, cfg)
@@ -0,0 +1,115 @@
+import asyncio
+import base64
+from typing import Callable
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import BaseModel
+
+from auth import get_current_username
+from cancellation import RequestCancelled, cancelled_response, run_cancellable
+from coalesce import request_flights, request_key
+from endpoints.natal import compute_natal
+from endpoints.relationship import compute_relationship
+from endpoints.svg_chart import natal_svg_text, synastry_svg_text, transit_svg_text
+from endpoints.transit import compute_transit
+from enums import Mode
+from ratelimit import charge_rate_limit, rate_limit
+from render_pool import RenderError
+from schemas import (
+    ChartBundleRequest,
+    ChartBundleResponse,
+    ChartConfig,
+    NatalRequest,
+    RelationshipRequest,
+    SynastrySvgRequest,
+    TransitMomentRequest,
+)
+from utils import ensure_config, render_pdf_from_svg
+
+router = APIRouter(tags=["svg"])
+
+# Query parameters of a plain `/natal`-style request, so bundle sections share its in-flight key.
+_NO_PROJECTION = (None, None)
+
+
+def _require(condition: object, message: str) -> None:
+    if not condition:
+        raise HTTPException(status_code=400, detail=message)
+
+
+def _bundle_parts(payload: ChartBundleRequest, cfg: ChartConfig) -> tuple[str, Callable, BaseModel, Callable, BaseModel, str]:
+    """
+    Map a bundle request onto its endpoints: `(section, json_func, json_payload, svg_func, svg_payload, svg_endpoint)`.
+    """
+    mode = payload.mode
+    if mode == Mode.NATAL:
+        _require(payload.birth, "Natal mode requires birth.")
+        request = NatalRequest(birth=payload.birth, config=cfg)
+        return "natal", compute_natal, request, natal_svg_text, request, "svg/natal"
+    if mode in (Mode.TRANSIT, Mode.NATAL_TRANSIT):
+        _require(payload.moment, "Transit mode requires a moment.")
+        if mode == Mode.NATAL_TRANSIT:
+            _require(payload.birth, "Dual mode requires birth and moment.")
+        request = TransitMomentRequest(moment=payload.moment, birth=payload.birth, config=cfg)
+        return "transit", compute_transit, request, transit_svg_text, request, "svg/transit"
+    _require(payload.first and payload.second, "Relationship mode requires first and second.")
+    json_request = RelationshipRequest(first=payload.first, second=payload.second, config=cfg)
+    svg_request = SynastrySvgRequest(first=payload.first, second=payload.second, config=cfg, grid_view=payload.grid_view)
+    return "relationship", compute_relationship, json_request, synastry_svg_text, svg_request, "svg/synastry"
+
+
+async def build_chart_bundle(payload: ChartBundleRequest, cfg: ChartConfig, request: Request) -> ChartBundleResponse:
+    """
+    Compute the chart JSON and SVG with the same functions as the separate endpoints.
+
+    The section and SVG go through `request_flights` under the keys of
+    `/api/natal` + `/api/svg/natal` (transit, relationship), so they match those
+    responses exactly and share any identical computation already in flight.
+    """
+    section, json_func, json_payload, svg_func, svg_payload, svg_endpoint = _bundle_parts(payload, cfg)
+    json_key = request_key(section, json_payload, cfg, projection=_NO_PROJECTION)
+    parts = [request_flights.run(section, json_key, request, json_func, json_payload, cfg, None)]
+    if payload.include_svg or payload.include_pdf:
+        svg_key = request_key(svg_endpoint, svg_payload, cfg)
+        parts.append(request_flights.run(svg_endpoint, svg_key, request, svg_func, svg_payload, cfg))
+    results = await asyncio.gather(*parts)
+
+    bundle = ChartBundleResponse(mode=payload.mode, **{section: results[0]})
+    if len(results) == 1:
+        return bundle
+    svg_text = results[1]
+    if payload.include_svg:
+        bundle.svg = svg_text
+    if payload.include_pdf:
+        pdf_bytes = await run_cancellable(request, render_pdf_from_svg, svg_text, filename_prefix=section)
+        bundle.pdf_base64 = base64.b64encode(pdf_bytes).decode("ascii")
+    return bundle
+
+
+@router.post(
+    "/chart/bundle",
+    response_model=ChartBundleResponse,
+    dependencies=[Depends(rate_limit("chart", weight=2))],
+)
+async def chart_bundle(
+    payload: ChartBundleRequest,
+    request: Request,
+    username: str = Depends(get_current_username),
+) -> ChartBundleResponse:
+    """
+    Return chart JSON, rendered SVG and (with `include_pdf=true`) the chart PDF in one response.
+
+    Replaces the `/api/natal` + `/api/svg/natal` (or transit / relationship)
+    round trip pair; each part is identical to the separate endpoint's response.
+    """
+    print("POST /chart/bundle", payload.dict(exclude_none=True))
+    if payload.include_pdf:
+        charge_rate_limit(username, "pdf")
+    cfg = ensure_config(payload.config)
+    try:
+        return await build_chart_bundle(payload, cfg, request)
+    except RequestCancelled:
+        return cancelled_response("POST /chart/bundle")
+    except RenderError as exc:
+        print("POST /chart/bundle render failed", str(exc))
+        return Response(status_code=503, content=str(exc))
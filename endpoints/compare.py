@@ -0,0 +1,133 @@
+import os
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from enums import Perspective, ZodiacType
+from ephemeris import SWE_BODIES, ayanamsa, body_positions, house_cusps, house_numbers, julian_day
+from projection import point_key
+from ratelimit import rate_limit
+from schemas import (
+    ChartConfig,
+    ComparedChart,
+    ComparedPoint,
+    ConfigComparisonRequest,
+    ConfigComparisonResponse,
+)
+from sky_events import SIGNS
+from utils import ensure_config, to_local_datetime
+
+router = APIRouter(tags=["natal"])
+
+# Variants per request; all 23 house systems times a few zodiacs fit comfortably.
+COMPARE_MAX_CONFIGS = int(os.getenv("COMPARE_MAX_CONFIGS", "100"))
+
+# Points derived from another ephemeris body instead of computed themselves.
+_SOUTH_NODES = {
+    "true_south_lunar_node": "true_north_lunar_node",
+    "mean_south_lunar_node": "mean_north_lunar_node",
+}
+_ANGLES = ("ascendant", "medium_coeli", "descendant", "imum_coeli")
+
+
+def _point_keys(cfg: ChartConfig) -> list[str]:
+    """Active points of `cfg` that can be compared, in configuration order."""
+    keys = [point_key(p) for p in cfg.active_points or []]
+    return [k for k in keys if k in SWE_BODIES or k in _SOUTH_NODES or k in _ANGLES]
+
+
+def _ephemeris_bodies(cfg: ChartConfig) -> set[str]:
+    return {_SOUTH_NODES.get(k, k) for k in _point_keys(cfg) if k not in _ANGLES}
+
+
+def compute_comparison(payload: ConfigComparisonRequest) -> ConfigComparisonResponse:
+    """
+    Compute every configuration variant from shared tropical positions.
+
+    The Julian day is converted once and tropical positions are computed once
+    per perspective; sidereal variants subtract the ayanamsa of their mode.
+    Only the house cusps are computed per variant.
+    """
+    if len(payload.configs) > COMPARE_MAX_CONFIGS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {COMPARE_MAX_CONFIGS} configurations per request.",
+        )
+    birth = payload.birth
+    jd = julian_day(to_local_datetime(birth))
+    configs = [ensure_config(c.model_copy(deep=True)) for c in payload.configs]
+
+    tropical: dict[Perspective, dict[str, tuple[float, float]]] = {}
+    for perspective in dict.fromkeys(c.perspective for c in configs):
+        bodies = sorted(set().union(*(_ephemeris_bodies(c) for c in configs if c.perspective == perspective)))
+        base = ChartConfig(perspective=perspective, zodiac_type=ZodiacType.TROPIC, sidereal_mode=None)
+        lon, speed = body_positions([jd], bodies, base, birth.lng, birth.lat)
+        tropical[perspective] = {b: (lon[0, i], speed[0, i]) for i, b in enumerate(bodies)}
+
+    offsets = {
+        c.sidereal_mode: ayanamsa(jd, c.sidereal_mode)
+        for c in configs
+        if c.zodiac_type == ZodiacType.SIDEREAL and c.sidereal_mode is not None
+    }
+
+    charts = []
+    for cfg in configs:
+        offset = offsets.get(cfg.sidereal_mode, 0.0) if cfg.zodiac_type == ZodiacType.SIDEREAL else 0.0
+        cusps, angles = house_cusps(jd, [birth.lat], [birth.lng], cfg)
+        asc, mc = angles[0].tolist()
+        angle_lon = {"ascendant": asc, "medium_coeli": mc, "descendant": asc + 180.0, "imum_coeli": mc + 180.0}
+
+        keys = _point_keys(cfg)
+        longitudes, speeds = [], []
+        for key in keys:
+            if key in angle_lon:
+                lon, speed = angle_lon[key], 0.0
+            else:
+                lon, speed = tropical[cfg.perspective][_SOUTH_NODES.get(key, key)]
+                if cfg.perspective == Perspective.HELIOCENTRIC and key == "sun":
+                    # The ephemeris reports the heliocentric Sun as an all-zero placeholder in every zodiac.
+                    lon = 0.0
+                else:
+                    lon = lon - offset + (180.0 if key in _SOUTH_NODES else 0.0)
+            longitudes.append(lon % 360.0)
+            speeds.append(speed)
+        houses = house_numbers(np.array([longitudes]), cusps)[0] if keys else []
+
+        charts.append(
+            ComparedChart(
+                config=cfg,
+                ayanamsa=round(offset, 6) if cfg.zodiac_type == ZodiacType.SIDEREAL else None,
+                cusps=[round(c, 4) for c in cusps[0].tolist()],
+                points=[
+                    ComparedPoint(
+                        point=key,
+                        abs_pos=round(lon, 4),
+                        sign=SIGNS[int(lon // 30.0)],
+                        position=round(lon % 30.0, 4),
+                        house=int(house),
+                        retrograde=speed < 0,
+                    )
+                    for key, lon, speed, house in zip(keys, longitudes, speeds, houses)
+                ],
+            )
+        )
+    return ConfigComparisonResponse(julian_day=jd, charts=charts)
+
+
+@router.post(
+    "/natal/compare",
+    response_model=ConfigComparisonResponse,
+    dependencies=[Depends(rate_limit("chart", weight=2))],
+)
+async def compare_configs(payload: ConfigComparisonRequest) -> ConfigComparisonResponse:
+    """
+    One birth chart under several configurations, side by side.
+
+    Compares house systems, zodiacs and ayanamsas (e.g. all house systems,
+    tropical vs Lahiri vs Krishnamurti) without a full subject per variant.
+    Points without a direct ephemeris position (other than the south nodes
+    and the angles) are left out.
+    """
+    print("POST /natal/compare", {"birth": payload.birth.dict(), "configs": len(payload.configs)})
+    return await run_in_threadpool(compute_comparison, payload)
@@ -1,11 +1,39 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from coalesce import request_flights
+from current_sky import current_sky
+from endpoints.returns import return_cache
+from live_sky import live_sky_hub
+from ratelimit import rate_limit
+from render_pool import render_pool
+from sky_events import sky_event_store
+from utils import report_cache, subject_cache
 
 router = APIRouter(tags=["system"])
 
 
-@router.get("/health")
+@router.get("/health", dependencies=[Depends(rate_limit("light", limit_concurrency=False))])
 async def health_check() -> dict:
     """
     Simple liveness probe for the Astro API.
     """
     return {"status": "ok"}
+
+
+@router.get("/metrics", dependencies=[Depends(rate_limit("light", limit_concurrency=False))])
+async def metrics() -> dict:
+    """
+    In-process counters: render pool jobs and fallback renderers, coalesced
+    identical requests, live-sky channels, current-sky, report, return and
+    natal subject cache hits, plus the year coverage of the sky-event calendars.
+    """
+    return {
+        "render": render_pool.stats(),
+        "coalescing": request_flights.stats(),
+        "current_sky": current_sky.stats(),
+        "live_sky": live_sky_hub.stats(),
+        "report_cache": report_cache.stats(),
+        "return_cache": return_cache.stats(),
+        "subject_cache": subject_cache.stats(),
+        "sky_events": sky_event_store.stats(),
+    }
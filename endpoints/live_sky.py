@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+from auth import get_current_username
+from enums import LiveSkyAction, Perspective
+from live_sky import SLOW_CONSUMER, Subscriber, live_sky_hub
+from ratelimit import rate_limit
+from schemas import LiveSkySubscription
+from utils import ensure_config
+
+router = APIRouter(tags=["live-sky"])
+
+# Close codes: 1008 policy violation, 1013 try again later.
+CLOSE_TOO_MANY_CONNECTIONS = 1008
+CLOSE_SLOW_CONSUMER = 1013
+
+
+async def _send(websocket: WebSocket, send_lock: asyncio.Lock, message: dict) -> None:
+    # The update and subscription tasks share the socket; one frame is written at a time.
+    async with send_lock:
+        await websocket.send_json(message)
+
+
+async def _send_updates(websocket: WebSocket, subscriber: Subscriber, send_lock: asyncio.Lock) -> None:
+    while True:
+        update = await subscriber.queue.get()
+        if update is SLOW_CONSUMER:
+            async with send_lock:
+                await websocket.close(code=CLOSE_SLOW_CONSUMER, reason="Slow consumer: too many updates dropped.")
+            return
+        await _send(websocket, send_lock, update)
+
+
+async def _receive_subscriptions(websocket: WebSocket, subscriber: Subscriber, send_lock: asyncio.Lock) -> None:
+    while True:
+        text = await websocket.receive_text()
+        try:
+            message = json.loads(text)
+        except json.JSONDecodeError:
+            await _send(websocket, send_lock, {"type": "error", "detail": "Messages must be JSON objects."})
+            continue
+        try:
+            subscription = LiveSkySubscription.model_validate(message)
+        except ValidationError as exc:
+            detail = exc.errors(include_url=False, include_context=False)
+            await _send(websocket, send_lock, {"type": "error", "detail": detail})
+            continue
+
+        if subscription.action == LiveSkyAction.UNSUBSCRIBE:
+            live_sky_hub.unsubscribe(subscriber)
+            await _send(websocket, send_lock, {"type": "unsubscribed"})
+            continue
+
+        cfg = ensure_config(subscription.config)
+        if cfg.perspective == Perspective.TOPOCENTRIC and subscription.location is None:
+            detail = "The topocentric perspective needs a location."
+            await _send(websocket, send_lock, {"type": "error", "detail": detail})
+            continue
+        channel = live_sky_hub.subscribe(subscriber, cfg, subscription.location)
+        await _send(
+            websocket,
+            send_lock,
+            {"type": "subscribed", "channel": channel.key, "subscribers": len(channel.subscribers)},
+        )
+
+
+@router.websocket("/live-sky", dependencies=[Depends(rate_limit("chart", limit_concurrency=False))])
+async def live_sky(websocket: WebSocket, username: str = Depends(get_current_username)) -> None:
+    """
+    Live sky feed over a WebSocket.
+
+    Clients send `{"action": "subscribe", "config": {...}, "location": {...}}`
+    to join a channel and receive a compact `sky` update (points and Ptolemaic
+    patterns) on every tick. Each channel is computed once per tick no matter
+    how many clients share it; clients that fall behind lose their oldest
+    queued updates and are eventually closed with code 1013.
+    """
+    subscriber = live_sky_hub.connect(username)
+    if subscriber is None:
+        await websocket.close(code=CLOSE_TOO_MANY_CONNECTIONS, reason="Too many live-sky connections.")
+        return
+
+    await websocket.accept()
+    send_lock = asyncio.Lock()
+    sender = asyncio.create_task(_send_updates(websocket, subscriber, send_lock))
+    receiver = asyncio.create_task(_receive_subscriptions(websocket, subscriber, send_lock))
+    try:
+        done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            exc = task.exception()
+            if exc is not None and not isinstance(exc, WebSocketDisconnect):
+                raise exc
+    finally:
+        sender.cancel()
+        receiver.cancel()
+        live_sky_hub.disconnect(subscriber)
@@ -1,9 +1,20 @@
-from fastapi import APIRouter
+from typing import Optional
 
-from schemas import NatalRequest, NatalResponse
+from fastapi import APIRouter, Depends, Request
+
+from cancellation import CancelToken, RequestCancelled, cancelled_response, check_cancelled
+from coalesce import request_flights, request_key
+from projection import (
+    SubjectProjection,
+    dump_subject_with_patterns,
+    filter_aspects,
+    projection_params,
+    resolve_projection,
+)
+from ratelimit import rate_limit
+from schemas import ChartConfig, NatalRequest, NatalResponse
 from utils import (
     build_subject,
-    compute_major_aspects,
     compute_normal_aspects,
     ensure_config,
 )
@@ -11,15 +22,38 @@ from utils import (
 router = APIRouter(tags=["natal"])
 
 
-@router.post("/natal", response_model=NatalResponse)
-async def natal_chart(payload: NatalRequest) -> NatalResponse:
+def compute_natal(
+    payload: NatalRequest,
+    cfg: ChartConfig,
+    projection: Optional[SubjectProjection] = None,
+    cancel_token: Optional[CancelToken] = None,
+) -> NatalResponse:
+    """Build the natal subject and dump it with its aspects and patterns."""
+    subject = build_subject(payload.birth, cfg)
+    check_cancelled(cancel_token)
+    subject_dict, major_aspects = dump_subject_with_patterns(subject, cfg, projection)
+    aspects = filter_aspects(compute_normal_aspects(subject), projection)
+    return NatalResponse(subject=subject_dict, aspects=aspects, major_aspects=major_aspects)
+
+
+@router.post("/natal", response_model=NatalResponse, dependencies=[Depends(rate_limit("chart"))])
+async def natal_chart(
+    payload: NatalRequest,
+    request: Request,
+    projection: tuple = Depends(projection_params),
+) -> NatalResponse:
     """
     Compute a natal chart configuration as a structured JSON response.
+
+    `points` / `fields` restrict which points (and which of their attributes)
+    are dumped into `subject`; `aspects` are limited to the selected points.
+    Identical concurrent requests share one computation.
     """
     print("POST /natal", payload.dict(exclude_none=True))
     cfg = ensure_config(payload.config)
-    subject = build_subject(payload.birth, cfg)
-    subject_dict = subject.model_dump(mode="json")
-    aspects = compute_normal_aspects(subject)
-    major_aspects = compute_major_aspects(subject_dict, active_points=cfg.active_points)
-    return NatalResponse(subject=subject_dict, aspects=aspects, major_aspects=major_aspects)
+    subject_projection = resolve_projection(*projection, cfg)
+    key = request_key("natal", payload, cfg, projection=projection)
+    try:
+        return await request_flights.run("natal", key, request, compute_natal, payload, cfg, subject_projection)
+    except RequestCancelled:
+        return cancelled_response("POST /natal")
@@ -0,0 +1,239 @@
+import math
+import os
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from aspects.cross import PointPositions
+from aspects.ptolemaic import PTOLEMAIC_ASPECTS, NormalAspect
+from aspects.timeline import find_aspect_windows, find_sign_ingresses
+from cancellation import CancelToken, RequestCancelled, cancelled_response, check_cancelled, run_cancellable
+from enums import ProgressionMethod
+from ephemeris import SWE_BODIES, body_positions, datetime_from_jd, grid_step_days, julian_day
+from projection import active_point_keys, point_key
+from ratelimit import rate_limit
+from schemas import (
+    ChartConfig,
+    ProgressedAspect,
+    ProgressedPosition,
+    ProgressedSignChange,
+    ProgressionRequest,
+    ProgressionResponse,
+)
+from sky_events import SIGNS
+from utils import cached_subject, ensure_config, resolve_range_bounds
+
+router = APIRouter(tags=["progressions"])
+
+# Longest target range; a lifetime maps to ~120 progressed days.
+PROGRESSIONS_MAX_YEARS = float(os.getenv("PROGRESSIONS_MAX_YEARS", "120"))
+
+# Day-for-a-year: each tropical year of life corresponds to one day after birth.
+TROPICAL_YEAR_DAYS = 365.24219
+
+# `grid_step_days` keeps a body from crossing an 8° orb between samples; progressed
+# orbs are tighter, so the progressed-time grid is refined in proportion.
+_GRID_STEP_ORB = 8.0
+
+# Perfections and ingresses are refined to one minute of target (real) time.
+_TOLERANCE_DAYS = 1.0 / 1440.0 / TROPICAL_YEAR_DAYS
+
+
+def progressed_jd(natal_jd: float, target_jd):
+    """Progressed Julian day (UT) for a target Julian day, or an array of them."""
+    return natal_jd + (np.asarray(target_jd, dtype=float) - natal_jd) / TROPICAL_YEAR_DAYS
+
+
+def target_jd(natal_jd: float, progressed):
+    """Inverse of `progressed_jd`: the target date whose progressed moment is `progressed`."""
+    return natal_jd + (np.asarray(progressed, dtype=float) - natal_jd) * TROPICAL_YEAR_DAYS
+
+
+def _unprocessable(message: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=message)
+
+
+def compute_progressions(
+    payload: ProgressionRequest,
+    cfg: ChartConfig,
+    method: ProgressionMethod,
+    cancel_token: Optional[CancelToken] = None,
+) -> ProgressionResponse:
+    """
+    Progressed positions at the start of the range plus every progressed-to-natal
+    perfection and sign change within it.
+
+    The target range is mapped to progressed Julian days once; everything after
+    that works on ephemeris positions in progressed time (a century of target
+    dates is ~100 progressed days), refined like the aspect timeline.
+    """
+    _, start_dt, end_dt = resolve_range_bounds(payload)
+    if end_dt < start_dt:
+        raise HTTPException(status_code=400, detail="end must not be before moment.")
+    start_jd, end_jd = julian_day(start_dt), julian_day(end_dt)
+    if end_jd - start_jd > PROGRESSIONS_MAX_YEARS * 365.25:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Progressions are limited to {PROGRESSIONS_MAX_YEARS:g} years.",
+        )
+
+    aspect_defs = tuple(NormalAspect(a.name, a.angle, payload.orb, a.icon) for a in PTOLEMAIC_ASPECTS)
+    if payload.aspects is not None:
+        wanted = {a.strip().lower() for a in payload.aspects}
+        aspect_defs = tuple(a for a in aspect_defs if a.name in wanted)
+        unknown = sorted(wanted - {a.name for a in aspect_defs})
+        if unknown:
+            raise _unprocessable(f"Unknown aspects: {', '.join(unknown)}.")
+
+    birth = payload.birth
+    natal_subject = cached_subject(birth, cfg)
+    natal_jd = float(natal_subject.julian_day)
+    all_natal = PointPositions.from_subjects([natal_subject], sorted(active_point_keys(cfg)))
+    all_natal_lon = dict(zip(all_natal.keys, all_natal.longitudes[0].tolist()))
+
+    natal_keys = payload.natal_points if payload.natal_points is not None else sorted(active_point_keys(cfg))
+    natal_positions = PointPositions.from_subjects([natal_subject], natal_keys)
+    missing = sorted({point_key(p) for p in natal_keys} - set(natal_positions.keys))
+    if payload.natal_points is not None and missing:
+        raise _unprocessable(f"Natal points not available in the chart: {', '.join(missing)}.")
+    natal = dict(zip(natal_positions.keys, natal_positions.longitudes[0].tolist()))
+
+    natal_sun = float(body_positions([natal_jd], ["sun"], cfg, birth.lng, birth.lat)[0][0, 0])
+
+    if method == ProgressionMethod.SECONDARY:
+        if payload.points is not None:
+            points = [point_key(p) for p in payload.points]
+            unknown = [p for p, key in zip(payload.points, points) if key not in SWE_BODIES]
+            if unknown:
+                raise _unprocessable(
+                    f"Unsupported progressed points: {', '.join(unknown)}. Supported: {', '.join(SWE_BODIES)}."
+                )
+        else:
+            points = [key for key in SWE_BODIES if key in active_point_keys(cfg)]
+
+        def positions(jds, point: str):
+            longitudes, speeds = body_positions(jds, [point], cfg, birth.lng, birth.lat)
+            return longitudes[:, 0], speeds[:, 0]
+
+        def step(point: str) -> float:
+            return grid_step_days(point) * payload.orb / _GRID_STEP_ORB
+
+    else:
+        # Solar arc: every natal point (angles included) advances by the progressed Sun's arc.
+        if payload.points is not None:
+            points = [point_key(p) for p in payload.points]
+            unknown = [p for p, key in zip(payload.points, points) if key not in all_natal_lon]
+            if unknown:
+                raise _unprocessable(f"Points not available in the natal chart: {', '.join(unknown)}.")
+        else:
+            points = list(all_natal_lon)
+
+        def positions(jds, point: str):
+            sun, speed = body_positions(jds, ["sun"], cfg, birth.lng, birth.lat)
+            return (all_natal_lon[point] + sun[:, 0] - natal_sun) % 360.0, speed[:, 0]
+
+        def step(point: str) -> float:
+            return grid_step_days("sun") * payload.orb / _GRID_STEP_ORB
+
+    start_p = float(progressed_jd(natal_jd, start_jd))
+    end_p = float(progressed_jd(natal_jd, end_jd))
+    tz = ZoneInfo(payload.moment.tz_str)
+
+    def local(jd: float):
+        return datetime_from_jd(float(target_jd(natal_jd, jd)), tz)
+
+    start_sun = float(body_positions([start_p], ["sun"], cfg, birth.lng, birth.lat)[0][0, 0])
+    position_entries = []
+    for point in points:
+        lon, speed = positions(np.array([start_p]), point)
+        position_entries.append(
+            ProgressedPosition(
+                point=point,
+                longitude=round(float(lon[0]), 4),
+                sign=SIGNS[int(lon[0] % 360.0 // 30.0)],
+                retrograde=method == ProgressionMethod.SECONDARY and bool(speed[0] < 0),
+            )
+        )
+
+    check_cancelled(cancel_token)
+    windows = find_aspect_windows(
+        positions,
+        points,
+        natal,
+        start_p,
+        end_p,
+        step_days={point: step(point) for point in points},
+        aspects=aspect_defs,
+        tolerance_days=_TOLERANCE_DAYS,
+        on_body=lambda _: check_cancelled(cancel_token),
+    )
+    perfections = sorted(
+        (
+            ProgressedAspect(timestamp=local(jd), progressed=w.transit, natal=w.natal, aspect=w.aspect)
+            for w in windows
+            for jd in w.exact
+        ),
+        key=lambda p: (p.timestamp, p.progressed, p.natal),
+    )
+
+    sign_changes = []
+    for point in points:
+        check_cancelled(cancel_token)
+        grid = np.linspace(start_p, end_p, max(2, math.ceil((end_p - start_p) / step(point)) + 1))
+        for ingress in find_sign_ingresses(positions, point, grid, positions(grid, point)[0], _TOLERANCE_DAYS):
+            sign_changes.append(
+                ProgressedSignChange(
+                    timestamp=local(ingress.jd),
+                    point=point,
+                    sign=SIGNS[ingress.sign],
+                    from_sign=SIGNS[ingress.from_sign],
+                    retrograde=not ingress.forward,
+                )
+            )
+    sign_changes.sort(key=lambda c: (c.timestamp, c.point))
+
+    return ProgressionResponse(
+        method=method,
+        start=start_dt,
+        end=end_dt,
+        progressed_start=datetime_from_jd(start_p),
+        solar_arc=round((start_sun - natal_sun) % 360.0, 4),
+        positions=position_entries,
+        perfections=perfections,
+        sign_changes=sign_changes,
+    )
+
+
+async def _run(payload: ProgressionRequest, request: Request, method: ProgressionMethod, label: str):
+    print(label, payload.dict(exclude_none=True))
+    cfg = ensure_config(payload.config)
+    try:
+        return await run_cancellable(request, compute_progressions, payload, cfg, method)
+    except RequestCancelled:
+        return cancelled_response(label)
+
+
+@router.post("/progressions", response_model=ProgressionResponse, dependencies=[Depends(rate_limit("chart", weight=2))])
+async def secondary_progressions(payload: ProgressionRequest, request: Request) -> ProgressionResponse:
+    """
+    Secondary progressions (day-for-a-year) over a range of target dates.
+
+    Returns the progressed positions at `moment`, the dates on which progressed
+    points perfect aspects to natal points, and progressed sign changes
+    (e.g. the progressed Moon moving through the signs).
+    """
+    return await _run(payload, request, ProgressionMethod.SECONDARY, "POST /progressions")
+
+
+@router.post("/solar-arc", response_model=ProgressionResponse, dependencies=[Depends(rate_limit("chart", weight=2))])
+async def solar_arc_directions(payload: ProgressionRequest, request: Request) -> ProgressionResponse:
+    """
+    Solar arc directions over a range of target dates.
+
+    Every natal point, angles included, advances by the arc of the
+    secondary-progressed Sun; reports directed-to-natal perfections and
+    directed sign changes like `/progressions`.
+    """
+    return await _run(payload, request, ProgressionMethod.SOLAR_ARC, "POST /solar-arc")
@@ -1,27 +1,66 @@
-from fastapi import APIRouter
+from typing import Optional
 
-from schemas import RelationshipRequest, RelationshipResponse
-from utils import compute_dual_chart_aspects
+from fastapi import APIRouter, Depends, Request
+
+from cancellation import CancelToken, RequestCancelled, cancelled_response, check_cancelled
+from coalesce import request_flights, request_key
+from projection import (
+    SubjectProjection,
+    cross_chart_patterns,
+    dump_dual_aspects,
+    dump_subject,
+    projection_params,
+    resolve_projection,
+)
+from ratelimit import rate_limit
+from schemas import ChartConfig, RelationshipRequest, RelationshipResponse
+from utils import compute_dual_chart_aspects, ensure_config
 
 router = APIRouter(tags=["relationship"])
 
 
-@router.post("/relationship", response_model=RelationshipResponse)
-async def relationship(payload: RelationshipRequest) -> RelationshipResponse:
+def compute_relationship(
+    payload: RelationshipRequest,
+    cfg: ChartConfig,
+    projection: Optional[SubjectProjection] = None,
+    cancel_token: Optional[CancelToken] = None,
+) -> RelationshipResponse:
+    """Build both subjects and dump them with their dual-chart aspects and cross-chart patterns."""
+    first_subject, second_subject, aspects_model = compute_dual_chart_aspects(payload.first, payload.second, cfg)
+    check_cancelled(cancel_token)
+    return RelationshipResponse(
+        first_subject=dump_subject(first_subject, projection),
+        second_subject=dump_subject(second_subject, projection),
+        aspects=dump_dual_aspects(aspects_model, projection),
+        cross_major_aspects=cross_chart_patterns({"first": first_subject, "second": second_subject}, cfg),
+    )
+
+
+@router.post(
+    "/relationship",
+    response_model=RelationshipResponse,
+    dependencies=[Depends(rate_limit("chart"))],
+)
+async def relationship(
+    payload: RelationshipRequest,
+    request: Request,
+    projection: tuple = Depends(projection_params),
+) -> RelationshipResponse:
     """
     Compute dual-chart aspects between two subjects.
 
-    Returns both AstrologicalSubject JSON dumps plus the dual-chart aspects model.
+    Returns both AstrologicalSubject JSON dumps plus the dual-chart aspects model
+    and the Ptolemaic patterns formed jointly by both charts.
+    `points` / `fields` restrict the dumped points of both subjects.
+    Identical concurrent requests share one computation.
     """
     print("POST /relationship", payload.dict(exclude_none=True))
-    first_subject, second_subject, aspects_model = compute_dual_chart_aspects(
-        payload.first,
-        payload.second,
-        payload.config,
-    )
-
-    return RelationshipResponse(
-        first_subject=first_subject.model_dump(mode="json"),
-        second_subject=second_subject.model_dump(mode="json"),
-        aspects=aspects_model.model_dump(mode="json"),
-    )
+    cfg = ensure_config(payload.config)
+    subject_projection = resolve_projection(*projection, cfg)
+    key = request_key("relationship", payload, cfg, projection=projection)
+    try:
+        return await request_flights.run(
+            "relationship", key, request, compute_relationship, payload, cfg, subject_projection
+        )
+    except RequestCancelled:
+        return cancelled_response("POST /relationship")
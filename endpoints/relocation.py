@@ -0,0 +1,110 @@
+import os
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from auth import get_current_username
+from enums import Perspective
+from ephemeris import HOUSE_MAX_LATITUDE, SWE_BODIES, body_positions, house_cusps, house_numbers, julian_day
+from projection import active_point_keys, point_key
+from ratelimit import charge_rate_limit, rate_limit
+from schemas import ChartConfig, RelocatedChart, RelocationRequest, RelocationResponse
+from utils import ensure_config, to_local_datetime
+
+router = APIRouter(tags=["relocation"])
+
+# Locations per request; a thousand relocated charts take a few tens of milliseconds.
+RELOCATION_MAX_LOCATIONS = int(os.getenv("RELOCATION_MAX_LOCATIONS", "2000"))
+# Every further block of this many locations costs one more `chart` token.
+RELOCATION_LOCATIONS_PER_TOKEN = int(os.getenv("RELOCATION_LOCATIONS_PER_TOKEN", "100"))
+
+
+def compute_relocation(payload: RelocationRequest, cfg: ChartConfig) -> RelocationResponse:
+    """
+    Relocate one birth moment to every requested location.
+
+    Planet positions do not depend on the location (except topocentric
+    parallax), so they are computed once; only cusps and angles are computed
+    per location, and house placements for all locations in one array pass.
+    """
+    if payload.points is not None:
+        points = [point_key(p) for p in payload.points]
+        unknown = [p for p, key in zip(payload.points, points) if key not in SWE_BODIES]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Unsupported points: {', '.join(unknown)}. Supported: {', '.join(SWE_BODIES)}.",
+            )
+    else:
+        points = [key for key in SWE_BODIES if key in active_point_keys(cfg)]
+
+    birth = payload.birth
+    jd = julian_day(to_local_datetime(birth))
+    lats = np.array([loc.lat for loc in payload.locations])
+    lngs = np.array([loc.lng for loc in payload.locations])
+
+    shared = body_positions([jd], points, cfg, birth.lng, birth.lat, with_speed=False)[0]  # (1, P)
+    topocentric = cfg.perspective == Perspective.TOPOCENTRIC
+    if topocentric:
+        # Parallax (mostly the Moon's) makes positions depend on the observer; subjects
+        # clamp the observer latitude like the house latitude.
+        observer_lats = np.clip(lats, -HOUSE_MAX_LATITUDE, HOUSE_MAX_LATITUDE)
+        longitudes = np.vstack(
+            [
+                body_positions([jd], points, cfg, lng, lat, with_speed=False)[0]
+                for lat, lng in zip(observer_lats.tolist(), lngs.tolist())
+            ]
+        )
+    else:
+        longitudes = np.repeat(shared, lats.size, axis=0)
+
+    cusps, angles = house_cusps(jd, lats, lngs, cfg)
+    houses = house_numbers(longitudes, cusps)
+
+    charts = []
+    for i, loc in enumerate(payload.locations):
+        asc, mc = angles[i].tolist()
+        charts.append(
+            RelocatedChart(
+                name=loc.name,
+                lat=loc.lat,
+                lng=loc.lng,
+                ascendant=round(asc, 4),
+                medium_coeli=round(mc, 4),
+                descendant=round((asc + 180.0) % 360.0, 4),
+                imum_coeli=round((mc + 180.0) % 360.0, 4),
+                cusps=[round(c, 4) for c in cusps[i].tolist()],
+                houses=dict(zip(points, houses[i].tolist())),
+                positions=dict(zip(points, np.round(longitudes[i], 4).tolist())) if topocentric else None,
+            )
+        )
+    return RelocationResponse(
+        julian_day=jd,
+        positions=dict(zip(points, np.round(shared[0], 4).tolist())),
+        charts=charts,
+    )
+
+
+@router.post("/relocation", response_model=RelocationResponse, dependencies=[Depends(rate_limit("chart", weight=2))])
+async def relocation(payload: RelocationRequest, username: str = Depends(get_current_username)) -> RelocationResponse:
+    """
+    Angles, house cusps and house placements of one birth moment at many locations.
+
+    Meant for "best city" searches: planets are computed once instead of
+    building a full subject per candidate city. Requests with more than
+    `RELOCATION_LOCATIONS_PER_TOKEN` locations are charged one extra `chart`
+    token per further block of that size.
+    """
+    print("POST /relocation", {"birth": payload.birth.dict(), "locations": len(payload.locations)})
+    count = len(payload.locations)
+    if count > RELOCATION_MAX_LOCATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {RELOCATION_MAX_LOCATIONS} locations per request.",
+        )
+    extra_tokens = (count - 1) // RELOCATION_LOCATIONS_PER_TOKEN
+    if extra_tokens:
+        charge_rate_limit(username, "chart", extra_tokens)
+    cfg = ensure_config(payload.config)
+    return await run_in_threadpool(compute_relocation, payload, cfg)
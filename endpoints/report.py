@@ -1,15 +1,34 @@
-from fastapi import APIRouter, Response, Request
+import base64
 
+from fastapi import APIRouter, Depends, Request, Response
+
+from auth import get_current_username
+from cancellation import RequestCancelled, cancelled_response
+from coalesce import request_flights, request_key
+from ratelimit import charge_rate_limit, rate_limit
 from schemas import ReportRequest, ReportResponse
-from utils import generate_report_content, render_structured_report_pdf
+from utils import ensure_config, get_report_content, project_report, render_structured_report_pdf
 
 router = APIRouter(tags=["report"])
 
 
-@router.post("/report", response_model=ReportResponse)
-async def generate_report(payload: ReportRequest, request: Request) -> ReportResponse:
+@router.post("/report", response_model=ReportResponse, dependencies=[Depends(rate_limit("chart", weight=3))])
+async def generate_report(
+    payload: ReportRequest,
+    request: Request,
+    include_pdf: bool = False,
+    username: str = Depends(get_current_username),
+) -> ReportResponse:
     """
     Generate a rich report (structured data + Markdown text).
+
+    Reports are cached by request, so a following `/report/pdf` call for the
+    same payload skips the computation. With `include_pdf=true` the PDF is
+    rendered from the same structure and returned base64-encoded in `pdf_base64`.
+
+    `detail` (default `standard`) controls how much of `structured` is returned;
+    raw Kerykeion dumps are only included with `detail=full`. Identical
+    concurrent requests share one computation.
     """
     try:
         raw = await request.json()
@@ -26,14 +45,40 @@ async def generate_report(payload: ReportRequest, request: Request) -> ReportRes
             "raw_body": raw,
         },
     )
-    structured, text = generate_report_content(payload)
-    return ReportResponse(kind=payload.kind, text=text, structured=structured)
+    if include_pdf:
+        charge_rate_limit(username, "pdf")
+
+    def build_report(cancel_token) -> ReportResponse:
+        structured, text = get_report_content(payload, cancel_token=cancel_token)
+        pdf_base64 = None
+        if include_pdf:
+            pdf_bytes = render_structured_report_pdf(
+                structured,
+                filename_prefix=structured.get("mode", "report"),
+                cancel_token=cancel_token,
+            )
+            pdf_base64 = base64.b64encode(pdf_bytes).decode("ascii")
+        return ReportResponse(
+            kind=payload.kind,
+            text=text,
+            structured=project_report(structured, payload.detail),
+            pdf_base64=pdf_base64,
+        )
+
+    key = request_key("report", payload, ensure_config(payload.config), include_pdf=include_pdf)
+    try:
+        return await request_flights.run("report", key, request, build_report)
+    except RequestCancelled:
+        return cancelled_response("POST /report")
 
 
-@router.post("/report/pdf", response_class=Response)
+@router.post("/report/pdf", response_class=Response, dependencies=[Depends(rate_limit("pdf"))])
 async def generate_report_pdf(payload: ReportRequest, request: Request) -> Response:
     """
     Generate a PDF version of the structured report (no chart).
+
+    Renders from the cached report when `/report` was called with the same payload;
+    identical concurrent requests share one rendering.
     """
     mode = payload.mode or "natal"
     try:
@@ -51,8 +96,20 @@ async def generate_report_pdf(payload: ReportRequest, request: Request) -> Respo
             "raw_body": raw,
         },
     )
-    structured, _ = generate_report_content(payload)
-    mode = structured.get("mode", mode)
-    pdf_bytes = render_structured_report_pdf(structured, filename_prefix=mode)
+
+    def build_pdf(cancel_token) -> tuple[str, bytes]:
+        structured, _ = get_report_content(payload, cancel_token=cancel_token)
+        report_mode = structured.get("mode", mode)
+        return report_mode, render_structured_report_pdf(
+            structured,
+            filename_prefix=report_mode,
+            cancel_token=cancel_token,
+        )
+
+    key = request_key("report/pdf", payload, ensure_config(payload.config))
+    try:
+        mode, pdf_bytes = await request_flights.run("report/pdf", key, request, build_pdf)
+    except RequestCancelled:
+        return cancelled_response("POST /report/pdf")
     headers = {"Content-Disposition": f'attachment; filename="{mode}-report.pdf"'}
     return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
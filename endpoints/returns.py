@@ -0,0 +1,181 @@
+import os
+from datetime import timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from aspects.cross import PointPositions
+from aspects.ptolemaic import NormalAspect
+from aspects.timeline import find_aspect_windows
+from cache import TTLCache, canonical_hash
+from cancellation import CancelToken, RequestCancelled, cancelled_response, check_cancelled, run_cancellable
+from ephemeris import SWE_BODIES, body_positions, datetime_from_jd, grid_step_days, julian_day
+from projection import (
+    SubjectProjection,
+    dump_subject_with_patterns,
+    filter_aspects,
+    point_key,
+    projection_params,
+    resolve_projection,
+)
+from ratelimit import rate_limit
+from schemas import ChartConfig, NatalResponse, ReturnChart, ReturnRequest, ReturnResponse
+from utils import (
+    build_subject_for_moment,
+    cached_subject,
+    compute_normal_aspects,
+    ensure_config,
+    moment_to_birth,
+    resolve_range_bounds,
+)
+
+router = APIRouter(tags=["returns"])
+
+# Longest searchable period; a decade of lunar returns is ~134 charts.
+RETURNS_MAX_YEARS = float(os.getenv("RETURNS_MAX_YEARS", "10"))
+RETURN_CACHE_SIZE = int(os.getenv("RETURN_CACHE_SIZE", "256"))
+RETURN_CACHE_TTL_SECONDS = float(os.getenv("RETURN_CACHE_TTL_SECONDS", "3600"))
+
+# Results only depend on the request, so repeated (e.g. yearly) queries are served from memory.
+return_cache: TTLCache[ReturnResponse] = TTLCache(RETURN_CACHE_SIZE, RETURN_CACHE_TTL_SECONDS)
+
+# A return is an exact conjunction of the transiting body with its natal position. The
+# orb only has to exceed what the body covers in one grid step, so no crossing is skipped.
+_RETURN_ASPECT = NormalAspect("conjunction", 0.0, 10.0, "◎")
+
+
+def find_return_times(
+    body: str,
+    natal_longitude: float,
+    start_jd: float,
+    end_jd: float,
+    cfg: ChartConfig,
+    lng: float = 0.0,
+    lat: float = 0.0,
+) -> list[float]:
+    """Julian days (UT) at which `body` is exactly at `natal_longitude`, in time order."""
+
+    def positions(jds, name: str):
+        longitudes, speeds = body_positions(jds, [name], cfg, lng, lat)
+        return longitudes[:, 0], speeds[:, 0]
+
+    windows = find_aspect_windows(
+        positions,
+        [body],
+        {body: natal_longitude},
+        start_jd,
+        end_jd,
+        step_days={body: grid_step_days(body)},
+        aspects=(_RETURN_ASPECT,),
+        tolerance_days=1.0 / 86400.0,
+    )
+    return sorted(jd for window in windows for jd in window.exact)
+
+
+def compute_returns(
+    payload: ReturnRequest,
+    cfg: ChartConfig,
+    projection: Optional[SubjectProjection] = None,
+    cancel_token: Optional[CancelToken] = None,
+) -> ReturnResponse:
+    """
+    Solve for every return of `payload.body` in the period and cast a chart for each.
+    """
+    body = point_key(payload.body)
+    if body not in SWE_BODIES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unsupported body: {payload.body}. Supported: {', '.join(SWE_BODIES)}.",
+        )
+    _, start_dt, end_dt = resolve_range_bounds(payload)
+    if end_dt < start_dt:
+        raise HTTPException(status_code=400, detail="end must not be before moment.")
+    start_jd, end_jd = julian_day(start_dt), julian_day(end_dt)
+    if end_jd - start_jd > RETURNS_MAX_YEARS * 365.25:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Return searches are limited to {RETURNS_MAX_YEARS:g} years.",
+        )
+
+    natal_subject = cached_subject(payload.birth, cfg)
+    natal_positions = PointPositions.from_subjects([natal_subject], [body])
+    if not natal_positions.keys:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{payload.body} is not available in the natal chart.",
+        )
+    natal_longitude = float(natal_positions.longitudes[0, 0])
+
+    moment = payload.moment
+    check_cancelled(cancel_token)
+    return_jds = find_return_times(body, natal_longitude, start_jd, end_jd, cfg, moment.lng, moment.lat)
+
+    tz = ZoneInfo(moment.tz_str)
+    base = moment_to_birth(moment, name=f"{payload.body} return")
+    returns: list[ReturnChart] = []
+    for jd in return_jds:
+        timestamp = datetime_from_jd(jd, tz)
+        chart = None
+        if payload.include_chart:
+            check_cancelled(cancel_token)
+            # Subjects have minute resolution; cast for the nearest minute.
+            subject = build_subject_for_moment(base, timestamp + timedelta(seconds=30), cfg)
+            subject_dict, major_aspects = dump_subject_with_patterns(subject, cfg, projection)
+            chart = NatalResponse(
+                subject=subject_dict,
+                aspects=filter_aspects(compute_normal_aspects(subject), projection),
+                major_aspects=major_aspects,
+            )
+        returns.append(ReturnChart(timestamp=timestamp, chart=chart))
+
+    return ReturnResponse(body=body, natal_longitude=round(natal_longitude, 6), returns=returns)
+
+
+def cached_returns(
+    payload: ReturnRequest,
+    cfg: ChartConfig,
+    projection: Optional[SubjectProjection] = None,
+    cancel_token: Optional[CancelToken] = None,
+) -> ReturnResponse:
+    """`compute_returns` behind `return_cache`, keyed by the normalized request and projection."""
+    key = canonical_hash(
+        {
+            "request": payload.model_dump(mode="json", exclude={"config"}),
+            "config": cfg.model_dump(mode="json"),
+            "projection": None
+            if projection is None
+            else {
+                "points": sorted(projection.points) if projection.points is not None else None,
+                "fields": sorted(projection.fields) if projection.fields is not None else None,
+            },
+        }
+    )
+    cached = return_cache.get(key)
+    if cached is not None:
+        return cached
+    result = compute_returns(payload, cfg, projection, cancel_token=cancel_token)
+    return_cache.set(key, result)
+    return result
+
+
+@router.post("/returns", response_model=ReturnResponse, dependencies=[Depends(rate_limit("chart", weight=2))])
+async def planetary_returns(
+    payload: ReturnRequest,
+    request: Request,
+    projection: tuple = Depends(projection_params),
+) -> ReturnResponse:
+    """
+    Find solar, lunar or any planetary return within a period and cast its chart.
+
+    The exact return moments are solved on the ephemeris (no range scanning);
+    each return chart is built for the location of `moment`. `points` /
+    `fields` restrict the dumped return charts. Results are cached.
+    """
+    print("POST /returns", payload.dict(exclude_none=True))
+    cfg = ensure_config(payload.config)
+    subject_projection = resolve_projection(*projection, cfg)
+    try:
+        return await run_cancellable(request, cached_returns, payload, cfg, subject_projection)
+    except RequestCancelled:
+        return cancelled_response("POST /returns")
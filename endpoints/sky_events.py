@@ -0,0 +1,97 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from starlette.concurrency import run_in_threadpool
+
+from enums import SiderealMode, SkyEventKind, ZodiacType
+from ephemeris import datetime_from_jd, julian_day
+from ratelimit import rate_limit
+from schemas import SkyEvent, SkyEventsResponse
+from sky_events import (
+    INGRESS_BODIES,
+    SKY_EVENTS_MAX_ON_DEMAND_YEARS,
+    STATION_BODIES,
+    calendar_config,
+    sky_event_store,
+)
+
+router = APIRouter(tags=["sky"])
+
+_EVENT_BODIES = frozenset(INGRESS_BODIES + STATION_BODIES)
+
+
+def _csv(value: Optional[str]) -> Optional[list[str]]:
+    if value is None:
+        return None
+    return [part.strip().lower() for part in value.split(",") if part.strip()]
+
+
+@router.get("/sky-events", response_model=SkyEventsResponse, dependencies=[Depends(rate_limit("chart"))])
+async def sky_events(
+    start: date = Query(..., description="First day (inclusive) in `tz`.", examples=["2025-01-01"]),
+    end: date = Query(..., description="Last day (inclusive) in `tz`.", examples=["2025-12-31"]),
+    tz: str = Query("UTC", description="IANA timezone for day boundaries and returned timestamps."),
+    zodiac_type: ZodiacType = Query(ZodiacType.SIDEREAL, description="Zodiac of the calendar."),
+    sidereal_mode: SiderealMode = Query(SiderealMode.KRISHNAMURTI, description="Ayanamsa for sidereal calendars."),
+    kinds: Optional[str] = Query(None, description="Comma-separated kinds: ingress, station, lunation, eclipse."),
+    bodies: Optional[str] = Query(None, description="Comma-separated point keys, e.g. `mercury,venus`."),
+) -> SkyEventsResponse:
+    """
+    Sign ingresses, retrograde stations, new/full moons and eclipses in a date range.
+
+    Events are location-independent and served from the precomputed calendar
+    of the requested zodiac (an indexed range query). Years the batch job has
+    not built yet are computed and stored on demand, up to a small limit.
+    """
+    print("GET /sky-events", {"start": start, "end": end, "tz": tz, "zodiac_type": zodiac_type, "kinds": kinds})
+    try:
+        zone = ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Unknown timezone: {tz}.")
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start.")
+
+    kind_list = _csv(kinds)
+    valid_kinds = {k.value for k in SkyEventKind}
+    if kind_list is not None and not set(kind_list) <= valid_kinds:
+        unknown = ", ".join(sorted(set(kind_list) - valid_kinds))
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Unknown event kinds: {unknown}.")
+    body_list = _csv(bodies)
+    if body_list is not None and not set(body_list) <= _EVENT_BODIES:
+        unknown = ", ".join(sorted(set(body_list) - _EVENT_BODIES))
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Unknown event bodies: {unknown}.")
+
+    calendar, cfg = calendar_config(zodiac_type, sidereal_mode)
+    start_dt = datetime.combine(start, time(0, 0), tzinfo=zone)
+    end_dt = datetime.combine(end + timedelta(days=1), time(0, 0), tzinfo=zone)
+    years = range(start_dt.astimezone(timezone.utc).year, end_dt.astimezone(timezone.utc).year + 1)
+
+    try:
+        built = await run_in_threadpool(
+            sky_event_store.ensure_years, calendar, cfg, years, SKY_EVENTS_MAX_ON_DEMAND_YEARS
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc))
+    records = await run_in_threadpool(
+        sky_event_store.query, calendar, julian_day(start_dt), julian_day(end_dt), kind_list, body_list
+    )
+    return SkyEventsResponse(
+        calendar=calendar,
+        start=start_dt,
+        end=end_dt,
+        built_years=built,
+        events=[
+            SkyEvent(
+                timestamp=datetime_from_jd(r.jd, zone),
+                kind=r.kind,
+                body=r.body,
+                label=r.label,
+                sign=r.sign,
+                from_sign=r.from_sign,
+                longitude=r.longitude,
+            )
+            for r in records
+        ],
+    )
@@ -1,6 +1,13 @@
-from fastapi import APIRouter, Response
+from typing import Optional
 
+from fastapi import APIRouter, Depends, Request, Response
+
+from cancellation import CancelToken, RequestCancelled, cancelled_response, check_cancelled
+from coalesce import request_flights, request_key
+from ratelimit import rate_limit
+from render_pool import RenderError
 from schemas import (
+    ChartConfig,
     NatalRequest,
     TransitMomentRequest,
     SynastrySvgRequest,
@@ -15,21 +22,40 @@ from kerykeion.charts.chart_drawer import ChartDrawer  # type: ignore
 router = APIRouter(tags=["svg"])
 
 
-@router.post("/svg/natal", response_class=Response)
-async def natal_svg(payload: NatalRequest) -> Response:
-    print("POST /svg/natal", payload.dict(exclude_none=True))
-    cfg = ensure_config(payload.config)
+async def _coalesced_svg(endpoint: str, payload, cfg: ChartConfig, request: Request, func) -> Response:
+    """Serve an SVG endpoint, sharing the drawing between identical concurrent requests."""
+    key = request_key(endpoint, payload, cfg)
+    try:
+        svg = await request_flights.run(endpoint, key, request, func, payload, cfg)
+    except RequestCancelled:
+        return cancelled_response(f"POST /{endpoint}")
+    return Response(content=svg, media_type="image/svg+xml")
+
+
+def natal_svg_text(
+    payload: NatalRequest,
+    cfg: ChartConfig,
+    cancel_token: Optional[CancelToken] = None,
+) -> str:
     subject = build_subject(payload.birth, cfg)
     chart_data = ChartDataFactory.create_natal_chart_data(subject, active_points=cfg.active_points)
     drawer = ChartDrawer(chart_data=chart_data, theme=cfg.theme.value)
-    svg = render_svg_to_string(drawer, filename_prefix="natal")
-    return Response(content=svg, media_type="image/svg+xml")
+    check_cancelled(cancel_token)
+    return render_svg_to_string(drawer, filename_prefix="natal")
 
 
-@router.post("/svg/transit", response_class=Response)
-async def transit_svg(payload: TransitMomentRequest) -> Response:
-    print("POST /svg/transit", payload.dict(exclude_none=True))
+@router.post("/svg/natal", response_class=Response, dependencies=[Depends(rate_limit("chart", weight=2))])
+async def natal_svg(payload: NatalRequest, request: Request) -> Response:
+    print("POST /svg/natal", payload.dict(exclude_none=True))
     cfg = ensure_config(payload.config)
+    return await _coalesced_svg("svg/natal", payload, cfg, request, natal_svg_text)
+
+
+def transit_svg_text(
+    payload: TransitMomentRequest,
+    cfg: ChartConfig,
+    cancel_token: Optional[CancelToken] = None,
+) -> str:
     m = payload.moment
     moment_birth = BirthData(
         name="Transit",
@@ -60,14 +86,22 @@ async def transit_svg(payload: TransitMomentRequest) -> Response:
         drawer = ChartDrawer(chart_data=chart_data, theme=cfg.theme.value)
         filename_prefix = "transit"
 
-    svg = render_svg_to_string(drawer, filename_prefix=filename_prefix)
-    return Response(content=svg, media_type="image/svg+xml")
+    check_cancelled(cancel_token)
+    return render_svg_to_string(drawer, filename_prefix=filename_prefix)
 
 
-@router.post("/svg/synastry", response_class=Response)
-async def synastry_svg(payload: SynastrySvgRequest) -> Response:
-    print("POST /svg/synastry", payload.dict(exclude_none=True))
+@router.post("/svg/transit", response_class=Response, dependencies=[Depends(rate_limit("chart", weight=2))])
+async def transit_svg(payload: TransitMomentRequest, request: Request) -> Response:
+    print("POST /svg/transit", payload.dict(exclude_none=True))
     cfg = ensure_config(payload.config)
+    return await _coalesced_svg("svg/transit", payload, cfg, request, transit_svg_text)
+
+
+def synastry_svg_text(
+    payload: SynastrySvgRequest,
+    cfg: ChartConfig,
+    cancel_token: Optional[CancelToken] = None,
+) -> str:
     first_subject = build_subject(payload.first, cfg)
     second_subject = build_subject(payload.second, cfg)
 
@@ -88,18 +122,28 @@ async def synastry_svg(payload: SynastrySvgRequest) -> Response:
         drawer = ChartDrawer(chart_data=chart_data, theme=cfg.theme.value)
         filename_prefix = "synastry"
 
-    svg = render_svg_to_string(drawer, filename_prefix=filename_prefix)
-    return Response(content=svg, media_type="image/svg+xml")
+    check_cancelled(cancel_token)
+    return render_svg_to_string(drawer, filename_prefix=filename_prefix)
 
 
-@router.post("/svg/pdf", response_class=Response)
-async def svg_pdf(payload: SvgPdfRequest) -> Response:
-    """
-    Generate a PDF from chart data for natal, transit (single or dual), or relationship (synastry).
-    """
-    print("POST /svg/pdf", payload.dict(exclude_none=True))
+@router.post("/svg/synastry", response_class=Response, dependencies=[Depends(rate_limit("chart", weight=2))])
+async def synastry_svg(payload: SynastrySvgRequest, request: Request) -> Response:
+    print("POST /svg/synastry", payload.dict(exclude_none=True))
     cfg = ensure_config(payload.config)
+    return await _coalesced_svg("svg/synastry", payload, cfg, request, synastry_svg_text)
 
+
+def render_chart_pdf(
+    payload: SvgPdfRequest,
+    cfg: ChartConfig,
+    cancel_token: Optional[CancelToken] = None,
+) -> Response:
+    """
+    Build the chart SVG for the requested mode and render it to a PDF response.
+
+    `cancel_token` is checked once the subjects are built, after the SVG is
+    drawn and throughout the PDF renderer fallback chain.
+    """
     mode = payload.mode
     svg_text = ""
 
@@ -109,6 +153,7 @@ async def svg_pdf(payload: SvgPdfRequest) -> Response:
         subject = build_subject(payload.birth, cfg)
         chart_data = ChartDataFactory.create_natal_chart_data(subject)
         drawer = ChartDrawer(chart_data=chart_data, theme=cfg.theme.value)
+        check_cancelled(cancel_token)
         svg_text = render_svg_to_string(drawer, filename_prefix="natal")
     elif mode == "transit":
         if not payload.moment:
@@ -140,6 +185,7 @@ async def svg_pdf(payload: SvgPdfRequest) -> Response:
             chart_data = ChartDataFactory.create_natal_chart_data(transit_subject, active_points=cfg.active_points)
             filename_prefix = "transit"
         drawer = ChartDrawer(chart_data=chart_data, theme=cfg.theme.value)
+        check_cancelled(cancel_token)
         svg_text = render_svg_to_string(drawer, filename_prefix=filename_prefix)
     elif mode == "relationship":
         if not (payload.first and payload.second):
@@ -156,6 +202,7 @@ async def svg_pdf(payload: SvgPdfRequest) -> Response:
             theme=cfg.theme.value,
         )
         filename_prefix = "relationship"
+        check_cancelled(cancel_token)
         svg_text = render_svg_to_string(drawer, filename_prefix=filename_prefix)
     else:  # natal_transit dual wheel
         if not (payload.birth and payload.moment):
@@ -182,8 +229,32 @@ async def svg_pdf(payload: SvgPdfRequest) -> Response:
         )
         drawer = ChartDrawer(chart_data=chart_data, theme=cfg.theme.value)
         filename_prefix = "dual"
+        check_cancelled(cancel_token)
         svg_text = render_svg_to_string(drawer, filename_prefix=filename_prefix)
 
-    pdf_bytes = render_pdf_from_svg(svg_text, filename_prefix=mode)
+    check_cancelled(cancel_token)
+    pdf_bytes = render_pdf_from_svg(svg_text, filename_prefix=mode, cancel_token=cancel_token)
     headers = {"Content-Disposition": f'attachment; filename="{mode}-chart.pdf"'}
     return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
+
+
+@router.post("/svg/pdf", response_class=Response, dependencies=[Depends(rate_limit("pdf"))])
+async def svg_pdf(payload: SvgPdfRequest, request: Request) -> Response:
+    """
+    Generate a PDF from chart data for natal, transit (single or dual), or relationship (synastry).
+
+    Rendering runs off the event loop and is abandoned if the client disconnects
+    (and no identical request is waiting for the same PDF). Rasterization happens
+    in the isolated render pool; a job that exceeds its time or memory limit
+    answers 503.
+    """
+    print("POST /svg/pdf", payload.dict(exclude_none=True))
+    cfg = ensure_config(payload.config)
+    key = request_key("svg/pdf", payload, cfg)
+    try:
+        return await request_flights.run("svg/pdf", key, request, render_chart_pdf, payload, cfg)
+    except RequestCancelled:
+        return cancelled_response("POST /svg/pdf")
+    except RenderError as exc:
+        print("POST /svg/pdf render failed", str(exc))
+        return Response(status_code=503, content=str(exc))
@@ -1,6 +1,21 @@
-from fastapi import APIRouter
+from typing import Optional
 
+from fastapi import APIRouter, Depends, Request
+
+from cancellation import CancelToken, RequestCancelled, cancelled_response, check_cancelled
+from coalesce import request_flights, request_key
+from current_sky import transit_subject_with_patterns
+from projection import (
+    SubjectProjection,
+    cross_chart_patterns,
+    dump_subject_with_patterns,
+    filter_aspects,
+    projection_params,
+    resolve_projection,
+)
+from ratelimit import rate_limit
 from schemas import (
+    ChartConfig,
     TransitMomentRequest,
     TransitResponse,
     TransitSnapshot,
@@ -8,7 +23,6 @@ from schemas import (
 )
 from utils import (
     build_subject,
-    compute_major_aspects,
     compute_normal_aspects,
     ensure_config,
     to_local_datetime,
@@ -17,21 +31,13 @@ from utils import (
 router = APIRouter(tags=["transit"])
 
 
-@router.post("/transit", response_model=TransitResponse)
-async def transit_snapshot(payload: TransitMomentRequest) -> TransitResponse:
-    """
-    Compute a transit snapshot for a given moment.
-
-    The request does not require a `name` for the transit moment; instead,
-    the server assigns an internal label ("Transit") when constructing the
-    underlying Kerykeion subject.
-
-    When `birth` is provided, the corresponding natal chart is evaluated using
-    the same configuration and returned as `natal_subject`.
-    """
-    print("POST /transit", payload.dict(exclude_none=True))
-    cfg = ensure_config(payload.config)
-
+def compute_transit(
+    payload: TransitMomentRequest,
+    cfg: ChartConfig,
+    projection: Optional[SubjectProjection] = None,
+    cancel_token: Optional[CancelToken] = None,
+) -> TransitResponse:
+    """Build the transit (and optional natal) subject and dump them as one snapshot."""
     # Convert transit moment input (no name) into a BirthData-like structure.
     m = payload.moment
     moment_birth = BirthData(
@@ -48,19 +54,26 @@ async def transit_snapshot(payload: TransitMomentRequest) -> TransitResponse:
         nation=m.nation,
     )
 
-    transit_subject = build_subject(moment_birth, cfg)
-    transit_dict = transit_subject.model_dump(mode="json")
-    transit_aspects = compute_normal_aspects(transit_subject)
-    transit_major_aspects = compute_major_aspects(transit_dict, active_points=cfg.active_points)
+    # Near-now moments reuse the shared minute sky and only compute houses / angles here.
+    sky = transit_subject_with_patterns(moment_birth, cfg, projection)
+    if sky is not None:
+        transit_subject, transit_dict, transit_major_aspects = sky
+    else:
+        transit_subject = build_subject(moment_birth, cfg)
+        check_cancelled(cancel_token)
+        transit_dict, transit_major_aspects = dump_subject_with_patterns(transit_subject, cfg, projection)
+    transit_aspects = filter_aspects(compute_normal_aspects(transit_subject), projection)
 
     natal_dict = None
     natal_aspects = None
     natal_major_aspects = None
+    cross_major_aspects = None
     if payload.birth is not None:
+        check_cancelled(cancel_token)
         natal_subject = build_subject(payload.birth, cfg)
-        natal_dict = natal_subject.model_dump(mode="json")
-        natal_aspects = compute_normal_aspects(natal_subject)
-        natal_major_aspects = compute_major_aspects(natal_dict, active_points=cfg.active_points)
+        natal_dict, natal_major_aspects = dump_subject_with_patterns(natal_subject, cfg, projection)
+        natal_aspects = filter_aspects(compute_normal_aspects(natal_subject), projection)
+        cross_major_aspects = cross_chart_patterns({"natal": natal_subject, "transit": transit_subject}, cfg)
 
     timestamp = to_local_datetime(moment_birth)
 
@@ -72,5 +85,36 @@ async def transit_snapshot(payload: TransitMomentRequest) -> TransitResponse:
         natal_subject=natal_dict,
         natal_aspects=natal_aspects,
         natal_major_aspects=natal_major_aspects,
+        cross_major_aspects=cross_major_aspects,
     )
     return TransitResponse(snapshot=snapshot)
+
+
+@router.post("/transit", response_model=TransitResponse, dependencies=[Depends(rate_limit("chart"))])
+async def transit_snapshot(
+    payload: TransitMomentRequest,
+    request: Request,
+    projection: tuple = Depends(projection_params),
+) -> TransitResponse:
+    """
+    Compute a transit snapshot for a given moment.
+
+    The request does not require a `name` for the transit moment; instead,
+    the server assigns an internal label ("Transit") when constructing the
+    underlying Kerykeion subject.
+
+    When `birth` is provided, the corresponding natal chart is evaluated using
+    the same configuration and returned as `natal_subject`, together with the
+    Ptolemaic patterns formed jointly by natal and transit points.
+
+    `points` / `fields` restrict the dumped points of both subjects. Identical
+    concurrent requests (e.g. a widely shared moment) share one computation.
+    """
+    print("POST /transit", payload.dict(exclude_none=True))
+    cfg = ensure_config(payload.config)
+    subject_projection = resolve_projection(*projection, cfg)
+    key = request_key("transit", payload, cfg, projection=projection)
+    try:
+        return await request_flights.run("transit", key, request, compute_transit, payload, cfg, subject_projection)
+    except RequestCancelled:
+        return cancelled_response("POST /transit")
@@ -1,8 +1,36 @@
-from typing import List
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
+from admission import admit_range_request, estimate_range_cost, range_jobs, submit_range_job
+from aspects.cross import PointPositions, compute_cross_aspects
+from aspects.lifecycle import PatternTracker
+from auth import get_current_username
+from cancellation import CancelToken, RequestCancelled, cancelled_response, check_cancelled, run_cancellable
+from enums import RangeOutput
+from projection import (
+    SubjectProjection,
+    active_point_keys,
+    cross_chart_patterns,
+    dump_subject_with_patterns,
+    filter_aspects,
+    projection_params,
+    resolve_projection,
+    subject_patterns,
+)
+from ranges import iter_range_steps
+from ratelimit import rate_limit
 from schemas import (
+    ChartConfig,
+    RangeCostEstimate,
+    PatternLifecycle,
+    RangeJobStatus,
     TransitRangeRequest,
     TransitRangeResponse,
     TransitSnapshot,
@@ -10,97 +38,426 @@ from schemas import (
 )
 from utils import (
     ensure_config,
-    build_subject,
     build_subject_for_moment,
-    compute_major_aspects,
+    cached_subject,
     compute_normal_aspects,
-    to_local_datetime,
-    iter_range_datetimes,
+    resolve_range_bounds,
 )
 
 router = APIRouter(tags=["transit"])
 
+# Range steps whose transit-to-natal aspects are computed in one vectorized pass.
+RANGE_CROSS_ASPECT_BATCH = int(os.getenv("RANGE_CROSS_ASPECT_BATCH", "500"))
+
+
+@dataclass(frozen=True)
+class NatalContext:
+    """
+    Time-independent natal data shared by every snapshot in a range.
+
+    `fields` are copied into each `TransitSnapshot`; `positions` holds the
+    natal longitudes the transit-to-natal aspects are measured against and
+    `subject` the natal subject for transit-to-natal patterns.
+    """
+
+    fields: dict
+    positions: Optional[PointPositions] = None
+    subject: Optional[object] = None
+
+
+def cross_aspect_points(cfg: ChartConfig, projection: Optional[SubjectProjection] = None) -> list[str]:
+    """
+    Point keys compared in transit-to-natal aspects: the active points, narrowed by `points` when given.
+    """
+    keys = active_point_keys(cfg)
+    if projection is not None and projection.points is not None:
+        keys &= projection.points
+    return sorted(keys)
+
 
-@router.post("/transit-range", response_model=TransitRangeResponse)
-async def transit_range(payload: TransitRangeRequest) -> TransitRangeResponse:
+def build_natal_context(
+    birth: Optional[BirthData],
+    cfg: ChartConfig,
+    projection: Optional[SubjectProjection] = None,
+) -> NatalContext:
+    """
+    Compute the (time-independent) natal fields shared by every snapshot in a range.
+    """
+    if birth is None:
+        return NatalContext(fields={"natal_subject": None, "natal_aspects": None, "natal_major_aspects": None})
+    natal_subject = cached_subject(birth, cfg)
+    natal_dict, natal_major_aspects = dump_subject_with_patterns(natal_subject, cfg, projection)
+    return NatalContext(
+        fields={
+            "natal_subject": natal_dict,
+            "natal_aspects": filter_aspects(compute_normal_aspects(natal_subject), projection),
+            "natal_major_aspects": natal_major_aspects,
+        },
+        positions=PointPositions.from_subjects([natal_subject], cross_aspect_points(cfg, projection)),
+        subject=natal_subject,
+    )
+
+
+def attach_cross_aspects(
+    snapshots: List[TransitSnapshot],
+    moment_subjects: list,
+    natal_context: NatalContext,
+) -> None:
+    """
+    Fill `cross_aspects` of consecutive snapshots with one vectorized pass against the natal longitudes.
+    """
+    if natal_context.positions is None or not snapshots:
+        return
+    transit_positions = PointPositions.from_subjects(moment_subjects, natal_context.positions.keys)
+    rows = compute_cross_aspects(transit_positions, natal_context.positions)
+    for snapshot, cross_aspects in zip(snapshots, rows):
+        snapshot.cross_aspects = cross_aspects
+
+
+def build_range_snapshot(
+    start_birth: BirthData,
+    dt: datetime,
+    cfg: ChartConfig,
+    natal_context: NatalContext,
+    projection: Optional[SubjectProjection] = None,
+    moment_subject=None,
+    with_cross_aspects: bool = True,
+) -> TransitSnapshot:
+    """
+    Build a single transit snapshot for one step of a range.
+
+    With a natal chart the snapshot also carries the transit-to-natal aspects,
+    computed with the vectorized kernel against the cached natal longitudes;
+    pass `with_cross_aspects=False` to fill them later for a whole batch with
+    `attach_cross_aspects`. Pass `moment_subject` when the step's subject has
+    already been built.
+    """
+    if moment_subject is None:
+        moment_subject = build_subject_for_moment(start_birth, dt, cfg)
+    moment_dict, major_aspects = dump_subject_with_patterns(moment_subject, cfg, projection)
+    snapshot = TransitSnapshot(
+        timestamp=dt,
+        subject=moment_dict,
+        aspects=filter_aspects(compute_normal_aspects(moment_subject), projection),
+        major_aspects=major_aspects,
+        **natal_context.fields,
+    )
+    if with_cross_aspects:
+        attach_cross_aspects([snapshot], [moment_subject], natal_context)
+    return snapshot
+
+
+def range_step_patterns(
+    moment_subject,
+    cfg: ChartConfig,
+    natal_context: NatalContext,
+    major_aspects: Optional[list[dict]] = None,
+) -> list[dict]:
+    """
+    Patterns tracked for one range step: the transit chart's own (`major_aspects`
+    when already computed) plus, with a natal chart, those spanning both charts.
+    """
+    patterns = list(major_aspects) if major_aspects is not None else subject_patterns(moment_subject, cfg)
+    if natal_context.subject is not None:
+        patterns += cross_chart_patterns({"natal": natal_context.subject, "transit": moment_subject}, cfg)
+    return patterns
+
+
+def build_range_step(
+    start_birth: BirthData,
+    dt: datetime,
+    cfg: ChartConfig,
+    natal_context: NatalContext,
+    projection: Optional[SubjectProjection] = None,
+    tracker: Optional[PatternTracker] = None,
+    with_snapshot: bool = True,
+    with_cross_aspects: bool = True,
+) -> tuple[object, Optional[TransitSnapshot]]:
+    """
+    Build one range step: its transit subject and, `with_snapshot`, its snapshot.
+
+    The step's patterns are fed to `tracker` when given.
+    """
+    moment_subject = build_subject_for_moment(start_birth, dt, cfg)
+    snapshot = None
+    major_aspects = None
+    if with_snapshot:
+        snapshot = build_range_snapshot(
+            start_birth,
+            dt,
+            cfg,
+            natal_context,
+            projection,
+            moment_subject=moment_subject,
+            with_cross_aspects=with_cross_aspects,
+        )
+        major_aspects = [p.model_dump() for p in snapshot.major_aspects]
+    if tracker is not None:
+        tracker.observe(dt, range_step_patterns(moment_subject, cfg, natal_context, major_aspects))
+    return moment_subject, snapshot
+
+
+def pattern_lifecycles(tracker: PatternTracker) -> List[PatternLifecycle]:
+    """The tracker's pattern occurrences as response models, in order of formation."""
+    return [PatternLifecycle.model_validate(span, from_attributes=True) for span in tracker.spans]
+
+
+def compute_range(
+    payload: TransitRangeRequest,
+    cfg: ChartConfig,
+    projection: Optional[SubjectProjection] = None,
+    cancel_token: Optional[CancelToken] = None,
+) -> TransitRangeResponse:
+    """
+    Compute a range in the requested output mode, checking `cancel_token` between steps.
+
+    Pattern lifecycles are tracked incrementally as the steps are built; with
+    `output=patterns` no snapshot (subject dump, Kerykeion aspects) is built at all.
+    Transit-to-natal aspects are computed per batch of `RANGE_CROSS_ASPECT_BATCH`
+    steps in a single vectorized call.
+    """
+    start_birth, start_dt, end_dt = resolve_range_bounds(payload)
+    with_snapshots = payload.output != RangeOutput.PATTERNS
+    tracker = PatternTracker() if payload.output != RangeOutput.SNAPSHOTS else None
+
+    # Natal chart is time-independent; compute it once and reuse.
+    natal_context = build_natal_context(payload.birth, cfg, projection)
+
+    snapshots: List[TransitSnapshot] = []
+    # Transit subjects of the snapshots still waiting for their cross aspects.
+    pending_subjects: list = []
+    for step in iter_range_steps(start_dt, end_dt, payload.granularity, payload.step_minutes):
+        check_cancelled(cancel_token)
+        moment_subject, snapshot = build_range_step(
+            start_birth,
+            step.local,
+            cfg,
+            natal_context,
+            projection,
+            tracker,
+            with_snapshot=with_snapshots,
+            with_cross_aspects=False,
+        )
+        if snapshot is None:
+            continue
+        snapshots.append(snapshot)
+        if natal_context.positions is not None:
+            pending_subjects.append(moment_subject)
+            if len(pending_subjects) >= RANGE_CROSS_ASPECT_BATCH:
+                attach_cross_aspects(snapshots[-len(pending_subjects) :], pending_subjects, natal_context)
+                pending_subjects = []
+    if pending_subjects:
+        attach_cross_aspects(snapshots[-len(pending_subjects) :], pending_subjects, natal_context)
+
+    patterns = pattern_lifecycles(tracker) if tracker is not None else None
+    return TransitRangeResponse(snapshots=snapshots, patterns=patterns)
+
+
+def summarize_snapshot_changes(
+    previous: TransitSnapshot,
+    current: TransitSnapshot,
+    active_points: list[str],
+) -> dict:
+    """
+    Describe what changed between two consecutive snapshots.
+
+    Reports sign, house and retrograde changes for the active points plus
+    Ptolemaic patterns that formed or dissolved since the previous step.
+    """
+    changes: list[dict] = []
+    for code in active_points:
+        key = code.lower()
+        before = previous.subject.get(key)
+        after = current.subject.get(key)
+        if not isinstance(before, dict) or not isinstance(after, dict):
+            continue
+        for field in ("sign", "house", "retrograde"):
+            if before.get(field) != after.get(field):
+                changes.append({"point": key, "field": field, "from": before.get(field), "to": after.get(field)})
+
+    def pattern_keys(snapshot: TransitSnapshot) -> set[tuple[str, tuple[str, ...]]]:
+        return {(p.id, tuple(p.points)) for p in snapshot.major_aspects}
+
+    before_patterns = pattern_keys(previous)
+    after_patterns = pattern_keys(current)
+    return {
+        "timestamp": current.timestamp.isoformat(),
+        "changes": changes,
+        "patterns_formed": [{"id": pid, "points": list(pts)} for pid, pts in sorted(after_patterns - before_patterns)],
+        "patterns_dissolved": [{"id": pid, "points": list(pts)} for pid, pts in sorted(before_patterns - after_patterns)],
+    }
+
+
+def _sse_event(event: str, data: str) -> str:
+    """Format a single Server-Sent Events frame; `data` must already be JSON."""
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+@router.post(
+    "/transit-range/estimate",
+    response_model=RangeCostEstimate,
+    dependencies=[Depends(rate_limit("light", limit_concurrency=False))],
+)
+async def transit_range_estimate(payload: TransitRangeRequest) -> RangeCostEstimate:
+    """
+    Estimate snapshot count, CPU time, memory and response size of a range without running it.
+    """
+    return estimate_range_cost(payload)
+
+
+@router.post(
+    "/transit-range",
+    response_model=TransitRangeResponse,
+    responses={202: {"model": RangeJobStatus, "description": "Range accepted as a background job."}},
+    dependencies=[Depends(rate_limit("range"))],
+)
+async def transit_range(
+    payload: TransitRangeRequest,
+    request: Request,
+    allow_async: bool = True,
+    username: str = Depends(get_current_username),
+    projection: tuple = Depends(projection_params),
+) -> TransitRangeResponse:
     """
     Compute a sequence of transit snapshots between two moments.
 
     The input uses a single transit-style `moment` (date/time/location) plus an
     `end` date/time. Location (lat, lng, tz, city, nation) from `moment` is
     reused across the entire range.
+
+    The range is computed off the event loop and abandoned as soon as the
+    client disconnects.
+
+    Requests are admitted against a cost estimate: ranges above the sync limit
+    become background jobs (202 + job status, poll `/transit-range/jobs/{id}`)
+    unless `allow_async=false`, oversized ranges are rejected with 413 and
+    users over their budget get 429 with `Retry-After`.
+
+    `output=patterns` returns each Ptolemaic pattern once with its formation,
+    dissolution and tightest step instead of per-snapshot pattern lists.
+
+    `points` / `fields` restrict the dumped points of every snapshot.
     """
     print("POST /transit-range", payload.dict(exclude_none=True))
     cfg = ensure_config(payload.config)
+    subject_projection = resolve_projection(*projection, cfg)
+    estimate, run_async = admit_range_request(payload, username, allow_async=allow_async)
+    if run_async:
+        job = submit_range_job(username, estimate, compute_range, payload, cfg, subject_projection)
+        return JSONResponse(
+            status_code=202,
+            content=job.to_status().model_dump(mode="json"),
+            headers={"Location": f"{request.url.path}/jobs/{job.id}"},
+        )
+    try:
+        return await run_cancellable(request, compute_range, payload, cfg, subject_projection)
+    except RequestCancelled:
+        return cancelled_response("POST /transit-range")
 
-    # Build BirthData representations for the start and end timestamps.
-    m = payload.moment
-    start_birth = BirthData(
-        name="Transit start",
-        year=m.year,
-        month=m.month,
-        day=m.day,
-        hour=m.hour,
-        minute=m.minute,
-        lng=m.lng,
-        lat=m.lat,
-        tz_str=m.tz_str,
-        city=m.city,
-        nation=m.nation,
-    )
 
-    e = payload.end
-    end_birth = BirthData(
-        name="Transit end",
-        year=e.year,
-        month=e.month,
-        day=e.day,
-        hour=e.hour,
-        minute=e.minute,
-        lng=m.lng,
-        lat=m.lat,
-        tz_str=m.tz_str,
-        city=m.city,
-        nation=m.nation,
-    )
+@router.post(
+    "/transit-range/stream",
+    response_class=StreamingResponse,
+    dependencies=[Depends(rate_limit("range"))],
+)
+async def transit_range_stream(
+    payload: TransitRangeRequest,
+    request: Request,
+    changes_only: bool = False,
+    username: str = Depends(get_current_username),
+    projection: tuple = Depends(projection_params),
+) -> StreamingResponse:
+    """
+    Stream transit range snapshots as Server-Sent Events.
 
-    start_dt = to_local_datetime(start_birth)
-    end_dt = to_local_datetime(end_birth)
+    Emits a `start` event with the total step count, one `snapshot` event per
+    step (or, with `changes_only=true`, the first full snapshot followed by
+    `changes` events), periodic `progress` events and a final `done` event.
+    `output=patterns` sends no snapshots; with `patterns` or `both` the pattern
+    lifecycles arrive in a `patterns` event before `done`. `changes_only`
+    needs snapshots, so it is rejected with 422 for `output=patterns`.
+    Computation stops as soon as the client disconnects.
 
-    snapshots: List[TransitSnapshot] = []
-    natal_dict_cached = None
-    natal_aspects_cached = None
-    natal_major_aspects_cached = None
+    Streams are admitted like `/transit-range` but never downgraded to a
+    background job, since results already arrive incrementally.
+    """
+    print("POST /transit-range/stream", payload.dict(exclude_none=True))
+    with_snapshots = payload.output != RangeOutput.PATTERNS
+    if changes_only and not with_snapshots:
+        raise HTTPException(status_code=422, detail="changes_only needs snapshots; use output=snapshots or both.")
+    cfg = ensure_config(payload.config)
+    subject_projection = resolve_projection(*projection, cfg)
+    estimate, _ = admit_range_request(payload, username, buffered=False)
+    start_birth, start_dt, end_dt = resolve_range_bounds(payload)
+    total = estimate.snapshots
+    # Roughly one progress event per percent (every step for short ranges).
+    progress_every = max(1, total // 100)
 
-    for dt in iter_range_datetimes(start_dt, end_dt, payload.granularity):
-        moment_subject = build_subject_for_moment(start_birth, dt, cfg)
-        moment_dict = moment_subject.model_dump(mode="json")
-        moment_aspects = compute_normal_aspects(moment_subject)
-        moment_major_aspects = compute_major_aspects(moment_dict, active_points=cfg.active_points)
-
-        natal_dict = None
-        natal_aspects = None
-        natal_major_aspects = None
-        if payload.birth is not None:
-            # Natal chart is time-independent; compute it once and reuse.
-            if natal_dict_cached is None:
-                natal_subject = build_subject(payload.birth, cfg)
-                natal_dict_cached = natal_subject.model_dump(mode="json")
-                natal_aspects_cached = compute_normal_aspects(natal_subject)
-                natal_major_aspects_cached = compute_major_aspects(natal_dict_cached, active_points=cfg.active_points)
-            natal_dict = natal_dict_cached
-            natal_aspects = natal_aspects_cached
-            natal_major_aspects = natal_major_aspects_cached
-
-        snapshot = TransitSnapshot(
-            timestamp=dt,
-            subject=moment_dict,
-            aspects=moment_aspects,
-            major_aspects=moment_major_aspects,
-            natal_subject=natal_dict,
-            natal_aspects=natal_aspects,
-            natal_major_aspects=natal_major_aspects,
-        )
-        snapshots.append(snapshot)
+    async def event_stream() -> AsyncIterator[str]:
+        yield _sse_event("start", json.dumps({"total": total, "granularity": payload.granularity.value}))
+        natal_context = await run_in_threadpool(build_natal_context, payload.birth, cfg, subject_projection)
+        tracker = PatternTracker() if payload.output != RangeOutput.SNAPSHOTS else None
+
+        previous: Optional[TransitSnapshot] = None
+        completed = 0
+        for step in iter_range_steps(start_dt, end_dt, payload.granularity, payload.step_minutes):
+            if await request.is_disconnected():
+                print("POST /transit-range/stream cancelled", {"completed": completed, "total": total})
+                return
+            _, snapshot = await run_in_threadpool(
+                build_range_step,
+                start_birth,
+                step.local,
+                cfg,
+                natal_context,
+                subject_projection,
+                tracker,
+                with_snapshot=with_snapshots,
+            )
+            if changes_only and previous is not None:
+                summary = summarize_snapshot_changes(previous, snapshot, cfg.active_points)
+                yield _sse_event("changes", json.dumps(summary))
+            elif snapshot is not None:
+                yield _sse_event("snapshot", snapshot.model_dump_json())
+            previous = snapshot
+            completed += 1
+            if completed % progress_every == 0 or completed == total:
+                progress = {
+                    "completed": completed,
+                    "total": total,
+                    "percent": round(100.0 * completed / total, 1),
+                    "timestamp": step.local.isoformat(),
+                }
+                yield _sse_event("progress", json.dumps(progress))
 
-    return TransitRangeResponse(snapshots=snapshots)
+        if tracker is not None:
+            patterns = [lifecycle.model_dump(mode="json") for lifecycle in pattern_lifecycles(tracker)]
+            yield _sse_event("patterns", json.dumps({"patterns": patterns}))
+        yield _sse_event("done", json.dumps({"completed": completed, "total": total}))
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=headers)
+
+
+@router.get(
+    "/transit-range/jobs/{job_id}",
+    response_model=RangeJobStatus,
+    dependencies=[Depends(rate_limit("light", limit_concurrency=False))],
+)
+async def transit_range_job(job_id: str, username: str = Depends(get_current_username)) -> RangeJobStatus:
+    """
+    Poll a background transit range; `result` is filled once the job has succeeded.
+    """
+    return range_jobs.get(username, job_id).to_status()
+
+
+@router.delete(
+    "/transit-range/jobs/{job_id}",
+    response_model=RangeJobStatus,
+    dependencies=[Depends(rate_limit("light", limit_concurrency=False))],
+)
+async def cancel_transit_range_job(job_id: str, username: str = Depends(get_current_username)) -> RangeJobStatus:
+    """
+    Cancel a queued or running background transit range.
+    """
+    return range_jobs.cancel(username, job_id).to_status()
@@ -61,7 +61,59 @@ class RangeGranularity(str, Enum):
     MINUTE = "minute"
     HOUR = "hour"
     DAY = "day"
+    WEEK = "week"
     MONTH = "month"
+    CUSTOM = "custom"
+
+
+class RangeOutput(str, Enum):
+    """What a transit range returns: full snapshots, pattern lifecycles, or both."""
+    SNAPSHOTS = "snapshots"
+    PATTERNS = "patterns"
+    BOTH = "both"
+
+
+class JobStatus(str, Enum):
+    """Lifecycle state of a background (async) computation."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    EXPIRED = "expired"
+
+
+class SkyEventKind(str, Enum):
+    """Kinds of location-independent events in the sky-event calendar."""
+    INGRESS = "ingress"
+    STATION = "station"
+    LUNATION = "lunation"
+    ECLIPSE = "eclipse"
+
+
+class ProgressionMethod(str, Enum):
+    """How natal positions are moved forward for /progressions and /solar-arc."""
+    SECONDARY = "secondary"
+    SOLAR_ARC = "solar_arc"
+
+
+class AngleLine(str, Enum):
+    """Angle a planet occupies along an astrocartography line."""
+    ASC = "ASC"
+    DSC = "DSC"
+    MC = "MC"
+    IC = "IC"
+
+
+class PatternAspect(str, Enum):
+    """Aspects a Ptolemaic pattern edge can require; keys of `ChartConfig.pattern_orbs`."""
+    CONJUNCTION = "conjunction"
+    SEXTILE = "sextile"
+    SQUARE = "square"
+    TRINE = "trine"
+    OPPOSITION = "opposition"
+    SESQUIQUADRATE = "sesquiquadrate"
+    QUINCUNX = "quincunx"
 
 
 class ReportKind(str, Enum):
@@ -70,6 +122,13 @@ class ReportKind(str, Enum):
     NATAL = "NATAL"
 
 
+class ReportDetail(str, Enum):
+    """How much of the structured report to return."""
+    SUMMARY = "summary"
+    STANDARD = "standard"
+    FULL = "full"
+
+
 class Theme(str, Enum):
     """
     Chart drawing theme.
@@ -90,3 +149,9 @@ class Mode(str, Enum):
     TRANSIT = "transit"
     NATAL_TRANSIT = "natal_transit"
     RELATIONSHIP = "relationship"
+
+
+class LiveSkyAction(str, Enum):
+    """Client message types of the live-sky WebSocket feed."""
+    SUBSCRIBE = "subscribe"
+    UNSUBSCRIBE = "unsubscribe"
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator, Sequence
+
+import numpy as np
+import swisseph as swe  # type: ignore
+import kerykeion  # type: ignore
+
+from enums import Perspective, SiderealMode, ZodiacType
+from schemas import ChartConfig
+from utils import EPHEMERIS_LOCK
+
+# Same data files Kerykeion computes subjects from, so positions agree with /api/transit.
+EPHE_PATH = str(Path(kerykeion.__file__).resolve().parent / "sweph")
+
+# Subject point key -> Swiss Ephemeris body id, for points with a direct ephemeris position.
+SWE_BODIES: dict[str, int] = {
+    "sun": swe.SUN,
+    "moon": swe.MOON,
+    "mercury": swe.MERCURY,
+    "venus": swe.VENUS,
+    "mars": swe.MARS,
+    "jupiter": swe.JUPITER,
+    "saturn": swe.SATURN,
+    "uranus": swe.URANUS,
+    "neptune": swe.NEPTUNE,
+    "pluto": swe.PLUTO,
+    "mean_north_lunar_node": swe.MEAN_NODE,
+    "true_north_lunar_node": swe.TRUE_NODE,
+    "mean_lilith": swe.MEAN_APOG,
+    "chiron": swe.CHIRON,
+}
+
+# Coarse sampling step per body for event searches: short enough that no body crosses
+# a whole 8° orb (or a sign boundary and back) between samples.
+_GRID_STEP_DAYS = {
+    "moon": 0.5,
+    "mercury": 0.5,
+    "sun": 1.0,
+    "venus": 1.0,
+    "mars": 2.0,
+    "jupiter": 5.0,
+    "saturn": 5.0,
+    "true_north_lunar_node": 2.0,
+}
+_DEFAULT_GRID_STEP_DAYS = 10.0
+
+# Kerykeion clamps house latitudes to avoid undefined quadrant cusps near the poles.
+HOUSE_MAX_LATITUDE = 66.0
+
+# Points closer than this to a cusp count as on it.
+_CUSP_TOLERANCE = 1e-9
+
+_J2000_JD = 2451545.0
+_J2000_UTC = datetime(2000, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def grid_step_days(body: str) -> float:
+    """Sampling step (days) used to bracket events of `body` before refining them."""
+    return _GRID_STEP_DAYS.get(body, _DEFAULT_GRID_STEP_DAYS)
+
+
+def julian_day(dt: datetime) -> float:
+    """Julian day (UT) of an aware datetime."""
+    return _J2000_JD + (dt - _J2000_UTC) / timedelta(days=1)
+
+
+def datetime_from_jd(jd: float, tz: timezone | None = None) -> datetime:
+    """Aware datetime for a Julian day (UT), converted to `tz` when given, rounded to the second."""
+    dt = _J2000_UTC + timedelta(days=float(jd) - _J2000_JD)
+    dt = (dt + timedelta(microseconds=500_000)).replace(microsecond=0)
+    return dt.astimezone(tz) if tz is not None else dt
+
+
+@contextmanager
+def ephemeris_flags(cfg: ChartConfig, lng: float = 0.0, lat: float = 0.0) -> Iterator[int]:
+    """
+    Configure Swiss Ephemeris for `cfg` (perspective, zodiac, ayanamsa) and yield `calc_ut` flags.
+
+    Mirrors Kerykeion's subject setup and holds `EPHEMERIS_LOCK`, since the
+    sidereal mode and topocentric observer are process-global.
+    """
+    with EPHEMERIS_LOCK:
+        swe.set_ephe_path(EPHE_PATH)
+        flags = swe.FLG_SWIEPH | swe.FLG_SPEED
+        topocentric = False
+        if cfg.perspective == Perspective.TRUE_GEOCENTRIC:
+            flags |= swe.FLG_TRUEPOS
+        elif cfg.perspective == Perspective.HELIOCENTRIC:
+            flags |= swe.FLG_HELCTR
+        elif cfg.perspective == Perspective.TOPOCENTRIC:
+            flags |= swe.FLG_TOPOCTR
+            swe.set_topo(lng, lat, 0.0)
+            topocentric = True
+        if cfg.zodiac_type == ZodiacType.SIDEREAL and cfg.sidereal_mode is not None:
+            flags |= swe.FLG_SIDEREAL
+            swe.set_sid_mode(getattr(swe, f"SIDM_{cfg.sidereal_mode.value}"))
+        try:
+            yield flags
+        finally:
+            if topocentric:
+                swe.set_topo(0.0, 0.0, 0.0)
+
+
+def body_positions(
+    jds: Sequence[float] | np.ndarray,
+    bodies: Sequence[str],
+    cfg: ChartConfig,
+    lng: float = 0.0,
+    lat: float = 0.0,
+    with_speed: bool = True,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Longitudes and daily speeds of `bodies` (keys of `SWE_BODIES`) at every Julian day.
+
+    Returns two `(len(jds), len(bodies))` arrays. Pass `with_speed=False` when
+    speeds are not needed (they are then zero): topocentric speeds are by far
+    the most expensive part of a position.
+    """
+    jd_values = np.asarray(jds, dtype=float).ravel()
+    longitudes = np.empty((jd_values.size, len(bodies)))
+    speeds = np.empty((jd_values.size, len(bodies)))
+    body_ids = [SWE_BODIES[b] for b in bodies]
+    with ephemeris_flags(cfg, lng, lat) as flags:
+        if not with_speed:
+            flags &= ~swe.FLG_SPEED
+        for row, jd in enumerate(jd_values.tolist()):
+            for col, body_id in enumerate(body_ids):
+                values = swe.calc_ut(jd, body_id, flags)[0]
+                longitudes[row, col] = values[0]
+                speeds[row, col] = values[3]
+    return longitudes, speeds
+
+
+def equatorial_positions(
+    jd: float,
+    bodies: Sequence[str],
+    cfg: ChartConfig,
+) -> tuple[np.ndarray, np.ndarray, float]:
+    """
+    Right ascension and declination (degrees) of `bodies` at `jd`, plus the
+    Greenwich apparent sidereal time in degrees.
+
+    Always geocentric: equatorial coordinates do not depend on the zodiac, and
+    relocation maps need the Earth-centred view (`TRUE_GEOCENTRIC` is honoured).
+    """
+    ra = np.empty(len(bodies))
+    dec = np.empty(len(bodies))
+    flags = swe.FLG_SWIEPH | swe.FLG_EQUATORIAL
+    if cfg.perspective == Perspective.TRUE_GEOCENTRIC:
+        flags |= swe.FLG_TRUEPOS
+    with EPHEMERIS_LOCK:
+        swe.set_ephe_path(EPHE_PATH)
+        for col, body in enumerate(bodies):
+            values = swe.calc_ut(jd, SWE_BODIES[body], flags)[0]
+            ra[col] = values[0]
+            dec[col] = values[1]
+        sidereal_time = swe.sidtime(jd) * 15.0
+    return ra, dec, sidereal_time
+
+
+def ayanamsa(jd: float, mode: SiderealMode) -> float:
+    """
+    Ayanamsa (degrees) of `mode` at `jd`, including nutation.
+
+    Subtracting it from an apparent tropical longitude gives exactly the
+    sidereal longitude Kerykeion computes with that mode.
+    """
+    with EPHEMERIS_LOCK:
+        swe.set_ephe_path(EPHE_PATH)
+        swe.set_sid_mode(getattr(swe, f"SIDM_{mode.value}"))
+        return float(swe.get_ayanamsa_ex_ut(jd, swe.FLG_SWIEPH)[1])
+
+
+def house_cusps(
+    jd: float,
+    latitudes: Sequence[float] | np.ndarray,
+    longitudes: Sequence[float] | np.ndarray,
+    cfg: ChartConfig,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    House cusps and angles of `cfg.house_system` for many locations at one moment.
+
+    Returns `(cusps, angles)`: a `(N, 12)` array of cusp longitudes and a
+    `(N, 2)` array of ascendant and midheaven. Latitudes are clamped to
+    ±`HOUSE_MAX_LATITUDE` like Kerykeion subjects.
+    """
+    lats = np.clip(np.asarray(latitudes, dtype=float).ravel(), -HOUSE_MAX_LATITUDE, HOUSE_MAX_LATITUDE)
+    lngs = np.asarray(longitudes, dtype=float).ravel()
+    cusps = np.empty((lats.size, 12))
+    angles = np.empty((lats.size, 2))
+    hsys = cfg.house_system.value.encode("ascii")
+    with ephemeris_flags(cfg) as flags:
+        for row, (lat, lng) in enumerate(zip(lats.tolist(), lngs.tolist())):
+            cusp_values, ascmc = swe.houses_ex(jd, lat, lng, hsys, flags)
+            cusps[row] = cusp_values[:12]
+            angles[row] = ascmc[:2]
+    return cusps, angles
+
+
+def house_numbers(longitudes: np.ndarray, cusps: np.ndarray) -> np.ndarray:
+    """
+    House (1-12) of every point in every chart: `(N, P)` longitudes against `(N, 12)` cusps.
+
+    A point on a cusp (up to float noise, as in Kerykeion) belongs to the house that cusp starts.
+    """
+    first = cusps[:, :1]
+    cusp_offsets = (cusps - first) % 360.0
+    point_offsets = (longitudes - first) % 360.0
+    point_offsets = np.where(point_offsets > 360.0 - _CUSP_TOLERANCE, 0.0, point_offsets)
+    return (point_offsets[:, :, None] >= cusp_offsets[:, None, :] - _CUSP_TOLERANCE).sum(axis=-1)
@@ -365,6 +365,31 @@
       const text = formatPointGroup(chain, points);
       return text ? [`<li><strong>Chain</strong>: ${text}</li>`] : [];
     },
+    yod: (pattern, points) => {
+      const apex = pattern.structure?.apex;
+      const base = pattern.structure?.base || [];
+      const lines = [];
+      if (apex) lines.push(`<li><strong>Apex</strong>: ${formatPointInline(points, apex)}</li>`);
+      const baseText = formatPointGroup(base, points);
+      if (baseText) lines.push(`<li><strong>Sextile base</strong>: ${baseText}</li>`);
+      return lines;
+    },
+    minor_grand_trine: (pattern, points) => {
+      const focal = pattern.structure?.focal;
+      const others = (pattern.points || []).filter((k) => k !== focal);
+      const lines = [];
+      if (focal) lines.push(`<li><strong>Focal</strong>: ${formatPointInline(points, focal)}</li>`);
+      if (others.length) lines.push(`<li><strong>Trine base</strong>: ${formatPointGroup(others, points)}</li>`);
+      return lines;
+    },
+    thors_hammer: (pattern, points) => {
+      const focal = pattern.structure?.focal;
+      const others = (pattern.points || []).filter((k) => k !== focal);
+      const lines = [];
+      if (focal) lines.push(`<li><strong>Focal</strong>: ${formatPointInline(points, focal)}</li>`);
+      if (others.length) lines.push(`<li><strong>Square base</strong>: ${formatPointGroup(others, points)}</li>`);
+      return lines;
+    },
     default: (pattern, points) => {
       const text = formatPointGroup(pattern.points || [], points);
       return text ? [`<li><strong>Points</strong>: ${text}</li>`] : [];
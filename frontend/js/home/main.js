@@ -8,6 +8,29 @@
   const { saveFormState, saveApiData } = state;
   const getRender = () => App.render || {};
 
+  // One round trip per chart: JSON data and SVG come from a single subject build.
+  async function fetchChartBundle(body, label) {
+    const resp = await fetch("/api/chart/bundle", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify(body),
+    });
+    if (!resp.ok) {
+      const text = await resp.text();
+      throw new Error(`${label} request failed: ${resp.status} ${resp.statusText} - ${text}`);
+    }
+    return resp.json();
+  }
+
+  function showChart(mode, formPayload, svgText, message) {
+    dom.chartContainer.innerHTML = svgText || "";
+    runtime.hasChart = true;
+    utils.updateDownloadState();
+    utils.setStatus(message);
+    saveFormState(mode, formPayload);
+    saveApiData(mode, { svg: svgText, summary: dom.summaryEl ? dom.summaryEl.innerHTML : "" });
+  }
+
   App.handleSubmit = async function handleSubmit(event) {
     event.preventDefault();
     utils.setStatus("");
@@ -26,137 +49,37 @@
       const { payload, birthDateParts, transitDateParts } = buildPayloadFromForm(mode);
 
       if (mode === "natal") {
-        const jsonResp = await fetch("/api/natal", {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify(payload),
-        });
-        if (!jsonResp.ok) {
-          const text = await jsonResp.text();
-          throw new Error(`Natal request failed: ${jsonResp.status} ${jsonResp.statusText} - ${text}`);
-        }
-        const natalJson = await jsonResp.json();
-        if (natalJson && natalJson.subject) {
-          getRender().renderNatalSummary?.(natalJson.subject, birthDateParts);
+        const bundle = await fetchChartBundle({ ...payload, mode }, "Natal");
+        if (bundle.natal && bundle.natal.subject) {
+          getRender().renderNatalSummary?.(bundle.natal.subject, birthDateParts);
         } else if (dom.summaryEl) {
           dom.summaryEl.innerHTML = "<p>Unexpected response from natal endpoint – subject field not found.</p>";
         }
-
-        const svgResp = await fetch("/api/svg/natal", {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify(payload),
-        });
-        if (!svgResp.ok) {
-          const text = await svgResp.text();
-          throw new Error(`SVG natal request failed: ${svgResp.status} ${svgResp.statusText} - ${text}`);
-        }
-        const svgText = await svgResp.text();
-        dom.chartContainer.innerHTML = svgText;
-        runtime.hasChart = true;
-        utils.updateDownloadState();
-        utils.setStatus("Natal chart generated.");
-        saveFormState(mode, payload);
-        saveApiData(mode, { svg: svgText, summary: dom.summaryEl ? dom.summaryEl.innerHTML : "" });
+        showChart(mode, payload, bundle.svg, "Natal chart generated.");
       } else if (mode === "transit") {
-        const jsonResp = await fetch("/api/transit", {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify(payload),
-        });
-        if (!jsonResp.ok) {
-          const text = await jsonResp.text();
-          throw new Error(`Transit request failed: ${jsonResp.status} ${jsonResp.statusText} - ${text}`);
-        }
-        const transitJson = await jsonResp.json();
-        if (transitJson && transitJson.snapshot) {
-          getRender().renderTransitSummary?.(transitJson.snapshot, transitDateParts);
+        const bundle = await fetchChartBundle({ ...payload, mode }, "Transit");
+        if (bundle.transit && bundle.transit.snapshot) {
+          getRender().renderTransitSummary?.(bundle.transit.snapshot, transitDateParts);
         } else if (dom.summaryEl) {
           dom.summaryEl.innerHTML = "<p>Unexpected response from transit endpoint – snapshot not found.</p>";
         }
-
-        const svgResp = await fetch("/api/svg/transit", {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify(payload),
-        });
-        if (!svgResp.ok) {
-          const text = await svgResp.text();
-          throw new Error(`SVG transit request failed: ${svgResp.status} ${svgResp.statusText} - ${text}`);
-        }
-        const svgText = await svgResp.text();
-        dom.chartContainer.innerHTML = svgText;
-        runtime.hasChart = true;
-        utils.updateDownloadState();
-        utils.setStatus("Transit chart generated.");
-        saveFormState(mode, payload);
-        saveApiData(mode, { svg: svgText, summary: dom.summaryEl ? dom.summaryEl.innerHTML : "" });
+        showChart(mode, payload, bundle.svg, "Transit chart generated.");
       } else if (mode === "natal_transit") {
-        const jsonResp = await fetch("/api/transit", {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify(payload),
-        });
-        if (!jsonResp.ok) {
-          const text = await jsonResp.text();
-          throw new Error(`Natal + transit request failed: ${jsonResp.status} ${jsonResp.statusText} - ${text}`);
-        }
-        const transitJson = await jsonResp.json();
-        if (transitJson && transitJson.snapshot) {
-          getRender().renderCombinedSummary?.(transitJson.snapshot, birthDateParts, transitDateParts);
+        const bundle = await fetchChartBundle({ ...payload, mode }, "Natal + transit");
+        if (bundle.transit && bundle.transit.snapshot) {
+          getRender().renderCombinedSummary?.(bundle.transit.snapshot, birthDateParts, transitDateParts);
         } else if (dom.summaryEl) {
           dom.summaryEl.innerHTML = "<p>Unexpected response from transit endpoint – snapshot not found.</p>";
         }
-
-        const svgResp = await fetch("/api/svg/transit", {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify(payload),
-        });
-        if (!svgResp.ok) {
-          const text = await svgResp.text();
-          throw new Error(`SVG dual-wheel request failed: ${svgResp.status} ${svgResp.statusText} - ${text}`);
-        }
-        const svgText = await svgResp.text();
-        dom.chartContainer.innerHTML = svgText;
-        runtime.hasChart = true;
-        utils.updateDownloadState();
-        utils.setStatus("Natal + Transit chart generated.");
-        saveFormState(mode, payload);
-        saveApiData(mode, { svg: svgText, summary: dom.summaryEl ? dom.summaryEl.innerHTML : "" });
+        showChart(mode, payload, bundle.svg, "Natal + Transit chart generated.");
       } else {
         const synPayload = buildRelationshipPayload();
-        const jsonResp = await fetch("/api/relationship", {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify(synPayload),
-        });
-        if (!jsonResp.ok) {
-          const text = await jsonResp.text();
-          throw new Error(`Relationship request failed: ${jsonResp.status} ${jsonResp.statusText} - ${text}`);
-        }
-        const relJson = await jsonResp.json();
+        const bundle = await fetchChartBundle({ ...synPayload, mode: "relationship", grid_view: false }, "Relationship");
         const renderer = getRender();
-        if (renderer.renderRelationshipSummary) {
-          renderer.renderRelationshipSummary(relJson);
-        }
-
-        const svgResp = await fetch("/api/svg/synastry", {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ ...synPayload, grid_view: false }),
-        });
-        if (!svgResp.ok) {
-          const text = await svgResp.text();
-          throw new Error(`SVG synastry request failed: ${svgResp.status} ${svgResp.statusText} - ${text}`);
+        if (renderer.renderRelationshipSummary && bundle.relationship) {
+          renderer.renderRelationshipSummary(bundle.relationship);
         }
-        const svgText = await svgResp.text();
-        dom.chartContainer.innerHTML = svgText;
-        runtime.hasChart = true;
-        utils.updateDownloadState();
-        utils.setStatus("Relationship chart generated.");
-        saveFormState(mode, { ...payload, ...synPayload });
-        saveApiData(mode, { svg: svgText, summary: dom.summaryEl ? dom.summaryEl.innerHTML : "" });
+        showChart(mode, { ...payload, ...synPayload }, bundle.svg, "Relationship chart generated.");
       }
     } catch (err) {
       utils.setStatus(err.message || "An error occurred while generating the chart.", true);
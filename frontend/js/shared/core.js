@@ -56,6 +56,8 @@
     square: "□",
     trine: "△",
     opposition: "☍",
+    sesquiquadrate: "⚼",
+    quincunx: "⚻",
   };
 
   const POINTS_ICONS = {
@@ -154,6 +156,36 @@
       orb: "Sextiles ±5–6°; opposition ±8–10°.",
       construction: "A sextile B sextile C sextile D, with A↔D in opposition.",
     },
+    {
+      id: "yod",
+      name: "Yod",
+      planets: "3 planets",
+      aspects: ["sextile", "quincunx"],
+      aspectsLabel: "Sextile + Quincunxes",
+      geometry: "Narrow isosceles triangle: a 60° base pointing to an apex 150° from both ends.",
+      orb: "Sextile ±4°; quincunxes ±2–3°.",
+      construction: "A sextile B, both quincunx C (C = apex).",
+    },
+    {
+      id: "minor_grand_trine",
+      name: "Minor Grand Trine",
+      planets: "3 planets",
+      aspects: ["trine", "sextile"],
+      aspectsLabel: "Trine + Sextiles",
+      geometry: "Half a Grand Sextile: a 120° trine bisected by a point 60° from both ends.",
+      orb: "Trine ±6°; sextiles ±4°.",
+      construction: "A trine C, with B sextile A and C (B = focal).",
+    },
+    {
+      id: "thors_hammer",
+      name: "Thor's Hammer",
+      planets: "3 planets",
+      aspects: ["square", "sesquiquadrate"],
+      aspectsLabel: "Square + Sesquiquadrates",
+      geometry: "Square whose two ends both form 135° sesquiquadrates to a focal point.",
+      orb: "Square ±6°; sesquiquadrates ±2°.",
+      construction: "A square B, both sesquiquadrate C (C = focal).",
+    },
   ];
 
   function buildMajorAspectIcons() {
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from zoneinfo import ZoneInfo
+
+from starlette.concurrency import run_in_threadpool
+
+from cache import canonical_hash
+from current_sky import LOCATION_POINT_KEYS, transit_subject_with_patterns
+from projection import active_point_keys, dump_subject_with_patterns, point_key
+from schemas import BirthData, ChartConfig, LiveSkyLocation
+from utils import build_subject
+
+# Seconds between updates; subjects have minute resolution, so ticks below 60 s repeat positions.
+LIVE_SKY_TICK_SECONDS = float(os.getenv("LIVE_SKY_TICK_SECONDS", "60"))
+# Updates buffered per subscriber; when full, the oldest pending update is dropped.
+LIVE_SKY_QUEUE_SIZE = int(os.getenv("LIVE_SKY_QUEUE_SIZE", "4"))
+# Consecutive dropped updates after which a slow subscriber is disconnected.
+LIVE_SKY_MAX_DROPPED = int(os.getenv("LIVE_SKY_MAX_DROPPED", "10"))
+LIVE_SKY_MAX_CONNECTIONS_PER_USER = int(os.getenv("LIVE_SKY_MAX_CONNECTIONS_PER_USER", "4"))
+
+# Queued in place of an update to tell a subscriber's sender to disconnect.
+SLOW_CONSUMER = object()
+
+
+def channel_key(cfg: ChartConfig, location: Optional[LiveSkyLocation]) -> str:
+    """Channel identity: everything that changes an update (the theme does not)."""
+    return canonical_hash(
+        {
+            "config": cfg.model_dump(mode="json", exclude={"theme"}),
+            "location": location.model_dump(mode="json") if location is not None else None,
+        }
+    )
+
+
+def compute_live_update(cfg: ChartConfig, location: Optional[LiveSkyLocation], now: datetime) -> dict:
+    """
+    Compact sky update for the minute of `now`: the active points and their Ptolemaic patterns.
+
+    Without a location only location-independent points are reported and
+    houses are left out. Near-now moments come from the shared current sky.
+    """
+    tz_str = location.tz_str if location is not None else "UTC"
+    local = now.astimezone(ZoneInfo(tz_str))
+    birth = BirthData(
+        name="Live sky",
+        year=local.year,
+        month=local.month,
+        day=local.day,
+        hour=local.hour,
+        minute=local.minute,
+        lat=location.lat if location is not None else 0.0,
+        lng=location.lng if location is not None else 0.0,
+        tz_str=tz_str,
+    )
+    if location is None:
+        cfg = cfg.model_copy(
+            update={"active_points": [p for p in cfg.active_points if point_key(p) not in LOCATION_POINT_KEYS]}
+        )
+
+    sky = transit_subject_with_patterns(birth, cfg)
+    if sky is not None:
+        _, subject_dict, patterns = sky
+    else:
+        subject_dict, patterns = dump_subject_with_patterns(build_subject(birth, cfg), cfg, None)
+
+    points = {}
+    for key in sorted(active_point_keys(cfg)):
+        point = subject_dict.get(key)
+        if not isinstance(point, dict):
+            continue
+        entry = {
+            "sign": point.get("sign"),
+            "position": round(float(point.get("position", 0.0)), 4),
+            "abs_pos": round(float(point.get("abs_pos", 0.0)), 4),
+            "retrograde": bool(point.get("retrograde")),
+        }
+        if location is not None:
+            entry["house"] = point.get("house")
+        points[key] = entry
+
+    return {
+        "type": "sky",
+        "timestamp": local.replace(second=0, microsecond=0).isoformat(),
+        "points": points,
+        "patterns": [{"id": p["id"], "name": p["name"], "points": p["points"]} for p in patterns],
+    }
+
+
+@dataclass(eq=False)
+class Subscriber:
+    """
+    One WebSocket's bounded update queue.
+
+    `offer` never blocks the broadcaster: a full queue drops its oldest update
+    (newer skies supersede older ones), and a subscriber that keeps falling
+    behind gets `SLOW_CONSUMER` queued so its connection is closed.
+    """
+
+    username: str
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=LIVE_SKY_QUEUE_SIZE))
+    max_dropped: int = LIVE_SKY_MAX_DROPPED
+    dropped: int = 0
+    total_dropped: int = 0
+    overflowed: bool = False
+
+    def offer(self, update: dict) -> bool:
+        """Queue `update`; returns False once the subscriber has been marked as too slow."""
+        if self.overflowed:
+            return False
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            self.total_dropped += 1
+            if self.dropped >= self.max_dropped:
+                # Discard the backlog so the close is the next thing the sender sees.
+                self.overflowed = True
+                while not self.queue.empty():
+                    self.queue.get_nowait()
+                self.queue.put_nowait(SLOW_CONSUMER)
+                return False
+        else:
+            self.dropped = 0
+        self.queue.put_nowait(update)
+        return True
+
+
+@dataclass(eq=False)
+class LiveSkyChannel:
+    key: str
+    cfg: ChartConfig
+    location: Optional[LiveSkyLocation]
+    subscribers: set[Subscriber] = field(default_factory=set)
+    latest: Optional[dict] = None
+    task: Optional[asyncio.Task] = None
+
+
+class LiveSkyHub:
+    """
+    Fan-out of per-channel sky updates to WebSocket subscribers.
+
+    Each channel with at least one subscriber runs one ticker task that
+    computes the update once per tick (aligned to the wall clock) and offers
+    it to every subscriber; the ticker stops with the channel's last subscriber.
+    """
+
+    def __init__(
+        self,
+        tick_seconds: float = LIVE_SKY_TICK_SECONDS,
+        max_connections_per_user: int = LIVE_SKY_MAX_CONNECTIONS_PER_USER,
+        compute: Callable[[ChartConfig, Optional[LiveSkyLocation], datetime], dict] = compute_live_update,
+    ) -> None:
+        self.tick_seconds = tick_seconds
+        self.max_connections_per_user = max_connections_per_user
+        self.compute = compute
+        self._channels: dict[str, LiveSkyChannel] = {}
+        self._membership: dict[Subscriber, LiveSkyChannel] = {}
+        self._connections: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.ticks = 0
+        self.updates_sent = 0
+        self.slow_disconnects = 0
+        self._dropped_closed = 0
+
+    def connect(self, username: str) -> Optional[Subscriber]:
+        """Register a connection; None when the user already has the maximum open."""
+        with self._lock:
+            if self._connections.get(username, 0) >= self.max_connections_per_user:
+                return None
+            self._connections[username] = self._connections.get(username, 0) + 1
+        return Subscriber(username)
+
+    def disconnect(self, subscriber: Subscriber) -> None:
+        self.unsubscribe(subscriber)
+        with self._lock:
+            remaining = self._connections.get(subscriber.username, 0) - 1
+            if remaining > 0:
+                self._connections[subscriber.username] = remaining
+            else:
+                self._connections.pop(subscriber.username, None)
+        self._dropped_closed += subscriber.total_dropped
+        if subscriber.overflowed:
+            self.slow_disconnects += 1
+
+    def subscribe(self, subscriber: Subscriber, cfg: ChartConfig, location: Optional[LiveSkyLocation]) -> LiveSkyChannel:
+        """Move `subscriber` to the (cfg, location) channel, starting its ticker if needed."""
+        self.unsubscribe(subscriber)
+        key = channel_key(cfg, location)
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = LiveSkyChannel(key, cfg, location)
+            self._channels[key] = channel
+            channel.task = asyncio.create_task(self._run_channel(channel))
+        channel.subscribers.add(subscriber)
+        self._membership[subscriber] = channel
+        if channel.latest is not None:
+            subscriber.offer(channel.latest)
+        return channel
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        channel = self._membership.pop(subscriber, None)
+        if channel is None:
+            return
+        channel.subscribers.discard(subscriber)
+        if not channel.subscribers:
+            del self._channels[channel.key]
+            if channel.task is not None:
+                channel.task.cancel()
+
+    def _next_delay(self, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        return self.tick_seconds - now % self.tick_seconds
+
+    async def _run_channel(self, channel: LiveSkyChannel) -> None:
+        while channel.subscribers:
+            try:
+                update = await run_in_threadpool(self.compute, channel.cfg, channel.location, datetime.now(timezone.utc))
+            except Exception as exc:
+                print("live sky update failed", {"channel": channel.key[:12], "error": repr(exc)})
+                update = {"type": "error", "detail": "Sky update failed; retrying next tick."}
+            else:
+                channel.latest = update
+            self.ticks += 1
+            for subscriber in list(channel.subscribers):
+                if subscriber.offer(update):
+                    self.updates_sent += 1
+            await asyncio.sleep(self._next_delay())
+
+    def stats(self) -> dict:
+        return {
+            "channels": len(self._channels),
+            "subscribers": len(self._membership),
+            "connections": sum(self._connections.values()),
+            "ticks": self.ticks,
+            "updates_sent": self.updates_sent,
+            "dropped_updates": self._dropped_closed + sum(s.total_dropped for s in self._membership),
+            "slow_disconnects": self.slow_disconnects,
+            "tick_seconds": self.tick_seconds,
+        }
+
+
+live_sky_hub = LiveSkyHub()
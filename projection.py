@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, Query, status
+
+from kerykeion.schemas import AstrologicalSubjectModel, KerykeionPointModel  # type: ignore
+
+from aspects.ptolemaic import compute_cross_major_aspects, compute_major_aspects
+from schemas import ChartConfig
+
+# Subject attributes holding a KerykeionPointModel (planets, angles, nodes, house cusps, ...).
+SUBJECT_POINT_KEYS: frozenset[str] = frozenset(
+    name
+    for name, info in AstrologicalSubjectModel.model_fields.items()
+    if "KerykeionPointModel" in str(info.annotation)
+)
+SUBJECT_HOUSE_KEYS: frozenset[str] = frozenset(k for k in SUBJECT_POINT_KEYS if k.endswith("_house"))
+POINT_FIELDS: frozenset[str] = frozenset(KerykeionPointModel.model_fields)
+
+# Point fields the Ptolemaic pattern matcher reads.
+_PATTERN_FIELDS = {"name", "sign", "position", "abs_pos", "house", "retrograde"}
+
+
+def point_key(name: str) -> str:
+    """Subject attribute name for a point label ("Mean_North_Lunar_Node" -> "mean_north_lunar_node")."""
+    return str(name).strip().replace(" ", "_").replace("-", "_").lower()
+
+
+def active_point_keys(cfg: ChartConfig) -> set[str]:
+    return {point_key(p) for p in cfg.active_points or []}
+
+
+def pattern_orbs(cfg: ChartConfig) -> dict[str, float]:
+    """The config's pattern orb overrides keyed by plain aspect name."""
+    return {aspect.value: orb for aspect, orb in cfg.pattern_orbs.items()}
+
+
+@dataclass(frozen=True)
+class SubjectProjection:
+    """
+    Which points of a subject to dump and which attributes of each point.
+
+    `None` means "all". Non-point subject metadata (name, location, datetimes,
+    lunar phase, ...) is always included.
+    """
+
+    points: Optional[frozenset[str]] = None
+    fields: Optional[frozenset[str]] = None
+
+    def include(self) -> dict:
+        """`include` argument for `model_dump` restricting the dump to this projection."""
+        spec: dict = {}
+        for name in AstrologicalSubjectModel.model_fields:
+            if name not in SUBJECT_POINT_KEYS:
+                spec[name] = True
+            elif self.points is None or name in self.points:
+                spec[name] = set(self.fields) if self.fields is not None else True
+        return spec
+
+    def keeps_aspect(self, aspect: dict) -> bool:
+        if self.points is None:
+            return True
+        return point_key(aspect.get("left", "")) in self.points and point_key(aspect.get("right", "")) in self.points
+
+
+def _split(value: Optional[str]) -> Optional[list[str]]:
+    if value is None:
+        return None
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def resolve_projection(fields: Optional[str], points: Optional[str], cfg: ChartConfig) -> Optional[SubjectProjection]:
+    """
+    Parse comma-separated `fields` / `points` query values; None when neither is given.
+
+    `points` accepts subject point names plus the keywords `active` (the
+    configured active points) and `houses` (the twelve house cusps). Unknown
+    names are rejected with 422.
+    """
+    field_list = _split(fields)
+    point_list = _split(points)
+    if field_list is None and point_list is None:
+        return None
+
+    if field_list is not None:
+        unknown = sorted(set(field_list) - POINT_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Unknown point fields: {', '.join(unknown)}. Valid fields: {', '.join(sorted(POINT_FIELDS))}.",
+            )
+
+    point_set: Optional[set[str]] = None
+    if point_list is not None:
+        point_set = set()
+        unknown = []
+        for item in point_list:
+            key = point_key(item)
+            if key == "active":
+                point_set |= active_point_keys(cfg) & SUBJECT_POINT_KEYS
+            elif key == "houses":
+                point_set |= SUBJECT_HOUSE_KEYS
+            elif key in SUBJECT_POINT_KEYS:
+                point_set.add(key)
+            else:
+                unknown.append(item)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Unknown points: {', '.join(unknown)}.",
+            )
+
+    return SubjectProjection(
+        points=frozenset(point_set) if point_set is not None else None,
+        fields=frozenset(field_list) if field_list is not None else None,
+    )
+
+
+def dump_subject(subject, projection: Optional[SubjectProjection]) -> dict:
+    """`model_dump(mode="json")` of a subject, restricted to `projection` when given."""
+    if projection is None:
+        return subject.model_dump(mode="json")
+    return subject.model_dump(mode="json", include=projection.include())
+
+
+def filter_aspects(aspects: list[dict], projection: Optional[SubjectProjection]) -> list[dict]:
+    """Keep only aspects whose both points are in the projection."""
+    if projection is None or projection.points is None:
+        return aspects
+    return [a for a in aspects if projection.keeps_aspect(a)]
+
+
+def dump_dual_aspects(aspects_model, projection: Optional[SubjectProjection]) -> dict:
+    """
+    Dump a dual-chart aspects model, projecting its embedded subjects and aspect list.
+    """
+    if projection is None:
+        return aspects_model.model_dump(mode="json")
+    include: dict = {name: True for name in type(aspects_model).model_fields}
+    include["first_subject"] = include["second_subject"] = projection.include()
+    data = aspects_model.model_dump(mode="json", include=include)
+    if projection.points is not None:
+        data["aspects"] = [
+            a for a in data.get("aspects", [])
+            if point_key(a.get("p1_name", "")) in projection.points and point_key(a.get("p2_name", "")) in projection.points
+        ]
+    return data
+
+
+def pattern_projection(cfg: ChartConfig) -> SubjectProjection:
+    """The active points with only the fields the Ptolemaic pattern matcher reads."""
+    return SubjectProjection(
+        points=frozenset(active_point_keys(cfg) & SUBJECT_POINT_KEYS),
+        fields=frozenset(_PATTERN_FIELDS),
+    )
+
+
+def subject_patterns(subject, cfg: ChartConfig) -> list[dict]:
+    """Ptolemaic patterns of a subject, from a minimal dump of its active points."""
+    return compute_major_aspects(
+        dump_subject(subject, pattern_projection(cfg)), active_points=cfg.active_points, orbs=pattern_orbs(cfg)
+    )
+
+
+def dump_subject_with_patterns(
+    subject,
+    cfg: ChartConfig,
+    projection: Optional[SubjectProjection],
+) -> tuple[dict, list[dict]]:
+    """
+    Dump a subject and compute its Ptolemaic patterns from a single dump when possible.
+
+    With a projection the patterns are computed from a second, minimal dump of
+    the active points, so the response dump can omit what the matcher needs.
+    """
+    subject_dict = dump_subject(subject, projection)
+    if projection is None:
+        return subject_dict, compute_major_aspects(
+            subject_dict, active_points=cfg.active_points, orbs=pattern_orbs(cfg)
+        )
+    return subject_dict, subject_patterns(subject, cfg)
+
+
+def cross_chart_patterns(subjects: dict[str, object], cfg: ChartConfig) -> list[dict]:
+    """
+    Ptolemaic patterns spanning several subjects, keyed `"<chart>.<point>"` (e.g. `natal.sun`).
+
+    Each subject is dumped with only its active points and the matcher's fields.
+    """
+    projection = pattern_projection(cfg)
+    charts = {name: dump_subject(subject, projection) for name, subject in subjects.items()}
+    return compute_cross_major_aspects(charts, active_points=cfg.active_points, orbs=pattern_orbs(cfg))
+
+
+def projection_params(
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated point attributes to return, e.g. `abs_pos,sign,retrograde`.",
+    ),
+    points: Optional[str] = Query(
+        default=None,
+        description="Comma-separated points to return, e.g. `sun,moon`; `active` = configured active points, `houses` = cusps.",
+    ),
+) -> tuple[Optional[str], Optional[str]]:
+    """Route dependency collecting the raw `fields` / `points` query values."""
+    return fields, points
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Generator, NamedTuple, Optional
+from zoneinfo import ZoneInfo
+
+from enums import RangeGranularity
+from ephemeris import julian_day
+from utils import add_months
+
+# Offsets are sampled this often to find timezone transitions; no zone changes
+# its offset twice within a day.
+_TRANSITION_SCAN = timedelta(days=1)
+
+_FIXED_STEPS = {
+    RangeGranularity.MINUTE: timedelta(minutes=1),
+    RangeGranularity.HOUR: timedelta(hours=1),
+    RangeGranularity.DAY: timedelta(days=1),
+    RangeGranularity.WEEK: timedelta(weeks=1),
+}
+
+
+class RangeStep(NamedTuple):
+    """One sample of a range: the same instant in UTC, local time and Julian day (UT)."""
+
+    utc: datetime
+    local: datetime
+    jd: float
+
+
+@dataclass(frozen=True)
+class OffsetSegment:
+    """
+    A span of UTC time during which a timezone keeps one UTC offset.
+
+    `fold_until` is set after a backward transition: local wall-clock times
+    before it (naive) occur for the second time and need `fold=1`.
+    """
+
+    start: datetime
+    offset: timedelta
+    fold_until: Optional[datetime] = None
+
+
+def offset_segments(tz: ZoneInfo, start: datetime, end: datetime) -> list[OffsetSegment]:
+    """
+    UTC offset segments of `tz` covering `[start, end]`, with transitions found to the second.
+    """
+    start_utc = start.astimezone(timezone.utc)
+    end_utc = end.astimezone(timezone.utc)
+
+    def offset_at(moment: datetime) -> timedelta:
+        return moment.astimezone(tz).utcoffset()
+
+    segments = [OffsetSegment(start_utc, offset_at(start_utc))]
+    lo, lo_offset = start_utc, segments[0].offset
+    while lo < end_utc:
+        hi = min(lo + _TRANSITION_SCAN, end_utc)
+        hi_offset = offset_at(hi)
+        if hi_offset != lo_offset:
+            # Bisect the transition instant to the second (the first second with the new offset).
+            a, b = 0, int((hi - lo).total_seconds())
+            while b - a > 1:
+                mid = (a + b) // 2
+                if offset_at(lo + timedelta(seconds=mid)) == lo_offset:
+                    a = mid
+                else:
+                    b = mid
+            transition = lo + timedelta(seconds=b)
+            fold_until = None
+            if hi_offset < lo_offset:
+                fold_until = (transition + lo_offset).replace(tzinfo=None)
+            segments.append(OffsetSegment(transition, hi_offset, fold_until))
+        lo, lo_offset = hi, hi_offset
+    return segments
+
+
+def _step_size(granularity: RangeGranularity, step_minutes: Optional[int]) -> Optional[timedelta]:
+    if granularity == RangeGranularity.CUSTOM:
+        if step_minutes is None or step_minutes < 1:
+            raise ValueError("granularity 'custom' requires step_minutes >= 1.")
+        return timedelta(minutes=step_minutes)
+    if granularity == RangeGranularity.MONTH:
+        return None
+    if granularity not in _FIXED_STEPS:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+    return _FIXED_STEPS[granularity]
+
+
+def count_range_steps(
+    start: datetime,
+    end: datetime,
+    granularity: RangeGranularity,
+    step_minutes: Optional[int] = None,
+) -> int:
+    """
+    Return how many steps `iter_range_steps` yields for the same arguments.
+
+    Fixed-size steps are counted arithmetically so huge minute ranges do not
+    need to be materialized; monthly steps are few enough to simply iterate.
+    """
+    if start > end:
+        raise ValueError("start must be <= end")
+    step = _step_size(granularity, step_minutes)
+    if step is not None:
+        return (end.astimezone(timezone.utc) - start.astimezone(timezone.utc)) // step + 1
+    return sum(1 for _ in iter_range_steps(start, end, granularity))
+
+
+def iter_range_steps(
+    start: datetime,
+    end: datetime,
+    granularity: RangeGranularity,
+    step_minutes: Optional[int] = None,
+) -> Generator[RangeStep, None, None]:
+    """
+    Yield the steps from `start` to `end` (inclusive, aware local datetimes).
+
+    Fixed-size granularities (minute, hour, day, week, custom `step_minutes`)
+    step in UTC, so DST transitions neither repeat nor skip samples; daily and
+    weekly steps are exactly 24 h / 7 days apart, so their local clock time
+    shifts with DST. Local times come from the timezone's offset segments,
+    computed once for the whole span. Months step on the local calendar.
+    """
+    if start > end:
+        raise ValueError("start must be <= end")
+    step = _step_size(granularity, step_minutes)
+    tz = start.tzinfo
+
+    if step is None:
+        current = start
+        while current <= end:
+            utc = current.astimezone(timezone.utc)
+            yield RangeStep(utc, current, julian_day(utc))
+            current = add_months(current, 1)
+        return
+
+    segments = offset_segments(tz, start, end)
+    start_utc = segments[0].start
+    start_jd = julian_day(start_utc)
+    step_days = step / timedelta(days=1)
+    index = 0
+    for i in range(count_range_steps(start, end, granularity, step_minutes)):
+        utc = start_utc + i * step
+        while index + 1 < len(segments) and utc >= segments[index + 1].start:
+            index += 1
+        segment = segments[index]
+        local = (utc + segment.offset).replace(tzinfo=None)
+        fold = 1 if segment.fold_until is not None and local < segment.fold_until else 0
+        yield RangeStep(utc, local.replace(tzinfo=tz, fold=fold), start_jd + i * step_days)
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Optional
+
+from fastapi import Depends, HTTPException, status
+
+from auth import get_current_username
+
+
+@dataclass(frozen=True)
+class BucketSpec:
+    """Token bucket shape: `capacity` tokens (burst), refilled at `refill_per_second`."""
+
+    capacity: float
+    refill_per_second: float
+
+    def __post_init__(self) -> None:
+        # A bucket that never refills would lock users out for good (and has no finite Retry-After).
+        if self.capacity <= 0 or self.refill_per_second <= 0:
+            raise ValueError(f"Rate limit buckets need a positive burst and refill rate, got {self}.")
+
+
+def _bucket_from_env(name: str, per_minute: float, burst: float) -> BucketSpec:
+    prefix = f"RATE_LIMIT_{name.upper()}"
+    per_minute = float(os.getenv(f"{prefix}_PER_MINUTE", per_minute))
+    burst = float(os.getenv(f"{prefix}_BURST", burst))
+    return BucketSpec(capacity=burst, refill_per_second=per_minute / 60.0)
+
+
+# One bucket per cost class; each endpoint draws a weight from exactly one of them.
+RATE_LIMIT_BUCKETS: dict[str, BucketSpec] = {
+    "light": _bucket_from_env("light", per_minute=120, burst=120),
+    "chart": _bucket_from_env("chart", per_minute=60, burst=30),
+    "pdf": _bucket_from_env("pdf", per_minute=10, burst=5),
+    "range": _bucket_from_env("range", per_minute=5, burst=3),
+}
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1").lower() not in {"0", "false", "no"}
+MAX_CONCURRENT_REQUESTS_PER_USER = int(os.getenv("RATE_LIMIT_MAX_CONCURRENT_PER_USER", "4"))
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets keyed by (user, bucket name), refilled lazily on access.
+    """
+
+    def __init__(self, specs: dict[str, BucketSpec]) -> None:
+        self.specs = specs
+        self._state: dict[tuple[str, str], tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def consume(self, user: str, bucket: str, weight: float = 1.0, now: Optional[float] = None) -> Optional[float]:
+        """
+        Take `weight` tokens. Returns None on success, otherwise seconds until enough have refilled.
+        """
+        spec = self.specs[bucket]
+        now = time.monotonic() if now is None else now
+        # A request heavier than the whole bucket would never pass; charge a full bucket instead.
+        weight = min(weight, spec.capacity)
+        with self._lock:
+            tokens, last = self._state.get((user, bucket), (spec.capacity, now))
+            tokens = min(spec.capacity, tokens + (now - last) * spec.refill_per_second)
+            if tokens >= weight:
+                self._state[(user, bucket)] = (tokens - weight, now)
+                return None
+            self._state[(user, bucket)] = (tokens, now)
+        return (weight - tokens) / spec.refill_per_second
+
+
+class ConcurrencyLimiter:
+    """
+    Non-blocking per-user counter of in-flight expensive requests.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self._active: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, user: str) -> bool:
+        with self._lock:
+            current = self._active.get(user, 0)
+            if current >= self.limit:
+                return False
+            self._active[user] = current + 1
+            return True
+
+    def release(self, user: str) -> None:
+        with self._lock:
+            current = self._active.get(user, 0) - 1
+            if current > 0:
+                self._active[user] = current
+            else:
+                self._active.pop(user, None)
+
+    def active(self, user: str) -> int:
+        with self._lock:
+            return self._active.get(user, 0)
+
+
+rate_limiter = TokenBucketLimiter(RATE_LIMIT_BUCKETS)
+concurrency_limiter = ConcurrencyLimiter(MAX_CONCURRENT_REQUESTS_PER_USER)
+
+
+def _too_many_requests(detail: str, retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+def charge_rate_limit(username: str, bucket: str, weight: float = 1.0) -> None:
+    """
+    Charge `weight` tokens from `bucket` inside a handler, for costs that depend on the payload.
+    """
+    if not RATE_LIMIT_ENABLED:
+        return
+    retry_after = rate_limiter.consume(username, bucket, weight)
+    if retry_after is not None:
+        raise _too_many_requests(f"Rate limit exceeded for {bucket} requests.", retry_after)
+
+
+def rate_limit(bucket: str, weight: float = 1.0, limit_concurrency: bool = True) -> Callable[..., AsyncIterator[None]]:
+    """
+    Build a route dependency that charges `weight` tokens from `bucket` for the current user.
+
+    With `limit_concurrency`, the request also holds one of the user's
+    concurrent-request slots until it completes; the slot is checked first, so
+    requests refused for concurrency are not charged. Both limits answer 429
+    with `Retry-After`.
+    """
+    if bucket not in RATE_LIMIT_BUCKETS:
+        raise ValueError(f"Unknown rate limit bucket: {bucket}")
+
+    async def dependency(username: str = Depends(get_current_username)) -> AsyncIterator[None]:
+        if not RATE_LIMIT_ENABLED:
+            yield
+            return
+        if not limit_concurrency:
+            charge_rate_limit(username, bucket, weight)
+            yield
+            return
+        # Take the slot first: a request refused for concurrency must not spend tokens.
+        if not concurrency_limiter.try_acquire(username):
+            raise _too_many_requests(
+                f"At most {concurrency_limiter.limit} expensive requests may run at once.",
+                retry_after=1,
+            )
+        try:
+            charge_rate_limit(username, bucket, weight)
+            yield
+        finally:
+            concurrency_limiter.release(username)
+
+    return dependency
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import math
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+
+from reportlab.lib.pagesizes import letter  # type: ignore
+from reportlab.lib.units import inch  # type: ignore
+from reportlab.lib.utils import ImageReader  # type: ignore
+from reportlab.graphics import renderPDF  # type: ignore
+from reportlab.pdfgen import canvas  # type: ignore
+from reportlab.platypus import SimpleDocTemplate, Image  # type: ignore
+from svglib.svglib import svg2rlg  # type: ignore
+import cairosvg  # type: ignore
+
+from cancellation import CancelToken, DISCONNECT_POLL_INTERVAL, RequestCancelled
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    resource = None  # type: ignore[assignment]
+
+# Size of the warm worker pool; 0 renders in the API process (no isolation).
+RENDER_POOL_WORKERS = int(os.getenv("RENDER_POOL_WORKERS", "2"))
+# Each worker is replaced after this many jobs to return fragmented cairo/Pillow memory.
+RENDER_POOL_MAX_JOBS_PER_WORKER = int(os.getenv("RENDER_POOL_MAX_JOBS_PER_WORKER", "50"))
+# Per-job wall-clock limit; a worker still rendering after it is killed.
+RENDER_JOB_TIMEOUT_SECONDS = float(os.getenv("RENDER_JOB_TIMEOUT_SECONDS", "30"))
+# Address-space limit of each worker; allocations beyond it fail inside the worker only.
+RENDER_JOB_MEMORY_MB = int(os.getenv("RENDER_JOB_MEMORY_MB", "1024"))
+
+# Extra time the API process waits past the job limit before giving up on a worker.
+_TIMEOUT_GRACE_SECONDS = 5.0
+
+# Fallback chain, best first; "empty" means every renderer failed.
+RENDER_PATHS = ("cairosvg_pdf", "cairosvg_png", "svglib", "empty")
+
+
+class RenderError(Exception):
+    """Raised when a render job could not produce a PDF (timeout or crashed worker)."""
+
+
+def render_svg_pdf(svg_text: str, filename_prefix: str = "chart") -> tuple[bytes, str]:
+    """
+    Convert a (color-normalized) SVG to a PDF page, returning `(pdf_bytes, path)`.
+
+    Tries a vector PDF via cairosvg first, then a 300 dpi PNG via cairosvg
+    embedded in a PDF, then svglib/reportlab. `path` names the renderer that
+    produced the result (see `RENDER_PATHS`).
+    """
+    svg_bytes = svg_text.encode("utf-8")
+    try:
+        return cairosvg.svg2pdf(bytestring=svg_bytes, dpi=300, unsafe=True), "cairosvg_pdf"
+    except Exception:
+        pass
+
+    try:
+        png_bytes = cairosvg.svg2png(bytestring=svg_bytes, dpi=300, unsafe=True)
+    except Exception:
+        png_bytes = None
+    if png_bytes:
+        return _png_to_pdf(png_bytes, filename_prefix), "cairosvg_png"
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix="kerykeion_svg_"))
+    try:
+        svg_path = tmp_dir / f"{filename_prefix}.svg"
+        svg_path.write_text(svg_text, encoding="utf-8")
+        drawing = svg2rlg(str(svg_path))
+        if drawing is not None:
+            return renderPDF.drawToString(drawing), "svglib"
+    except Exception:
+        pass
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return _png_to_pdf(None, filename_prefix), "empty"
+
+
+def _png_to_pdf(png_bytes: Optional[bytes], filename_prefix: str) -> bytes:
+    """
+    Lay out a PNG on a single letter page; an empty page when `png_bytes` is None.
+    """
+    tmp_dir = Path(tempfile.mkdtemp(prefix="kerykeion_pdf_"))
+    try:
+        pdf_path = tmp_dir / f"{filename_prefix}.pdf"
+        story = []
+        if png_bytes:
+            try:
+                img = Image(BytesIO(png_bytes))
+                img._restrictSize(7.5 * inch, 9.0 * inch)
+                story.append(img)
+            except Exception:
+                pass
+
+        doc = SimpleDocTemplate(str(pdf_path), pagesize=letter, leftMargin=40, rightMargin=40, topMargin=40, bottomMargin=40)
+        try:
+            doc.build(story)
+        except Exception:
+            # Fallback: draw directly onto canvas
+            c = canvas.Canvas(str(pdf_path), pagesize=letter)
+            width, height = letter
+            if png_bytes:
+                try:
+                    reader = ImageReader(BytesIO(png_bytes))
+                    iw, ih = reader.getSize()
+                    scale = min((width - 80) / iw, (height - 80) / ih, 1.0)
+                    c.drawImage(
+                        reader,
+                        40,
+                        40,
+                        width=iw * scale,
+                        height=ih * scale,
+                        preserveAspectRatio=True,
+                        mask="auto",
+                    )
+                except Exception:
+                    pass
+            c.save()
+        return pdf_path.read_bytes()
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _init_worker(memory_mb: int) -> None:
+    """
+    Runs once in every new worker: apply the memory limit and restore default SIGALRM handling.
+    """
+    if resource is not None and memory_mb > 0:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if hasattr(signal, "SIGALRM"):
+        # Default action terminates the process, even while stuck inside cairo's C code.
+        signal.signal(signal.SIGALRM, signal.SIG_DFL)
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+def _run_job(svg_text: str, filename_prefix: str, timeout_seconds: float) -> tuple[bytes, str, float, float]:
+    """
+    Worker entry point: render under an alarm and report `(pdf, path, seconds, peak_rss_mb)`.
+    """
+    if hasattr(signal, "alarm"):
+        signal.alarm(max(1, math.ceil(timeout_seconds)))
+    try:
+        started = time.perf_counter()
+        pdf_bytes, path = render_svg_pdf(svg_text, filename_prefix)
+        elapsed = time.perf_counter() - started
+    finally:
+        if hasattr(signal, "alarm"):
+            signal.alarm(0)
+    peak_rss_mb = 0.0
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux.
+        peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    return pdf_bytes, path, elapsed, peak_rss_mb
+
+
+class RenderPool:
+    """
+    Warm subprocess pool that renders chart PDFs away from the API process.
+
+    Each worker runs under an address-space limit and a per-job alarm, and is
+    recycled after `max_jobs_per_worker` jobs. A worker killed by either limit
+    breaks the pool, which is rebuilt on the next job; only that job (and any
+    running next to it) fails. With `workers=0` jobs render in-process.
+    """
+
+    def __init__(self, workers: int, max_jobs_per_worker: int, timeout_seconds: float, memory_mb: int) -> None:
+        self.workers = workers
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.timeout_seconds = timeout_seconds
+        self.memory_mb = memory_mb
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stats: dict = {
+            "jobs": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "worker_crashes": 0,
+            "cancelled": 0,
+            "pool_restarts": 0,
+            "render_seconds": 0.0,
+            "peak_worker_rss_mb": 0.0,
+            "paths": {path: 0 for path in RENDER_PATHS},
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # max_tasks_per_child requires a non-fork start method; spawn also
+                # keeps the API's threads and locks out of the workers.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.memory_mb,),
+                    max_tasks_per_child=self.max_jobs_per_worker or None,
+                )
+                for _ in range(self.workers):
+                    self._executor.submit(_warm_up)
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+                self._stats["pool_restarts"] += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _record(self, key: str, path: Optional[str] = None, seconds: float = 0.0, rss_mb: float = 0.0) -> None:
+        with self._lock:
+            self._stats[key] += 1
+            if path is not None:
+                self._stats["paths"][path] += 1
+                self._stats["render_seconds"] += seconds
+                self._stats["peak_worker_rss_mb"] = max(self._stats["peak_worker_rss_mb"], rss_mb)
+
+    def render(self, svg_text: str, filename_prefix: str = "chart", cancel_token: Optional[CancelToken] = None) -> bytes:
+        """
+        Render `svg_text` to PDF bytes in a worker, honouring `cancel_token` while waiting.
+
+        Raises `RenderError` when the job times out or its worker dies.
+        """
+        with self._lock:
+            self._stats["jobs"] += 1
+        if self.workers <= 0:
+            started = time.perf_counter()
+            pdf_bytes, path = render_svg_pdf(svg_text, filename_prefix)
+            self._record("succeeded", path, time.perf_counter() - started)
+            return pdf_bytes
+
+        executor = self._get_executor()
+        try:
+            future = executor.submit(_run_job, svg_text, filename_prefix, self.timeout_seconds)
+        except (BrokenProcessPool, RuntimeError):
+            # The pool broke (or was discarded) since we fetched it; retry once on a fresh one.
+            self._discard_executor(executor)
+            executor = self._get_executor()
+            future = executor.submit(_run_job, svg_text, filename_prefix, self.timeout_seconds)
+
+        deadline = time.monotonic() + self.timeout_seconds + _TIMEOUT_GRACE_SECONDS
+        while True:
+            try:
+                pdf_bytes, path, seconds, rss_mb = future.result(timeout=DISCONNECT_POLL_INTERVAL)
+                break
+            except FuturesTimeout:
+                if cancel_token is not None and cancel_token.cancelled:
+                    # A queued job is dropped; a running one finishes (bounded by its alarm) and is ignored.
+                    future.cancel()
+                    self._record("cancelled")
+                    raise RequestCancelled()
+                if time.monotonic() > deadline:
+                    self._record("timeouts")
+                    self._discard_executor(executor)
+                    raise RenderError(f"Chart rendering exceeded {self.timeout_seconds:g}s.")
+            except BrokenProcessPool:
+                # The worker was killed: alarm (time limit) or the OS (memory).
+                self._record("worker_crashes")
+                self._discard_executor(executor)
+                raise RenderError("Chart rendering worker died (time or memory limit exceeded).")
+            except Exception as exc:
+                self._record("failed")
+                raise RenderError(f"Chart rendering failed: {exc.__class__.__name__}") from exc
+
+        self._record("succeeded", path, seconds, rss_mb)
+        if path != RENDER_PATHS[0]:
+            print(f"render pool: {filename_prefix} rendered via fallback path {path}")
+        return pdf_bytes
+
+    def stats(self) -> dict:
+        """Snapshot of job counters, fallback path counts and pool configuration."""
+        with self._lock:
+            snapshot = {**self._stats, "paths": dict(self._stats["paths"])}
+        snapshot["render_seconds"] = round(snapshot["render_seconds"], 3)
+        snapshot["peak_worker_rss_mb"] = round(snapshot["peak_worker_rss_mb"], 1)
+        snapshot["config"] = {
+            "workers": self.workers,
+            "max_jobs_per_worker": self.max_jobs_per_worker,
+            "timeout_seconds": self.timeout_seconds,
+            "memory_mb": self.memory_mb,
+        }
+        return snapshot
+
+
+render_pool = RenderPool(
+    RENDER_POOL_WORKERS,
+    RENDER_POOL_MAX_JOBS_PER_WORKER,
+    RENDER_JOB_TIMEOUT_SECONDS,
+    RENDER_JOB_MEMORY_MB,
+)
+
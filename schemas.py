@@ -1,15 +1,23 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Annotated, Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
 from enums import (
+    AngleLine,
     HouseSystem,
+    JobStatus,
+    LiveSkyAction,
     Mode,
+    PatternAspect,
     Perspective,
+    ProgressionMethod,
     RangeGranularity,
+    RangeOutput,
+    ReportDetail,
     ReportKind,
     SiderealMode,
+    SkyEventKind,
     Theme,
     ZodiacType,
 )
@@ -138,6 +146,14 @@ class ChartConfig(BaseModel):
         ],
         description="Chart points to include (passed to Kerykeion).",
     )
+    pattern_orbs: Dict[PatternAspect, Annotated[float, Field(ge=0, le=15)]] = Field(
+        default_factory=dict,
+        description=(
+            "Per-aspect orb overrides (degrees) for Ptolemaic pattern matching, e.g. `{\"trine\": 8}`. "
+            "Defaults: conjunction/square/trine/opposition 6, sextile 4, quincunx 3, sesquiquadrate 2."
+        ),
+        examples=[{"trine": 8, "quincunx": 2}],
+    )
 
 
 class AspectPointSummary(BaseModel):
@@ -224,6 +240,18 @@ class NormalAspectEntry(BaseModel):
     raw: dict = Field(default_factory=dict, description="Raw aspect payload from Kerykeion.")
 
 
+class CrossAspectEntry(BaseModel):
+    """
+    Compact transit-to-natal aspect within a range snapshot.
+    """
+
+    transit: str = Field(..., description="Transit point key, e.g. mars.")
+    natal: str = Field(..., description="Natal point key, e.g. sun.")
+    aspect: str = Field(..., description="Ptolemaic aspect name (conjunction, sextile, square, trine, opposition).")
+    orb: float = Field(..., description="Distance from the exact aspect angle in degrees.")
+    applying: bool = Field(..., description="True while the transit point is moving towards exactness.")
+
+
 class NatalRequest(BaseModel):
     """
     Request payload for a natal chart computation.
@@ -423,6 +451,17 @@ class TransitSnapshot(BaseModel):
         default=None,
         description="High-level Ptolemaic configurations for the natal subject when provided.",
     )
+    cross_major_aspects: Optional[List[PtolemaicPatternAspect]] = Field(
+        default=None,
+        description=(
+            "Ptolemaic configurations spanning natal and transit points (`/transit` with `birth` only); "
+            "points are keyed `natal.<point>` / `transit.<point>`."
+        ),
+    )
+    cross_aspects: Optional[List[CrossAspectEntry]] = Field(
+        default=None,
+        description="Transit-to-natal Ptolemaic aspects between active points (ranges with `birth` only), tightest first.",
+    )
 
 
 class TransitResponse(BaseModel):
@@ -451,9 +490,19 @@ class TransitRangeRequest(BaseModel):
     )
     granularity: RangeGranularity = Field(
         default=RangeGranularity.HOUR,
-        description="Step size used to sample the range (minute, hour, day, month).",
+        description=(
+            "Step size used to sample the range (minute, hour, day, week, month, or custom "
+            "`step_minutes`). Fixed-size steps are taken in UTC, so DST transitions neither "
+            "repeat nor skip samples."
+        ),
         examples=[RangeGranularity.HOUR],
     )
+    step_minutes: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Step size in minutes; required when `granularity` is `custom`.",
+        examples=[15],
+    )
     birth: Optional[BirthData] = Field(
         default=None,
         description="Optional natal birth chart. When present, each snapshot includes `natal_subject`.",
@@ -462,6 +511,38 @@ class TransitRangeRequest(BaseModel):
         default_factory=ChartConfig,
         description="Chart configuration shared across all snapshots.",
     )
+    output: RangeOutput = Field(
+        default=RangeOutput.SNAPSHOTS,
+        description=(
+            "`snapshots` returns every snapshot; `patterns` returns only the Ptolemaic pattern "
+            "lifecycles (each occurrence once, with start/end/tightest timestamps); `both` returns both."
+        ),
+        examples=[RangeOutput.PATTERNS],
+    )
+
+
+class PatternLifecycle(BaseModel):
+    """
+    One uninterrupted occurrence of a Ptolemaic pattern within a transit range.
+    """
+
+    id: str = Field(..., description="Pattern identifier, e.g., grand_trine.")
+    name: str = Field(..., description="Pattern display name.")
+    points: list[str] = Field(
+        ...,
+        description="Sorted point keys; with `birth`, `natal.<point>` / `transit.<point>` for cross-chart patterns.",
+    )
+    start: Optional[datetime] = Field(
+        default=None,
+        description="First step the pattern was present at; null when already formed at the range start.",
+    )
+    end: Optional[datetime] = Field(
+        default=None,
+        description="First step the pattern was gone again; null when still formed at the range end.",
+    )
+    tightest: datetime = Field(..., description="Step at which the pattern was closest to exact.")
+    tightest_orb: float = Field(..., description="Orb of the loosest link at the tightest step, in degrees.")
+    steps: int = Field(..., description="Number of range steps the pattern was present at.")
 
 
 class TransitRangeResponse(BaseModel):
@@ -469,7 +550,45 @@ class TransitRangeResponse(BaseModel):
     Response for the /transit-range endpoint.
     """
 
-    snapshots: List[TransitSnapshot]
+    snapshots: List[TransitSnapshot] = Field(
+        default_factory=list,
+        description="Snapshots in range order (empty with `output=patterns`).",
+    )
+    patterns: Optional[List[PatternLifecycle]] = Field(
+        default=None,
+        description="Pattern lifecycles in order of formation (`output=patterns` or `both` only).",
+    )
+
+
+class RangeCostEstimate(BaseModel):
+    """
+    Expected size and cost of a transit range request, computed before executing it.
+    """
+
+    snapshots: int = Field(..., description="Number of snapshots the range will produce.")
+    cost: int = Field(..., description="Cost units charged against the per-user budget (one per subject build).")
+    estimated_cpu_seconds: float = Field(..., description="Approximate CPU time needed to compute the range.")
+    estimated_memory_mb: float = Field(..., description="Approximate peak memory held while building the response.")
+    estimated_response_mb: float = Field(..., description="Approximate size of the serialized JSON response.")
+    max_sync_snapshots: int = Field(..., description="Largest range (in snapshots) answered synchronously.")
+    max_snapshots: int = Field(..., description="Largest range (in snapshots) accepted at all.")
+
+
+class RangeJobStatus(BaseModel):
+    """
+    State of a transit range that was downgraded to a background job.
+    """
+
+    job_id: str = Field(..., description="Opaque identifier of the background job.")
+    status: JobStatus = Field(..., description="Current job state.")
+    created_at: datetime = Field(..., description="When the job was accepted (UTC).")
+    finished_at: Optional[datetime] = Field(default=None, description="When the job finished (UTC).")
+    estimate: RangeCostEstimate = Field(..., description="Cost estimate computed at admission.")
+    result: Optional[TransitRangeResponse] = Field(
+        default=None,
+        description="Transit range result once the job has succeeded.",
+    )
+    error: Optional[str] = Field(default=None, description="Error message when the job failed or its result expired.")
 
 
 class ReportRequest(BaseModel):
@@ -519,6 +638,15 @@ class ReportRequest(BaseModel):
         description="Optional report mode label used for naming/handling PDF downloads.",
         examples=[Mode.NATAL],
     )
+    detail: ReportDetail = Field(
+        default=ReportDetail.STANDARD,
+        description=(
+            "Amount of structured data returned: `summary` (points and aspect summaries), "
+            "`standard` (adds houses and aspect rows) or `full` (adds raw Kerykeion dumps "
+            "and a copy of the Markdown). Does not affect the PDF."
+        ),
+        examples=[ReportDetail.STANDARD],
+    )
 
 
 class SvgPdfRequest(BaseModel):
@@ -553,6 +681,10 @@ class ReportResponse(BaseModel):
         ...,
         description="Structured report data (subjects, houses, aspects) suitable for PDFs.",
     )
+    pdf_base64: Optional[str] = Field(
+        default=None,
+        description="Report PDF, base64-encoded; only set when requested with `include_pdf=true`.",
+    )
 
 
 class RelationshipRequest(BaseModel):
@@ -591,6 +723,10 @@ class RelationshipResponse(BaseModel):
         ...,
         description="Raw DualChartAspectsModel from Kerykeion serialized to JSON.",
     )
+    cross_major_aspects: List[PtolemaicPatternAspect] = Field(
+        default_factory=list,
+        description="Ptolemaic configurations spanning both charts; points are keyed `first.<point>` / `second.<point>`.",
+    )
 
 
 class SynastrySvgRequest(BaseModel):
@@ -618,3 +754,485 @@ class SynastrySvgRequest(BaseModel):
         ),
         examples=[True],
     )
+
+
+class ChartBundleRequest(BaseModel):
+    """
+    Request body for a chart bundle: JSON data, SVG and optionally PDF in one call.
+    """
+
+    mode: Mode = Field(
+        default=Mode.NATAL,
+        description="Chart mode; selects which inputs are required and which data section is filled.",
+        examples=[Mode.NATAL],
+    )
+    birth: Optional[BirthData] = Field(default=None, description="Birth data for natal / inner wheel.")
+    moment: Optional[TransitMomentInput] = Field(default=None, description="Transit moment for transit / outer wheel.")
+    first: Optional[BirthData] = Field(default=None, description="First partner for relationship charts.")
+    second: Optional[BirthData] = Field(default=None, description="Second partner for relationship charts.")
+    config: ChartConfig = Field(default_factory=ChartConfig, description="Chart configuration.")
+    grid_view: bool = Field(default=False, description="Show synastry grid view when mode=relationship.")
+    include_svg: bool = Field(default=True, description="Return the rendered chart SVG in `svg`.")
+    include_pdf: bool = Field(
+        default=False,
+        description="Also render the chart PDF (base64 in `pdf_base64`); charged against the PDF rate limit.",
+    )
+
+
+class ChartBundleResponse(BaseModel):
+    """
+    Chart JSON, SVG and optional PDF, computed by the same functions as the separate endpoints.
+
+    Exactly one of `natal`, `transit` or `relationship` is set, matching `mode`
+    (`transit` for both transit and natal_transit).
+    """
+
+    mode: Mode
+    natal: Optional[NatalResponse] = Field(default=None, description="Same payload as `POST /api/natal`.")
+    transit: Optional[TransitResponse] = Field(default=None, description="Same payload as `POST /api/transit`.")
+    relationship: Optional[RelationshipResponse] = Field(
+        default=None,
+        description="Same payload as `POST /api/relationship`.",
+    )
+    svg: Optional[str] = Field(default=None, description="Same SVG as the matching `POST /api/svg/*` endpoint.")
+    pdf_base64: Optional[str] = Field(default=None, description="Chart PDF, base64-encoded, when requested.")
+
+
+class AspectTimelineRequest(BaseModel):
+    """
+    Transit-to-natal aspect windows between a start moment and an end date/time.
+
+    Location and timezone come from `moment` (as in `TransitRangeRequest`); they
+    only matter for the topocentric perspective and for local timestamps.
+    """
+
+    birth: BirthData = Field(default_factory=BirthData, description="Natal chart the transits are measured against.")
+    moment: TransitMomentInput = Field(
+        default_factory=TransitMomentInput,
+        description="Start moment (date/time/location).",
+    )
+    end: TransitEndInput = Field(
+        default_factory=TransitEndInput,
+        description="End date/time; location and timezone reused from `moment`.",
+    )
+    config: ChartConfig = Field(default_factory=ChartConfig, description="Chart configuration for both charts.")
+    transit_points: Optional[List[str]] = Field(
+        default=None,
+        description="Transiting bodies, e.g. ['Saturn', 'Jupiter']; defaults to the active points with an ephemeris position.",
+        examples=[["Jupiter", "Saturn"]],
+    )
+    natal_points: Optional[List[str]] = Field(
+        default=None,
+        description="Natal points aspected; defaults to the configured active points.",
+        examples=[["Sun", "Moon", "Ascendant"]],
+    )
+    aspects: Optional[List[str]] = Field(
+        default=None,
+        description="Ptolemaic aspects to track (conjunction, sextile, square, trine, opposition); default all.",
+        examples=[["conjunction", "square", "opposition"]],
+    )
+
+
+class AspectWindowEntry(BaseModel):
+    """
+    One period during which a transit body is within orb of an aspect to a natal point.
+    """
+
+    transit: str = Field(..., description="Transit point key, e.g. saturn.")
+    natal: str = Field(..., description="Natal point key, e.g. sun.")
+    aspect: str = Field(..., description="Ptolemaic aspect name.")
+    start: Optional[datetime] = Field(
+        default=None,
+        description="Orb entry (local time); null when already in orb at the start of the range.",
+    )
+    end: Optional[datetime] = Field(
+        default=None,
+        description="Orb exit (local time); null when still in orb at the end of the range.",
+    )
+    exact: List[datetime] = Field(
+        default_factory=list,
+        description="Exact passes (local time); several when a retrograde loop re-crosses the aspect.",
+    )
+    min_orb: float = Field(..., description="Tightest orb within the window in degrees (0 when exact).")
+
+
+class AspectTimelineResponse(BaseModel):
+    """
+    Response for the /aspect-timeline endpoint.
+    """
+
+    start: datetime = Field(..., description="Local start of the searched range.")
+    end: datetime = Field(..., description="Local end of the searched range.")
+    windows: List[AspectWindowEntry] = Field(default_factory=list, description="In-orb windows ordered by start.")
+
+
+class SkyEvent(BaseModel):
+    """
+    Location-independent sky event from the global calendar.
+    """
+
+    timestamp: datetime = Field(..., description="Event time in the requested timezone.")
+    kind: SkyEventKind = Field(..., description="ingress, station, lunation or eclipse.")
+    body: str = Field(..., description="Point key: the moving body, `moon` for lunations, `sun`/`moon` for solar/lunar eclipses.")
+    label: str = Field(
+        ...,
+        description=(
+            "direct/retrograde (ingress motion or station direction), new_moon/full_moon, "
+            "or the eclipse type (total, annular, hybrid, partial, penumbral)."
+        ),
+    )
+    sign: Optional[str] = Field(default=None, description="Sign entered (ingress) or occupied by the body.")
+    from_sign: Optional[str] = Field(default=None, description="Sign left, for ingresses.")
+    longitude: Optional[float] = Field(default=None, description="Ecliptic longitude of the body at the event.")
+
+
+class SkyEventsResponse(BaseModel):
+    """
+    Response for the /sky-events endpoint.
+    """
+
+    calendar: str = Field(..., description="Calendar served, e.g. `tropic` or `sidereal_krishnamurti`.")
+    start: datetime = Field(..., description="Inclusive start of the queried range.")
+    end: datetime = Field(..., description="Exclusive end of the queried range.")
+    built_years: List[int] = Field(
+        default_factory=list,
+        description="Years computed on demand for this request because the batch job had not built them.",
+    )
+    events: List[SkyEvent] = Field(default_factory=list, description="Events ordered by time.")
+
+
+class ReturnRequest(BaseModel):
+    """
+    Planetary return search: when a transiting body comes back to its natal longitude.
+
+    The period runs from `moment` to `end`; return charts are cast at the
+    location of `moment` (relocated returns use a different location there).
+    """
+
+    birth: BirthData = Field(default_factory=BirthData, description="Natal chart providing the natal longitude.")
+    body: str = Field(
+        default="Sun",
+        description="Returning body: Sun (solar return), Moon (lunar return) or any other ephemeris body.",
+        examples=["Sun", "Moon", "Saturn"],
+    )
+    moment: TransitMomentInput = Field(
+        default_factory=TransitMomentInput,
+        description="Start of the searched period, and the location the return charts are cast for.",
+    )
+    end: TransitEndInput = Field(
+        default_factory=lambda: TransitEndInput(year=2026, month=1, day=1, hour=0, minute=0),
+        description="End of the searched period; timezone reused from `moment`.",
+    )
+    config: ChartConfig = Field(default_factory=ChartConfig, description="Chart configuration for all charts.")
+    include_chart: bool = Field(
+        default=True,
+        description="Build the full return chart for every return (otherwise only the exact moments).",
+    )
+
+
+class ReturnChart(BaseModel):
+    """
+    One exact return and, optionally, the chart cast for it.
+    """
+
+    timestamp: datetime = Field(..., description="Exact return moment (local time of `moment`, to the second).")
+    chart: Optional[NatalResponse] = Field(
+        default=None,
+        description="Return chart (subject, aspects, patterns) cast for the return minute at the requested location.",
+    )
+
+
+class ReturnResponse(BaseModel):
+    """
+    Response for the /returns endpoint.
+    """
+
+    body: str = Field(..., description="Point key of the returning body.")
+    natal_longitude: float = Field(..., description="Natal ecliptic longitude the body returns to.")
+    returns: List[ReturnChart] = Field(
+        default_factory=list,
+        description="Returns in time order; retrograde planets may return several times in a row.",
+    )
+
+
+class ProgressionRequest(BaseModel):
+    """
+    Progressed (or solar-arc directed) chart over a range of target dates.
+
+    `moment` / `end` are real dates; each is mapped to its progressed moment
+    (one day after birth per year of life). Only the timezone of `moment` is
+    used, for local timestamps; positions are computed for the birth place.
+    """
+
+    birth: BirthData = Field(default_factory=BirthData, description="Natal chart that is progressed.")
+    moment: TransitMomentInput = Field(
+        default_factory=TransitMomentInput,
+        description="Start of the target date range.",
+    )
+    end: TransitEndInput = Field(
+        default_factory=lambda: TransitEndInput(year=2035, month=1, day=1, hour=0, minute=0),
+        description="End of the target date range; timezone reused from `moment`.",
+    )
+    config: ChartConfig = Field(default_factory=ChartConfig, description="Chart configuration for both charts.")
+    points: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Progressed / directed points; defaults to the active points with an ephemeris position "
+            "(secondary) or all active points including angles (solar arc)."
+        ),
+        examples=[["Sun", "Moon", "Venus"]],
+    )
+    natal_points: Optional[List[str]] = Field(
+        default=None,
+        description="Natal points aspected; defaults to the configured active points.",
+        examples=[["Sun", "Moon", "Ascendant"]],
+    )
+    aspects: Optional[List[str]] = Field(
+        default=None,
+        description="Ptolemaic aspects to track (conjunction, sextile, square, trine, opposition); default all.",
+        examples=[["conjunction", "square", "opposition"]],
+    )
+    orb: float = Field(1.0, gt=0, le=5, description="Orb in degrees for progressed-to-natal aspects.")
+
+
+class ProgressedPosition(BaseModel):
+    """
+    Progressed or directed position of one point at the start of the range.
+    """
+
+    point: str = Field(..., description="Point key, e.g. moon.")
+    longitude: float = Field(..., description="Ecliptic longitude in degrees.")
+    sign: str = Field(..., description="Sign short code, e.g. Ari.")
+    retrograde: bool = Field(False, description="Progressed motion is retrograde (secondary progressions only).")
+
+
+class ProgressedAspect(BaseModel):
+    """
+    Progressed-to-natal aspect becoming exact.
+    """
+
+    timestamp: datetime = Field(..., description="Target date (local time) on which the aspect perfects.")
+    progressed: str = Field(..., description="Progressed / directed point key.")
+    natal: str = Field(..., description="Natal point key.")
+    aspect: str = Field(..., description="Ptolemaic aspect name.")
+
+
+class ProgressedSignChange(BaseModel):
+    """
+    Progressed / directed point entering a new sign.
+    """
+
+    timestamp: datetime = Field(..., description="Target date (local time) of the ingress.")
+    point: str = Field(..., description="Point key.")
+    sign: str = Field(..., description="Sign entered.")
+    from_sign: str = Field(..., description="Sign left.")
+    retrograde: bool = Field(False, description="Ingress by retrograde motion.")
+
+
+class ProgressionResponse(BaseModel):
+    """
+    Response for the /progressions and /solar-arc endpoints.
+    """
+
+    method: ProgressionMethod = Field(..., description="secondary or solar_arc.")
+    start: datetime = Field(..., description="Local start of the target range.")
+    end: datetime = Field(..., description="Local end of the target range.")
+    progressed_start: datetime = Field(..., description="Progressed moment (UTC) corresponding to `start`.")
+    solar_arc: float = Field(..., description="Solar arc in degrees at `start` (progressed minus natal Sun).")
+    positions: List[ProgressedPosition] = Field(default_factory=list, description="Positions at `start`.")
+    perfections: List[ProgressedAspect] = Field(default_factory=list, description="Exact aspects in time order.")
+    sign_changes: List[ProgressedSignChange] = Field(default_factory=list, description="Ingresses in time order.")
+
+
+class AstroCartographyRequest(BaseModel):
+    """
+    Astrocartography (relocation map) lines for a birth moment.
+
+    Only the moment of `birth` matters; its location is ignored.
+    """
+
+    birth: BirthData = Field(default_factory=BirthData, description="Birth moment (date, time, timezone).")
+    config: ChartConfig = Field(default_factory=ChartConfig, description="Active points and perspective.")
+    points: Optional[List[str]] = Field(
+        default=None,
+        description="Planets to draw; defaults to the active points with an ephemeris position.",
+        examples=[["Sun", "Venus", "Jupiter"]],
+    )
+    lat_step: float = Field(1.0, ge=0.1, le=5.0, description="Latitude sampling of the ASC/DSC curves, in degrees.")
+    max_latitude: float = Field(80.0, gt=0.0, lt=90.0, description="Lines are drawn between ±max_latitude.")
+    geojson: bool = Field(False, description="Also return the lines as a GeoJSON FeatureCollection.")
+
+
+class AstroCartographyPoint(BaseModel):
+    """
+    Equatorial position of one planet at the birth moment.
+    """
+
+    point: str = Field(..., description="Point key, e.g. venus.")
+    right_ascension: float = Field(..., description="Right ascension in degrees.")
+    declination: float = Field(..., description="Declination in degrees.")
+
+
+class AstroCartographyLine(BaseModel):
+    """
+    Where on Earth a planet is on one angle, as [lng, lat] polylines.
+
+    Lines are split at the antimeridian, so one line may have several segments.
+    """
+
+    point: str = Field(..., description="Point key.")
+    angle: AngleLine = Field(..., description="ASC (rising), DSC (setting), MC or IC.")
+    segments: List[List[List[float]]] = Field(default_factory=list, description="Polylines of [lng, lat] pairs.")
+
+
+class AstroCartographyResponse(BaseModel):
+    """
+    Response for the /astrocartography endpoint.
+    """
+
+    julian_day: float = Field(..., description="Julian day (UT) of the birth moment.")
+    sidereal_time: float = Field(..., description="Greenwich apparent sidereal time in degrees.")
+    points: List[AstroCartographyPoint] = Field(default_factory=list, description="Equatorial positions used.")
+    lines: List[AstroCartographyLine] = Field(default_factory=list, description="Four lines per planet.")
+    geojson: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="GeoJSON FeatureCollection of MultiLineStrings (when requested).",
+    )
+
+
+class RelocationLocation(BaseModel):
+    """
+    One candidate location for a relocated chart.
+    """
+
+    name: Optional[str] = Field(default=None, description="Optional label, e.g. a city name.", examples=["Lisbon"])
+    lat: float = Field(..., ge=-90, le=90, description="Latitude in decimal degrees (North positive).", examples=[38.72])
+    lng: float = Field(..., ge=-180, le=180, description="Longitude in decimal degrees (East positive).", examples=[-9.14])
+
+
+class RelocationRequest(BaseModel):
+    """
+    One birth moment relocated to many places.
+
+    Only the moment of `birth` is used; its location is replaced by each entry of `locations`.
+    """
+
+    birth: BirthData = Field(default_factory=BirthData, description="Birth moment (date, time, timezone).")
+    locations: List[RelocationLocation] = Field(..., min_length=1, description="Candidate locations.")
+    config: ChartConfig = Field(default_factory=ChartConfig, description="House system, zodiac and active points.")
+    points: Optional[List[str]] = Field(
+        default=None,
+        description="Planets placed in houses; defaults to the active points with an ephemeris position.",
+        examples=[["Sun", "Moon", "Venus"]],
+    )
+
+
+class RelocatedChart(BaseModel):
+    """
+    Angles, cusps and house placements of the birth moment at one location.
+    """
+
+    name: Optional[str] = Field(default=None, description="Label of the location.")
+    lat: float = Field(..., description="Latitude of the location.")
+    lng: float = Field(..., description="Longitude of the location.")
+    ascendant: float = Field(..., description="Ascendant longitude in degrees.")
+    medium_coeli: float = Field(..., description="Midheaven longitude in degrees.")
+    descendant: float = Field(..., description="Descendant longitude in degrees.")
+    imum_coeli: float = Field(..., description="Imum Coeli longitude in degrees.")
+    cusps: List[float] = Field(..., description="Longitudes of the 12 house cusps.")
+    houses: Dict[str, int] = Field(..., description="House number (1-12) per point key.")
+    positions: Optional[Dict[str, float]] = Field(
+        default=None,
+        description="Point longitudes seen from this location (topocentric perspective only).",
+    )
+
+
+class RelocationResponse(BaseModel):
+    """
+    Response for the /relocation endpoint.
+    """
+
+    julian_day: float = Field(..., description="Julian day (UT) of the birth moment.")
+    positions: Dict[str, float] = Field(
+        ...,
+        description="Point longitudes shared by all locations (seen from the birth place when topocentric).",
+    )
+    charts: List[RelocatedChart] = Field(default_factory=list, description="One chart per location, in request order.")
+
+
+class ConfigComparisonRequest(BaseModel):
+    """
+    One birth chart computed under several chart configurations.
+    """
+
+    birth: BirthData = Field(default_factory=BirthData, description="Birth data shared by all variants.")
+    configs: List[ChartConfig] = Field(
+        ...,
+        min_length=1,
+        description="Configuration variants, e.g. several house systems or tropical vs sidereal.",
+        examples=[
+            [
+                {"zodiac_type": "Tropic", "house_system": "P"},
+                {"zodiac_type": "Sidereal", "sidereal_mode": "LAHIRI", "house_system": "W"},
+            ]
+        ],
+    )
+
+
+class ComparedPoint(BaseModel):
+    """
+    One point of a compared chart.
+    """
+
+    point: str = Field(..., description="Point key, e.g. sun.")
+    abs_pos: float = Field(..., description="Absolute ecliptic longitude (0-360 degrees).")
+    sign: str = Field(..., description="Three-letter sign code.")
+    position: float = Field(..., description="Position within the sign (0-30 degrees).")
+    house: int = Field(..., description="House number (1-12).")
+    retrograde: bool = Field(False, description="Apparent retrograde motion.")
+
+
+class ComparedChart(BaseModel):
+    """
+    The birth chart under one configuration variant.
+    """
+
+    config: ChartConfig = Field(..., description="Normalized configuration of this variant.")
+    ayanamsa: Optional[float] = Field(default=None, description="Ayanamsa in degrees (sidereal variants only).")
+    cusps: List[float] = Field(..., description="Longitudes of the 12 house cusps.")
+    points: List[ComparedPoint] = Field(default_factory=list, description="Active points in configuration order.")
+
+
+class ConfigComparisonResponse(BaseModel):
+    """
+    Response for the /natal/compare endpoint.
+    """
+
+    julian_day: float = Field(..., description="Julian day (UT) of the birth moment.")
+    charts: List[ComparedChart] = Field(default_factory=list, description="One chart per variant, in request order.")
+
+
+class LiveSkyLocation(BaseModel):
+    """
+    Observer location of a live-sky channel; adds houses and angles to the updates.
+    """
+
+    lat: float = Field(..., ge=-90, le=90, description="Latitude in decimal degrees (North positive).", examples=[52.3676])
+    lng: float = Field(..., ge=-180, le=180, description="Longitude in decimal degrees (East positive).", examples=[4.9041])
+    tz_str: str = Field("UTC", description="IANA timezone for update timestamps.", examples=["Europe/Amsterdam"])
+
+
+class LiveSkySubscription(BaseModel):
+    """
+    Client message on the live-sky WebSocket: join a (config, location) channel or leave it.
+    """
+
+    action: LiveSkyAction = Field(
+        default=LiveSkyAction.SUBSCRIBE,
+        description="`subscribe` joins the channel (leaving any previous one); `unsubscribe` leaves it.",
+    )
+    config: ChartConfig = Field(default_factory=ChartConfig, description="Zodiac, perspective and active points.")
+    location: Optional[LiveSkyLocation] = Field(
+        default=None,
+        description="Optional observer; without it updates carry only location-independent points.",
+    )
@@ -0,0 +1,408 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+import swisseph as swe  # type: ignore
+
+from aspects.timeline import find_sign_ingresses, refine_roots
+from enums import Perspective, SiderealMode, SkyEventKind, ZodiacType
+from ephemeris import SWE_BODIES, body_positions, ephemeris_flags, grid_step_days, julian_day
+from schemas import ChartConfig
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# SQLite file holding every calendar; created on first use.
+SKY_EVENTS_DB = Path(os.getenv("SKY_EVENTS_DB", str(BASE_DIR / "data" / "sky_events.sqlite3")))
+# Default span built by the batch job.
+SKY_EVENTS_START_YEAR = int(os.getenv("SKY_EVENTS_START_YEAR", "1950"))
+SKY_EVENTS_END_YEAR = int(os.getenv("SKY_EVENTS_END_YEAR", "2050"))
+# Years a single request may compute on demand when the batch job has not covered them.
+SKY_EVENTS_MAX_ON_DEMAND_YEARS = int(os.getenv("SKY_EVENTS_MAX_ON_DEMAND_YEARS", "5"))
+
+SIGNS = ("Ari", "Tau", "Gem", "Can", "Leo", "Vir", "Lib", "Sco", "Sag", "Cap", "Aqu", "Pis")
+INGRESS_BODIES = (
+    "sun",
+    "moon",
+    "mercury",
+    "venus",
+    "mars",
+    "jupiter",
+    "saturn",
+    "uranus",
+    "neptune",
+    "pluto",
+    "mean_north_lunar_node",
+    "chiron",
+)
+STATION_BODIES = ("mercury", "venus", "mars", "jupiter", "saturn", "uranus", "neptune", "pluto", "chiron")
+
+_TOLERANCE_DAYS = 1.0 / 1440.0
+
+_SOLAR_ECLIPSE_TYPES = (
+    (swe.ECL_ANNULAR_TOTAL, "hybrid"),
+    (swe.ECL_TOTAL, "total"),
+    (swe.ECL_ANNULAR, "annular"),
+    (swe.ECL_PARTIAL, "partial"),
+)
+_LUNAR_ECLIPSE_TYPES = (
+    (swe.ECL_TOTAL, "total"),
+    (swe.ECL_PARTIAL, "partial"),
+    (swe.ECL_PENUMBRAL, "penumbral"),
+)
+
+
+@dataclass(frozen=True)
+class SkyEventRecord:
+    """
+    One calendar event at Julian day `jd` (UT).
+
+    `label` qualifies the kind: ingress / station direction, lunation phase or
+    eclipse type. `sign` / `longitude` locate the body at the event.
+    """
+
+    jd: float
+    kind: str
+    body: str
+    label: str
+    sign: Optional[str] = None
+    from_sign: Optional[str] = None
+    longitude: Optional[float] = None
+
+
+def calendar_config(zodiac_type: ZodiacType, sidereal_mode: Optional[SiderealMode]) -> tuple[str, ChartConfig]:
+    """
+    Calendar key and geocentric ChartConfig for a zodiac.
+
+    Topocentric corrections are deliberately ignored: calendars are shared by
+    every location.
+    """
+    if zodiac_type == ZodiacType.TROPIC:
+        cfg = ChartConfig(perspective=Perspective.APPARENT_GEOCENTRIC, zodiac_type=ZodiacType.TROPIC, sidereal_mode=None)
+        return "tropic", cfg
+    mode = sidereal_mode or SiderealMode.KRISHNAMURTI
+    cfg = ChartConfig(perspective=Perspective.APPARENT_GEOCENTRIC, zodiac_type=ZodiacType.SIDEREAL, sidereal_mode=mode)
+    return f"sidereal_{mode.value.lower()}", cfg
+
+
+def all_calendars() -> list[tuple[str, ChartConfig]]:
+    """Every calendar the API can serve: tropical plus one per supported ayanamsa."""
+    return [calendar_config(ZodiacType.TROPIC, None)] + [
+        calendar_config(ZodiacType.SIDEREAL, mode) for mode in SiderealMode
+    ]
+
+
+def year_bounds(year: int) -> tuple[float, float]:
+    """Julian days of January 1st 00:00 UTC of `year` and of the following year."""
+    return (
+        julian_day(datetime(year, 1, 1, tzinfo=timezone.utc)),
+        julian_day(datetime(year + 1, 1, 1, tzinfo=timezone.utc)),
+    )
+
+
+def _wrap(values: np.ndarray) -> np.ndarray:
+    return (values + 180.0) % 360.0 - 180.0
+
+
+def _sign(longitude: float) -> str:
+    return SIGNS[int(longitude % 360.0 // 30.0)]
+
+
+def _grid(start_jd: float, end_jd: float, step: float) -> np.ndarray:
+    return np.linspace(start_jd, end_jd, max(2, int(np.ceil((end_jd - start_jd) / step)) + 1))
+
+
+def _body_events(body: str, start_jd: float, end_jd: float, cfg: ChartConfig) -> list[SkyEventRecord]:
+    """Sign ingresses (and, for planets, stations) of one body in `[start_jd, end_jd)`."""
+    grid = _grid(start_jd, end_jd, grid_step_days(body))
+    lon, speed = (a[:, 0] for a in body_positions(grid, [body], cfg))
+    events: list[SkyEventRecord] = []
+
+    def positions(t: np.ndarray, name: str = body) -> tuple[np.ndarray, np.ndarray]:
+        lon_t, speed_t = body_positions(t, [name], cfg)
+        return lon_t[:, 0], speed_t[:, 0]
+
+    if body in INGRESS_BODIES:
+        for ingress in find_sign_ingresses(positions, body, grid, lon, _TOLERANCE_DAYS):
+            events.append(
+                SkyEventRecord(
+                    jd=ingress.jd,
+                    kind=SkyEventKind.INGRESS.value,
+                    body=body,
+                    label="direct" if ingress.forward else "retrograde",
+                    sign=SIGNS[ingress.sign],
+                    from_sign=SIGNS[ingress.from_sign],
+                    longitude=float((ingress.sign if ingress.forward else ingress.from_sign) * 30),
+                )
+            )
+
+    if body in STATION_BODIES:
+        (steps,) = np.nonzero(np.sign(speed[1:]) != np.sign(speed[:-1]))
+
+        def station_residual(t: np.ndarray, index: np.ndarray) -> tuple[np.ndarray, None]:
+            return positions(t)[1], None
+
+        roots = refine_roots(station_residual, grid[steps], grid[steps + 1], speed[steps], speed[steps + 1], _TOLERANCE_DAYS)
+        if roots.size:
+            station_lon = positions(roots)[0]
+            for jd, s, station_lon_deg in zip(roots.tolist(), steps.tolist(), station_lon.tolist()):
+                events.append(
+                    SkyEventRecord(
+                        jd=jd,
+                        kind=SkyEventKind.STATION.value,
+                        body=body,
+                        label="retrograde" if speed[s] > 0 else "direct",
+                        sign=_sign(station_lon_deg),
+                        longitude=round(station_lon_deg, 4),
+                    )
+                )
+    return events
+
+
+def _lunations(start_jd: float, end_jd: float, cfg: ChartConfig) -> list[SkyEventRecord]:
+    """New and full moons in `[start_jd, end_jd)`."""
+    grid = _grid(start_jd, end_jd, grid_step_days("moon"))
+    lon, _ = body_positions(grid, ["sun", "moon"], cfg)
+    elongation = lon[:, 1] - lon[:, 0]
+    events: list[SkyEventRecord] = []
+    for phase, angle in (("new_moon", 0.0), ("full_moon", 180.0)):
+        distance = _wrap(elongation - angle)
+        # Zero crossings only; the +-180 wrap of the distance is skipped.
+        near = np.abs(distance) < 90.0
+        (steps,) = np.nonzero((np.sign(distance[1:]) != np.sign(distance[:-1])) & near[1:] & near[:-1])
+
+        def residual(t: np.ndarray, index: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+            lon_t, speed_t = body_positions(t, ["sun", "moon"], cfg)
+            return _wrap(lon_t[:, 1] - lon_t[:, 0] - angle), speed_t[:, 1] - speed_t[:, 0]
+
+        roots = refine_roots(residual, grid[steps], grid[steps + 1], distance[steps], distance[steps + 1], _TOLERANCE_DAYS)
+        if roots.size:
+            moon_lon = body_positions(roots, ["moon"], cfg)[0][:, 0]
+            for jd, moon in zip(roots.tolist(), moon_lon.tolist()):
+                events.append(
+                    SkyEventRecord(
+                        jd=jd,
+                        kind=SkyEventKind.LUNATION.value,
+                        body="moon",
+                        label=phase,
+                        sign=_sign(moon),
+                        longitude=round(moon, 4),
+                    )
+                )
+    return events
+
+
+def _eclipse_label(flags: int, types: Sequence[tuple[int, str]]) -> str:
+    for bit, label in types:
+        if flags & bit:
+            return label
+    return "partial"
+
+
+def _eclipses(start_jd: float, end_jd: float, cfg: ChartConfig) -> list[SkyEventRecord]:
+    """Solar and lunar eclipses (time of greatest eclipse) in `[start_jd, end_jd)`."""
+    events: list[SkyEventRecord] = []
+    with ephemeris_flags(cfg) as flags:
+        for body, search, types in (
+            ("sun", swe.sol_eclipse_when_glob, _SOLAR_ECLIPSE_TYPES),
+            ("moon", swe.lun_eclipse_when, _LUNAR_ECLIPSE_TYPES),
+        ):
+            jd = start_jd
+            while True:
+                result, times = search(jd, swe.FLG_SWIEPH)
+                maximum = times[0]
+                if maximum >= end_jd:
+                    break
+                longitude = swe.calc_ut(maximum, SWE_BODIES[body], flags)[0][0]
+                events.append(
+                    SkyEventRecord(
+                        jd=maximum,
+                        kind=SkyEventKind.ECLIPSE.value,
+                        body=body,
+                        label=_eclipse_label(result, types),
+                        sign=_sign(longitude),
+                        longitude=round(longitude, 4),
+                    )
+                )
+                jd = maximum + 1.0
+    return events
+
+
+def compute_year_events(year: int, cfg: ChartConfig) -> list[SkyEventRecord]:
+    """Every calendar event of `year` (UTC) for the zodiac of `cfg`, ordered by time."""
+    start_jd, end_jd = year_bounds(year)
+    events: list[SkyEventRecord] = []
+    for body in dict.fromkeys(INGRESS_BODIES + STATION_BODIES):
+        events.extend(_body_events(body, start_jd, end_jd, cfg))
+    events.extend(_lunations(start_jd, end_jd, cfg))
+    events.extend(_eclipses(start_jd, end_jd, cfg))
+    # A root refined onto the year boundary belongs to the following year.
+    return sorted((e for e in events if start_jd <= e.jd < end_jd), key=lambda e: e.jd)
+
+
+class SkyEventStore:
+    """
+    SQLite-backed event calendars, indexed by `(calendar, jd)` for range queries.
+
+    `sky_event_years` records which (calendar, year) pairs are complete, so a
+    partially built calendar never serves a year with missing events.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._write_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.path), timeout=30.0)
+        if not self._initialized:
+            with connection:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS sky_events ("
+                    " calendar TEXT NOT NULL, jd REAL NOT NULL, kind TEXT NOT NULL, body TEXT NOT NULL,"
+                    " label TEXT NOT NULL, sign TEXT, from_sign TEXT, longitude REAL)"
+                )
+                connection.execute("CREATE INDEX IF NOT EXISTS sky_events_calendar_jd ON sky_events (calendar, jd)")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS sky_event_years ("
+                    " calendar TEXT NOT NULL, year INTEGER NOT NULL, built_at REAL NOT NULL,"
+                    " PRIMARY KEY (calendar, year))"
+                )
+            self._initialized = True
+        return connection
+
+    def covered_years(self, calendar: str) -> set[int]:
+        connection = self._connect()
+        try:
+            rows = connection.execute("SELECT year FROM sky_event_years WHERE calendar = ?", (calendar,)).fetchall()
+        finally:
+            connection.close()
+        return {row[0] for row in rows}
+
+    def store_year(self, calendar: str, year: int, events: Iterable[SkyEventRecord]) -> None:
+        """Replace one year of a calendar atomically."""
+        start_jd, end_jd = year_bounds(year)
+        rows = [
+            (calendar, e.jd, e.kind, e.body, e.label, e.sign, e.from_sign, e.longitude)
+            for e in events
+        ]
+        with self._write_lock:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.execute(
+                        "DELETE FROM sky_events WHERE calendar = ? AND jd >= ? AND jd < ?",
+                        (calendar, start_jd, end_jd),
+                    )
+                    connection.executemany("INSERT INTO sky_events VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                    connection.execute(
+                        "INSERT OR REPLACE INTO sky_event_years VALUES (?, ?, ?)",
+                        (calendar, year, time.time()),
+                    )
+            finally:
+                connection.close()
+
+    def ensure_years(self, calendar: str, cfg: ChartConfig, years: Iterable[int], max_missing: int) -> list[int]:
+        """
+        Compute and store the requested years the batch job has not built yet.
+
+        Returns the years that were built. Raises `ValueError` when more than
+        `max_missing` years are missing.
+        """
+        missing = sorted(set(years) - self.covered_years(calendar))
+        if len(missing) > max_missing:
+            raise ValueError(
+                f"{len(missing)} year(s) of the {calendar} calendar are not built yet "
+                f"(at most {max_missing} are computed per request); run `python sky_events.py`."
+            )
+        for year in missing:
+            self.store_year(calendar, year, compute_year_events(year, cfg))
+        return missing
+
+    def query(
+        self,
+        calendar: str,
+        start_jd: float,
+        end_jd: float,
+        kinds: Optional[Sequence[str]] = None,
+        bodies: Optional[Sequence[str]] = None,
+    ) -> list[SkyEventRecord]:
+        """Events of `calendar` with `start_jd <= jd < end_jd`, ordered by time (index range scan)."""
+        sql = (
+            "SELECT jd, kind, body, label, sign, from_sign, longitude FROM sky_events"
+            " WHERE calendar = ? AND jd >= ? AND jd < ?"
+        )
+        params: list = [calendar, start_jd, end_jd]
+        if kinds:
+            sql += f" AND kind IN ({', '.join('?' * len(kinds))})"
+            params.extend(kinds)
+        if bodies:
+            sql += f" AND body IN ({', '.join('?' * len(bodies))})"
+            params.extend(bodies)
+        connection = self._connect()
+        try:
+            rows = connection.execute(sql + " ORDER BY jd", params).fetchall()
+        finally:
+            connection.close()
+        return [SkyEventRecord(*row) for row in rows]
+
+    def stats(self) -> dict:
+        """Per-calendar year coverage and event counts."""
+        if not self.path.exists():
+            return {"path": str(self.path), "calendars": {}}
+        connection = self._connect()
+        try:
+            years = connection.execute(
+                "SELECT calendar, COUNT(*), MIN(year), MAX(year) FROM sky_event_years GROUP BY calendar"
+            ).fetchall()
+            counts = dict(connection.execute("SELECT calendar, COUNT(*) FROM sky_events GROUP BY calendar").fetchall())
+        finally:
+            connection.close()
+        return {
+            "path": str(self.path),
+            "calendars": {
+                calendar: {"years": n, "first_year": first, "last_year": last, "events": counts.get(calendar, 0)}
+                for calendar, n, first, last in years
+            },
+        }
+
+
+sky_event_store = SkyEventStore(SKY_EVENTS_DB)
+
+
+def build_calendars(start_year: int, end_year: int, calendars: Optional[Sequence[str]] = None, force: bool = False) -> None:
+    """Batch job: build (or complete) the calendars for `start_year..end_year` inclusive."""
+    for key, cfg in all_calendars():
+        if calendars and key not in calendars:
+            continue
+        covered = set() if force else sky_event_store.covered_years(key)
+        started = time.perf_counter()
+        built = 0
+        for year in range(start_year, end_year + 1):
+            if year in covered:
+                continue
+            sky_event_store.store_year(key, year, compute_year_events(year, cfg))
+            built += 1
+        print(f"sky events: {key} built {built} year(s) in {time.perf_counter() - started:.1f}s")
+
+
+# Offline batch job, e.g. `python sky_events.py --start-year 1950 --end-year 2050`.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the sky-event calendars.")
+    parser.add_argument("--start-year", type=int, default=SKY_EVENTS_START_YEAR)
+    parser.add_argument("--end-year", type=int, default=SKY_EVENTS_END_YEAR)
+    parser.add_argument("--calendar", action="append", help="Calendar key (e.g. tropic, sidereal_lahiri); default all.")
+    parser.add_argument("--force", action="store_true", help="Rebuild years that are already stored.")
+    args = parser.parse_args()
+    build_calendars(args.start_year, args.end_year, args.calendar, force=args.force)
@@ -0,0 +1,199 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from fastapi import HTTPException
+
+import admission
+from admission import CostBudget, RangeJobStore, admit_range_request, estimate_range_cost, submit_range_job
+from cancellation import check_cancelled
+from enums import JobStatus, RangeGranularity, RangeOutput
+from schemas import (
+    BirthData,
+    RangeCostEstimate,
+    TransitEndInput,
+    TransitMomentInput,
+    TransitRangeRequest,
+    TransitRangeResponse,
+)
+
+
+def _estimate(memory_mb: float = 1.0) -> RangeCostEstimate:
+    return RangeCostEstimate(
+        snapshots=1,
+        cost=1,
+        estimated_cpu_seconds=1.0,
+        estimated_memory_mb=memory_mb,
+        estimated_response_mb=memory_mb,
+        max_sync_snapshots=1,
+        max_snapshots=1,
+    )
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.01)
+
+
+class TestCostBudget(unittest.TestCase):
+    def test_charges_until_limit(self):
+        budget = CostBudget(limit=100, window_seconds=60)
+        self.assertIsNone(budget.try_charge("alice", 60, now=0.0))
+        self.assertIsNone(budget.try_charge("alice", 40, now=1.0))
+        self.assertEqual(budget.remaining("alice", now=2.0), 0)
+        # Other users have their own budget.
+        self.assertIsNone(budget.try_charge("bob", 100, now=2.0))
+
+    def test_retry_after_points_at_first_freeing_entry(self):
+        budget = CostBudget(limit=100, window_seconds=60)
+        budget.try_charge("alice", 60, now=0.0)
+        budget.try_charge("alice", 40, now=10.0)
+        # 50 more only fits once the first (60) entry expires at t=60.
+        self.assertAlmostEqual(budget.try_charge("alice", 50, now=20.0), 40.0)
+        self.assertIsNone(budget.try_charge("alice", 50, now=60.0))
+
+    def test_refund_takes_back_latest_charge(self):
+        budget = CostBudget(limit=100, window_seconds=60)
+        budget.try_charge("alice", 30, now=0.0)
+        budget.try_charge("alice", 50, now=1.0)
+        budget.refund("alice", 50)
+        self.assertEqual(budget.remaining("alice", now=2.0), 70)
+        # Nothing to refund is a no-op.
+        budget.refund("bob", 10)
+        self.assertEqual(budget.remaining("bob", now=2.0), 100)
+
+
+class TestRangeEstimate(unittest.TestCase):
+    def test_snapshot_count_and_natal_cost(self):
+        payload = TransitRangeRequest(
+            moment=TransitMomentInput(year=2025, month=1, day=1, hour=0, minute=0),
+            end=TransitEndInput(year=2025, month=1, day=2, hour=0, minute=0),
+            granularity=RangeGranularity.HOUR,
+            birth=BirthData(),
+        )
+        estimate = estimate_range_cost(payload)
+        self.assertEqual(estimate.snapshots, 25)
+        self.assertEqual(estimate.cost, 26)
+
+    def test_reversed_range_rejected(self):
+        payload = TransitRangeRequest(
+            moment=TransitMomentInput(year=2025, month=1, day=2),
+            end=TransitEndInput(year=2025, month=1, day=1),
+        )
+        with self.assertRaises(HTTPException) as ctx:
+            estimate_range_cost(payload)
+        self.assertEqual(ctx.exception.status_code, 422)
+
+
+    def test_memory_limit_rejects_buffered_but_not_streamed_ranges(self):
+        payload = TransitRangeRequest(
+            moment=TransitMomentInput(year=2025, month=1, day=1, hour=0, minute=0),
+            end=TransitEndInput(year=2025, month=1, day=1, hour=10, minute=0),
+            granularity=RangeGranularity.HOUR,
+        )
+        original = admission.RANGE_MAX_MEMORY_MB
+        admission.RANGE_MAX_MEMORY_MB = 0.5
+        try:
+            with self.assertRaises(HTTPException) as ctx:
+                admit_range_request(payload, "memory-test")
+            self.assertEqual(ctx.exception.status_code, 413)
+            # Streams hold one snapshot at a time; pattern output is a fraction of the size.
+            self.assertEqual(admit_range_request(payload, "memory-test", buffered=False)[1], False)
+            admit_range_request(payload.model_copy(update={"output": RangeOutput.PATTERNS}), "memory-test")
+        finally:
+            admission.RANGE_MAX_MEMORY_MB = original
+
+    def test_job_refused_after_admission_is_refunded(self):
+        budget = CostBudget(limit=100, window_seconds=60)
+        store = RangeJobStore(max_workers=1, max_jobs_per_user=1, ttl_seconds=60)
+        release = threading.Event()
+        store.submit("race-test", _estimate(), lambda cancel_token=None: release.wait(5))
+        self.addCleanup(release.set)
+
+        # The request was admitted (and charged) while a slot looked free; another took it first.
+        budget.try_charge("race-test", 10)
+        with mock.patch.multiple(admission, range_jobs=store, range_budget=budget):
+            with self.assertRaises(HTTPException) as ctx:
+                submit_range_job("race-test", _estimate().model_copy(update={"cost": 10}), TransitRangeResponse)
+        self.assertEqual(ctx.exception.status_code, 429)
+        self.assertEqual(budget.remaining("race-test"), 100)
+
+
+class TestRangeJobStore(unittest.TestCase):
+    def test_cancelled_queued_job_never_runs(self):
+        store = RangeJobStore(max_workers=1, max_jobs_per_user=5, ttl_seconds=60)
+        release = threading.Event()
+        calls = []
+
+        def blocking(cancel_token=None):
+            release.wait(5)
+            return TransitRangeResponse()
+
+        def recorded(cancel_token=None):
+            calls.append(1)
+            return TransitRangeResponse()
+
+        first = store.submit("alice", _estimate(), blocking)
+        queued = store.submit("alice", _estimate(), recorded)
+        _wait_for(lambda: first.status == JobStatus.RUNNING)
+        self.assertEqual(store.cancel("alice", queued.id).status, JobStatus.CANCELLED)
+        release.set()
+        _wait_for(lambda: first.status == JobStatus.SUCCEEDED)
+        store._executor.shutdown(wait=True)
+        self.assertEqual(calls, [])
+        self.assertEqual(queued.status, JobStatus.CANCELLED)
+
+    def test_running_job_is_finalised_by_its_worker(self):
+        store = RangeJobStore(max_workers=1, max_jobs_per_user=1, ttl_seconds=60)
+        started = threading.Event()
+
+        def cancellable(cancel_token=None):
+            started.set()
+            while True:
+                check_cancelled(cancel_token)
+                time.sleep(0.01)
+
+        job = store.submit("alice", _estimate(), cancellable)
+        started.wait(5)
+        store.cancel("alice", job.id)
+        _wait_for(lambda: job.finished_at is not None)
+        self.assertEqual(job.status, JobStatus.CANCELLED)
+        self.assertIsNone(job.result)
+
+    def test_memory_budget_expires_oldest_results(self):
+        store = RangeJobStore(max_workers=1, max_jobs_per_user=5, ttl_seconds=60, memory_mb=100)
+
+        def done(cancel_token=None):
+            return TransitRangeResponse()
+
+        old = store.submit("alice", _estimate(60), done)
+        _wait_for(lambda: old.status == JobStatus.SUCCEEDED)
+        new = store.submit("bob", _estimate(60), done)
+        self.assertEqual(old.status, JobStatus.EXPIRED)
+        self.assertIsNone(old.result)
+        _wait_for(lambda: new.status == JobStatus.SUCCEEDED)
+
+    def test_memory_budget_rejects_when_running_jobs_fill_it(self):
+        store = RangeJobStore(max_workers=1, max_jobs_per_user=5, ttl_seconds=60, memory_mb=100)
+        release = threading.Event()
+
+        def blocking(cancel_token=None):
+            release.wait(5)
+            return TransitRangeResponse()
+
+        store.submit("alice", _estimate(60), blocking)
+        try:
+            with self.assertRaises(HTTPException) as ctx:
+                store.submit("bob", _estimate(60), blocking)
+            self.assertEqual(ctx.exception.status_code, 429)
+            self.assertIn("Retry-After", ctx.exception.headers)
+        finally:
+            release.set()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import math
+import unittest
+
+import numpy as np
+
+from aspects.ptolemaic import PTOLEMAIC_ASPECTS
+from aspects.timeline import find_aspect_windows
+
+CONJUNCTION = tuple(a for a in PTOLEMAIC_ASPECTS if a.name == "conjunction")
+
+
+def linear(jds, body):
+    # 1°/day starting at 0° on day 0.
+    jds = np.asarray(jds, dtype=float)
+    return jds % 360.0, np.ones_like(jds)
+
+
+def looping(jds, body):
+    # Slow forward drift with a retrograde loop: 100° + 0.05 t + 3 sin(2πt/100).
+    jds = np.asarray(jds, dtype=float)
+    lon = 100.0 + 0.05 * jds + 3.0 * np.sin(2 * math.pi * jds / 100.0)
+    speed = 0.05 + 3.0 * 2 * math.pi / 100.0 * np.cos(2 * math.pi * jds / 100.0)
+    return lon % 360.0, speed
+
+
+class TestFindAspectWindows(unittest.TestCase):
+    def test_entry_exact_exit_for_direct_motion(self):
+        windows = find_aspect_windows(linear, ["mars"], {"sun": 50.0}, 0.0, 100.0, {"mars": 1.0}, CONJUNCTION)
+        self.assertEqual(len(windows), 1)
+        window = windows[0]
+        self.assertEqual((window.transit, window.natal, window.aspect), ("mars", "sun", "conjunction"))
+        self.assertAlmostEqual(window.start, 44.0, places=3)
+        self.assertAlmostEqual(window.exact[0], 50.0, places=3)
+        self.assertAlmostEqual(window.end, 56.0, places=3)
+        self.assertEqual(window.min_orb, 0.0)
+
+    def test_sextile_has_two_targets(self):
+        sextile = tuple(a for a in PTOLEMAIC_ASPECTS if a.name == "sextile")
+        windows = find_aspect_windows(linear, ["mars"], {"sun": 180.0}, 0.0, 359.0, {"mars": 1.0}, sextile)
+        self.assertEqual([round(w.exact[0]) for w in windows], [120, 240])
+
+    def test_retrograde_loop_gives_several_exact_passes(self):
+        windows = find_aspect_windows(looping, ["saturn"], {"sun": 101.5}, 0.0, 100.0, {"saturn": 5.0}, CONJUNCTION)
+        self.assertEqual(len(windows), 1)
+        self.assertIsNone(windows[0].start)  # already in orb at day 0
+        self.assertEqual(len(windows[0].exact), 3)
+
+    def test_open_window_at_range_end(self):
+        windows = find_aspect_windows(linear, ["mars"], {"sun": 50.0}, 0.0, 47.0, {"mars": 1.0}, CONJUNCTION)
+        self.assertIsNone(windows[0].end)
+        self.assertEqual(windows[0].exact, [])
+        self.assertAlmostEqual(windows[0].min_orb, 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+import numpy as np
+
+from endpoints.astrocartography import compute_astrocartography, horizon_longitudes, meridian_longitudes
+from enums import AngleLine, Perspective, ZodiacType
+from schemas import AstroCartographyRequest, ChartConfig
+from utils import build_subject
+
+
+class TestLineGeometry(unittest.TestCase):
+    def test_equator_body_rises_a_quarter_turn_east_of_its_meridian(self):
+        ra, dec = np.array([100.0]), np.array([0.0])
+        mc, ic = meridian_longitudes(ra, 40.0)
+        asc, dsc, valid = horizon_longitudes(ra, dec, 40.0, np.array([-60.0, 0.0, 60.0]))
+        self.assertEqual((mc[0], ic[0]), (60.0, -120.0))
+        np.testing.assert_allclose(asc[0], [-30.0] * 3)
+        np.testing.assert_allclose(dsc[0], [150.0] * 3)
+        self.assertTrue(valid.all())
+
+    def test_circumpolar_latitudes_have_no_horizon_line(self):
+        _, _, valid = horizon_longitudes(np.array([0.0]), np.array([23.0]), 0.0, np.array([0.0, 60.0, 70.0]))
+        self.assertEqual(valid[0].tolist(), [True, True, False])
+
+
+class TestAgainstSubjects(unittest.TestCase):
+    def test_sun_lines_put_the_sun_on_the_angles(self):
+        cfg = ChartConfig(zodiac_type=ZodiacType.TROPIC, sidereal_mode=None, perspective=Perspective.APPARENT_GEOCENTRIC)
+        payload = AstroCartographyRequest(config=cfg, points=["Sun"], geojson=True)
+        result = compute_astrocartography(payload, cfg)
+        self.assertEqual(len(result.geojson["features"]), 4)
+        angles = {AngleLine.ASC: "ascendant", AngleLine.MC: "medium_coeli"}
+        for line in result.lines:
+            if line.angle not in angles:
+                continue
+            segment = line.segments[0]
+            lng, lat = segment[len(segment) // 2]
+            subject = build_subject(payload.birth.model_copy(update={"lng": lng, "lat": lat}), cfg)
+            self.assertAlmostEqual(getattr(subject, angles[line.angle]).abs_pos, subject.sun.abs_pos, places=2)
@@ -0,0 +1,95 @@
+import base64
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from app import app
+
+AUTH = {"Authorization": "Basic " + base64.b64encode(b"demo:demo1234").decode()}
+
+BIRTH = {
+    "name": "Bundle",
+    "year": 1990,
+    "month": 7,
+    "day": 15,
+    "hour": 10,
+    "minute": 30,
+    "lng": 12.4964,
+    "lat": 41.9028,
+    "tz_str": "Europe/Rome",
+    "city": "Rome",
+    "nation": "IT",
+}
+
+PARTNER = {**BIRTH, "name": "Partner", "year": 1988, "month": 2, "day": 3, "hour": 18, "minute": 5}
+
+MOMENT = {
+    "year": 2025,
+    "month": 3,
+    "day": 1,
+    "hour": 12,
+    "minute": 0,
+    "lng": 12.4964,
+    "lat": 41.9028,
+    "tz_str": "Europe/Rome",
+}
+
+
+class TestChartBundle(unittest.TestCase):
+    def setUp(self) -> None:
+        patch = mock.patch("ratelimit.RATE_LIMIT_ENABLED", False)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.client = TestClient(app)
+
+    def _assert_parity(self, mode: str, body: dict, section: str, json_url: str, svg_url: str, **svg_extra):
+        bundle = self.client.post("/api/chart/bundle", json={"mode": mode, **body}, headers=AUTH)
+        chart = self.client.post(json_url, json=body, headers=AUTH)
+        svg = self.client.post(svg_url, json={**body, **svg_extra}, headers=AUTH)
+        for response in (bundle, chart, svg):
+            self.assertEqual(response.status_code, 200, response.text)
+
+        data = bundle.json()
+        self.assertEqual(data["mode"], mode)
+        self.assertEqual(data[section], chart.json())
+        self.assertEqual(data["svg"], svg.text)
+        for other in {"natal", "transit", "relationship"} - {section}:
+            self.assertIsNone(data[other])
+        self.assertIsNone(data["pdf_base64"])
+        return data
+
+    def test_natal_bundle_matches_natal(self):
+        body = {"birth": BIRTH, "config": {"theme": "dark"}}
+        data = self._assert_parity("natal", body, "natal", "/api/natal", "/api/svg/natal")
+        self.assertIn("sun", data["natal"]["subject"])
+
+    def test_natal_transit_bundle_matches_transit(self):
+        body = {"moment": MOMENT, "birth": BIRTH}
+        data = self._assert_parity("natal_transit", body, "transit", "/api/transit", "/api/svg/transit")
+        self.assertTrue(data["transit"]["snapshot"]["cross_major_aspects"])
+
+    def test_transit_bundle_matches_transit(self):
+        body = {"moment": MOMENT}
+        data = self._assert_parity("transit", body, "transit", "/api/transit", "/api/svg/transit")
+        self.assertIsNone(data["transit"]["snapshot"]["natal_subject"])
+
+    def test_relationship_bundle_matches_relationship(self):
+        body = {"first": BIRTH, "second": PARTNER}
+        data = self._assert_parity(
+            "relationship", body, "relationship", "/api/relationship", "/api/svg/synastry", grid_view=False
+        )
+        self.assertTrue(data["relationship"]["cross_major_aspects"])
+
+    def test_json_only_bundle_skips_rendering(self):
+        body = {"mode": "natal", "birth": BIRTH, "include_svg": False}
+        with mock.patch("endpoints.bundle.natal_svg_text") as render:
+            response = self.client.post("/api/chart/bundle", json=body, headers=AUTH)
+        self.assertEqual(response.status_code, 200, response.text)
+        render.assert_not_called()
+        self.assertIsNone(response.json()["svg"])
+        self.assertIn("sun", response.json()["natal"]["subject"])
+
+
+if __name__ == "__main__":
+    unittest.main()
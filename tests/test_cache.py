@@ -0,0 +1,33 @@
+import unittest
+
+from cache import TTLCache, canonical_hash
+
+
+class TestCanonicalHash(unittest.TestCase):
+    def test_key_order_does_not_matter(self):
+        self.assertEqual(canonical_hash({"a": 1, "b": [1, 2]}), canonical_hash({"b": [1, 2], "a": 1}))
+        self.assertNotEqual(canonical_hash({"a": 1}), canonical_hash({"a": 2}))
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_expiry(self):
+        cache = TTLCache(maxsize=4, ttl_seconds=10)
+        cache.set("k", "v", now=0.0)
+        self.assertEqual(cache.get("k", now=9.0), "v")
+        self.assertIsNone(cache.get("k", now=10.0))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_least_recently_used_is_evicted(self):
+        cache = TTLCache(maxsize=2, ttl_seconds=100)
+        cache.set("a", 1, now=0.0)
+        cache.set("b", 2, now=0.0)
+        cache.get("a", now=1.0)
+        cache.set("c", 3, now=2.0)
+        self.assertEqual(cache.get("a", now=3.0), 1)
+        self.assertIsNone(cache.get("b", now=3.0))
+        self.assertEqual(cache.get("c", now=3.0), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import cancellation
+import endpoints.transit_range as transit_range
+import utils
+from cancellation import CLIENT_CLOSED_REQUEST, CancelToken, RequestCancelled, run_cancellable
+from enums import Mode, RangeGranularity
+from schemas import BirthData, ReportRequest, TransitEndInput, TransitMomentInput, TransitRangeRequest
+from utils import ensure_config, generate_report_content
+
+
+class FakeRequest:
+    """Stand-in for a Starlette request whose client disconnects after `connected_polls` polls."""
+
+    def __init__(self, connected_polls: int = 0) -> None:
+        self.connected_polls = connected_polls
+
+    async def is_disconnected(self) -> bool:
+        if self.connected_polls > 0:
+            self.connected_polls -= 1
+            return False
+        return True
+
+
+def _range_payload() -> TransitRangeRequest:
+    return TransitRangeRequest(
+        moment=TransitMomentInput(year=2025, month=1, day=1, hour=0, minute=0),
+        end=TransitEndInput(year=2025, month=1, day=2, hour=0, minute=0),
+        granularity=RangeGranularity.HOUR,
+    )
+
+
+def _cancel_after_first_call(token: CancelToken, func):
+    calls = []
+
+    def wrapper(*args, **kwargs):
+        calls.append(1)
+        token.cancel()
+        return func(*args, **kwargs)
+
+    return wrapper, calls
+
+
+class TestRunCancellable(unittest.TestCase):
+    def setUp(self) -> None:
+        patch = mock.patch.object(cancellation, "DISCONNECT_POLL_INTERVAL", 0.01)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_disconnect_cancels_token(self):
+        def wait_for_cancel(cancel_token):
+            return cancel_token._event.wait(5)
+
+        self.assertTrue(asyncio.run(run_cancellable(FakeRequest(connected_polls=2), wait_for_cancel)))
+
+    def test_connected_client_keeps_token(self):
+        def finish(cancel_token):
+            return cancel_token.cancelled
+
+        self.assertFalse(asyncio.run(run_cancellable(FakeRequest(connected_polls=1000), finish)))
+
+
+class TestComputationCheckpoints(unittest.TestCase):
+    def test_range_stops_at_next_step(self):
+        token = CancelToken()
+        wrapper, calls = _cancel_after_first_call(token, transit_range.build_subject_for_moment)
+        payload = _range_payload()
+        with mock.patch.object(transit_range, "build_subject_for_moment", wrapper):
+            with self.assertRaises(RequestCancelled):
+                transit_range.compute_range(payload, ensure_config(payload.config), None, cancel_token=token)
+        self.assertEqual(len(calls), 1)
+
+    def test_report_stops_before_next_subject(self):
+        token = CancelToken()
+        wrapper, calls = _cancel_after_first_call(token, utils.build_subject_block)
+        report = ReportRequest(mode=Mode.RELATIONSHIP, first=BirthData(name="A"), second=BirthData(name="B"))
+        with mock.patch.object(utils, "build_subject_block", wrapper):
+            with self.assertRaises(RequestCancelled):
+                generate_report_content(report, cancel_token=token)
+        self.assertEqual(len(calls), 1)
+
+
+class TestCancelledEndpoint(unittest.TestCase):
+    def test_disconnected_range_request_returns_499(self):
+        payload = _range_payload()
+        with mock.patch.object(cancellation, "DISCONNECT_POLL_INTERVAL", 0.01):
+            response = asyncio.run(
+                transit_range.transit_range(
+                    payload, FakeRequest(), allow_async=False, username="cancel-test", projection=(None, None)
+                )
+            )
+        self.assertEqual(response.status_code, CLIENT_CLOSED_REQUEST)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+import cancellation
+from cancellation import RequestCancelled
+from coalesce import SingleFlight, request_key
+from schemas import ChartConfig, NatalRequest
+
+
+class FakeRequest:
+    def __init__(self, disconnected: bool = False) -> None:
+        self.disconnected = disconnected
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+class TestRequestKey(unittest.TestCase):
+    def test_normalized_config_coalesces(self):
+        cfg = ChartConfig()
+        implicit = request_key("natal", NatalRequest(), cfg)
+        explicit = request_key("natal", NatalRequest(config=ChartConfig()), cfg)
+        self.assertEqual(implicit, explicit)
+        self.assertNotEqual(implicit, request_key("svg/natal", NatalRequest(), cfg))
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_identical_requests_share_one_run(self):
+        flights = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def compute(value, cancel_token=None):
+            calls.append(value)
+            release.wait(5)
+            return {"value": value}
+
+        async def scenario():
+            tasks = [asyncio.create_task(flights.run("natal", "k", FakeRequest(), compute, 1)) for _ in range(5)]
+            await asyncio.sleep(0.05)
+            release.set()
+            return await asyncio.gather(*tasks)
+
+        results = asyncio.run(scenario())
+        self.assertEqual(calls, [1])
+        self.assertTrue(all(r is results[0] for r in results))
+        stats = flights.stats()
+        self.assertEqual((stats["started"], stats["coalesced"], stats["in_flight"]), (1, 4, 0))
+        self.assertEqual(stats["coalesced_by_endpoint"], {"natal": 4})
+
+    def test_errors_reach_every_waiter(self):
+        flights = SingleFlight()
+
+        def compute(cancel_token=None):
+            raise ValueError("boom")
+
+        async def scenario():
+            tasks = [flights.run("natal", "k", FakeRequest(), compute) for _ in range(3)]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = asyncio.run(scenario())
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+
+    def test_computation_cancelled_once_all_waiters_leave(self):
+        flights = SingleFlight()
+        tokens = []
+
+        def compute(cancel_token=None):
+            tokens.append(cancel_token)
+            while not cancel_token.cancelled:
+                threading.Event().wait(0.01)
+            cancel_token.raise_if_cancelled()
+
+        async def scenario():
+            tasks = [flights.run("natal", "k", FakeRequest(disconnected=True), compute) for _ in range(2)]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.sleep(0.05)
+            return results
+
+        results = asyncio.run(scenario())
+        self.assertTrue(all(isinstance(r, RequestCancelled) for r in results))
+        self.assertTrue(tokens[0].cancelled)
+        self.assertEqual(flights.stats()["abandoned"], 1)
+        self.assertEqual(flights.stats()["in_flight"], 0)
+
+    def test_disabled_runs_each_request_and_cancels_on_disconnect(self):
+        flights = SingleFlight(enabled=False)
+        calls = []
+
+        def compute(cancel_token=None):
+            calls.append(cancel_token)
+            while not cancel_token.cancelled:
+                threading.Event().wait(0.01)
+            cancel_token.raise_if_cancelled()
+
+        async def scenario():
+            tasks = [flights.run("natal", "k", FakeRequest(disconnected=True), compute) for _ in range(2)]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        with mock.patch.object(cancellation, "DISCONNECT_POLL_INTERVAL", 0.01):
+            results = asyncio.run(scenario())
+        self.assertTrue(all(isinstance(r, RequestCancelled) for r in results))
+        self.assertEqual(len(calls), 2)
+        self.assertIsNot(calls[0], calls[1])
+        self.assertEqual(flights.stats()["started"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from endpoints.compare import compute_comparison
+from schemas import BirthData, ChartConfig, ConfigComparisonRequest
+from utils import build_subject
+
+HOUSE_NAMES = [
+    "First", "Second", "Third", "Fourth", "Fifth", "Sixth",
+    "Seventh", "Eighth", "Ninth", "Tenth", "Eleventh", "Twelfth",
+]
+
+
+class TestComputeComparison(unittest.TestCase):
+    def test_variants_match_full_subjects(self):
+        configs = [
+            ChartConfig(zodiac_type="Tropic", house_system="P"),
+            ChartConfig(sidereal_mode="LAHIRI", house_system="W"),
+            ChartConfig(sidereal_mode="KRISHNAMURTI", house_system="Y", perspective="Apparent Geocentric"),
+            ChartConfig(perspective="Heliocentric"),
+        ]
+        result = compute_comparison(ConfigComparisonRequest(configs=configs))
+        self.assertEqual(len(result.charts), len(configs))
+        self.assertIsNone(result.charts[0].ayanamsa)
+        for config, chart in zip(configs, result.charts):
+            subject = build_subject(BirthData(), config)
+            for point in chart.points:
+                expected = getattr(subject, point.point)
+                self.assertAlmostEqual(point.abs_pos, expected.abs_pos, places=3, msg=(config, point.point))
+                self.assertEqual(f"{HOUSE_NAMES[point.house - 1]}_House", expected.house, (config, point.point))
+                self.assertEqual(point.retrograde, bool(expected.retrograde))
+
+    def test_request_configs_are_not_mutated(self):
+        config = ChartConfig(zodiac_type="Tropic", sidereal_mode="LAHIRI")
+        compute_comparison(ConfigComparisonRequest(configs=[config]))
+        self.assertEqual(config.sidereal_mode.value, "LAHIRI")
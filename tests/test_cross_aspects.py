@@ -0,0 +1,48 @@
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from aspects.cross import PointPositions, compute_cross_aspects, cross_aspect_arrays
+
+
+def _point(abs_pos, speed=0.0):
+    return SimpleNamespace(abs_pos=abs_pos, speed=speed)
+
+
+class TestCrossAspectKernel(unittest.TestCase):
+    def test_wraps_around_zero_aries(self):
+        # 358 vs 121: separation 123 across 0° -> trine, 3° wide.
+        moment, moving, fixed, aspect, orb, _ = cross_aspect_arrays(
+            np.array([[358.0]]), np.array([[1.0]]), np.array([121.0])
+        )
+        self.assertEqual(len(moment), 1)
+        self.assertAlmostEqual(float(orb[0]), 3.0)
+
+    def test_applying_follows_transit_motion(self):
+        natal = PointPositions(keys=("sun",), longitudes=np.array([[100.0]]), speeds=np.zeros((1, 1)))
+        transit = PointPositions(
+            keys=("mars",),
+            # Same 95° square approach: direct motion separates, retrograde motion applies.
+            longitudes=np.array([[195.0], [195.0]]),
+            speeds=np.array([[0.5], [-0.3]]),
+        )
+        rows = compute_cross_aspects(transit, natal)
+        self.assertEqual([r["aspect"] for r in rows[0]], ["square"])
+        self.assertFalse(rows[0][0]["applying"])
+        self.assertTrue(rows[1][0]["applying"])
+
+    def test_from_subjects_skips_missing_points(self):
+        natal = SimpleNamespace(sun=_point(10.0), moon=_point(200.0))
+        transit = SimpleNamespace(sun=_point(70.0, 1.0), moon=_point(15.0, 13.0))
+        natal_positions = PointPositions.from_subjects([natal], ["Sun", "Moon", "Chiron"])
+        self.assertEqual(natal_positions.keys, ("sun", "moon"))
+
+        rows = compute_cross_aspects(PointPositions.from_subjects([transit], natal_positions.keys), natal_positions)[0]
+        found = {(r["transit"], r["natal"], r["aspect"]) for r in rows}
+        self.assertEqual(found, {("sun", "sun", "sextile"), ("moon", "sun", "conjunction"), ("moon", "moon", "opposition")})
+        self.assertEqual(rows[0]["orb"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+from current_sky import CurrentSkyCache
+from enums import HouseSystem, Perspective
+from projection import dump_subject_with_patterns
+from schemas import BirthData, ChartConfig
+from utils import build_subject
+
+NOW = datetime(2025, 10, 21, 12, 25, 40, tzinfo=timezone.utc)
+
+
+def transit_birth(tz_str: str, lat: float, lng: float) -> BirthData:
+    local = NOW.astimezone(ZoneInfo(tz_str))
+    return BirthData(
+        name="Transit",
+        year=local.year,
+        month=local.month,
+        day=local.day,
+        hour=local.hour,
+        minute=local.minute,
+        lat=lat,
+        lng=lng,
+        tz_str=tz_str,
+    )
+
+
+class TestCurrentSkyCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = CurrentSkyCache(maxsize=8, window_minutes=1, refresh=False)
+        self.cfg = ChartConfig(perspective=Perspective.APPARENT_GEOCENTRIC, house_system=HouseSystem.PLACIDUS)
+
+    def test_relocated_subject_matches_full_build(self):
+        for tz_str, lat, lng in [("Europe/Amsterdam", 52.37, 4.9), ("America/New_York", 40.7, -74.0)]:
+            birth = transit_birth(tz_str, lat, lng)
+            snapshot = self.cache.get(NOW.astimezone(ZoneInfo(tz_str)), self.cfg, now=NOW)
+            self.assertIsNotNone(snapshot)
+            self.assertEqual(
+                snapshot.subject_at(birth, self.cfg).model_dump(mode="json"),
+                build_subject(birth, self.cfg).model_dump(mode="json"),
+            )
+        # Both locations shared one sky.
+        self.assertEqual(self.cache.stats()["size"], 1)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_planet_patterns_match_matcher(self):
+        cfg = self.cfg.model_copy(update={"active_points": ["sun", "moon", "mercury", "venus", "mars", "jupiter", "saturn"]})
+        birth = transit_birth("Asia/Tokyo", 35.7, 139.7)
+        snapshot = self.cache.get(NOW, cfg, now=NOW)
+        _, expected = dump_subject_with_patterns(build_subject(birth, cfg), cfg, None)
+        self.assertEqual(snapshot.patterns(cfg.active_points), expected)
+
+    def test_bypassed_outside_window_and_for_topocentric(self):
+        self.assertIsNone(self.cache.get(datetime(2025, 10, 21, 12, 30, tzinfo=timezone.utc), self.cfg, now=NOW))
+        self.assertIsNone(self.cache.get(NOW, ChartConfig(perspective=Perspective.TOPOCENTRIC), now=NOW))
+        self.assertEqual(self.cache.stats()["bypassed"], 2)
+
+    def test_prefetch_builds_recently_used_configs(self):
+        self.cache.get(NOW, self.cfg, now=NOW)
+        next_minute = datetime(2025, 10, 21, 12, 26, tzinfo=timezone.utc)
+        self.assertEqual(self.cache.prefetch(next_minute), 1)
+        self.assertEqual(self.cache.prefetch(next_minute), 0)
+        self.assertIsNotNone(self.cache.get(next_minute, self.cfg, now=NOW))
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
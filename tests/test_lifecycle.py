@@ -0,0 +1,41 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from aspects.lifecycle import PatternTracker
+
+T0 = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+
+def trine(points, orb):
+    return {"id": "grand_trine", "name": "Grand Trine", "points": points, "links": [{"orb": orb}, {"orb": orb / 2}]}
+
+
+class TestPatternTracker(unittest.TestCase):
+    def test_spans_report_formation_dissolution_and_tightest_step(self):
+        steps = [
+            [trine(["a", "b", "c"], 3.0)],
+            [trine(["c", "b", "a"], 1.0), trine(["d", "e", "f"], 5.0)],  # point order does not matter
+            [trine(["d", "e", "f"], 2.0)],
+            [trine(["a", "b", "c"], 0.5), trine(["d", "e", "f"], 4.0)],
+        ]
+        tracker = PatternTracker()
+        for i, patterns in enumerate(steps):
+            tracker.observe(T0 + timedelta(hours=i), patterns)
+
+        spans = [(s.points, s.start, s.end, s.tightest, s.tightest_orb, s.steps) for s in tracker.spans]
+        hour = lambda n: T0 + timedelta(hours=n)
+        self.assertEqual(
+            spans,
+            [
+                # Already formed at the first step, dissolved at step 2.
+                (("a", "b", "c"), None, hour(2), hour(1), 1.0, 2),
+                # Still formed at the last step.
+                (("d", "e", "f"), hour(1), None, hour(2), 2.0, 3),
+                # Re-formed occurrences are reported separately.
+                (("a", "b", "c"), hour(3), None, hour(3), 0.5, 1),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+import asyncio
+import base64
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+import endpoints.live_sky as live_sky_endpoint
+from app import app
+from enums import Perspective
+from live_sky import SLOW_CONSUMER, LiveSkyHub, Subscriber, compute_live_update, live_sky_hub
+from schemas import ChartConfig, LiveSkyLocation
+from utils import ensure_config
+
+NOW = datetime(2025, 10, 21, 12, 25, 40, tzinfo=timezone.utc)
+
+
+class TestSubscriber(unittest.TestCase):
+    def test_full_queue_drops_oldest_then_closes_slow_consumer(self):
+        subscriber = Subscriber("demo", queue=asyncio.Queue(maxsize=2), max_dropped=3)
+        for tick in range(4):
+            self.assertTrue(subscriber.offer({"tick": tick}))
+        # Ticks 0 and 1 were dropped; the newest two are kept.
+        self.assertEqual([subscriber.queue.get_nowait()["tick"] for _ in range(2)], [2, 3])
+
+        for tick in range(6):
+            subscriber.offer({"tick": tick})
+        self.assertTrue(subscriber.overflowed)
+        self.assertEqual(subscriber.total_dropped, 5)
+        self.assertIs(subscriber.queue.get_nowait(), SLOW_CONSUMER)
+        self.assertFalse(subscriber.offer({"tick": 99}))
+
+
+class TestLiveSkyHub(unittest.TestCase):
+    def test_channel_computed_once_per_tick_for_all_subscribers(self):
+        calls = []
+
+        def compute(cfg, location, now):
+            calls.append(location)
+            return {"type": "sky", "n": len(calls)}
+
+        hub = LiveSkyHub(tick_seconds=0.05, compute=compute)
+        cfg = ChartConfig()
+
+        async def scenario():
+            subscribers = [hub.connect("demo") for _ in range(3)]
+            channels = {hub.subscribe(s, cfg, None).key for s in subscribers}
+            updates = [await asyncio.wait_for(s.queue.get(), 1) for s in subscribers]
+            stats = hub.stats()
+            for s in subscribers:
+                hub.disconnect(s)
+            await asyncio.sleep(0.1)
+            return channels, updates, stats
+
+        channels, updates, stats = asyncio.run(scenario())
+        self.assertEqual(len(channels), 1)
+        self.assertTrue(all(u == {"type": "sky", "n": 1} for u in updates))
+        self.assertEqual((stats["channels"], stats["subscribers"]), (1, 3))
+        ticks = len(calls)
+        self.assertEqual(hub.stats()["channels"], 0)
+        self.assertEqual(len(calls), ticks)
+
+    def test_connection_limit_per_user(self):
+        hub = LiveSkyHub(max_connections_per_user=1)
+        first = hub.connect("demo")
+        self.assertIsNone(hub.connect("demo"))
+        hub.disconnect(first)
+        self.assertIsNotNone(hub.connect("demo"))
+
+
+class TestComputeLiveUpdate(unittest.TestCase):
+    def test_location_adds_angles_and_houses(self):
+        cfg = ensure_config(ChartConfig(perspective=Perspective.APPARENT_GEOCENTRIC))
+        sky = compute_live_update(cfg, None, NOW)
+        self.assertNotIn("ascendant", sky["points"])
+        self.assertNotIn("house", sky["points"]["sun"])
+
+        located = compute_live_update(cfg, LiveSkyLocation(lat=52.37, lng=4.9, tz_str="Europe/Amsterdam"), NOW)
+        self.assertEqual(located["timestamp"], "2025-10-21T14:25:00+02:00")
+        self.assertIn("ascendant", located["points"])
+        self.assertIn("house", located["points"]["sun"])
+        self.assertEqual(located["points"]["sun"]["abs_pos"], sky["points"]["sun"]["abs_pos"])
+
+
+class FakeWebSocket:
+    """Records frames and fails if two writes overlap, as a real socket may interleave them."""
+
+    def __init__(self, frames: list[str]) -> None:
+        self.frames = frames
+        self.sent: list = []
+        self.writing = False
+
+    async def receive_text(self) -> str:
+        await asyncio.sleep(0)
+        if not self.frames:
+            raise WebSocketDisconnect()
+        return self.frames.pop(0)
+
+    async def _write(self, frame) -> None:
+        if self.writing:
+            raise RuntimeError("concurrent write")
+        self.writing = True
+        await asyncio.sleep(0.001)
+        self.sent.append(frame)
+        self.writing = False
+
+    async def send_json(self, data: dict) -> None:
+        await self._write(data)
+
+    async def close(self, code: int, reason: str = "") -> None:
+        await self._write(("close", code))
+
+
+class TestLiveSkySocketWriters(unittest.TestCase):
+    def test_updates_and_replies_never_write_concurrently(self):
+        websocket = FakeWebSocket(["not json"] * 20)
+        subscriber = Subscriber("demo", queue=asyncio.Queue())
+        for tick in range(20):
+            subscriber.queue.put_nowait({"type": "sky", "tick": tick})
+        subscriber.queue.put_nowait(SLOW_CONSUMER)
+
+        async def scenario():
+            send_lock = asyncio.Lock()
+            return await asyncio.gather(
+                live_sky_endpoint._send_updates(websocket, subscriber, send_lock),
+                live_sky_endpoint._receive_subscriptions(websocket, subscriber, send_lock),
+                return_exceptions=True,
+            )
+
+        sender_result, receiver_result = asyncio.run(scenario())
+        self.assertIsNone(sender_result)
+        self.assertIsInstance(receiver_result, WebSocketDisconnect)
+        self.assertEqual(len(websocket.sent), 41)
+        self.assertEqual(sum(1 for frame in websocket.sent if frame == {"type": "error", "detail": mock.ANY}), 20)
+
+
+class TestLiveSkyRoute(unittest.TestCase):
+    AUTH = {"Authorization": "Basic " + base64.b64encode(b"demo:demo1234").decode()}
+
+    def setUp(self) -> None:
+        patches = [
+            mock.patch("ratelimit.RATE_LIMIT_ENABLED", False),
+            mock.patch.object(live_sky_hub, "compute", lambda cfg, location, now: {"type": "sky", "lat": location.lat}),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.client = TestClient(app)
+
+    def test_subscribe_update_and_malformed_frames(self):
+        with self.client.websocket_connect("/api/live-sky", headers=self.AUTH) as ws:
+            ws.send_text("not json")
+            self.assertEqual(ws.receive_json()["type"], "error")
+            ws.send_json({"action": "subscribe", "config": {"perspective": "Nope"}})
+            self.assertEqual(ws.receive_json()["type"], "error")
+
+            ws.send_json({"action": "subscribe", "location": {"lat": 52.37, "lng": 4.9, "tz_str": "Europe/Amsterdam"}})
+            subscribed = ws.receive_json()
+            self.assertEqual((subscribed["type"], subscribed["subscribers"]), ("subscribed", 1))
+            self.assertEqual(ws.receive_json(), {"type": "sky", "lat": 52.37})
+
+            ws.send_json({"action": "unsubscribe"})
+            self.assertEqual(ws.receive_json(), {"type": "unsubscribed"})
+
+    def test_handshake_requires_credentials(self):
+        with self.assertRaises(WebSocketDisconnect):
+            with self.client.websocket_connect("/api/live-sky") as ws:
+                ws.receive_json()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+from endpoints.progressions import TROPICAL_YEAR_DAYS, compute_progressions, progressed_jd, target_jd
+from enums import ProgressionMethod
+from schemas import ProgressionRequest, TransitEndInput, TransitMomentInput
+from utils import ensure_config
+
+
+class TestProgressedTime(unittest.TestCase):
+    def test_day_for_a_year_round_trip(self):
+        natal = 2447892.5
+        self.assertAlmostEqual(float(progressed_jd(natal, natal + 30 * TROPICAL_YEAR_DAYS)), natal + 30.0)
+        self.assertAlmostEqual(float(target_jd(natal, progressed_jd(natal, 2460000.25))), 2460000.25)
+
+
+class TestComputeProgressions(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.cfg = ensure_config(None)
+        cls.payload = ProgressionRequest(
+            moment=TransitMomentInput(year=2025, month=1, day=1, hour=0, minute=0),
+            end=TransitEndInput(year=2035, month=1, day=1, hour=0, minute=0),
+        )
+
+    def test_solar_arc_moves_the_sun_like_secondary_progression(self):
+        secondary = compute_progressions(self.payload, self.cfg, ProgressionMethod.SECONDARY)
+        directed = compute_progressions(self.payload, self.cfg, ProgressionMethod.SOLAR_ARC)
+        self.assertEqual(secondary.solar_arc, directed.solar_arc)
+        sun = [c.timestamp for c in secondary.sign_changes if c.point == "sun"]
+        self.assertEqual(sun, [c.timestamp for c in directed.sign_changes if c.point == "sun"])
+        self.assertEqual(len(sun), 1)
+
+    def test_progressed_moon_changes_sign_every_few_years(self):
+        result = compute_progressions(self.payload, self.cfg, ProgressionMethod.SECONDARY)
+        moon = [c.timestamp for c in result.sign_changes if c.point == "moon"]
+        self.assertIn(len(moon), (3, 4, 5))
+        self.assertTrue(all(1.5 < (b - a).days / 365.25 < 3.5 for a, b in zip(moon, moon[1:])))
+        self.assertEqual(result.perfections, sorted(result.perfections, key=lambda p: (p.timestamp, p.progressed, p.natal)))
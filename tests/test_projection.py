@@ -0,0 +1,40 @@
+import unittest
+
+from fastapi import HTTPException
+
+from projection import SUBJECT_HOUSE_KEYS, filter_aspects, resolve_projection
+from schemas import ChartConfig
+
+
+class TestResolveProjection(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cfg = ChartConfig(active_points=["Sun", "Moon", "Mean_North_Lunar_Node"])
+
+    def test_no_params_means_no_projection(self):
+        self.assertIsNone(resolve_projection(None, None, self.cfg))
+
+    def test_keywords_and_names(self):
+        projection = resolve_projection("abs_pos,sign", "active,houses,Venus", self.cfg)
+        self.assertEqual(projection.fields, frozenset({"abs_pos", "sign"}))
+        self.assertTrue({"sun", "moon", "mean_north_lunar_node", "venus"} <= projection.points)
+        self.assertTrue(SUBJECT_HOUSE_KEYS <= projection.points)
+
+    def test_unknown_names_are_rejected(self):
+        with self.assertRaises(HTTPException) as ctx:
+            resolve_projection(None, "sun,nibiru", self.cfg)
+        self.assertEqual(ctx.exception.status_code, 422)
+        with self.assertRaises(HTTPException):
+            resolve_projection("abs_pos,colour", None, self.cfg)
+
+    def test_aspects_limited_to_selected_points(self):
+        projection = resolve_projection(None, "sun,moon", self.cfg)
+        aspects = [
+            {"left": "Sun", "aspect": "trine", "right": "Moon"},
+            {"left": "Sun", "aspect": "square", "right": "Mars"},
+        ]
+        self.assertEqual(filter_aspects(aspects, projection), aspects[:1])
+        self.assertEqual(filter_aspects(aspects, None), aspects)
+
+
+if __name__ == "__main__":
+    unittest.main()
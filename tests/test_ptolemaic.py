@@ -4,8 +4,12 @@ from aspects.ptolemaic import (
     PTOLEMAIC_ASPECTS,
     PTOLEMAIC_PATTERNS,
     NormalAspect,
+    PatternDefinition,
+    PatternEdge,
     PtolemaicAspectCalculator,
     PtolemaicAspectConfiguration,
+    compile_pattern,
+    compute_cross_major_aspects,
     compute_major_aspects,
     compute_ptolemaic_patterns,
 )
@@ -19,7 +23,7 @@ class TestPtolemaicDefinitions(unittest.TestCase):
 
     def test_pattern_definitions(self):
         ids = [p.id for p in PTOLEMAIC_PATTERNS]
-        self.assertEqual(len(PTOLEMAIC_PATTERNS), 8)
+        self.assertEqual(len(PTOLEMAIC_PATTERNS), 11)
         self.assertIn("stellium", ids)
         self.assertTrue(all(isinstance(p, PtolemaicAspectConfiguration) for p in PTOLEMAIC_PATTERNS))
 
@@ -279,5 +283,96 @@ class TestPtolemaicPatterns(unittest.TestCase):
         self.assertTrue(cluster_links, "Mercury/Sun/Venus stellium should expose both conjunction links")
 
 
+class TestDeclarativePatterns(unittest.TestCase):
+    def _ids(self, subject, **kwargs):
+        return [p["id"] for p in compute_major_aspects(subject, active_points=list(subject), **kwargs)]
+
+    def test_yod(self):
+        subject = {"a": {"abs_pos": 0.0}, "b": {"abs_pos": 61.0}, "apex": {"abs_pos": 211.5}}
+        yods = [p for p in compute_major_aspects(subject, active_points=list(subject)) if p["id"] == "yod"]
+        self.assertEqual(len(yods), 1)
+        self.assertEqual(yods[0]["structure"], {"apex": "apex", "base": ("a", "b")})
+        self.assertEqual([link["type"] for link in yods[0]["links"]], ["sextile", "quincunx", "quincunx"])
+
+    def test_minor_grand_trine_and_thors_hammer(self):
+        subject = {"a": {"abs_pos": 10.0}, "b": {"abs_pos": 70.0}, "c": {"abs_pos": 130.0}}
+        patterns = compute_major_aspects(subject, active_points=list(subject))
+        self.assertEqual([(p["id"], p["structure"]) for p in patterns], [("minor_grand_trine", {"focal": "b"})])
+
+        subject = {"a": {"abs_pos": 0.0}, "b": {"abs_pos": 90.0}, "focal": {"abs_pos": 226.0}}
+        hammers = [p for p in compute_major_aspects(subject, active_points=list(subject)) if p["id"] == "thors_hammer"]
+        self.assertEqual([h["structure"] for h in hammers], [{"focal": "focal"}])
+
+    def test_orb_overrides(self):
+        subject = {"a": {"abs_pos": 0.0}, "b": {"abs_pos": 127.0}, "c": {"abs_pos": 240.0}}
+        self.assertNotIn("grand_trine", self._ids(subject))
+        self.assertIn("grand_trine", self._ids(subject, orbs={"trine": 8}))
+        self.assertNotIn("grand_trine", self._ids({**subject, "b": {"abs_pos": 122.0}}, orbs={"trine": 1}))
+        with self.assertRaises(ValueError):
+            PtolemaicAspectCalculator(orbs={"semisextile": 2})
+
+    def test_custom_definition(self):
+        config = PTOLEMAIC_PATTERNS[0]
+        square_pair = PatternDefinition(
+            configuration=config,
+            vertices=("a", "b"),
+            edges=(PatternEdge(0, 1, "square"),),
+            structure=lambda v: {},
+        )
+        calc = PtolemaicAspectCalculator(patterns=[square_pair])
+        subject = {"x": {"abs_pos": 0.0}, "y": {"abs_pos": 92.0}, "z": {"abs_pos": 180.0}}
+        matches = calc.compute_patterns(subject, active_points=list(subject))
+        self.assertEqual([m.points for m in matches], [("x", "y"), ("y", "z")])
+
+        disconnected = PatternDefinition(
+            configuration=config,
+            vertices=("a", "b", "c"),
+            edges=(PatternEdge(0, 1, "square"),),
+            structure=lambda v: {},
+        )
+        with self.assertRaises(ValueError):
+            compile_pattern(disconnected)
+
+    def test_sextile_chain_across_zero_is_a_trapeze(self):
+        subject = {"a": {"abs_pos": 185.0}, "b": {"abs_pos": 245.0}, "c": {"abs_pos": 305.0}, "d": {"abs_pos": 5.0}}
+        trapezes = [p for p in compute_major_aspects(subject, active_points=list(subject)) if p["id"] == "trapeze"]
+        self.assertEqual([t["structure"]["chain"] for t in trapezes], [("a", "b", "c", "d")])
+
+
+class TestCrossChartPatterns(unittest.TestCase):
+    def test_grand_trine_across_three_charts(self):
+        charts = {
+            "first": {"sun": {"abs_pos": 10.0}, "moon": {"abs_pos": 200.0}},
+            "second": {"moon": {"abs_pos": 132.0}},
+            "transit": {"jupiter": {"abs_pos": 248.0}, "saturn": {"abs_pos": 75.0}},
+        }
+        patterns = compute_cross_major_aspects(charts)
+        trines = [p for p in patterns if p["id"] == "grand_trine"]
+        self.assertEqual([t["points"] for t in trines], [["first.sun", "second.moon", "transit.jupiter"]])
+
+    def test_single_chart_patterns_excluded(self):
+        charts = {
+            "natal": {"a": {"abs_pos": 0.0}, "b": {"abs_pos": 120.0}, "c": {"abs_pos": 240.0}},
+            "transit": {"x": {"abs_pos": 300.0}},
+        }
+        ids = {p["id"] for p in compute_cross_major_aspects(charts)}
+        self.assertNotIn("grand_trine", ids)
+        # natal.a / transit.x sextile + grand trine -> kite spanning both charts.
+        self.assertIn("kite", ids)
+
+    def test_matches_single_subject_matcher_on_merged_points(self):
+        charts = {
+            "natal": {f"p{i}": {"abs_pos": (i * 47.0) % 360} for i in range(10)},
+            "transit": {f"p{i}": {"abs_pos": (i * 31.0 + 5) % 360} for i in range(10)},
+        }
+        merged = {f"{chart}.{key}": point for chart, points in charts.items() for key, point in points.items()}
+        expected = [
+            p
+            for p in compute_major_aspects(merged, active_points=list(merged))
+            if len({key.split(".")[0] for key in p["points"]}) > 1
+        ]
+        self.assertEqual(compute_cross_major_aspects(charts), expected)
+
+
 if __name__ == "__main__":
     unittest.main()
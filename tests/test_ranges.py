@@ -0,0 +1,64 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from enums import RangeGranularity
+from ephemeris import julian_day
+from ranges import count_range_steps, iter_range_steps, offset_segments
+
+AMSTERDAM = ZoneInfo("Europe/Amsterdam")
+
+
+class TestOffsetSegments(unittest.TestCase):
+    def test_transition_found_to_the_second(self):
+        segments = offset_segments(
+            AMSTERDAM, datetime(2025, 10, 20, tzinfo=AMSTERDAM), datetime(2025, 11, 5, tzinfo=AMSTERDAM)
+        )
+        self.assertEqual(len(segments), 2)
+        self.assertEqual(segments[1].start, datetime(2025, 10, 26, 1, 0, tzinfo=timezone.utc))
+        self.assertEqual(segments[1].offset, timedelta(hours=1))
+        self.assertEqual(segments[1].fold_until, datetime(2025, 10, 26, 3, 0))
+
+
+class TestIterRangeSteps(unittest.TestCase):
+    def test_fall_back_hours_are_distinct_instants(self):
+        start = datetime(2025, 10, 26, 0, 0, tzinfo=AMSTERDAM)
+        end = datetime(2025, 10, 26, 4, 0, tzinfo=AMSTERDAM)
+        steps = list(iter_range_steps(start, end, RangeGranularity.HOUR))
+        # 00:00 .. 04:00 local spans five wall-clock hours but six real ones.
+        self.assertEqual(len(steps), 6)
+        self.assertEqual(count_range_steps(start, end, RangeGranularity.HOUR), 6)
+        self.assertEqual(len({step.utc for step in steps}), 6)
+        self.assertEqual([step.local.hour for step in steps], [0, 1, 2, 2, 3, 4])
+        self.assertEqual([step.local.fold for step in steps], [0, 0, 0, 1, 0, 0])
+        for step in steps:
+            self.assertEqual(step.local.astimezone(timezone.utc), step.utc)
+            self.assertAlmostEqual(step.jd, julian_day(step.utc), places=9)
+
+    def test_spring_forward_skips_no_sample(self):
+        start = datetime(2025, 3, 30, 0, 0, tzinfo=AMSTERDAM)
+        end = datetime(2025, 3, 30, 4, 0, tzinfo=AMSTERDAM)
+        steps = list(iter_range_steps(start, end, RangeGranularity.HOUR))
+        self.assertEqual([step.local.hour for step in steps], [0, 1, 3, 4])
+        gaps = {b.utc - a.utc for a, b in zip(steps, steps[1:])}
+        self.assertEqual(gaps, {timedelta(hours=1)})
+
+    def test_week_and_custom_steps(self):
+        start = datetime(2025, 1, 1, tzinfo=AMSTERDAM)
+        end = datetime(2025, 1, 29, tzinfo=AMSTERDAM)
+        self.assertEqual(count_range_steps(start, end, RangeGranularity.WEEK), 5)
+        custom = list(iter_range_steps(start, start + timedelta(hours=1), RangeGranularity.CUSTOM, 15))
+        self.assertEqual([step.local.minute for step in custom], [0, 15, 30, 45, 0])
+        with self.assertRaises(ValueError):
+            count_range_steps(start, end, RangeGranularity.CUSTOM)
+
+    def test_months_follow_local_calendar(self):
+        start = datetime(2025, 1, 31, 12, 0, tzinfo=AMSTERDAM)
+        end = datetime(2025, 5, 1, tzinfo=AMSTERDAM)
+        steps = list(iter_range_steps(start, end, RangeGranularity.MONTH))
+        self.assertEqual([(s.local.month, s.local.day, s.local.hour) for s in steps][:2], [(1, 31, 12), (2, 28, 12)])
+        self.assertEqual(len(steps), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
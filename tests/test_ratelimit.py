@@ -0,0 +1,69 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from fastapi import HTTPException
+
+import ratelimit
+from ratelimit import BucketSpec, ConcurrencyLimiter, TokenBucketLimiter, rate_limit
+
+
+class TestTokenBucketLimiter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.limiter = TokenBucketLimiter({"pdf": BucketSpec(capacity=2, refill_per_second=0.5)})
+
+    def test_burst_then_retry_after(self):
+        self.assertIsNone(self.limiter.consume("alice", "pdf", now=0.0))
+        self.assertIsNone(self.limiter.consume("alice", "pdf", now=0.0))
+        self.assertAlmostEqual(self.limiter.consume("alice", "pdf", now=0.0), 2.0)
+        # One token refills after two seconds.
+        self.assertIsNone(self.limiter.consume("alice", "pdf", now=2.0))
+
+    def test_users_and_weights_are_independent(self):
+        self.assertIsNone(self.limiter.consume("alice", "pdf", weight=2, now=0.0))
+        self.assertIsNone(self.limiter.consume("bob", "pdf", weight=2, now=0.0))
+        self.assertAlmostEqual(self.limiter.consume("alice", "pdf", weight=1, now=1.0), 1.0)
+
+    def test_bucket_must_refill(self):
+        with self.assertRaises(ValueError):
+            BucketSpec(capacity=5, refill_per_second=0)
+        with self.assertRaises(ValueError):
+            BucketSpec(capacity=0, refill_per_second=1)
+
+
+class TestConcurrencyLimiter(unittest.TestCase):
+    def test_acquire_release(self):
+        limiter = ConcurrencyLimiter(limit=2)
+        self.assertTrue(limiter.try_acquire("alice"))
+        self.assertTrue(limiter.try_acquire("alice"))
+        self.assertFalse(limiter.try_acquire("alice"))
+        self.assertTrue(limiter.try_acquire("bob"))
+        limiter.release("alice")
+        self.assertEqual(limiter.active("alice"), 1)
+        self.assertTrue(limiter.try_acquire("alice"))
+
+
+class TestRateLimitDependency(unittest.TestCase):
+    def test_concurrency_rejection_spends_no_tokens(self):
+        limiter = TokenBucketLimiter({"chart": BucketSpec(capacity=5, refill_per_second=0.001)})
+        slots = ConcurrencyLimiter(limit=1)
+        dependency = rate_limit("chart")
+
+        async def scenario():
+            held = dependency(username="alice")
+            await held.__anext__()
+            for _ in range(3):
+                with self.assertRaises(HTTPException) as ctx:
+                    await dependency(username="alice").__anext__()
+                self.assertEqual(ctx.exception.status_code, 429)
+            await held.aclose()
+
+        with mock.patch.multiple(ratelimit, rate_limiter=limiter, concurrency_limiter=slots, RATE_LIMIT_ENABLED=True):
+            asyncio.run(scenario())
+        # Only the admitted request was charged, and its slot was released.
+        self.assertAlmostEqual(limiter._state[("alice", "chart")][0], 4.0, places=2)
+        self.assertEqual(slots.active("alice"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
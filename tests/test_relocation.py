@@ -0,0 +1,73 @@
+import base64
+import unittest
+from unittest import mock
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+import endpoints.relocation as relocation
+from app import app
+from endpoints.relocation import compute_relocation
+from ephemeris import house_numbers
+from schemas import BirthData, ChartConfig, RelocationLocation, RelocationRequest
+from utils import build_subject, ensure_config
+
+HOUSE_NAMES = [
+    "First", "Second", "Third", "Fourth", "Fifth", "Sixth",
+    "Seventh", "Eighth", "Ninth", "Tenth", "Eleventh", "Twelfth",
+]
+
+
+class TestHouseNumbers(unittest.TestCase):
+    def test_cusp_starts_its_house_and_wraps_past_aries(self):
+        cusps = np.array([[350.0 + 30.0 * i for i in range(12)]]) % 360.0
+        longitudes = np.array([[350.0, 355.0, 20.0, 349.9]])
+        self.assertEqual(house_numbers(longitudes, cusps).tolist(), [[1, 1, 2, 12]])
+
+
+class TestComputeRelocation(unittest.TestCase):
+    def test_matches_subjects_built_per_location(self):
+        locations = [
+            RelocationLocation(name="Lisbon", lat=38.72, lng=-9.14),
+            RelocationLocation(name="Tokyo", lat=35.68, lng=139.69),
+            RelocationLocation(name="Tromsø", lat=69.65, lng=18.96),
+        ]
+        for config in (None, ChartConfig(house_system="P", perspective="Apparent Geocentric")):
+            cfg = ensure_config(config)
+            result = compute_relocation(RelocationRequest(locations=locations, config=cfg), cfg)
+            for chart in result.charts:
+                subject = build_subject(BirthData(lat=chart.lat, lng=chart.lng), cfg)
+                self.assertAlmostEqual(chart.ascendant, subject.ascendant.abs_pos, places=3)
+                self.assertAlmostEqual(chart.cusps[3], subject.fourth_house.abs_pos, places=3)
+                for point, house in chart.houses.items():
+                    self.assertEqual(getattr(subject, point).house, f"{HOUSE_NAMES[house - 1]}_House", point)
+
+
+class TestRelocationRoute(unittest.TestCase):
+    def setUp(self) -> None:
+        patch = mock.patch("ratelimit.RATE_LIMIT_ENABLED", False)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.client = TestClient(app)
+        self.auth = {"Authorization": "Basic " + base64.b64encode(b"demo:demo1234").decode()}
+
+    def _post(self, count: int):
+        locations = [{"lat": -60.0 + 120.0 * i / count, "lng": -170.0 + 340.0 * i / count} for i in range(count)]
+        return self.client.post("/api/relocation", json={"locations": locations}, headers=self.auth)
+
+    def test_weight_scales_with_location_count(self):
+        with mock.patch.object(relocation, "charge_rate_limit") as charge:
+            self.assertEqual(self._post(100).status_code, 200)
+            charge.assert_not_called()
+            response = self._post(450)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["charts"]), 450)
+        charge.assert_called_once_with("demo", "chart", 4)
+
+    def test_too_many_locations_rejected_before_charging(self):
+        with mock.patch.object(relocation, "RELOCATION_MAX_LOCATIONS", 150), mock.patch.object(
+            relocation, "charge_rate_limit"
+        ) as charge:
+            response = self._post(151)
+        self.assertEqual(response.status_code, 413)
+        charge.assert_not_called()
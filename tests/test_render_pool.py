@@ -0,0 +1,105 @@
+import os
+import time
+import unittest
+from unittest import mock
+
+import render_pool
+from render_pool import RENDER_PATHS, RenderError, RenderPool
+
+SVG = '<svg xmlns="http://www.w3.org/2000/svg" width="100" height="100"><circle cx="50" cy="50" r="40" fill="red"/></svg>'
+
+
+# Worker-side stand-ins for `render_pool._run_job`. They live at module level so
+# spawned workers can import them; each patches the worker's copy of the module
+# and then runs the real job, so the alarm and stats plumbing stay in play.
+
+
+def _hanging_job(svg_text, filename_prefix, timeout_seconds):
+    render_pool.render_svg_pdf = lambda *args: time.sleep(60)
+    return render_pool._run_job(svg_text, filename_prefix, timeout_seconds)
+
+
+def _crashing_job(svg_text, filename_prefix, timeout_seconds):
+    os._exit(1)
+
+
+def _pid_job(svg_text, filename_prefix, timeout_seconds):
+    return str(os.getpid()).encode(), RENDER_PATHS[0], 0.0, 0.0
+
+
+def _no_cairo_job(svg_text, filename_prefix, timeout_seconds):
+    def unavailable(*args, **kwargs):
+        raise RuntimeError("cairo unavailable")
+
+    render_pool.cairosvg.svg2pdf = render_pool.cairosvg.svg2png = unavailable
+    return render_pool._run_job(svg_text, filename_prefix, timeout_seconds)
+
+
+class TestRenderPool(unittest.TestCase):
+    def test_in_process_render_records_path(self):
+        pool = RenderPool(workers=0, max_jobs_per_worker=1, timeout_seconds=5, memory_mb=0)
+        pdf = pool.render(SVG, "test")
+        self.assertTrue(pdf.startswith(b"%PDF"))
+
+        stats = pool.stats()
+        self.assertEqual(stats["jobs"], 1)
+        self.assertEqual(stats["succeeded"], 1)
+        self.assertEqual(set(stats["paths"]), set(RENDER_PATHS))
+        self.assertEqual(sum(stats["paths"].values()), 1)
+        self.assertEqual(stats["paths"]["empty"], 0)
+
+
+class TestSubprocessRenderPool(unittest.TestCase):
+    def _pool(self, workers: int = 1, max_jobs_per_worker: int = 0, timeout_seconds: float = 30) -> RenderPool:
+        pool = RenderPool(workers, max_jobs_per_worker, timeout_seconds, memory_mb=0)
+        self.addCleanup(lambda: pool._executor and pool._executor.shutdown(wait=True))
+        return pool
+
+    def test_alarm_kills_stuck_worker(self):
+        pool = self._pool(timeout_seconds=1)
+        started = time.monotonic()
+        with mock.patch.object(render_pool, "_run_job", _hanging_job):
+            with self.assertRaises(RenderError):
+                pool.render(SVG, "test")
+        # The worker's own alarm fires well before the API-side grace deadline.
+        self.assertLess(time.monotonic() - started, 1 + render_pool._TIMEOUT_GRACE_SECONDS)
+        stats = pool.stats()
+        self.assertEqual(stats["worker_crashes"], 1)
+        self.assertEqual(stats["pool_restarts"], 1)
+        self.assertEqual(stats["succeeded"], 0)
+
+    def test_pool_restarts_after_worker_crash(self):
+        pool = self._pool()
+        with mock.patch.object(render_pool, "_run_job", _crashing_job):
+            with self.assertRaises(RenderError):
+                pool.render(SVG, "test")
+        self.assertIsNone(pool._executor)
+
+        pdf = pool.render(SVG, "test")
+        self.assertTrue(pdf.startswith(b"%PDF"))
+        stats = pool.stats()
+        self.assertEqual(stats["jobs"], 2)
+        self.assertEqual(stats["worker_crashes"], 1)
+        self.assertEqual(stats["pool_restarts"], 1)
+        self.assertEqual(stats["succeeded"], 1)
+
+    def test_workers_are_recycled_after_max_jobs(self):
+        pool = self._pool(max_jobs_per_worker=1)
+        with mock.patch.object(render_pool, "_run_job", _pid_job):
+            pids = {pool.render(SVG, "test") for _ in range(3)}
+        self.assertEqual(len(pids), 3)
+        self.assertEqual(pool.stats()["pool_restarts"], 0)
+
+    def test_fallback_renderer_is_counted(self):
+        pool = self._pool()
+        with mock.patch.object(render_pool, "_run_job", _no_cairo_job):
+            pdf = pool.render(SVG, "test")
+        self.assertTrue(pdf.startswith(b"%PDF"))
+        stats = pool.stats()
+        self.assertEqual(stats["paths"]["svglib"], 1)
+        self.assertEqual(stats["paths"]["cairosvg_pdf"], 0)
+        self.assertGreater(stats["peak_worker_rss_mb"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from enums import ReportDetail
+from utils import project_report
+
+
+def full_report() -> dict:
+    aspects = {"title": "Natal aspects", "rows": [{"left": "Sun"}], "summary": {"total": 1}, "raw": {"aspects": []}}
+    return {
+        "mode": "relationship",
+        "title": "Synastry report",
+        "markdown": "# Synastry report",
+        "subjects": [
+            {"label": "Partner A", "points": [], "houses": [], "raw_subject": {"name": "A"}, "aspects": aspects},
+        ],
+        "synastry": dict(aspects),
+    }
+
+
+class TestProjectReport(unittest.TestCase):
+    def test_full_is_unchanged(self):
+        report = full_report()
+        self.assertIs(project_report(report, ReportDetail.FULL), report)
+
+    def test_standard_drops_raw_and_markdown(self):
+        report = full_report()
+        projected = project_report(report, ReportDetail.STANDARD)
+        self.assertNotIn("markdown", projected)
+        self.assertNotIn("raw_subject", projected["subjects"][0])
+        self.assertNotIn("raw", projected["subjects"][0]["aspects"])
+        self.assertEqual(projected["synastry"]["rows"], [{"left": "Sun"}])
+        self.assertNotIn("raw", projected["synastry"])
+        # The (possibly cached) source report is left intact.
+        self.assertIn("raw_subject", report["subjects"][0])
+        self.assertIn("raw", report["synastry"])
+
+    def test_summary_keeps_only_summaries(self):
+        projected = project_report(full_report(), ReportDetail.SUMMARY)
+        block = projected["subjects"][0]
+        self.assertNotIn("houses", block)
+        self.assertEqual(block["aspects"], {"title": "Natal aspects", "summary": {"total": 1}})
+        self.assertNotIn("rows", projected["synastry"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,26 @@
+import unittest
+from datetime import datetime, timezone
+
+from endpoints.returns import find_return_times
+from enums import ZodiacType
+from ephemeris import body_positions, julian_day
+from sky_events import calendar_config
+
+
+class TestFindReturnTimes(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        _, cls.cfg = calendar_config(ZodiacType.TROPIC, None)
+        cls.start = julian_day(datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+    def test_one_solar_return_per_year_at_natal_longitude(self):
+        jds = find_return_times("sun", 123.456, self.start, self.start + 365.0, self.cfg)
+        self.assertEqual(len(jds), 1)
+        longitudes, _ = body_positions(jds, ["sun"], self.cfg)
+        self.assertAlmostEqual(longitudes[0, 0], 123.456, places=4)
+
+    def test_lunar_returns_follow_the_sidereal_month(self):
+        jds = find_return_times("moon", 10.0, self.start, self.start + 365.0, self.cfg)
+        self.assertIn(len(jds), (13, 14))
+        gaps = [b - a for a, b in zip(jds, jds[1:])]
+        self.assertTrue(all(27.0 < gap < 28.0 for gap in gaps), gaps)
@@ -0,0 +1,63 @@
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+from enums import ZodiacType
+from ephemeris import datetime_from_jd, julian_day
+from sky_events import SkyEventRecord, SkyEventStore, calendar_config, compute_year_events
+
+
+class TestComputeYearEvents(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        _, cfg = calendar_config(ZodiacType.TROPIC, None)
+        cls.events = compute_year_events(2024, cfg)
+
+    def find(self, kind, body, label):
+        return [e for e in self.events if (e.kind, e.body, e.label) == (kind, body, label)]
+
+    def assertNear(self, record, expected: datetime, minutes: float = 2.0) -> None:
+        delta = abs((datetime_from_jd(record.jd) - expected).total_seconds()) / 60.0
+        self.assertLess(delta, minutes, f"{record} vs {expected}")
+
+    def test_march_equinox_ingress(self):
+        aries = [e for e in self.find("ingress", "sun", "direct") if e.sign == "Ari"]
+        self.assertEqual(len(aries), 1)
+        self.assertEqual(aries[0].from_sign, "Pis")
+        self.assertNear(aries[0], datetime(2024, 3, 20, 3, 6, tzinfo=timezone.utc))
+
+    def test_mercury_stations_and_eclipse(self):
+        self.assertNear(self.find("station", "mercury", "retrograde")[0], datetime(2024, 4, 1, 22, 14, tzinfo=timezone.utc))
+        total = self.find("eclipse", "sun", "total")
+        self.assertEqual(len(total), 1)
+        self.assertNear(total[0], datetime(2024, 4, 8, 18, 17, tzinfo=timezone.utc))
+
+    def test_events_are_ordered_and_within_year(self):
+        jds = [e.jd for e in self.events]
+        self.assertEqual(jds, sorted(jds))
+        self.assertGreaterEqual(jds[0], julian_day(datetime(2024, 1, 1, tzinfo=timezone.utc)))
+        self.assertEqual(len(self.find("lunation", "moon", "full_moon")), 12)
+
+
+class TestSkyEventStore(unittest.TestCase):
+    def test_range_query_and_coverage(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SkyEventStore(Path(tmp) / "events.sqlite3")
+            jan = julian_day(datetime(2030, 1, 10, tzinfo=timezone.utc))
+            events = [
+                SkyEventRecord(jan, "ingress", "sun", "direct", "Aqu", "Cap", 300.0),
+                SkyEventRecord(jan + 30, "lunation", "moon", "new_moon", "Aqu", None, 310.0),
+            ]
+            store.store_year("tropic", 2030, events)
+            self.assertEqual(store.covered_years("tropic"), {2030})
+            self.assertEqual(store.query("tropic", jan, jan + 60), events)
+            self.assertEqual(store.query("tropic", jan, jan + 60, kinds=["lunation"]), events[1:])
+            self.assertEqual(store.query("sidereal_lahiri", jan, jan + 60), [])
+            # Rebuilding a year replaces its events instead of duplicating them.
+            store.store_year("tropic", 2030, events[:1])
+            self.assertEqual(store.query("tropic", jan - 1, jan + 60), events[:1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import base64
+import json
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+import endpoints.transit_range as transit_range
+from app import app
+from aspects.ptolemaic import compute_major_aspects
+from endpoints.transit_range import build_natal_context, build_range_snapshot, summarize_snapshot_changes
+from schemas import BirthData, TransitRangeRequest, TransitSnapshot
+from utils import ensure_config, resolve_range_bounds
+
+AUTH = {"Authorization": "Basic " + base64.b64encode(b"demo:demo1234").decode()}
+
+RANGE_BODY = {
+    "moment": {"year": 2025, "month": 3, "day": 1, "hour": 0, "minute": 0},
+    "end": {"year": 2025, "month": 3, "day": 1, "hour": 6, "minute": 0},
+    "granularity": "hour",
+}
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    """Parse Server-Sent Events frames into (event, data) pairs."""
+    events = []
+    for frame in body.split("\n\n"):
+        if not frame.strip():
+            continue
+        fields = dict(line.split(": ", 1) for line in frame.split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestSummarizeSnapshotChanges(unittest.TestCase):
+    def _snapshot(self, subject: dict, pattern_points: dict) -> TransitSnapshot:
+        return TransitSnapshot(
+            timestamp=datetime(2025, 3, 1, tzinfo=timezone.utc),
+            subject=subject,
+            major_aspects=compute_major_aspects(pattern_points, active_points=list(pattern_points)),
+        )
+
+    def test_sign_retrograde_house_and_pattern_changes(self):
+        trine = {"a": {"abs_pos": 0.0}, "b": {"abs_pos": 120.0}, "c": {"abs_pos": 240.0}}
+        previous = self._snapshot(
+            {
+                "sun": {"sign": "Ari", "house": "First_House", "retrograde": False},
+                "mars": {"sign": "Can", "house": "Fourth_House", "retrograde": False},
+            },
+            trine,
+        )
+        current = self._snapshot(
+            {
+                "sun": {"sign": "Tau", "house": "Second_House", "retrograde": False},
+                "mars": {"sign": "Can", "house": "Fourth_House", "retrograde": True},
+            },
+            {**trine, "c": {"abs_pos": 200.0}},
+        )
+        summary = summarize_snapshot_changes(previous, current, ["Sun", "Mars", "Moon"])
+        self.assertEqual(
+            summary["changes"],
+            [
+                {"point": "sun", "field": "sign", "from": "Ari", "to": "Tau"},
+                {"point": "sun", "field": "house", "from": "First_House", "to": "Second_House"},
+                {"point": "mars", "field": "retrograde", "from": False, "to": True},
+            ],
+        )
+        self.assertEqual(summary["patterns_formed"], [])
+        self.assertEqual(summary["patterns_dissolved"], [{"id": "grand_trine", "points": ["a", "b", "c"]}])
+
+
+class TestComputeRangeCrossAspects(unittest.TestCase):
+    def test_batches_match_per_step_snapshots(self):
+        payload = TransitRangeRequest(**RANGE_BODY, birth=BirthData())
+        cfg = ensure_config(payload.config)
+        kernel = mock.Mock(wraps=transit_range.compute_cross_aspects)
+        with mock.patch.object(transit_range, "RANGE_CROSS_ASPECT_BATCH", 3), mock.patch.object(
+            transit_range, "compute_cross_aspects", kernel
+        ):
+            snapshots = transit_range.compute_range(payload, cfg).snapshots
+        # 7 steps in batches of 3: one kernel call per batch, each over all of its steps.
+        self.assertEqual([c.args[0].longitudes.shape[0] for c in kernel.call_args_list], [3, 3, 1])
+
+        start_birth, _, _ = resolve_range_bounds(payload)
+        natal_context = build_natal_context(payload.birth, cfg)
+        for snapshot in snapshots:
+            expected = build_range_snapshot(start_birth, snapshot.timestamp, cfg, natal_context)
+            self.assertEqual(snapshot.cross_aspects, expected.cross_aspects)
+        self.assertTrue(any(snapshot.cross_aspects for snapshot in snapshots))
+
+
+class TestTransitRangeStream(unittest.TestCase):
+    def setUp(self) -> None:
+        patch = mock.patch("ratelimit.RATE_LIMIT_ENABLED", False)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.client = TestClient(app)
+
+    def test_event_framing(self):
+        response = self.client.post("/api/transit-range/stream", json=RANGE_BODY, headers=AUTH)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        events = _events(response.text)
+
+        names = [name for name, _ in events]
+        self.assertEqual(names[0], "start")
+        self.assertEqual(events[0][1]["total"], 7)
+        self.assertEqual(names[-1], "done")
+        self.assertEqual(events[-1][1], {"completed": 7, "total": 7})
+        self.assertEqual(names.count("snapshot"), 7)
+        # Short ranges report progress after every step.
+        progress = [data for name, data in events if name == "progress"]
+        self.assertEqual([p["completed"] for p in progress], list(range(1, 8)))
+        self.assertEqual(progress[-1]["percent"], 100.0)
+        snapshot = next(data for name, data in events if name == "snapshot")
+        self.assertIn("sun", snapshot["subject"])
+
+    def test_changes_only_sends_one_snapshot_then_changes(self):
+        response = self.client.post(
+            "/api/transit-range/stream", params={"changes_only": "true"}, json=RANGE_BODY, headers=AUTH
+        )
+        names = [name for name, _ in _events(response.text) if name in ("snapshot", "changes")]
+        self.assertEqual(names, ["snapshot"] + ["changes"] * 6)
+
+    def test_patterns_output_streams_lifecycles_without_snapshots(self):
+        body = {**RANGE_BODY, "output": "patterns"}
+        events = _events(self.client.post("/api/transit-range/stream", json=body, headers=AUTH).text)
+        names = [name for name, _ in events]
+        self.assertNotIn("snapshot", names)
+        self.assertEqual(names[-2:], ["patterns", "done"])
+
+        expected = self.client.post("/api/transit-range", json=body, headers=AUTH).json()["patterns"]
+        self.assertTrue(expected)
+        self.assertEqual(events[-2][1]["patterns"], expected)
+
+    def test_both_output_streams_snapshots_and_lifecycles(self):
+        body = {**RANGE_BODY, "output": "both"}
+        response = self.client.post("/api/transit-range/stream", json=body, headers=AUTH)
+        names = [name for name, _ in _events(response.text)]
+        self.assertEqual(names.count("snapshot"), 7)
+        self.assertEqual(names.count("patterns"), 1)
+
+    def test_changes_only_rejects_patterns_output(self):
+        response = self.client.post(
+            "/api/transit-range/stream",
+            params={"changes_only": "true"},
+            json={**RANGE_BODY, "output": "patterns"},
+            headers=AUTH,
+        )
+        self.assertEqual(response.status_code, 422)
+
+
+if __name__ == "__main__":
+    unittest.main()
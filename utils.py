@@ -1,33 +1,37 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-from io import BytesIO
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+import os
 import shutil
 import tempfile
-from typing import Generator, Optional
+from typing import Optional
 from zoneinfo import ZoneInfo
 from calendar import monthrange
 import re
 import textwrap
+import threading
 
 from kerykeion import AstrologicalSubjectFactory, AspectsFactory  # type: ignore
 from kerykeion.charts.chart_drawer import ChartDrawer  # type: ignore
 from reportlab.lib.pagesizes import letter  # type: ignore
 from reportlab.pdfgen import canvas  # type: ignore
-from reportlab.graphics import renderPDF  # type: ignore
-from svglib.svglib import svg2rlg  # type: ignore
-from reportlab.lib.units import inch  # type: ignore
 from reportlab.lib import colors  # type: ignore
-from reportlab.platypus import SimpleDocTemplate, Image, Spacer, Table, TableStyle, Paragraph  # type: ignore
+from reportlab.platypus import SimpleDocTemplate, Spacer, Table, TableStyle, Paragraph  # type: ignore
 from reportlab.lib.styles import getSampleStyleSheet  # type: ignore
-import cairosvg  # type: ignore
 from reportlab.platypus.doctemplate import LayoutError  # type: ignore
-from reportlab.lib.utils import ImageReader  # type: ignore
 
 from aspects.ptolemaic import compute_major_aspects
-from enums import RangeGranularity, ZodiacType, ReportKind, Mode
-from schemas import BirthData, ChartConfig, ReportRequest
+from cache import TTLCache, canonical_hash
+from cancellation import CancelToken, check_cancelled
+from render_pool import render_pool
+from enums import ZodiacType, ReportDetail, ReportKind, Mode
+from schemas import BirthData, ChartConfig, ReportRequest, TransitMomentInput, TransitRangeRequest
+
+# Swiss Ephemeris keeps sidereal mode / topocentric location as process-global
+# state, so subject construction must not interleave across worker threads.
+EPHEMERIS_LOCK = threading.Lock()
 
 
 def ensure_config(config: Optional[ChartConfig]) -> ChartConfig:
@@ -73,9 +77,19 @@ def resolve_mode(request: ReportRequest) -> Mode:
     return mode
 
 
-def build_subject(birth: BirthData, config: Optional[ChartConfig]):
+def build_subject(
+    birth: BirthData,
+    config: Optional[ChartConfig],
+    is_dst: Optional[bool] = None,
+    active_points: Optional[list[str]] = None,
+):
     """
     Create a Kerykeion AstrologicalSubject from BirthData + ChartConfig.
+
+    `is_dst` disambiguates wall-clock times that occur twice (or not at all)
+    around a DST transition; Kerykeion rejects those when it is left unset.
+    `active_points` (Kerykeion point names) limits which points are computed;
+    house cusps are always included.
     """
     cfg = ensure_config(config)
 
@@ -98,8 +112,13 @@ def build_subject(birth: BirthData, config: Optional[ChartConfig]):
         kwargs["sidereal_mode"] = cfg.sidereal_mode.value
     kwargs["perspective_type"] = cfg.perspective.value
     kwargs["houses_system_identifier"] = cfg.house_system.value
+    if is_dst is not None:
+        kwargs["is_dst"] = is_dst
+    if active_points is not None:
+        kwargs["active_points"] = active_points
 
-    subject = AstrologicalSubjectFactory.from_birth_data(**kwargs)
+    with EPHEMERIS_LOCK:
+        subject = AstrologicalSubjectFactory.from_birth_data(**kwargs)
 
     # Optionally override city/nation labels if provided explicitly in the request
     if birth.city:
@@ -117,6 +136,9 @@ def build_subject_for_moment(
 ):
     """
     Reuse base location / timezone, but override date & time with the given datetime.
+
+    For aware datetimes the DST flag is forwarded, so repeated wall-clock
+    times (fall-back) resolve to the same instant as `dt`.
     """
     return build_subject(
         BirthData(
@@ -133,9 +155,31 @@ def build_subject_for_moment(
             nation=base.nation,
         ),
         config,
+        is_dst=bool(dt.dst()) if dt.tzinfo is not None else None,
     )
 
 
+# Natal subjects keyed by canonical birth data + config. Range-style endpoints
+# (transit ranges, timelines, returns, progressions) measure against the same
+# natal chart request after request.
+SUBJECT_CACHE_SIZE = int(os.getenv("SUBJECT_CACHE_SIZE", "256"))
+SUBJECT_CACHE_TTL_SECONDS = float(os.getenv("SUBJECT_CACHE_TTL_SECONDS", "3600"))
+subject_cache: TTLCache = TTLCache(SUBJECT_CACHE_SIZE, SUBJECT_CACHE_TTL_SECONDS)
+
+
+def cached_subject(birth: BirthData, config: Optional[ChartConfig]):
+    """
+    `build_subject` through `subject_cache`; cached subjects are shared and read-only.
+    """
+    cfg = ensure_config(config)
+    key = canonical_hash({"birth": birth.model_dump(mode="json"), "config": cfg.model_dump(mode="json")})
+    subject = subject_cache.get(key)
+    if subject is None:
+        subject = build_subject(birth, cfg)
+        subject_cache.set(key, subject)
+    return subject
+
+
 def sign_display(sign: Optional[str]) -> str:
     """Return a readable zodiac sign label from a short code."""
     if not sign:
@@ -257,6 +301,23 @@ def extract_houses_table(subject_data: dict) -> list[dict]:
     return rows
 
 
+def moment_to_birth(moment: TransitMomentInput, name: str = "Transit") -> BirthData:
+    """Turn a (nameless) transit moment into BirthData so it can be built as a subject."""
+    return BirthData(
+        name=name,
+        year=moment.year,
+        month=moment.month,
+        day=moment.day,
+        hour=moment.hour,
+        minute=moment.minute,
+        lng=moment.lng,
+        lat=moment.lat,
+        tz_str=moment.tz_str,
+        city=moment.city,
+        nation=moment.nation,
+    )
+
+
 def to_local_datetime(birth: BirthData) -> datetime:
     """Convert BirthData to an aware datetime using tz_str."""
     tz = ZoneInfo(birth.tz_str)
@@ -279,38 +340,29 @@ def add_months(dt: datetime, months: int) -> datetime:
     return dt.replace(year=year, month=month, day=day)
 
 
-def iter_range_datetimes(
-    start: datetime,
-    end: datetime,
-    granularity: RangeGranularity,
-) -> Generator[datetime, None, None]:
-    """Yield datetimes from start to end (inclusive) according to the desired granularity."""
-    if start > end:
-        raise ValueError("start must be <= end")
-
-    current = start
-
-    if granularity == RangeGranularity.MINUTE:
-        delta = timedelta(minutes=1)
-        while current <= end:
-            yield current
-            current += delta
-    elif granularity == RangeGranularity.HOUR:
-        delta = timedelta(hours=1)
-        while current <= end:
-            yield current
-            current += delta
-    elif granularity == RangeGranularity.DAY:
-        delta = timedelta(days=1)
-        while current <= end:
-            yield current
-            current += delta
-    elif granularity == RangeGranularity.MONTH:
-        while current <= end:
-            yield current
-            current = add_months(current, 1)
-    else:
-        raise ValueError(f"Unsupported granularity: {granularity}")
+def resolve_range_bounds(payload: TransitRangeRequest) -> tuple[BirthData, datetime, datetime]:
+    """
+    Build the BirthData used for every step plus the local start/end datetimes.
+    """
+    m = payload.moment
+    start_birth = moment_to_birth(m, name="Transit start")
+
+    e = payload.end
+    end_birth = BirthData(
+        name="Transit end",
+        year=e.year,
+        month=e.month,
+        day=e.day,
+        hour=e.hour,
+        minute=e.minute,
+        lng=m.lng,
+        lat=m.lat,
+        tz_str=m.tz_str,
+        city=m.city,
+        nation=m.nation,
+    )
+
+    return start_birth, to_local_datetime(start_birth), to_local_datetime(end_birth)
 
 
 def render_svg_to_string(drawer: ChartDrawer, filename_prefix: str = "chart") -> str:
@@ -474,6 +526,29 @@ def extract_aspect_rows(aspects_data: dict) -> list[dict]:
     return rows
 
 
+# Static Markdown fragments of the report tables. Rows are rendered with
+# f-strings in list comprehensions, which compile to a single string build
+# per row and beat `str.format` templates.
+_MD_POINTS_HEADER = ("", "### Planetary positions", "| Body | Sign | Degree | House | Rx |", "| --- | --- | --- | --- | --- |")
+_MD_HOUSES_HEADER = ("", "### Houses", "| House | Sign | Degree |", "| --- | --- | --- |")
+_MD_ASPECTS_HEADER = ("", "| Point A | Aspect | Point B | Orb | Movement |", "| --- | --- | --- | --- | --- |")
+_MD_SYNASTRY_HEADER = ("", "| Inner | Aspect | Outer | Orb | Movement |", "| --- | --- | --- | --- | --- |")
+
+
+def _md_aspect_rows(rows: list[dict]) -> list[str]:
+    return [
+        f"| {row.get('left','')} | {row.get('aspect','')} | {row.get('right','')} | {row.get('orb','')} | {row.get('movement','')} |"
+        for row in rows
+    ]
+
+
+def _md_aspect_totals(summary: dict) -> str:
+    return (
+        f"- Total aspects: {summary.get('total', 0)} "
+        f"(Applying: {summary.get('applying', 0)}, Separating: {summary.get('separating', 0)}, Fixed: {summary.get('fixed', 0)})"
+    )
+
+
 def render_markdown_report(structured: dict) -> str:
     """
     Render a Markdown-flavored view of the structured report.
@@ -490,47 +565,37 @@ def render_markdown_report(structured: dict) -> str:
         meta = subject.get("meta", {})
         lines.append("")
         lines.append(f"## {subject.get('label')}: {meta.get('name', 'Chart')}")
-        meta_bits = []
         if meta.get("local_datetime"):
-            meta_bits.append(f"**Date & time:** {meta['local_datetime']} ({meta.get('tz', '')})")
+            lines.append(f"- **Date & time:** {meta['local_datetime']} ({meta.get('tz', '')})")
         if meta.get("location"):
-            meta_bits.append(f"**Location:** {meta['location']}")
+            lines.append(f"- **Location:** {meta['location']}")
         if meta.get("zodiac_type"):
             zodiac = meta["zodiac_type"]
             if meta.get("sidereal_mode"):
                 zodiac = f"{zodiac} - {meta['sidereal_mode']}"
-            meta_bits.append(f"**Zodiac:** {zodiac}")
+            lines.append(f"- **Zodiac:** {zodiac}")
         if meta.get("house_system"):
-            meta_bits.append(f"**Houses:** {meta['house_system']}")
-        if meta_bits:
-            for bit in meta_bits:
-                lines.append(f"- {bit}")
+            lines.append(f"- **Houses:** {meta['house_system']}")
         lunar = subject.get("lunar_phase")
         if isinstance(lunar, dict) and lunar.get("moon_phase_name"):
             lines.append(f"- **Lunar phase:** {lunar.get('moon_phase_name')} {lunar.get('moon_emoji', '')}".rstrip())
 
         points = subject.get("points", [])
         if points:
-            lines.append("")
-            lines.append("### Planetary positions")
-            lines.append("| Body | Sign | Degree | House | Rx |")
-            lines.append("| --- | --- | --- | --- | --- |")
-            for row in points:
-                rx = "R" if row.get("retrograde") else ""
-                lines.append(
-                    f"| {row.get('name','')} | {row.get('sign','')} | {row.get('degree','')} | {row.get('house','')} | {rx} |"
-                )
+            lines.extend(_MD_POINTS_HEADER)
+            lines.extend(
+                [
+                    f"| {row.get('name','')} | {row.get('sign','')} | {row.get('degree','')} | {row.get('house','')} | {'R' if row.get('retrograde') else ''} |"
+                    for row in points
+                ]
+            )
 
         houses = subject.get("houses", [])
         if houses:
-            lines.append("")
-            lines.append("### Houses")
-            lines.append("| House | Sign | Degree |")
-            lines.append("| --- | --- | --- |")
-            for row in houses:
-                lines.append(
-                    f"| {row.get('name','')} | {row.get('sign','')} | {row.get('degree','')} |"
-                )
+            lines.extend(_MD_HOUSES_HEADER)
+            lines.extend(
+                [f"| {row.get('name','')} | {row.get('sign','')} | {row.get('degree','')} |" for row in houses]
+            )
 
         aspects_block = subject.get("aspects") or {}
         aspects_rows = aspects_block.get("rows") or []
@@ -541,17 +606,9 @@ def render_markdown_report(structured: dict) -> str:
             if aspects_block.get("title"):
                 lines.append(f"**{aspects_block['title']}**")
             if aspects_summary:
-                lines.append(
-                    f"- Total aspects: {aspects_summary.get('total', 0)} "
-                    f"(Applying: {aspects_summary.get('applying', 0)}, Separating: {aspects_summary.get('separating', 0)}, Fixed: {aspects_summary.get('fixed', 0)})"
-                )
-            lines.append("")
-            lines.append("| Point A | Aspect | Point B | Orb | Movement |")
-            lines.append("| --- | --- | --- | --- | --- |")
-            for row in aspects_rows:
-                lines.append(
-                    f"| {row.get('left','')} | {row.get('aspect','')} | {row.get('right','')} | {row.get('orb','')} | {row.get('movement','')} |"
-                )
+                lines.append(_md_aspect_totals(aspects_summary))
+            lines.extend(_MD_ASPECTS_HEADER)
+            lines.extend(_md_aspect_rows(aspects_rows))
 
     synastry = structured.get("synastry")
     if synastry:
@@ -562,33 +619,33 @@ def render_markdown_report(structured: dict) -> str:
         summary = synastry.get("summary") or {}
         if summary:
             lines.append("")
-            lines.append(
-                f"- Total aspects: {summary.get('total', 0)} "
-                f"(Applying: {summary.get('applying', 0)}, Separating: {summary.get('separating', 0)}, Fixed: {summary.get('fixed', 0)})"
-            )
+            lines.append(_md_aspect_totals(summary))
             closest = summary.get("closest") or []
             if closest:
                 lines.append("- Tightest aspects:")
-                for item in closest:
-                    lines.append(
+                lines.extend(
+                    [
                         f"  - {item.get('left','')} {item.get('aspect','')} {item.get('right','')} (orb {item.get('orb','')}, {item.get('movement','')})"
-                    )
+                        for item in closest
+                    ]
+                )
         rows = synastry.get("rows", [])
         if rows:
-            lines.append("")
-            lines.append("| Inner | Aspect | Outer | Orb | Movement |")
-            lines.append("| --- | --- | --- | --- | --- |")
-            for row in rows:
-                lines.append(
-                    f"| {row.get('left','')} | {row.get('aspect','')} | {row.get('right','')} | {row.get('orb','')} | {row.get('movement','')} |"
-                )
+            lines.extend(_MD_SYNASTRY_HEADER)
+            lines.extend(_md_aspect_rows(rows))
 
     return "\n".join(lines).strip()
 
 
-def generate_report_content(request: ReportRequest) -> tuple[dict, str]:
+def generate_report_content(
+    request: ReportRequest,
+    cancel_token: Optional[CancelToken] = None,
+) -> tuple[dict, str]:
     """
     Build a structured report plus a Markdown representation.
+
+    When a `cancel_token` is given it is checked before every subject and
+    aspect computation, raising `RequestCancelled` once the client is gone.
     """
     cfg = ensure_config(request.config)
     mode = resolve_mode(request)
@@ -601,8 +658,10 @@ def generate_report_content(request: ReportRequest) -> tuple[dict, str]:
     }
 
     def add_subject(birth: BirthData, label: str) -> tuple[dict, object]:
+        check_cancelled(cancel_token)
         block, subject = build_subject_block(birth, cfg, label)
         if request.include_aspects:
+            check_cancelled(cancel_token)
             try:
                 aspects_model = AspectsFactory.natal_aspects(subject)
                 aspects_dump = aspects_model.model_dump(mode="json")
@@ -656,6 +715,7 @@ def generate_report_content(request: ReportRequest) -> tuple[dict, str]:
         structured["title"] = f"Synastry report - {first_block['meta']['name']} natal + {second_block['meta']['name']} natal"
         structured["summary"] = "Dual-wheel synastry overview with shared aspects."
 
+        check_cancelled(cancel_token)
         aspects_model = AspectsFactory.dual_chart_aspects(first_subject, second_subject)
         aspects_dump = aspects_model.model_dump(mode="json")
         aspect_rows = extract_aspect_rows(aspects_dump)
@@ -689,6 +749,7 @@ def generate_report_content(request: ReportRequest) -> tuple[dict, str]:
         structured["title"] = f"Dual-wheel report - {natal_block['meta']['name']} natal + transit"
         structured["summary"] = "Natal chart paired with a transit snapshot."
 
+        check_cancelled(cancel_token)
         try:
             aspects_model = AspectsFactory.dual_chart_aspects(natal_subject, transit_subject)
             aspects_dump = aspects_model.model_dump(mode="json")
@@ -729,11 +790,76 @@ def generate_report_content(request: ReportRequest) -> tuple[dict, str]:
         structured["title"] = f"Natal report - {request.birth.name}"
         structured["summary"] = "Full natal positions with houses and angles."
 
+    check_cancelled(cancel_token)
     markdown = render_markdown_report(structured)
     structured["markdown"] = markdown
     return structured, markdown
 
 
+# Structured reports keyed by canonical request hash, so /report followed by
+# /report/pdf for the same request builds subjects and aspects only once.
+REPORT_CACHE_SIZE = int(os.getenv("REPORT_CACHE_SIZE", "128"))
+REPORT_CACHE_TTL_SECONDS = float(os.getenv("REPORT_CACHE_TTL_SECONDS", "600"))
+report_cache: TTLCache[tuple[dict, str]] = TTLCache(REPORT_CACHE_SIZE, REPORT_CACHE_TTL_SECONDS)
+
+
+def report_cache_key(request: ReportRequest) -> str:
+    """
+    Hash of the normalized request: config defaults applied and mode resolved.
+
+    `detail` is left out since it only trims the cached full report.
+    """
+    data = request.model_dump(mode="json", exclude={"detail"})
+    data["config"] = ensure_config(request.config).model_dump(mode="json")
+    data["mode"] = resolve_mode(request).value
+    return canonical_hash(data)
+
+
+def get_report_content(
+    request: ReportRequest,
+    cancel_token: Optional[CancelToken] = None,
+) -> tuple[dict, str]:
+    """
+    `generate_report_content` through the report cache; cached reports are shared and read-only.
+    """
+    key = report_cache_key(request)
+    cached = report_cache.get(key)
+    if cached is not None:
+        return cached
+    content = generate_report_content(request, cancel_token=cancel_token)
+    report_cache.set(key, content)
+    return content
+
+
+def _trim_aspect_section(section: dict, detail: ReportDetail) -> dict:
+    drop = {"raw", "rows"} if detail == ReportDetail.SUMMARY else {"raw"}
+    return {k: v for k, v in section.items() if k not in drop}
+
+
+def project_report(structured: dict, detail: ReportDetail) -> dict:
+    """
+    Trim a full structured report to `detail` without modifying it (it may be cached).
+
+    `standard` drops raw Kerykeion dumps and the duplicated Markdown; `summary`
+    additionally drops house tables and aspect rows, keeping aspect summaries.
+    """
+    if detail == ReportDetail.FULL:
+        return structured
+    skip_block = {"raw_subject", "houses"} if detail == ReportDetail.SUMMARY else {"raw_subject"}
+    subjects = []
+    for block in structured.get("subjects", []):
+        trimmed = {k: v for k, v in block.items() if k not in skip_block}
+        if "aspects" in trimmed:
+            trimmed["aspects"] = _trim_aspect_section(trimmed["aspects"], detail)
+        subjects.append(trimmed)
+
+    projected = {k: v for k, v in structured.items() if k not in {"markdown", "subjects", "synastry"}}
+    projected["subjects"] = subjects
+    if "synastry" in structured:
+        projected["synastry"] = _trim_aspect_section(structured["synastry"], detail)
+    return projected
+
+
 def generate_report_text(request: ReportRequest) -> str:
     """
     Backwards-compatible wrapper that returns only the Markdown report text.
@@ -742,6 +868,22 @@ def generate_report_text(request: ReportRequest) -> str:
     return markdown
 
 
+_PDF_TEXT_WRAPPER = textwrap.TextWrapper(width=110)
+
+
+def _wrap_line(wrapper: textwrap.TextWrapper, line: str) -> list[str]:
+    """
+    Wrap one line like `wrapper.wrap(line) or [""]`, skipping textwrap for short lines.
+
+    A printable line that already fits contains no whitespace other than plain
+    spaces, so textwrap would only strip its trailing spaces.
+    """
+    expanded = line.expandtabs(wrapper.tabsize)
+    if len(expanded) <= wrapper.width and expanded.isprintable():
+        return [expanded.rstrip(" ")]
+    return wrapper.wrap(line) or [""]
+
+
 def render_report_text_pdf(report_text: str, filename_prefix: str = "report") -> bytes:
     """
     Render plain report text into a simple PDF for download.
@@ -754,7 +896,7 @@ def render_report_text_pdf(report_text: str, filename_prefix: str = "report") ->
         y = height - 40
         c.setFont("Helvetica", 10)
         for line in report_text.splitlines():
-            for wrapped in textwrap.wrap(line, width=110) or [""]:
+            for wrapped in _wrap_line(_PDF_TEXT_WRAPPER, line):
                 c.drawString(40, y, wrapped)
                 y -= 12
                 if y < 40:
@@ -767,9 +909,44 @@ def render_report_text_pdf(report_text: str, filename_prefix: str = "report") ->
         shutil.rmtree(tmp_dir, ignore_errors=True)
 
 
-def render_structured_report_pdf(report: dict, filename_prefix: str = "report") -> bytes:
+# Table styles are immutable once built, so every report shares the same instances.
+_PDF_TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
+        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+    ]
+)
+_PDF_POINTS_TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
+        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ]
+)
+
+
+@lru_cache(maxsize=1)
+def _report_styles():
+    """ReportLab's sample stylesheet, built once instead of per report."""
+    return getSampleStyleSheet()
+
+
+def render_structured_report_pdf(
+    report: dict,
+    filename_prefix: str = "report",
+    cancel_token: Optional[CancelToken] = None,
+) -> bytes:
     """
     Render a richer PDF from the structured report payload (subjects + aspects).
+
+    A `cancel_token` is checked per subject section and per rendered page.
     """
     tmp_dir = Path(tempfile.mkdtemp(prefix="kerykeion_report_pdf_"))
     try:
@@ -782,7 +959,7 @@ def render_structured_report_pdf(report: dict, filename_prefix: str = "report")
             topMargin=40,
             bottomMargin=40,
         )
-        styles = getSampleStyleSheet()
+        styles = _report_styles()
         story = []
 
         title = report.get("title") or "Astrology Report"
@@ -793,6 +970,7 @@ def render_structured_report_pdf(report: dict, filename_prefix: str = "report")
             story.append(Paragraph(summary, styles["BodyText"]))
 
         for subject in report.get("subjects", []):
+            check_cancelled(cancel_token)
             meta = subject.get("meta", {})
             story.append(Spacer(1, 14))
             story.append(
@@ -843,19 +1021,7 @@ def render_structured_report_pdf(report: dict, filename_prefix: str = "report")
                         ]
                     )
                 table = Table(table_data, repeatRows=1)
-                table.setStyle(
-                    TableStyle(
-                        [
-                            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                            ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-                            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                            ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
-                            ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                        ]
-                    )
-                )
+                table.setStyle(_PDF_POINTS_TABLE_STYLE)
                 story.append(table)
 
             houses = subject.get("houses", [])
@@ -868,17 +1034,7 @@ def render_structured_report_pdf(report: dict, filename_prefix: str = "report")
                         [row.get("name", ""), row.get("sign", ""), row.get("degree", "")]
                     )
                 table = Table(table_data, repeatRows=1)
-                table.setStyle(
-                    TableStyle(
-                        [
-                            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                            ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
-                            ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                        ]
-                    )
-                )
+                table.setStyle(_PDF_TABLE_STYLE)
                 story.append(table)
 
             aspects = subject.get("aspects", {})
@@ -905,19 +1061,10 @@ def render_structured_report_pdf(report: dict, filename_prefix: str = "report")
                         ]
                     )
                 table = Table(table_data, repeatRows=1)
-                table.setStyle(
-                    TableStyle(
-                        [
-                            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                            ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
-                            ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                        ]
-                    )
-                )
+                table.setStyle(_PDF_TABLE_STYLE)
                 story.append(table)
 
+        check_cancelled(cancel_token)
         synastry = report.get("synastry")
         if synastry and synastry.get("rows"):
             story.append(Spacer(1, 14))
@@ -951,21 +1098,14 @@ def render_structured_report_pdf(report: dict, filename_prefix: str = "report")
                     ]
                 )
             table = Table(table_data, repeatRows=1)
-            table.setStyle(
-                TableStyle(
-                    [
-                        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                        ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
-                        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ]
-                )
-            )
+            table.setStyle(_PDF_TABLE_STYLE)
             story.append(table)
 
+        def on_page(canv, page_doc) -> None:
+            check_cancelled(cancel_token)
+
         try:
-            doc.build(story)
+            doc.build(story, onFirstPage=on_page, onLaterPages=on_page)
         except LayoutError:
             # Fallback to a simple text-based PDF if layout fails.
             markdown = report.get("markdown") or render_markdown_report(report)
@@ -991,117 +1131,61 @@ def normalize_svg_colors(svg_text: str) -> str:
     return re.sub(r"var\((--[-a-zA-Z0-9_]+)\)", replace_var, svg_text)
 
 
+REPORT_GLYPH_MAP = {
+    "☉": "Sun",
+    "☽": "Moon",
+    "☿": "Mercury",
+    "♀": "Venus",
+    "♂": "Mars",
+    "♃": "Jupiter",
+    "♄": "Saturn",
+    "♅": "Uranus",
+    "♆": "Neptune",
+    "♇": "Pluto",
+    "☊": "Node",
+    "☋": "Node",
+    "♈": "Aries",
+    "♉": "Taurus",
+    "♊": "Gemini",
+    "♋": "Cancer",
+    "♌": "Leo",
+    "♍": "Virgo",
+    "♎": "Libra",
+    "♏": "Scorpio",
+    "♐": "Sagittarius",
+    "♑": "Capricorn",
+    "♒": "Aquarius",
+    "♓": "Pisces",
+}
+# Single-pass replacement of every glyph via str.translate.
+_REPORT_GLYPH_TABLE = str.maketrans(REPORT_GLYPH_MAP)
+_REPORT_TEXT_WRAPPER = textwrap.TextWrapper(width=100, tabsize=2)
+
+
 def transform_report_text(report_text: str) -> str:
     """
     Prepare report text for PDF: replace glyphs, normalize, and wrap lines.
     """
-    glyph_map = {
-        "☉": "Sun",
-        "☽": "Moon",
-        "☿": "Mercury",
-        "♀": "Venus",
-        "♂": "Mars",
-        "♃": "Jupiter",
-        "♄": "Saturn",
-        "♅": "Uranus",
-        "♆": "Neptune",
-        "♇": "Pluto",
-        "☊": "Node",
-        "☋": "Node",
-        "♈": "Aries",
-        "♉": "Taurus",
-        "♊": "Gemini",
-        "♋": "Cancer",
-        "♌": "Leo",
-        "♍": "Virgo",
-        "♎": "Libra",
-        "♏": "Scorpio",
-        "♐": "Sagittarius",
-        "♑": "Capricorn",
-        "♒": "Aquarius",
-        "♓": "Pisces",
-    }
-
-    def replace_glyphs(text: str) -> str:
-        for glyph, word in glyph_map.items():
-            text = text.replace(glyph, word)
-        return text
-
-    cleaned = replace_glyphs(report_text)
     wrapped_lines: list[str] = []
-    for line in cleaned.splitlines():
-        line = line.expandtabs(2)
-        for chunk in textwrap.wrap(line, width=100) or [""]:
-            wrapped_lines.append(chunk)
+    for line in report_text.translate(_REPORT_GLYPH_TABLE).splitlines():
+        wrapped_lines.extend(_wrap_line(_REPORT_TEXT_WRAPPER, line))
     return "\n".join(wrapped_lines)
 
 
-def render_pdf_from_svg(svg_text: str, filename_prefix: str = "chart") -> bytes:
+def render_pdf_from_svg(
+    svg_text: str,
+    filename_prefix: str = "chart",
+    cancel_token: Optional[CancelToken] = None,
+) -> bytes:
     """
-    Render a PDF that embeds only the chart (converted to PNG) with no report text.
-    """
-    tmp_dir = Path(tempfile.mkdtemp(prefix="kerykeion_pdf_"))
-    try:
-        pdf_path = tmp_dir / f"{filename_prefix}.pdf"
-        fixed_svg = normalize_svg_colors(svg_text)
-
-        # First try to convert SVG directly to PDF (vector) for maximum quality and native styling.
-        try:
-            pdf_bytes = cairosvg.svg2pdf(bytestring=fixed_svg.encode("utf-8"), dpi=300, unsafe=True)
-            (tmp_dir / f"{filename_prefix}.pdf").write_bytes(pdf_bytes)
-            return pdf_bytes
-        except Exception:
-            pass
-
-        png_bytes: Optional[bytes] = None
-        try:
-            png_bytes = cairosvg.svg2png(bytestring=fixed_svg.encode("utf-8"), dpi=300, unsafe=True)
-        except Exception:
-            try:
-                svg_path = tmp_dir / f"{filename_prefix}.svg"
-                svg_path.write_text(fixed_svg, encoding="utf-8")
-                drawing = svg2rlg(str(svg_path))
-                renderPDF.drawToFile(drawing, str(tmp_dir / "tmp.pdf"))
-            except Exception:
-                png_bytes = None
-
-        story = []
-        if png_bytes:
-            try:
-                img = Image(BytesIO(png_bytes))
-                img._restrictSize(7.5 * inch, 9.0 * inch)
-                story.append(img)
-            except Exception:
-                pass
+    Render a PDF that embeds only the chart with no report text.
 
-        doc = SimpleDocTemplate(str(pdf_path), pagesize=letter, leftMargin=40, rightMargin=40, topMargin=40, bottomMargin=40)
-        try:
-            doc.build(story)
-        except Exception:
-            # Fallback: draw directly onto canvas
-            c = canvas.Canvas(str(pdf_path), pagesize=letter)
-            width, height = letter
-            if png_bytes:
-                try:
-                    reader = ImageReader(BytesIO(png_bytes))
-                    iw, ih = reader.getSize()
-                    scale = min((width - 80) / iw, (height - 80) / ih, 1.0)
-                    c.drawImage(
-                        reader,
-                        40,
-                        40,
-                        width=iw * scale,
-                        height=ih * scale,
-                        preserveAspectRatio=True,
-                        mask="auto",
-                    )
-                except Exception:
-                    pass
-            c.save()
-
-        return pdf_path.read_bytes()
-    finally:
-        shutil.rmtree(tmp_dir, ignore_errors=True)
+    Rasterization runs in the isolated render pool (see `render_pool.py`) under
+    per-job time and memory limits; raises `RenderError` if the job dies.
+    """
+    check_cancelled(cancel_token)
+    fixed_svg = normalize_svg_colors(svg_text)
+    return render_pool.render(fixed_svg, filename_prefix, cancel_token=cancel_token)
 
 
 def compute_dual_chart_aspects(